@@ -2,7 +2,9 @@ from rest_framework import serializers
 
 from account.models import AccessRequest, Role, TelegramProfile, User
 from core.utils.constants import EmployeeLevel, RoleSlug
+from core.utils.request_scope import ROLE_SLUGS, scoped_discard
 from gamification.services import ProgressionService
+from gamification.services_level_status import UserLevelStatusService
 
 
 class RoleSerializer(serializers.ModelSerializer):
@@ -149,6 +151,7 @@ class UserManagementUpdateSerializer(serializers.Serializer):
                     }
                 )
             instance.roles.set(roles)
+            scoped_discard(ROLE_SLUGS, instance.pk)
 
         update_fields: list[str] = []
         if "is_active" in validated_data:
@@ -157,6 +160,8 @@ class UserManagementUpdateSerializer(serializers.Serializer):
 
         if update_fields:
             instance.save(update_fields=update_fields)
+        if role_slugs is not None or "is_active" in validated_data:
+            ProgressionService.seed_technician_rows(user_ids=[instance.id])
 
         if "level" in validated_data:
             request = self.context.get("request")
@@ -174,6 +179,7 @@ class UserManagementUpdateSerializer(serializers.Serializer):
             else:
                 instance.level = next_level
                 instance.save(update_fields=["level"])
+                UserLevelStatusService.rebuild(user_ids=[instance.id])
 
         return instance
 
@@ -2,6 +2,9 @@ from django.urls import path
 
 from api.v1.core.views.analytics import (
     AnalyticsFleetAPIView,
+    AnalyticsFunnelAPIView,
+    AnalyticsQCTrendAPIView,
+    AnalyticsStageDurationAPIView,
     AnalyticsTeamAPIView,
     PublicTechnicianDetailAPIView,
     PublicTechnicianLeaderboardAPIView,
@@ -12,6 +15,13 @@ app_name = "analytics"
 urlpatterns = [
     path("fleet/", AnalyticsFleetAPIView.as_view(), name="analytics-fleet-api"),
     path("team/", AnalyticsTeamAPIView.as_view(), name="analytics-team-api"),
+    path("qc/", AnalyticsQCTrendAPIView.as_view(), name="analytics-qc-trend-api"),
+    path(
+        "stages/",
+        AnalyticsStageDurationAPIView.as_view(),
+        name="analytics-stage-durations-api",
+    ),
+    path("funnel/", AnalyticsFunnelAPIView.as_view(), name="analytics-funnel-api"),
     path(
         "public/leaderboard/",
         PublicTechnicianLeaderboardAPIView.as_view(),
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from api.v1.core.views.live import LiveEventStreamAPIView
+
+app_name = "live"
+
+urlpatterns = [
+    path("events/", LiveEventStreamAPIView.as_view(), name="live-events-api"),
+]
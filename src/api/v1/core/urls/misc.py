@@ -2,6 +2,7 @@ from django.urls import path
 
 from api.v1.core.views.misc import (
     AuditFeedAPIView,
+    DataExportAPIView,
     HealthAPIView,
 )
 
@@ -10,4 +11,9 @@ app_name = "misc"
 urlpatterns = [
     path("health/", HealthAPIView.as_view(), name="health-api"),
     path("audit-feed/", AuditFeedAPIView.as_view(), name="audit-feed-api"),
+    path(
+        "exports/<str:dataset>/",
+        DataExportAPIView.as_view(),
+        name="data-export-api",
+    ),
 ]
@@ -1,23 +1,85 @@
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
 from rest_framework import serializers, status
-from rest_framework.permissions import AllowAny
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
 from core.api.permissions import HasRole
 from core.api.schema import extend_schema
 from core.api.views import BaseAPIView
-from core.utils.constants import RoleSlug
+from core.utils.constants import (
+    AnalyticsGranularity,
+    RoleSlug,
+    TicketFunnelDimension,
+    TicketStageDimension,
+)
+from core.utils.swr_cache import CachedPayload
 from ticket.services_analytics import TicketAnalyticsService
+from ticket.services_funnel_analytics import TicketFunnelAnalyticsService
+from ticket.services_stage_analytics import TicketStageAnalyticsService
 
 AnalyticsPermission = HasRole.as_any(RoleSlug.SUPER_ADMIN, RoleSlug.OPS_MANAGER)
 
 
+def _cached_payload_response(entry: CachedPayload, payload=None) -> Response:
+    """Render a cached analytics payload with its age in the body and ``Age``."""
+    body = {
+        **(entry.payload if payload is None else payload),
+        "cache": {"age_seconds": entry.age_seconds, "stale": entry.stale},
+    }
+    response = Response(body, status=status.HTTP_200_OK)
+    response.headers["Age"] = str(entry.age_seconds)
+    return response
+
+
 class TeamAnalyticsQuerySerializer(serializers.Serializer):
     days = serializers.IntegerField(
         required=False, min_value=1, max_value=90, default=7
     )
 
 
+class QCTrendQuerySerializer(serializers.Serializer):
+    days = serializers.IntegerField(
+        required=False,
+        min_value=1,
+        max_value=TicketAnalyticsService.QC_TREND_MAX_DAYS,
+        default=30,
+    )
+    granularity = serializers.ChoiceField(
+        choices=AnalyticsGranularity.choices,
+        required=False,
+        default=AnalyticsGranularity.DAY,
+    )
+
+
+class StageDurationQuerySerializer(serializers.Serializer):
+    weeks = serializers.IntegerField(
+        required=False,
+        min_value=1,
+        max_value=TicketStageAnalyticsService.MAX_WEEKS,
+        default=8,
+    )
+    dimension = serializers.ChoiceField(
+        choices=TicketStageDimension.choices,
+        required=False,
+        default=TicketStageDimension.ALL,
+    )
+
+
+class FunnelQuerySerializer(serializers.Serializer):
+    weeks = serializers.IntegerField(
+        required=False,
+        min_value=1,
+        max_value=TicketFunnelAnalyticsService.MAX_WEEKS,
+        default=12,
+    )
+    dimension = serializers.ChoiceField(
+        choices=TicketFunnelDimension.choices,
+        required=False,
+        default=TicketFunnelDimension.ALL,
+    )
+
+
 class PublicTechnicianDetailQuerySerializer(serializers.Serializer):
     user_id = serializers.IntegerField(min_value=1)
 
@@ -27,16 +89,16 @@ class PublicTechnicianDetailQuerySerializer(serializers.Serializer):
     summary="Fleet analytics snapshot",
     description=(
         "Returns current fleet/ticket operational metrics including availability, "
-        "active backlog, SLA pressure indicators, and a 7-day QC KPI trend."
+        "active backlog, SLA pressure indicators, and a 7-day QC KPI trend. "
+        "Served from a stale-while-revalidate cache; `cache.age_seconds` and "
+        "the `Age` header tell how old `generated_at` is."
     ),
 )
 class AnalyticsFleetAPIView(BaseAPIView):
     permission_classes = (IsAuthenticated, AnalyticsPermission)
 
     def get(self, request, *args, **kwargs):
-        return Response(
-            TicketAnalyticsService.fleet_summary(), status=status.HTTP_200_OK
-        )
+        return _cached_payload_response(TicketAnalyticsService.fleet_summary.cached())
 
 
 @extend_schema(
@@ -44,7 +106,8 @@ class AnalyticsFleetAPIView(BaseAPIView):
     summary="Team analytics snapshot",
     description=(
         "Returns per-technician productivity metrics for a recent time window "
-        "(tickets done, first-pass QC rate, XP and attendance days)."
+        "(tickets done, first-pass QC rate, XP and attendance days). Cached "
+        "like the fleet snapshot."
     ),
     parameters=[TeamAnalyticsQuerySerializer],
 )
@@ -56,8 +119,88 @@ class AnalyticsTeamAPIView(BaseAPIView):
         serializer = self.get_serializer(data=request.query_params)
         serializer.is_valid(raise_exception=True)
         days = serializer.validated_data.get("days", 7)
-        payload = TicketAnalyticsService.team_summary(days=days)
-        return Response(payload, status=status.HTTP_200_OK)
+        return _cached_payload_response(
+            TicketAnalyticsService.team_summary.cached(days=days)
+        )
+
+
+@extend_schema(
+    tags=["Analytics"],
+    summary="QC trend",
+    description=(
+        "Returns done, first-pass, rework and QC pass/fail counts for the last "
+        "`days` business dates (up to 365), bucketed by `day`, `week` or "
+        "`month`. Edge buckets are clipped to the window. Cached like the "
+        "fleet snapshot."
+    ),
+    parameters=[QCTrendQuerySerializer],
+)
+class AnalyticsQCTrendAPIView(BaseAPIView):
+    permission_classes = (IsAuthenticated, AnalyticsPermission)
+    serializer_class = QCTrendQuerySerializer
+
+    def get(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return _cached_payload_response(
+            TicketAnalyticsService.qc_trend.cached(
+                days=serializer.validated_data["days"],
+                granularity=str(serializer.validated_data["granularity"]),
+            )
+        )
+
+
+@extend_schema(
+    tags=["Analytics"],
+    summary="Ticket stage durations",
+    description=(
+        "Returns weekly p50/p90/p99 and average minutes for time-to-assign, "
+        "time-in-progress, time-in-QC and end-to-end cycle time of done tickets, "
+        "fleet-wide or per technician/category. Served from persisted weekly "
+        "percentiles and cached like the fleet snapshot."
+    ),
+    parameters=[StageDurationQuerySerializer],
+)
+class AnalyticsStageDurationAPIView(BaseAPIView):
+    permission_classes = (IsAuthenticated, AnalyticsPermission)
+    serializer_class = StageDurationQuerySerializer
+
+    def get(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return _cached_payload_response(
+            TicketStageAnalyticsService.summary.cached(
+                weeks=serializer.validated_data["weeks"],
+                dimension=str(serializer.validated_data["dimension"]),
+            )
+        )
+
+
+@extend_schema(
+    tags=["Analytics"],
+    summary="Ticket funnel by intake week",
+    description=(
+        "Returns how many tickets of each weekly intake cohort reached review, "
+        "assignment, work, QC and done, with step conversion, drop-off, rework "
+        "counts and the `from>to` transition matrix, fleet-wide or per "
+        "category/master. Window totals sum the cohorts. Served from persisted "
+        "cohort rollups and cached like the fleet snapshot."
+    ),
+    parameters=[FunnelQuerySerializer],
+)
+class AnalyticsFunnelAPIView(BaseAPIView):
+    permission_classes = (IsAuthenticated, AnalyticsPermission)
+    serializer_class = FunnelQuerySerializer
+
+    def get(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return _cached_payload_response(
+            TicketFunnelAnalyticsService.summary.cached(
+                weeks=serializer.validated_data["weeks"],
+                dimension=str(serializer.validated_data["dimension"]),
+            )
+        )
 
 
 @extend_schema(
@@ -65,15 +208,30 @@ class AnalyticsTeamAPIView(BaseAPIView):
     summary="Public technician leaderboard",
     description=(
         "Public ranking chart for technicians based on cumulative score "
-        "(tickets, quality, XP, attendance, and penalties)."
+        "(tickets, quality, XP, attendance, and penalties). Supports "
+        "conditional requests via `ETag`/`If-None-Match` and "
+        "`Last-Modified`/`If-Modified-Since`."
     ),
 )
 class PublicTechnicianLeaderboardAPIView(BaseAPIView):
     permission_classes = (AllowAny,)
 
     def get(self, request, *args, **kwargs):
-        payload = TicketAnalyticsService.public_technician_leaderboard()
-        return Response(payload, status=status.HTTP_200_OK)
+        cached = TicketAnalyticsService.public_technician_leaderboard_entry.cached()
+        entry = cached.payload
+        etag = entry["etag"]
+        last_modified = entry["last_modified"]
+
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        response = not_modified or _cached_payload_response(
+            cached, payload=entry["payload"]
+        )
+        response.headers["ETag"] = etag
+        response.headers["Last-Modified"] = http_date(last_modified)
+        patch_cache_control(response, public=True, no_cache=True)
+        return response
 
 
 @extend_schema(
@@ -90,7 +248,9 @@ class PublicTechnicianDetailAPIView(BaseAPIView):
 
     def get(self, request, user_id: int, *args, **kwargs):
         try:
-            payload = TicketAnalyticsService.public_technician_detail(user_id=user_id)
+            entry = TicketAnalyticsService.public_technician_detail.cached(
+                user_id=user_id
+            )
         except ValueError as exc:
             return Response({"detail": str(exc)}, status=status.HTTP_404_NOT_FOUND)
-        return Response(payload, status=status.HTTP_200_OK)
+        return _cached_payload_response(entry)
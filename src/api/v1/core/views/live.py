@@ -0,0 +1,123 @@
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework import serializers, status
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.response import Response
+
+from core.api.authentication import QueryParamJWTAuthentication
+from core.api.permissions import request_role_slugs
+from core.api.schema import extend_schema
+from core.api.views import BaseAPIView
+from core.utils.constants import LiveEventTopic, RoleSlug
+from core.utils.live_events import get_live_event_hub, live_event_connection_count
+
+ROLE_TOPICS = {
+    RoleSlug.SUPER_ADMIN: frozenset(LiveEventTopic.values),
+    RoleSlug.OPS_MANAGER: frozenset(LiveEventTopic.values),
+    RoleSlug.MASTER: frozenset(LiveEventTopic.values),
+    RoleSlug.QC_INSPECTOR: frozenset({LiveEventTopic.TICKETS}),
+    RoleSlug.TECHNICIAN: frozenset(
+        {LiveEventTopic.TICKETS, LiveEventTopic.WORK_SESSIONS}
+    ),
+}
+# Roles that only see events about their own tickets and work sessions.
+OWN_EVENTS_ROLES = frozenset({RoleSlug.TECHNICIAN})
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Lets ``Accept: text/event-stream`` negotiate; errors still render as JSON."""
+
+    media_type = "text/event-stream"
+    format = "sse"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return JSONRenderer().render(data, renderer_context=renderer_context)
+
+
+class LiveEventStreamQuerySerializer(serializers.Serializer):
+    topics = serializers.CharField(required=False, allow_blank=True)
+
+    def validate_topics(self, value: str) -> frozenset[str]:
+        topics = frozenset(item.strip() for item in value.split(",") if item.strip())
+        unknown = sorted(topics - set(LiveEventTopic.values))
+        if unknown:
+            raise serializers.ValidationError(f"Unknown topics: {', '.join(unknown)}.")
+        return topics
+
+
+@extend_schema(
+    tags=["Live"],
+    summary="Live dashboard event stream",
+    description=(
+        "Server-sent events with compact deltas for ticket transitions "
+        "(`ticket.transition`), work-session changes (`work_session.transition`) "
+        "and fleet counter updates (`fleet.counters`). Optional `topics` is a "
+        "comma-separated subset of `tickets`, `work_sessions`, `fleet` allowed for "
+        "the caller's roles; technicians only receive their own events. "
+        "Browsers may pass the JWT as `access_token`. Idle streams get `: ping` "
+        "heartbeats; a `resync` event ends a stream that fell behind."
+    ),
+    parameters=[LiveEventStreamQuerySerializer],
+)
+class LiveEventStreamAPIView(BaseAPIView):
+    authentication_classes = (QueryParamJWTAuthentication,)
+    permission_classes = (IsAuthenticated,)
+    renderer_classes = (JSONRenderer, EventStreamRenderer)
+    serializer_class = LiveEventStreamQuerySerializer
+
+    def get(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        role_slugs = request_role_slugs(request)
+        allowed_topics = self.allowed_topics(
+            role_slugs=role_slugs, is_superuser=request.user.is_superuser
+        )
+        topics = serializer.validated_data.get("topics") or allowed_topics
+        if not topics or not topics <= allowed_topics:
+            raise PermissionDenied("Requested live topics are not allowed.")
+
+        if live_event_connection_count() >= settings.LIVE_EVENTS_MAX_CONNECTIONS:
+            return Response(
+                {"detail": "Live event stream is at capacity."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": "5"},
+            )
+
+        own_events_only = not request.user.is_superuser and (
+            role_slugs <= OWN_EVENTS_ROLES
+        )
+        response = StreamingHttpResponse(
+            self._event_stream(
+                topics=topics,
+                technician_id=request.user.id if own_events_only else None,
+            ),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    @staticmethod
+    def allowed_topics(
+        *, role_slugs: frozenset[str], is_superuser: bool
+    ) -> frozenset[str]:
+        if is_superuser:
+            return frozenset(LiveEventTopic.values)
+        return frozenset().union(
+            *(ROLE_TOPICS.get(slug, frozenset()) for slug in role_slugs)
+        )
+
+    @staticmethod
+    async def _event_stream(*, topics: frozenset[str], technician_id: int | None):
+        # Runs on the ASGI event loop; no database access from here on.
+        hub = get_live_event_hub()
+        async with hub.subscribe(
+            topics=topics, technician_id=technician_id
+        ) as subscription:
+            async for frame in subscription.frames(
+                heartbeat_seconds=settings.LIVE_EVENTS_HEARTBEAT_SECONDS
+            ):
+                yield frame
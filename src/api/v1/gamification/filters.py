@@ -1,4 +1,3 @@
-from django.db.models import Q
 from django_filters import rest_framework as filters
 from rest_framework.exceptions import PermissionDenied, ValidationError
 
@@ -89,12 +88,7 @@ class XPTransactionFilterSet(filters.FilterSet):
 
     def filter_ticket_id(self, queryset, name, value):
         ticket_id = self._validate_positive_int(value=value, field_name=name)
-        return queryset.filter(
-            Q(payload__ticket_id=ticket_id)
-            | Q(reference=f"ticket_base_xp:{ticket_id}")
-            | Q(reference=f"ticket_qc_first_pass_bonus:{ticket_id}")
-            | Q(reference__startswith=f"ticket_qc_status_update:{ticket_id}:")
-        )
+        return queryset.filter(ticket_id=ticket_id)
 
     def filter_ordering(self, queryset, name, value):
         return queryset.order_by(value, "-id")
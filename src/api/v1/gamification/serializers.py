@@ -1,7 +1,8 @@
 from rest_framework import serializers
 
-from gamification.models import XPTransaction
 from core.utils.constants import EmployeeLevel
+from gamification.models import XPTransaction
+from gamification.services_level_status import UserLevelStatusService
 
 
 class XPTransactionSerializer(serializers.ModelSerializer):
@@ -10,6 +11,7 @@ class XPTransactionSerializer(serializers.ModelSerializer):
         fields = (
             "id",
             "user",
+            "ticket",
             "amount",
             "entry_type",
             "reference",
@@ -54,3 +56,20 @@ class LevelManualSetSerializer(serializers.Serializer):
         allow_blank=True,
     )
     clear_warning = serializers.BooleanField(required=False, default=False)
+
+
+class LevelControlOverviewQuerySerializer(serializers.Serializer):
+    level = serializers.ChoiceField(choices=EmployeeLevel.values, required=False)
+    warning_active = serializers.BooleanField(required=False, allow_null=True)
+    meets_target = serializers.BooleanField(required=False, allow_null=True)
+    ordering = serializers.ChoiceField(
+        choices=list(UserLevelStatusService.ORDERINGS),
+        required=False,
+        default=UserLevelStatusService.DEFAULT_ORDERING,
+    )
+    cursor = serializers.CharField(required=False, allow_blank=False)
+    limit = serializers.IntegerField(
+        required=False,
+        min_value=1,
+        max_value=UserLevelStatusService.MAX_PAGE_SIZE,
+    )
@@ -8,6 +8,7 @@ from api.v1.gamification.filters import (
     can_view_all_transaction_entries,
 )
 from api.v1.gamification.serializers import (
+    LevelControlOverviewQuerySerializer,
     LevelManualSetSerializer,
     WeeklyEvaluationRunSerializer,
     XPAdjustmentSerializer,
@@ -84,13 +85,21 @@ class XPAdjustmentCreateAPIView(BaseAPIView):
     summary="Get level control overview",
     description=(
         "Returns technicians with XP totals for the selected date range, "
-        "target comparison, warning suggestions, and latest weekly progression states."
+        "target comparison, warning suggestions, and latest weekly progression states. "
+        "Rows can be filtered by `level`, `warning_active` and `meets_target`, sorted "
+        "with `ordering`, and paged with `limit` plus the returned `next_cursor`."
     ),
+    parameters=[LevelControlOverviewQuerySerializer],
 )
 class LevelControlOverviewAPIView(BaseAPIView):
     permission_classes = (IsAuthenticated, LevelControlPermission)
+    serializer_class = LevelControlOverviewQuerySerializer
 
     def get(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
         raw_date_from = str(request.query_params.get("date_from", "")).strip()
         raw_date_to = str(request.query_params.get("date_to", "")).strip()
 
@@ -119,6 +128,12 @@ class LevelControlOverviewAPIView(BaseAPIView):
             payload = ProgressionService.get_level_control_overview(
                 date_from=date_from,
                 date_to=date_to,
+                level=params.get("level"),
+                warning_active=params.get("warning_active"),
+                meets_target=params.get("meets_target"),
+                ordering=params["ordering"],
+                cursor=params.get("cursor"),
+                limit=params.get("limit"),
             )
         except ValueError as exc:
             return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
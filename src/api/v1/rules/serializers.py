@@ -8,6 +8,12 @@ class RulesConfigUpdateSerializer(serializers.Serializer):
     reason = serializers.CharField(max_length=255, required=False, allow_blank=True)
 
 
+class RulesConfigSimulationSerializer(serializers.Serializer):
+    config = serializers.JSONField()
+    date_from = serializers.DateField()
+    date_to = serializers.DateField()
+
+
 class RulesConfigRollbackSerializer(serializers.Serializer):
     target_version = serializers.IntegerField(min_value=1)
     reason = serializers.CharField(max_length=255, required=False, allow_blank=True)
@@ -4,6 +4,7 @@ from api.v1.rules.views import (
     RulesConfigAPIView,
     RulesConfigHistoryAPIView,
     RulesConfigRollbackAPIView,
+    RulesConfigSimulationAPIView,
 )
 
 app_name = "rules"
@@ -15,6 +16,11 @@ urlpatterns = [
         RulesConfigHistoryAPIView.as_view(),
         name="rules-config-history",
     ),
+    path(
+        "config/simulate/",
+        RulesConfigSimulationAPIView.as_view(),
+        name="rules-config-simulate",
+    ),
     path(
         "config/rollback/",
         RulesConfigRollbackAPIView.as_view(),
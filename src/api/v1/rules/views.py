@@ -8,6 +8,7 @@ from api.v1.rules.permissions import RulesReadPermission, RulesWritePermission
 from api.v1.rules.serializers import (
     RuleConfigStateSerializer,
     RulesConfigRollbackSerializer,
+    RulesConfigSimulationSerializer,
     RulesConfigUpdateSerializer,
     RulesConfigVersionSerializer,
 )
@@ -15,6 +16,7 @@ from core.api.schema import extend_schema
 from core.api.views import BaseAPIView, ListAPIView
 from rules.models import RulesConfigVersion
 from rules.services import RulesService
+from rules.services_simulation import RulesImpactSimulationService
 
 
 @extend_schema(
@@ -72,6 +74,31 @@ class RulesConfigRollbackAPIView(BaseAPIView):
         return Response(response_serializer.data, status=status.HTTP_200_OK)
 
 
+@extend_schema(
+    tags=["Rules Engine"],
+    summary="Simulate rules config impact",
+    description=(
+        "Dry-run: replays ticket XP, first-pass bonuses, flag colors and weekly "
+        "level evaluations for the date range under a candidate config and returns "
+        "a diff against recorded history. Nothing is persisted."
+    ),
+)
+class RulesConfigSimulationAPIView(BaseAPIView):
+    permission_classes = (IsAuthenticated, RulesReadPermission)
+    serializer_class = RulesConfigSimulationSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        report = RulesImpactSimulationService.simulate(
+            candidate_config=serializer.validated_data["config"],
+            date_from=serializer.validated_data["date_from"],
+            date_to=serializer.validated_data["date_to"],
+        )
+        return Response(report, status=status.HTTP_200_OK)
+
+
 @extend_schema(
     tags=["Rules Engine"],
     summary="List rules config version history",
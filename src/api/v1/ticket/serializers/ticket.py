@@ -64,6 +64,7 @@ class TicketSerializer(serializers.ModelSerializer):
     xp_amount = serializers.IntegerField(required=False, min_value=0)
     flag_color = serializers.ChoiceField(choices=TicketColor.choices, required=False)
     is_manual = serializers.BooleanField(read_only=True)
+    rework_count = serializers.IntegerField(source="qc_fail_count", read_only=True)
     approve_review = serializers.BooleanField(
         write_only=True, required=False, default=False
     )
@@ -99,6 +100,10 @@ class TicketSerializer(serializers.ModelSerializer):
             "assigned_at",
             "started_at",
             "finished_at",
+            "first_waiting_qc_at",
+            "last_waiting_qc_at",
+            "qc_wait_seconds_total",
+            "rework_count",
             "created_at",
             "updated_at",
         )
@@ -111,6 +116,9 @@ class TicketSerializer(serializers.ModelSerializer):
             "assigned_at",
             "started_at",
             "finished_at",
+            "first_waiting_qc_at",
+            "last_waiting_qc_at",
+            "qc_wait_seconds_total",
             "created_at",
             "updated_at",
             "approved_by",
@@ -409,27 +417,12 @@ class TicketSerializer(serializers.ModelSerializer):
 
     @staticmethod
     def _ticket_xp_divisor() -> int:
-        rules = RulesService.get_active_rules_config()
-        ticket_rules = rules.get("ticket_xp", {})
-        divisor = int(ticket_rules.get("base_divisor", 20) or 20)
-        if divisor <= 0:
-            return 20
-        return divisor
+        return RulesService.get_active_rules_snapshot().ticket_xp.base_divisor
 
     @staticmethod
     def _ticket_flag_thresholds() -> tuple[int, int]:
-        rules = RulesService.get_active_rules_config()
-        ticket_rules = rules.get("ticket_xp", {})
-
-        green_max_minutes = int(ticket_rules.get("flag_green_max_minutes", 30) or 30)
-        if green_max_minutes < 0:
-            green_max_minutes = 30
-
-        yellow_max_minutes = int(ticket_rules.get("flag_yellow_max_minutes", 60) or 60)
-        if yellow_max_minutes < green_max_minutes:
-            yellow_max_minutes = max(green_max_minutes, 60)
-
-        return green_max_minutes, yellow_max_minutes
+        rules = RulesService.get_active_rules_snapshot().ticket_xp
+        return rules.flag_green_max_minutes, rules.flag_yellow_max_minutes
 
     @staticmethod
     def _resolve_part_specs(
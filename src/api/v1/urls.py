@@ -6,6 +6,7 @@ urlpatterns = [
     path("users/", include("api.v1.account.urls", namespace="account")),
     path("auth/", include("api.v1.core.urls.auth", namespace="auth")),
     path("analytics/", include("api.v1.core.urls.analytics", namespace="analytics")),
+    path("live/", include("api.v1.core.urls.live", namespace="live")),
     path("rules/", include("api.v1.rules.urls", namespace="rules")),
     path("attendance/", include("api.v1.attendance.urls", namespace="attendance")),
     path("xp/", include("api.v1.gamification.urls", namespace="gamification")),
@@ -6,6 +6,7 @@ from account import managers
 from core.api.exceptions import DomainValidationError
 from core.models import SoftDeleteModel, TimestampedModel
 from core.utils.constants import AccessRequestStatus, EmployeeLevel, RoleSlug
+from core.utils.request_scope import ROLE_SLUGS, scoped_discard
 
 
 class Role(TimestampedModel, SoftDeleteModel):
@@ -98,6 +99,7 @@ class User(AbstractBaseUser, TimestampedModel, SoftDeleteModel):
         roles = Role.objects.filter(slug__in=list(role_slugs), deleted_at__isnull=True)
         if roles:
             self.roles.add(*roles)
+            scoped_discard(ROLE_SLUGS, self.pk)
 
 
 class UserRole(TimestampedModel, SoftDeleteModel):
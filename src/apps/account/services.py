@@ -6,6 +6,7 @@ from account.models import AccessRequest, TelegramProfile, User
 from core.api.exceptions import DomainValidationError
 from core.services.notifications import UserNotificationService
 from core.utils.constants import AccessRequestStatus
+from gamification.services import ProgressionService
 
 
 class AccountService:
@@ -313,6 +314,7 @@ class AccountService:
 
         user.assign_roles_by_slugs(role_slugs=role_slugs)
         user.activate_if_needed()
+        ProgressionService.seed_technician_rows(user_ids=[user.id])
         access_request.mark_approved(user=user)
         UserNotificationService.notify_access_request_decision(
             access_request=access_request,
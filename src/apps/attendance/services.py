@@ -1,5 +1,4 @@
 from datetime import date, datetime
-from zoneinfo import ZoneInfo
 
 from django.db import transaction
 from django.utils import timezone
@@ -8,71 +7,49 @@ from attendance.models import AttendanceRecord
 from core.api.exceptions import DomainValidationError
 from core.utils.constants import XPTransactionEntryType
 from gamification.services import GamificationService
+from gamification.services_daily_stats import TechnicianDailyStatsService
+from gamification.services_leaderboard import TechnicianScoreService
+from rules.compiled import AttendanceRules
 from rules.services import RulesService
 
 
 class AttendanceService:
     """Daily attendance check-in/out service with punctuality XP calculation."""
 
-    BUSINESS_TZ = ZoneInfo("Asia/Tashkent")
-
-    @classmethod
-    def _attendance_rules(cls) -> tuple[int, int, int, int, int, ZoneInfo]:
-        rules = RulesService.get_active_rules_config().get("attendance", {})
-        on_time_xp = int(rules.get("on_time_xp", 2) or 0)
-        grace_xp = int(rules.get("grace_xp", 0) or 0)
-        late_xp = int(rules.get("late_xp", -1) or 0)
-
-        on_time_cutoff = str(rules.get("on_time_cutoff", "10:00"))
-        grace_cutoff = str(rules.get("grace_cutoff", "10:20"))
-
-        try:
-            on_h, on_m = on_time_cutoff.split(":")
-            grace_h, grace_m = grace_cutoff.split(":")
-            on_minutes = int(on_h) * 60 + int(on_m)
-            grace_minutes = int(grace_h) * 60 + int(grace_m)
-        except (ValueError, TypeError):
-            on_minutes = 10 * 60
-            grace_minutes = 10 * 60 + 20
-
-        timezone_name = str(rules.get("timezone", str(cls.BUSINESS_TZ)))
-        try:
-            local_tz = ZoneInfo(timezone_name)
-        except Exception:
-            local_tz = cls.BUSINESS_TZ
-
-        return on_time_xp, grace_xp, late_xp, on_minutes, grace_minutes, local_tz
+    @staticmethod
+    def _attendance_rules() -> AttendanceRules:
+        return RulesService.get_active_rules_snapshot().attendance
 
     @classmethod
     def _business_date(cls, now_dt: datetime) -> date:
-        _, _, _, _, _, local_tz = cls._attendance_rules()
-        return now_dt.astimezone(local_tz).date()
+        return now_dt.astimezone(cls._attendance_rules().timezone).date()
+
+    @staticmethod
+    def _local_minutes(check_in_dt: datetime, rules: AttendanceRules) -> int:
+        local_dt = check_in_dt.astimezone(rules.timezone)
+        return local_dt.hour * 60 + local_dt.minute
 
     @classmethod
     def _punctuality_xp(cls, check_in_dt: datetime) -> int:
-        on_time_xp, grace_xp, late_xp, cutoff_10_00, cutoff_10_20, local_tz = (
-            cls._attendance_rules()
-        )
-        local_dt = check_in_dt.astimezone(local_tz)
-        minutes = local_dt.hour * 60 + local_dt.minute
-        if minutes <= cutoff_10_00:
-            return on_time_xp
-        if minutes <= cutoff_10_20:
-            return grace_xp
-        return late_xp
+        rules = cls._attendance_rules()
+        minutes = cls._local_minutes(check_in_dt, rules)
+        if minutes <= rules.on_time_cutoff_minutes:
+            return rules.on_time_xp
+        if minutes <= rules.grace_cutoff_minutes:
+            return rules.grace_xp
+        return rules.late_xp
 
     @classmethod
     def resolve_punctuality_status(cls, check_in_dt: datetime | None) -> str | None:
         if not check_in_dt:
             return None
 
-        _, _, _, cutoff_10_00, cutoff_10_20, local_tz = cls._attendance_rules()
-        local_dt = check_in_dt.astimezone(local_tz)
-        minutes = local_dt.hour * 60 + local_dt.minute
+        rules = cls._attendance_rules()
+        minutes = cls._local_minutes(check_in_dt, rules)
 
-        if minutes < cutoff_10_00:
+        if minutes < rules.on_time_cutoff_minutes:
             return "early"
-        if minutes <= cutoff_10_20:
+        if minutes <= rules.grace_cutoff_minutes:
             return "on_time"
         return "late"
 
@@ -118,6 +95,8 @@ class AttendanceService:
             )
 
         record.mark_check_in(check_in_at=now_dt)
+        TechnicianScoreService.record_check_in(user_id=user_id)
+        TechnicianDailyStatsService.record_check_in(record=record)
 
         xp_amount = cls._punctuality_xp(record.check_in_at)
         reference = f"attendance_checkin:{user_id}:{today.isoformat()}"
@@ -130,7 +109,7 @@ class AttendanceService:
             payload={
                 "work_date": today.isoformat(),
                 "check_in_at": record.check_in_at.isoformat(),
-                "timezone": str(cls._attendance_rules()[-1]),
+                "timezone": str(cls._attendance_rules().timezone),
             },
         )
         return record, xp_amount
@@ -148,4 +127,5 @@ class AttendanceService:
             raise DomainValidationError("Cannot check out before check in.")
 
         record.mark_check_out(check_out_at=now_dt)
+        TechnicianDailyStatsService.record_check_out(record=record)
         return record
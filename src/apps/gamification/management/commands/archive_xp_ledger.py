@@ -0,0 +1,17 @@
+from django.core.management import BaseCommand
+
+from gamification.services_xp_archive import XPArchiveService
+
+
+class Command(BaseCommand):
+    help = "Summarize closed business months of the XP ledger into monthly rows."
+
+    def handle(self, *args, **options):
+        summary = XPArchiveService.archive_closed_months()
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Archived XP ledger months: "
+                f"months={summary['months']} rows={summary['rows']} "
+                f"archived_through={summary['archived_through']}"
+            )
+        )
@@ -0,0 +1,36 @@
+from django.core.management import BaseCommand, CommandError
+
+from gamification.services import ProgressionService
+from gamification.services_xp_balance import XPBalanceService
+
+
+class Command(BaseCommand):
+    help = "Snapshot cumulative XP balances as of the end of a closed business day."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date",
+            type=str,
+            required=False,
+            help="Business date token in YYYY-MM-DD format. Defaults to yesterday.",
+        )
+
+    def handle(self, *args, **options):
+        date_token = options.get("date")
+
+        try:
+            snapshot_date = None
+            if date_token:
+                snapshot_date = ProgressionService.parse_date_token(
+                    date_token, field_name="date"
+                )
+            summary = XPBalanceService.capture(snapshot_date=snapshot_date)
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Captured XP balance snapshots: "
+                f"date={summary['business_date']} users={summary['users']}"
+            )
+        )
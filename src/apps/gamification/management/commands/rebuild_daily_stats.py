@@ -0,0 +1,53 @@
+from django.core.management import BaseCommand, CommandError
+
+from gamification.services import ProgressionService
+from gamification.services_daily_stats import TechnicianDailyStatsService
+
+
+class Command(BaseCommand):
+    help = "Recompute the daily technician KPI rollup from source data."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date-from",
+            type=str,
+            required=False,
+            help="Business date token in YYYY-MM-DD format.",
+        )
+        parser.add_argument(
+            "--date-to",
+            type=str,
+            required=False,
+            help="Business date token in YYYY-MM-DD format. Defaults to today.",
+        )
+
+    def handle(self, *args, **options):
+        date_from_token = options.get("date_from")
+        date_to_token = options.get("date_to")
+
+        try:
+            date_from = None
+            if date_from_token:
+                date_from = ProgressionService.parse_date_token(
+                    date_from_token, field_name="date_from"
+                )
+            date_to = None
+            if date_to_token:
+                date_to = ProgressionService.parse_date_token(
+                    date_to_token, field_name="date_to"
+                )
+
+            summary = TechnicianDailyStatsService.rebuild(
+                date_from=date_from,
+                date_to=date_to,
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Rebuilt daily technician stats: "
+                f"dates={summary['date_from']}..{summary['date_to']} "
+                f"rows={summary['rows']}"
+            )
+        )
@@ -0,0 +1,26 @@
+from django.core.management import BaseCommand
+
+from gamification.services_level_status import UserLevelStatusService
+
+
+class Command(BaseCommand):
+    help = "Recompute precomputed level-control status rows from source data."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user-id",
+            type=int,
+            action="append",
+            dest="user_ids",
+            help="Rebuild only this user. Can be passed multiple times.",
+        )
+
+    def handle(self, *args, **options):
+        summary = UserLevelStatusService.rebuild(user_ids=options.get("user_ids"))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Rebuilt level statuses: "
+                f"users={summary['users']} changed={summary['changed']}"
+            )
+        )
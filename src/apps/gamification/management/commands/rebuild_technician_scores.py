@@ -0,0 +1,26 @@
+from django.core.management import BaseCommand
+
+from gamification.services_leaderboard import TechnicianScoreService
+
+
+class Command(BaseCommand):
+    help = "Recompute persisted technician leaderboard scores from source data."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user-id",
+            type=int,
+            action="append",
+            dest="user_ids",
+            help="Rebuild only this user. Can be passed multiple times.",
+        )
+
+    def handle(self, *args, **options):
+        summary = TechnicianScoreService.rebuild(user_ids=options.get("user_ids"))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Rebuilt technician scores: "
+                f"users={summary['users']} changed={summary['changed']}"
+            )
+        )
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.11 on 2026-10-16 19:55
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gamification", "0006_userlevelhistoryevent"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TechnicianScore",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, db_index=True, verbose_name="Created At"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, db_index=True, verbose_name="Updated At"
+                    ),
+                ),
+                ("tickets_done_total", models.PositiveIntegerField(default=0)),
+                ("tickets_first_pass_total", models.PositiveIntegerField(default=0)),
+                ("tickets_rework_total", models.PositiveIntegerField(default=0)),
+                ("tickets_flag_green_total", models.PositiveIntegerField(default=0)),
+                ("tickets_flag_yellow_total", models.PositiveIntegerField(default=0)),
+                ("tickets_flag_red_total", models.PositiveIntegerField(default=0)),
+                ("resolution_minutes_total", models.BigIntegerField(default=0)),
+                ("qc_fail_events_total", models.PositiveIntegerField(default=0)),
+                ("xp_total", models.BigIntegerField(default=0)),
+                ("attendance_days_total", models.PositiveIntegerField(default=0)),
+                ("score", models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="technicianscore",
+            name="user",
+            field=models.OneToOneField(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="technician_score",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="technicianscore",
+            index=models.Index(
+                models.OrderBy(models.F("score"), descending=True),
+                models.OrderBy(models.F("tickets_done_total"), descending=True),
+                models.OrderBy(models.F("tickets_first_pass_total"), descending=True),
+                models.OrderBy(models.F("xp_total"), descending=True),
+                models.F("user"),
+                name="gamif_tech_score_rank_idx",
+            ),
+        ),
+    ]
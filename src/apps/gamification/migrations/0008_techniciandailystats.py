@@ -0,0 +1,107 @@
+# Generated by Django 5.2.11 on 2026-10-16 20:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gamification", "0007_technicianscore"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TechnicianDailyStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, db_index=True, verbose_name="Created At"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, db_index=True, verbose_name="Updated At"
+                    ),
+                ),
+                ("business_date", models.DateField()),
+                ("tickets_done", models.PositiveIntegerField(default=0)),
+                ("tickets_first_pass", models.PositiveIntegerField(default=0)),
+                ("tickets_rework", models.PositiveIntegerField(default=0)),
+                ("tickets_flag_green", models.PositiveIntegerField(default=0)),
+                ("tickets_flag_yellow", models.PositiveIntegerField(default=0)),
+                ("tickets_flag_red", models.PositiveIntegerField(default=0)),
+                ("qc_pass_events", models.PositiveIntegerField(default=0)),
+                ("qc_fail_events", models.PositiveIntegerField(default=0)),
+                ("xp_total", models.IntegerField(default=0)),
+                ("xp_by_entry_type", models.JSONField(blank=True, default=dict)),
+                ("attendance_days", models.PositiveSmallIntegerField(default=0)),
+                ("attendance_minutes", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="TechnicianDailyStatsDay",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, db_index=True, verbose_name="Created At"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, db_index=True, verbose_name="Updated At"
+                    ),
+                ),
+                ("business_date", models.DateField(unique=True)),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+        migrations.AddField(
+            model_name="techniciandailystats",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="daily_stats",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="techniciandailystats",
+            index=models.Index(
+                fields=["business_date", "user"], name="gamificatio_busines_2e2278_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="techniciandailystats",
+            constraint=models.UniqueConstraint(
+                fields=("user", "business_date"),
+                name="unique_technician_daily_stats_per_user_date",
+            ),
+        ),
+    ]
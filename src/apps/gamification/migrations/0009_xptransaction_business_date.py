@@ -0,0 +1,35 @@
+# Generated by Django 5.2.11 on 2026-10-16 20:30
+
+from zoneinfo import ZoneInfo
+
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+
+
+def backfill_business_date(apps, schema_editor):
+    XPTransaction = apps.get_model("gamification", "XPTransaction")
+    XPTransaction._base_manager.filter(business_date__isnull=True).update(
+        business_date=TruncDate("created_at", tzinfo=ZoneInfo("Asia/Tashkent"))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gamification", "0008_techniciandailystats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="xptransaction",
+            name="business_date",
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="xptransaction",
+            index=models.Index(
+                fields=["business_date", "user"], name="gamificatio_busines_6249ff_idx"
+            ),
+        ),
+        migrations.RunPython(backfill_business_date, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,117 @@
+# Generated by Django 6.0.9 on 2026-10-16 22:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gamification", "0009_xptransaction_business_date"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="XPBalanceSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, db_index=True, verbose_name="Created At"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, db_index=True, verbose_name="Updated At"
+                    ),
+                ),
+                ("business_date", models.DateField()),
+                ("as_of", models.DateTimeField(db_index=True)),
+                ("balance", models.BigIntegerField(default=0)),
+                ("tx_count", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RenameIndex(
+            model_name="userlevelhistoryevent",
+            new_name="gamificatio_user_id_a2feea_idx",
+            old_name="gamificatio_user_id_530bfd_idx",
+        ),
+        migrations.RenameIndex(
+            model_name="userlevelhistoryevent",
+            new_name="gamificatio_user_id_c01831_idx",
+            old_name="gamificatio_user_id_7f36a7_idx",
+        ),
+        migrations.RenameIndex(
+            model_name="userlevelhistoryevent",
+            new_name="gamificatio_source_6806d0_idx",
+            old_name="gamificatio_source_aa3e6c_idx",
+        ),
+        migrations.RenameIndex(
+            model_name="userlevelhistoryevent",
+            new_name="gamificatio_warning_33395e_idx",
+            old_name="gamificatio_warning_b7bf03_idx",
+        ),
+        migrations.AlterField(
+            model_name="userlevelhistoryevent",
+            name="created_at",
+            field=models.DateTimeField(
+                auto_now_add=True, db_index=True, verbose_name="Created At"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="userlevelhistoryevent",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, db_index=True, verbose_name="Updated At"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="xptransaction",
+            name="entry_type",
+            field=models.CharField(
+                choices=[
+                    ("attendance_punctuality", "Attendance Punctuality"),
+                    ("ticket_base_xp", "Ticket Base XP"),
+                    ("ticket_qc_first_pass_bonus", "Ticket QC First Pass Bonus"),
+                    ("ticket_qc_status_update", "Ticket QC Status Update"),
+                    ("manual_adjustment", "Manual Adjustment"),
+                ],
+                db_index=True,
+                max_length=50,
+            ),
+        ),
+        migrations.AddField(
+            model_name="xpbalancesnapshot",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="xp_balance_snapshots",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="xpbalancesnapshot",
+            index=models.Index(
+                fields=["user", "-as_of"], name="gamificatio_user_id_0c7bc0_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="xpbalancesnapshot",
+            constraint=models.UniqueConstraint(
+                fields=("user", "business_date"),
+                name="unique_xp_balance_snapshot_per_user_day",
+            ),
+        ),
+    ]
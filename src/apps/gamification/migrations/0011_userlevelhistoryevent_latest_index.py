@@ -0,0 +1,26 @@
+# Generated by Django 6.0.9 on 2026-10-16 22:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gamification", "0010_xpbalancesnapshot"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="userlevelhistoryevent",
+            name="gamificatio_user_id_a2feea_idx",
+        ),
+        migrations.AddIndex(
+            model_name="userlevelhistoryevent",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="gamificatio_user_id_e7ffac_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 6.0.9 on 2026-10-16 22:53
+
+import re
+from itertools import batched
+
+import django.db.models.deletion
+from django.db import migrations, models, transaction
+
+BACKFILL_BATCH_SIZE = 2000
+TICKET_REFERENCE_RE = re.compile(
+    r"^ticket_(?:base_xp|qc_first_pass_bonus|qc_status_update):(\d+)(?::|$)"
+)
+
+
+def _ticket_id_for(*, payload, reference: str) -> int | None:
+    raw = payload.get("ticket_id") if isinstance(payload, dict) else None
+    if raw is None:
+        match = TICKET_REFERENCE_RE.match(reference or "")
+        raw = match.group(1) if match else None
+    try:
+        return int(raw) if raw is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def backfill_xp_transaction_ticket(apps, schema_editor):
+    XPTransaction = apps.get_model("gamification", "XPTransaction")
+    Ticket = apps.get_model("ticket", "Ticket")
+    rows = (
+        XPTransaction._base_manager.filter(ticket__isnull=True)
+        .order_by("id")
+        .values_list("id", "payload", "reference")
+        .iterator(chunk_size=BACKFILL_BATCH_SIZE)
+    )
+    # Each batch commits on its own so a large ledger is not locked at once
+    # and an interrupted run resumes from the remaining NULL rows.
+    for batch in batched(rows, BACKFILL_BATCH_SIZE, strict=False):
+        ticket_by_entry = {
+            entry_id: ticket_id
+            for entry_id, payload, reference in batch
+            if (ticket_id := _ticket_id_for(payload=payload, reference=reference))
+        }
+        existing_ticket_ids = set(
+            Ticket._base_manager.filter(
+                id__in=set(ticket_by_entry.values())
+            ).values_list("id", flat=True)
+        )
+        entries = [
+            XPTransaction(id=entry_id, ticket_id=ticket_id)
+            for entry_id, ticket_id in ticket_by_entry.items()
+            if ticket_id in existing_ticket_ids
+        ]
+        with transaction.atomic():
+            XPTransaction._base_manager.bulk_update(entries, ["ticket"])
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("gamification", "0011_userlevelhistoryevent_latest_index"),
+        ("ticket", "0019_ticketfunnelstats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="xptransaction",
+            name="ticket",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="xp_transactions",
+                to="ticket.ticket",
+            ),
+        ),
+        migrations.RunPython(backfill_xp_transaction_ticket, migrations.RunPython.noop),
+    ]
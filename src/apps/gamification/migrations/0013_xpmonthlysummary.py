@@ -0,0 +1,112 @@
+# Generated by Django 6.0.9 on 2026-10-16 23:18
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gamification", "0012_xptransaction_ticket"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="XPMonthlySummaryMonth",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, db_index=True, verbose_name="Created At"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, db_index=True, verbose_name="Updated At"
+                    ),
+                ),
+                ("month", models.DateField(unique=True)),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="XPMonthlySummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, db_index=True, verbose_name="Created At"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, db_index=True, verbose_name="Updated At"
+                    ),
+                ),
+                ("month", models.DateField()),
+                (
+                    "entry_type",
+                    models.CharField(
+                        choices=[
+                            ("attendance_punctuality", "Attendance Punctuality"),
+                            ("ticket_base_xp", "Ticket Base XP"),
+                            (
+                                "ticket_qc_first_pass_bonus",
+                                "Ticket QC First Pass Bonus",
+                            ),
+                            ("ticket_qc_status_update", "Ticket QC Status Update"),
+                            ("manual_adjustment", "Manual Adjustment"),
+                        ],
+                        max_length=50,
+                    ),
+                ),
+                ("amount_total", models.BigIntegerField(default=0)),
+                ("entry_count", models.PositiveIntegerField(default=0)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="xp_monthly_summaries",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["user", "month"], name="gamificatio_user_id_cc058b_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("month", "user", "entry_type"),
+                        name="unique_xp_monthly_summary_per_user_type",
+                    )
+                ],
+            },
+        ),
+    ]
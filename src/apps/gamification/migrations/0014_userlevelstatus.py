@@ -0,0 +1,96 @@
+# Generated by Django 6.0.9 on 2026-10-16 23:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gamification", "0013_xpmonthlysummary"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserLevelStatus",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, db_index=True, verbose_name="Created At"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, db_index=True, verbose_name="Updated At"
+                    ),
+                ),
+                (
+                    "level",
+                    models.PositiveSmallIntegerField(
+                        choices=[(1, "L1"), (2, "L2"), (3, "L3"), (4, "L4"), (5, "L5")],
+                        default=1,
+                    ),
+                ),
+                ("week_start", models.DateField()),
+                ("week_xp", models.IntegerField(default=0)),
+                ("cumulative_xp", models.BigIntegerField(default=0)),
+                ("warning_active", models.BooleanField(default=False)),
+                (
+                    "latest_evaluation",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="gamification.weeklylevelevaluation",
+                    ),
+                ),
+                (
+                    "latest_history_event",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="gamification.userlevelhistoryevent",
+                    ),
+                ),
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="level_status",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["level", "user"], name="gamificatio_level_b2f981_idx"
+                    ),
+                    models.Index(
+                        fields=["cumulative_xp", "user"],
+                        name="gamificatio_cumulat_f0fb4f_idx",
+                    ),
+                    models.Index(
+                        fields=["warning_active", "level"],
+                        name="gamificatio_warning_3846bf_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 6.0.9 on 2026-10-17 01:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_is_active_technician(apps, schema_editor):
+    TechnicianScore = apps.get_model("gamification", "TechnicianScore")
+    User = apps.get_model("account", "User")
+    active_ids = User._base_manager.filter(
+        deleted_at__isnull=True,
+        is_active=True,
+        roles__slug="technician",
+        roles__deleted_at__isnull=True,
+    ).values("id")
+    TechnicianScore._base_manager.filter(user_id__in=active_ids).update(
+        is_active_technician=True
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gamification", "0014_userlevelstatus"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="technicianscore",
+            name="gamif_tech_score_rank_idx",
+        ),
+        migrations.AddField(
+            model_name="technicianscore",
+            name="is_active_technician",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name="technicianscore",
+            index=models.Index(
+                models.OrderBy(models.F("score"), descending=True),
+                models.OrderBy(models.F("tickets_done_total"), descending=True),
+                models.OrderBy(models.F("tickets_first_pass_total"), descending=True),
+                models.OrderBy(models.F("xp_total"), descending=True),
+                models.F("user"),
+                condition=models.Q(("is_active_technician", True)),
+                name="gamif_tech_active_rank_idx",
+            ),
+        ),
+        migrations.RunPython(backfill_is_active_technician, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 6.0.9 on 2026-10-17 12:40
+
+from django.db import migrations
+
+
+def build_technician_daily_stats(apps, schema_editor):
+    # Reads never build, so existing installs would show empty analytics until
+    # the hourly task ran. The build only references stored fields; a fresh
+    # database has no source rows and is left to the task.
+    from gamification.services_daily_stats import TechnicianDailyStatsService
+
+    if not any(
+        apps.get_model(app_label, model_name)._base_manager.exists()
+        for app_label, model_name in (
+            ("attendance", "AttendanceRecord"),
+            ("gamification", "XPTransaction"),
+            ("ticket", "TicketTransition"),
+        )
+    ):
+        return
+    TechnicianDailyStatsService.build_missing()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("attendance", "0002_alter_attendancerecord_managers"),
+        ("gamification", "0015_technicianscore_is_active_technician"),
+        ("ticket", "0020_seed_fleet_snapshot_counters"),
+    ]
+
+    operations = [
+        migrations.RunPython(build_technician_daily_stats, migrations.RunPython.noop),
+    ]
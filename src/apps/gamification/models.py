@@ -1,6 +1,12 @@
-from django.db import IntegrityError, models
+from collections.abc import Iterable, Mapping, Sequence
+from datetime import date
+from typing import Any
 
-from core.models import AppendOnlyManager, AppendOnlyModel
+from django.db import connection, models, transaction
+from django.db.models import Case, F, Q, Value, When
+
+from core.models import AppendOnlyManager, AppendOnlyModel, TimestampedModel
+from core.utils.business_dates import business_date
 from core.utils.constants import EmployeeLevel, XPTransactionEntryType
 
 
@@ -14,28 +20,100 @@ class XPTransactionManager(AppendOnlyManager):
         reference: str,
         description: str | None = None,
         payload: dict | None = None,
+        ticket_id: int | None = None,
     ):
-        try:
-            entry = self.create(
-                user_id=user_id,
-                amount=amount,
-                entry_type=entry_type,
-                reference=reference,
-                description=description,
-                payload=payload or {},
+        return self.append_entries(
+            [
+                {
+                    "user_id": user_id,
+                    "amount": amount,
+                    "entry_type": entry_type,
+                    "reference": reference,
+                    "description": description,
+                    "payload": payload,
+                    "ticket_id": ticket_id,
+                }
+            ]
+        )[0]
+
+    def append_entries(self, entries: Sequence[Mapping[str, Any]]):
+        """
+        Insert entries in one statement; return ``(entry, created)`` per input.
+
+        Existing references are skipped by ``ON CONFLICT DO NOTHING`` instead of
+        a caught ``IntegrityError``, so no savepoint is needed inside an outer
+        transaction. References already stored are read before the insert and
+        rows are read back by reference after it; a row counts as created when
+        its reference was not stored before. A reference repeated in
+        ``entries`` is created at most once.
+        """
+        if not entries:
+            return []
+        today = business_date()
+        drafts: dict[str, XPTransaction] = {}
+        for entry in entries:
+            drafts.setdefault(
+                entry["reference"],
+                self.model(
+                    user_id=entry["user_id"],
+                    amount=entry["amount"],
+                    entry_type=entry["entry_type"],
+                    reference=entry["reference"],
+                    description=entry.get("description"),
+                    payload=entry.get("payload") or {},
+                    ticket_id=entry.get("ticket_id"),
+                    business_date=today,
+                ),
+            )
+        with transaction.atomic(savepoint=False):
+            self._lock_references(drafts)
+            existing = set(
+                self.filter(reference__in=list(drafts)).values_list(
+                    "reference", flat=True
+                )
             )
-            return entry, True
-        except IntegrityError:
-            existing = self.get(reference=reference)
-            return existing, False
+            self.bulk_create(list(drafts.values()), ignore_conflicts=True)
+            stored = self.in_bulk(list(drafts), field_name="reference")
+
+        results = []
+        reported: set[str] = set(existing)
+        for entry in entries:
+            reference = entry["reference"]
+            results.append((stored[reference], reference not in reported))
+            reported.add(reference)
+        return results
+
+    def _lock_references(self, references: Iterable[str]) -> None:
+        # Concurrent appends of one reference wait here until the first
+        # commits, so only one of them sees the reference as new. SQLite
+        # serialises writers on its own; Postgres needs the advisory lock.
+        if connection.vendor != "postgresql":
+            return
+        with connection.cursor() as cursor:
+            for reference in sorted(references):
+                cursor.execute(
+                    "SELECT pg_advisory_xact_lock(%s, hashtext(%s))",
+                    [self.model.ADVISORY_LOCK_NAMESPACE, reference],
+                )
 
 
 class XPTransaction(AppendOnlyModel):
+    ADVISORY_LOCK_NAMESPACE = 8023
+
     objects = XPTransactionManager()
 
     user = models.ForeignKey(
         "account.User", on_delete=models.PROTECT, related_name="xp_transactions"
     )
+    # DO_NOTHING: soft-deleting a ticket must neither block on nor rewrite
+    # ledger rows; the database constraint still guards hard deletes.
+    ticket = models.ForeignKey(
+        "ticket.Ticket",
+        on_delete=models.DO_NOTHING,
+        null=True,
+        blank=True,
+        related_name="xp_transactions",
+    )
     amount = models.IntegerField()
     entry_type = models.CharField(
         max_length=50, choices=XPTransactionEntryType, db_index=True
@@ -43,17 +121,59 @@ class XPTransaction(AppendOnlyModel):
     reference = models.CharField(max_length=120, unique=True, db_index=True)
     description = models.CharField(max_length=255, blank=True, null=True)
     payload = models.JSONField(default=dict, blank=True)
+    business_date = models.DateField(null=True, blank=True, editable=False)
 
     class Meta:
         indexes = [
             models.Index(fields=["user", "created_at"]),
             models.Index(fields=["entry_type", "created_at"]),
+            models.Index(fields=["business_date", "user"]),
         ]
 
+    def save(self, *args, **kwargs):
+        if self._state.adding and self.business_date is None:
+            self.business_date = business_date(self.created_at)
+        return super().save(*args, **kwargs)
+
     def __str__(self) -> str:
         return f"XPTransaction#{self.pk} user={self.user_id} amount={self.amount} ({self.entry_type})"
 
 
+class XPBalanceSnapshot(AppendOnlyModel):
+    """
+    Cumulative XP of one user for all transactions created before ``as_of``.
+
+    Written by the daily snapshot job for users with XP activity since the
+    previous run, so a user's latest snapshot plus the transactions created
+    since the latest run cutoff gives the exact balance.
+    """
+
+    user = models.ForeignKey(
+        "account.User", on_delete=models.PROTECT, related_name="xp_balance_snapshots"
+    )
+    business_date = models.DateField()
+    as_of = models.DateTimeField(db_index=True)
+    balance = models.BigIntegerField(default=0)
+    tx_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "-as_of"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "business_date"],
+                name="unique_xp_balance_snapshot_per_user_day",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return (
+            f"XPBalanceSnapshot user={self.user_id} {self.business_date} "
+            f"balance={self.balance}"
+        )
+
+
 class WeeklyLevelEvaluation(AppendOnlyModel):
     user = models.ForeignKey(
         "account.User",
@@ -90,6 +210,13 @@ class WeeklyLevelEvaluation(AppendOnlyModel):
             )
         ]
 
+    @property
+    def warning_active_after(self) -> bool:
+        payload = self.payload if isinstance(self.payload, dict) else {}
+        if "warning_active_after" in payload:
+            return bool(payload.get("warning_active_after"))
+        return str(payload.get("target_status", "")) == "warning"
+
     def __str__(self) -> str:
         return (
             f"WeeklyLevelEvaluation#{self.pk} user={self.user_id} "
@@ -178,7 +305,8 @@ class UserLevelHistoryEvent(AppendOnlyModel):
 
     class Meta:
         indexes = [
-            models.Index(fields=["user", "created_at"]),
+            # Serves "latest event per user" (DISTINCT ON / correlated subquery).
+            models.Index(fields=["user", "-created_at", "-id"]),
             models.Index(fields=["user", "week_start"]),
             models.Index(fields=["source", "status", "created_at"]),
             models.Index(fields=["warning_active_after", "created_at"]),
@@ -189,3 +317,237 @@ class UserLevelHistoryEvent(AppendOnlyModel):
             f"UserLevelHistoryEvent#{self.pk} user={self.user_id} "
             f"{self.previous_level}->{self.new_level} {self.source} {self.status}"
         )
+
+
+class TechnicianScoreManager(models.Manager):
+    def apply_deltas(self, *, user_id: int, deltas: Mapping[str, int]) -> bool:
+        """Add deltas to the user's row; False when the row does not exist yet."""
+        updated = self.filter(user_id=user_id).update(
+            **{field: F(field) + int(delta) for field, delta in deltas.items()}
+        )
+        return bool(updated)
+
+
+class TechnicianScore(TimestampedModel):
+    """Persisted leaderboard score components, one row per scored user."""
+
+    COMPONENT_FIELDS = (
+        "tickets_done_total",
+        "tickets_first_pass_total",
+        "tickets_rework_total",
+        "tickets_flag_green_total",
+        "tickets_flag_yellow_total",
+        "tickets_flag_red_total",
+        "resolution_minutes_total",
+        "qc_fail_events_total",
+        "xp_total",
+        "attendance_days_total",
+    )
+
+    objects = TechnicianScoreManager()
+
+    user = models.OneToOneField(
+        "account.User",
+        on_delete=models.CASCADE,
+        related_name="technician_score",
+    )
+    tickets_done_total = models.PositiveIntegerField(default=0)
+    tickets_first_pass_total = models.PositiveIntegerField(default=0)
+    tickets_rework_total = models.PositiveIntegerField(default=0)
+    tickets_flag_green_total = models.PositiveIntegerField(default=0)
+    tickets_flag_yellow_total = models.PositiveIntegerField(default=0)
+    tickets_flag_red_total = models.PositiveIntegerField(default=0)
+    resolution_minutes_total = models.BigIntegerField(default=0)
+    qc_fail_events_total = models.PositiveIntegerField(default=0)
+    xp_total = models.BigIntegerField(default=0)
+    attendance_days_total = models.PositiveIntegerField(default=0)
+    score = models.BigIntegerField(default=0)
+    # Denormalised from the user and role tables so rank counts stay on the
+    # partial index below instead of joining users per row.
+    is_active_technician = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                F("score").desc(),
+                F("tickets_done_total").desc(),
+                F("tickets_first_pass_total").desc(),
+                F("xp_total").desc(),
+                "user",
+                name="gamif_tech_active_rank_idx",
+                condition=Q(is_active_technician=True),
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"TechnicianScore user={self.user_id} score={self.score}"
+
+
+class TechnicianDailyStats(TimestampedModel):
+    """Per-user KPI rollup for one business date (Asia/Tashkent)."""
+
+    COUNTER_FIELDS = (
+        "tickets_done",
+        "tickets_first_pass",
+        "tickets_rework",
+        "tickets_flag_green",
+        "tickets_flag_yellow",
+        "tickets_flag_red",
+        "qc_pass_events",
+        "qc_fail_events",
+        "xp_total",
+        "attendance_days",
+        "attendance_minutes",
+    )
+
+    user = models.ForeignKey(
+        "account.User",
+        on_delete=models.CASCADE,
+        related_name="daily_stats",
+    )
+    business_date = models.DateField()
+    tickets_done = models.PositiveIntegerField(default=0)
+    tickets_first_pass = models.PositiveIntegerField(default=0)
+    tickets_rework = models.PositiveIntegerField(default=0)
+    tickets_flag_green = models.PositiveIntegerField(default=0)
+    tickets_flag_yellow = models.PositiveIntegerField(default=0)
+    tickets_flag_red = models.PositiveIntegerField(default=0)
+    qc_pass_events = models.PositiveIntegerField(default=0)
+    qc_fail_events = models.PositiveIntegerField(default=0)
+    xp_total = models.IntegerField(default=0)
+    xp_by_entry_type = models.JSONField(default=dict, blank=True)
+    attendance_days = models.PositiveSmallIntegerField(default=0)
+    attendance_minutes = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["business_date", "user"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "business_date"],
+                name="unique_technician_daily_stats_per_user_date",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"TechnicianDailyStats user={self.user_id} {self.business_date}"
+
+
+class TechnicianDailyStatsDay(TimestampedModel):
+    """Marks a business date whose `TechnicianDailyStats` rows have been built."""
+
+    business_date = models.DateField(unique=True)
+
+    def __str__(self) -> str:
+        return f"TechnicianDailyStatsDay {self.business_date}"
+
+
+class XPMonthlySummary(TimestampedModel):
+    """Closed business month of the XP ledger per user and entry type."""
+
+    month = models.DateField()
+    user = models.ForeignKey(
+        "account.User",
+        on_delete=models.CASCADE,
+        related_name="xp_monthly_summaries",
+    )
+    entry_type = models.CharField(max_length=50, choices=XPTransactionEntryType)
+    amount_total = models.BigIntegerField(default=0)
+    entry_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "month"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["month", "user", "entry_type"],
+                name="unique_xp_monthly_summary_per_user_type",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"XPMonthlySummary user={self.user_id} {self.month} {self.entry_type}"
+
+
+class XPMonthlySummaryMonth(TimestampedModel):
+    """Marks a business month whose `XPMonthlySummary` rows have been built."""
+
+    month = models.DateField(unique=True)
+
+    def __str__(self) -> str:
+        return f"XPMonthlySummaryMonth {self.month}"
+
+
+class UserLevelStatusManager(models.Manager):
+    def apply_xp(self, *, user_id: int, amount: int, week_start: date) -> bool:
+        """
+        Add XP of the business week starting ``week_start`` to the user's row.
+
+        A row on an older week rolls forward to that week, a late entry of an
+        earlier week only moves cumulative XP. False when the row is missing.
+        """
+        amount = int(amount)
+        updated = self.filter(user_id=user_id).update(
+            week_xp=Case(
+                When(week_start=week_start, then=F("week_xp") + amount),
+                When(week_start__lt=week_start, then=Value(amount)),
+                default=F("week_xp"),
+            ),
+            week_start=Case(
+                When(week_start__lt=week_start, then=Value(week_start)),
+                default=F("week_start"),
+            ),
+            cumulative_xp=F("cumulative_xp") + amount,
+        )
+        return bool(updated)
+
+    def roll_over(self, *, week_start: date) -> int:
+        """Move rows of earlier weeks to ``week_start`` with no XP this week."""
+        return self.filter(week_start__lt=week_start).update(
+            week_start=week_start, week_xp=0
+        )
+
+
+class UserLevelStatus(TimestampedModel):
+    """Current level-control state of one user, rebuildable from source tables."""
+
+    objects = UserLevelStatusManager()
+
+    user = models.OneToOneField(
+        "account.User",
+        on_delete=models.CASCADE,
+        related_name="level_status",
+    )
+    level = models.PositiveSmallIntegerField(
+        choices=EmployeeLevel, default=EmployeeLevel.L1
+    )
+    week_start = models.DateField()
+    week_xp = models.IntegerField(default=0)
+    cumulative_xp = models.BigIntegerField(default=0)
+    warning_active = models.BooleanField(default=False)
+    latest_history_event = models.ForeignKey(
+        UserLevelHistoryEvent,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    latest_evaluation = models.ForeignKey(
+        WeeklyLevelEvaluation,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["level", "user"]),
+            models.Index(fields=["cumulative_xp", "user"]),
+            models.Index(fields=["warning_active", "level"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"UserLevelStatus user={self.user_id} level={self.level}"
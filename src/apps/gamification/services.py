@@ -1,16 +1,23 @@
-from datetime import date, datetime, time, timedelta
+from collections import Counter
+from collections.abc import Mapping, Sequence
+from datetime import date, datetime, timedelta
+from itertools import batched
 from typing import Any
 from uuid import uuid4
-from zoneinfo import ZoneInfo
 
-from django.db import IntegrityError, transaction
-from django.db.models import Sum
+from django.db import connection, transaction
+from django.db.models import OuterRef, Subquery, Sum
 from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 from account.models import User
 from core.api.exceptions import DomainValidationError
 from core.services.notifications import UserNotificationService
+from core.utils.business_dates import (
+    BUSINESS_TIMEZONE,
+    business_date,
+    business_date_range_bounds,
+)
 from core.utils.constants import EmployeeLevel, RoleSlug, XPTransactionEntryType
 from gamification.models import (
     LevelUpCouponEvent,
@@ -19,14 +26,20 @@ from gamification.models import (
     WeeklyLevelEvaluation,
     XPTransaction,
 )
+from gamification.services_daily_stats import TechnicianDailyStatsService
+from gamification.services_leaderboard import TechnicianScoreService
+from gamification.services_level_status import UserLevelStatusService
+from gamification.services_xp_balance import XPBalanceService
+from rules.compiled import DEFAULT_LEVEL_THRESHOLDS
 from rules.services import RulesService
 
 
 class GamificationService:
     """Append-only XP transaction writer with idempotent reference handling."""
 
-    @staticmethod
+    @classmethod
     def append_xp_entry(
+        cls,
         *,
         user_id: int,
         amount: int,
@@ -34,15 +47,46 @@ class GamificationService:
         reference: str,
         description: str | None = None,
         payload: dict | None = None,
+        ticket_id: int | None = None,
     ) -> tuple[XPTransaction, bool]:
-        return XPTransaction.objects.append_entry(
-            user_id=user_id,
-            amount=amount,
-            entry_type=entry_type,
-            reference=reference,
-            description=description,
-            payload=payload,
-        )
+        return cls.append_xp_entries(
+            [
+                {
+                    "user_id": user_id,
+                    "amount": amount,
+                    "entry_type": entry_type,
+                    "reference": reference,
+                    "description": description,
+                    "payload": payload,
+                    "ticket_id": ticket_id,
+                }
+            ]
+        )[0]
+
+    @staticmethod
+    @transaction.atomic
+    def append_xp_entries(
+        entries: Sequence[Mapping[str, Any]],
+    ) -> list[tuple[XPTransaction, bool]]:
+        """
+        Append several XP entries with one insert and two reads by reference.
+
+        Each entry takes the ``append_xp_entry`` keyword arguments; results are
+        ``(entry, created)`` in input order and only created entries feed the
+        score, daily-stats and level-status rollups, grouped per user, in the
+        same transaction as the insert.
+        """
+        results = XPTransaction.objects.append_entries(entries)
+        created_entries = [entry for entry, created in results if created]
+        # Read models take one delta per user rather than one per entry.
+        amounts_by_user: Counter[int] = Counter()
+        for entry in created_entries:
+            amounts_by_user[entry.user_id] += int(entry.amount)
+        for user_id, amount in sorted(amounts_by_user.items()):
+            TechnicianScoreService.record_xp(user_id=user_id, amount=amount)
+        TechnicianDailyStatsService.record_xp_entries(created_entries)
+        UserLevelStatusService.record_xp_entries(created_entries)
+        return results
 
     @classmethod
     @transaction.atomic
@@ -93,7 +137,8 @@ class GamificationService:
 class ProgressionService:
     """Weekly progression evaluator and level-control service."""
 
-    BUSINESS_TZ = ZoneInfo("Asia/Tashkent")
+    BUSINESS_TZ = BUSINESS_TIMEZONE
+    EVALUATION_BATCH_SIZE = 500
 
     @staticmethod
     def _normalize_level(level: int | None) -> int:
@@ -103,13 +148,7 @@ class ProgressionService:
 
     @staticmethod
     def _default_level_thresholds() -> dict[int, int]:
-        return {
-            int(EmployeeLevel.L1): 0,
-            int(EmployeeLevel.L2): 200,
-            int(EmployeeLevel.L3): 450,
-            int(EmployeeLevel.L4): 750,
-            int(EmployeeLevel.L5): 1100,
-        }
+        return dict(DEFAULT_LEVEL_THRESHOLDS)
 
     @staticmethod
     def parse_date_token(value: str, *, field_name: str) -> date:
@@ -131,13 +170,13 @@ class ProgressionService:
 
     @classmethod
     def default_previous_week_start(cls) -> date:
-        local_today = timezone.now().astimezone(cls.BUSINESS_TZ).date()
+        local_today = business_date()
         current_week_start = local_today - timedelta(days=local_today.weekday())
         return current_week_start - timedelta(days=7)
 
     @classmethod
     def default_last_7_day_range(cls) -> tuple[date, date]:
-        local_today = timezone.now().astimezone(cls.BUSINESS_TZ).date()
+        local_today = business_date()
         return local_today - timedelta(days=6), local_today
 
     @classmethod
@@ -154,73 +193,28 @@ class ProgressionService:
         date_from: date,
         date_to: date,
     ) -> tuple[date, date, datetime, datetime, int]:
-        if date_from > date_to:
-            raise ValueError("date_from must be less than or equal to date_to.")
-
-        range_days = (date_to - date_from).days + 1
-        if range_days > 366:
-            raise ValueError("Date range cannot exceed 366 days.")
-
-        start_dt = timezone.make_aware(
-            datetime.combine(date_from, time.min),
-            cls.BUSINESS_TZ,
-        )
-        end_exclusive_dt = timezone.make_aware(
-            datetime.combine(date_to + timedelta(days=1), time.min),
-            cls.BUSINESS_TZ,
+        start_dt, end_exclusive_dt, range_days = business_date_range_bounds(
+            date_from=date_from,
+            date_to=date_to,
         )
         return date_from, date_to, start_dt, end_exclusive_dt, range_days
 
     @classmethod
     def _progression_rules_from_active_config(
         cls,
-    ) -> tuple[dict[int, int], int, int, dict]:
-        state = RulesService.get_active_rules_state()
-        config = state.active_version.config
-        progression_rules = config.get("progression", {})
-
-        default_thresholds = cls._default_level_thresholds()
-        thresholds_raw = progression_rules.get("level_thresholds", {})
-        normalized_thresholds: dict[int, int] = {}
-        last_threshold = 0
-        for level in EmployeeLevel.values:
-            level_int = int(level)
-            raw_threshold = None
-            if isinstance(thresholds_raw, dict):
-                raw_threshold = thresholds_raw.get(
-                    str(level_int), thresholds_raw.get(level_int)
-                )
-            try:
-                parsed_threshold = int(raw_threshold)
-            except (TypeError, ValueError):
-                parsed_threshold = default_thresholds[level_int]
-            parsed_threshold = max(0, parsed_threshold)
-            if level_int == int(EmployeeLevel.L1):
-                parsed_threshold = 0
-            if parsed_threshold < last_threshold:
-                parsed_threshold = last_threshold
-            normalized_thresholds[level_int] = parsed_threshold
-            last_threshold = parsed_threshold
-
-        coupon_amount_raw = progression_rules.get("weekly_coupon_amount", 100_000)
-        try:
-            coupon_amount = int(coupon_amount_raw)
-        except (TypeError, ValueError):
-            coupon_amount = 100_000
-        coupon_amount = max(0, coupon_amount)
-
-        weekly_target_xp_raw = progression_rules.get("weekly_target_xp", 100)
-        try:
-            weekly_target_xp = int(weekly_target_xp_raw)
-        except (TypeError, ValueError):
-            weekly_target_xp = 100
-        weekly_target_xp = max(0, weekly_target_xp)
-
+    ) -> tuple[Mapping[int, int], int, int, dict]:
+        snapshot = RulesService.get_active_rules_snapshot()
+        progression_rules = snapshot.progression
         rules_snapshot = {
-            "version": state.active_version.version,
-            "cache_key": state.cache_key,
+            "version": snapshot.version,
+            "cache_key": snapshot.cache_key,
         }
-        return normalized_thresholds, coupon_amount, weekly_target_xp, rules_snapshot
+        return (
+            progression_rules.level_thresholds,
+            progression_rules.weekly_coupon_amount,
+            progression_rules.weekly_target_xp,
+            rules_snapshot,
+        )
 
     @staticmethod
     def _warning_active_from_evaluation(
@@ -228,10 +222,7 @@ class ProgressionService:
     ) -> bool:
         if not evaluation:
             return False
-        payload = evaluation.payload if isinstance(evaluation.payload, dict) else {}
-        if "warning_active_after" in payload:
-            return bool(payload.get("warning_active_after"))
-        return str(payload.get("target_status", "")) == "warning"
+        return evaluation.warning_active_after
 
     @staticmethod
     def _warning_active_from_history_event(
@@ -266,18 +257,32 @@ class ProgressionService:
         user_ids: list[int],
         created_before: datetime | None = None,
     ) -> dict[int, UserLevelHistoryEvent]:
-        qs = UserLevelHistoryEvent.objects.select_related("actor").filter(
-            user_id__in=user_ids
-        )
+        if not user_ids:
+            return {}
+        qs = UserLevelHistoryEvent.objects.filter(user_id__in=user_ids)
         if created_before is not None:
             qs = qs.filter(created_at__lt=created_before)
-        rows = qs.order_by("user_id", "-created_at", "-id")
 
-        latest: dict[int, UserLevelHistoryEvent] = {}
-        for row in rows:
-            if row.user_id not in latest:
-                latest[row.user_id] = row
-        return latest
+        # Both branches read one row per user from the (user, -created_at, -id)
+        # index instead of walking every user's full history.
+        if connection.vendor == "postgresql":
+            rows = (
+                qs.select_related("actor")
+                .order_by("user_id", "-created_at", "-id")
+                .distinct("user_id")
+            )
+        else:
+            newest = (
+                qs.filter(user_id=OuterRef("pk"))
+                .order_by("-created_at", "-id")
+                .values("id")[:1]
+            )
+            rows = UserLevelHistoryEvent.objects.select_related("actor").filter(
+                id__in=User.all_objects.filter(id__in=user_ids).values(
+                    latest_id=Subquery(newest)
+                )
+            )
+        return {row.user_id: row for row in rows}
 
     @classmethod
     def _latest_level_history_for_user(
@@ -286,7 +291,9 @@ class ProgressionService:
         user_id: int,
         created_before: datetime | None = None,
     ) -> UserLevelHistoryEvent | None:
-        qs = UserLevelHistoryEvent.objects.select_related("actor").filter(user_id=user_id)
+        qs = UserLevelHistoryEvent.objects.select_related("actor").filter(
+            user_id=user_id
+        )
         if created_before is not None:
             qs = qs.filter(created_at__lt=created_before)
         return qs.order_by("-created_at", "-id").first()
@@ -319,13 +326,9 @@ class ProgressionService:
     ) -> tuple[dict[int, int], dict[int, int]]:
         if not user_ids:
             return {}, {}
-        cumulative_rows = (
-            XPTransaction.objects.filter(
-                user_id__in=user_ids,
-                created_at__lt=period_end_exclusive_dt,
-            )
-            .values("user_id")
-            .annotate(total=Coalesce(Sum("amount"), 0))
+        cumulative_balances = XPBalanceService.balances(
+            user_ids=user_ids,
+            as_of=period_end_exclusive_dt,
         )
         period_rows = (
             XPTransaction.objects.filter(
@@ -337,7 +340,7 @@ class ProgressionService:
             .annotate(total=Coalesce(Sum("amount"), 0))
         )
         cumulative_by_user = {
-            int(row["user_id"]): int(row["total"] or 0) for row in cumulative_rows
+            user_id: balance.total for user_id, balance in cumulative_balances.items()
         }
         period_by_user = {
             int(row["user_id"]): int(row["total"] or 0) for row in period_rows
@@ -371,7 +374,7 @@ class ProgressionService:
         cls,
         *,
         raw_xp: int,
-        level_thresholds: dict[int, int] | None = None,
+        level_thresholds: Mapping[int, int] | None = None,
     ) -> int:
         normalized_raw_xp = max(0, int(raw_xp or 0))
         thresholds = level_thresholds or cls._default_level_thresholds()
@@ -405,7 +408,20 @@ class ProgressionService:
         *,
         date_from: date | None = None,
         date_to: date | None = None,
+        level: int | None = None,
+        warning_active: bool | None = None,
+        meets_target: bool | None = None,
+        ordering: str = UserLevelStatusService.DEFAULT_ORDERING,
+        cursor: str | None = None,
+        limit: int | None = None,
     ) -> dict[str, Any]:
+        """
+        Page active technicians' level-control rows from ``UserLevelStatus``.
+
+        Only range XP depends on the requested dates; level, cumulative XP,
+        warning state and latest history/evaluation are the current values.
+        Without ``limit`` every matching row is returned.
+        """
         resolved_date_from, resolved_date_to = (
             (date_from, date_to)
             if date_from is not None and date_to is not None
@@ -414,93 +430,46 @@ class ProgressionService:
         (
             resolved_date_from,
             resolved_date_to,
-            range_start_dt,
-            range_end_exclusive_dt,
+            _,
+            _,
             range_days,
         ) = cls._date_range_bounds(
             date_from=resolved_date_from,
             date_to=resolved_date_to,
         )
+        if level is not None and level not in EmployeeLevel.values:
+            raise ValueError("level is invalid.")
         level_thresholds, _, weekly_target_xp, rules_snapshot = (
             cls._progression_rules_from_active_config()
         )
         range_target_xp = (weekly_target_xp * range_days + 6) // 7
 
-        users = list(
-            User.objects.filter(
-                is_active=True,
-                roles__slug=RoleSlug.TECHNICIAN,
-                roles__deleted_at__isnull=True,
-            )
-            .distinct()
-            .only("id", "first_name", "last_name", "username", "level")
-            .order_by("first_name", "last_name", "username", "id")
-        )
-        user_ids = [user.id for user in users]
-        cumulative_xp_by_user, range_xp_by_user = cls._xp_aggregates(
-            user_ids=user_ids,
-            period_start_inclusive_dt=range_start_dt,
-            period_end_exclusive_dt=range_end_exclusive_dt,
-        )
-        latest_history_by_user = cls._latest_level_history_by_user(
-            user_ids=user_ids,
-            created_before=range_end_exclusive_dt,
-        )
-
-        latest_evaluation_rows = (
-            WeeklyLevelEvaluation.objects.select_related("evaluated_by")
-            .filter(
-                user_id__in=user_ids,
-                week_end__lte=resolved_date_to,
-            )
-            .order_by("user_id", "-week_end", "-id")
+        statuses, next_cursor, summary = UserLevelStatusService.overview_page(
+            date_from=resolved_date_from,
+            date_to=resolved_date_to,
+            range_target_xp=range_target_xp,
+            level=level,
+            warning_active=warning_active,
+            meets_target=meets_target,
+            ordering=ordering,
+            cursor=cursor,
+            limit=limit,
         )
-        latest_evaluation_by_user: dict[int, WeeklyLevelEvaluation] = {}
-        for row in latest_evaluation_rows:
-            if row.user_id not in latest_evaluation_by_user:
-                latest_evaluation_by_user[row.user_id] = row
 
         rows: list[dict[str, Any]] = []
-        summary = {
-            "technicians_total": len(users),
-            "met_target": 0,
-            "below_target": 0,
-            "warning_active": 0,
-            "suggested_warning": 0,
-            "suggested_reset_to_l1": 0,
-        }
-
-        for user in users:
-            user_id = int(user.id)
-            current_level = cls._normalize_level(user.level)
-            range_xp = int(range_xp_by_user.get(user_id, 0))
-            cumulative_xp = int(cumulative_xp_by_user.get(user_id, 0))
+        for status_row in statuses:
+            user = status_row.user
+            current_level = cls._normalize_level(status_row.level)
+            range_xp = int(status_row.range_xp)
+            cumulative_xp = int(status_row.cumulative_xp)
             mapped_level = cls.map_raw_xp_to_level(
                 raw_xp=cumulative_xp,
                 level_thresholds=level_thresholds,
             )
-            meets_target = range_xp >= range_target_xp
-
-            latest_history = latest_history_by_user.get(user_id)
-            latest_eval = latest_evaluation_by_user.get(user_id)
-            warning_active = cls._warning_active_from_history_event(latest_history)
-            if latest_history is None:
-                warning_active = cls._warning_active_from_evaluation(latest_eval)
-
-            suggested_warning = (not meets_target) and (not warning_active)
-            suggested_reset_to_l1 = (not meets_target) and warning_active
-
-            if meets_target:
-                summary["met_target"] += 1
-            else:
-                summary["below_target"] += 1
-            if warning_active:
-                summary["warning_active"] += 1
-            if suggested_warning:
-                summary["suggested_warning"] += 1
-            if suggested_reset_to_l1:
-                summary["suggested_reset_to_l1"] += 1
+            meets_target_row = range_xp >= range_target_xp
+            warning_active_row = bool(status_row.warning_active)
 
+            latest_history = status_row.latest_history_event
             latest_history_payload = None
             if latest_history:
                 latest_history_payload = {
@@ -529,9 +498,12 @@ class ProgressionService:
                     "note": latest_history.note,
                 }
 
+            latest_eval = status_row.latest_evaluation
             latest_eval_payload = None
             if latest_eval:
-                eval_payload = latest_eval.payload if isinstance(latest_eval.payload, dict) else {}
+                eval_payload = (
+                    latest_eval.payload if isinstance(latest_eval.payload, dict) else {}
+                )
                 latest_eval_payload = {
                     "id": latest_eval.id,
                     "week_start": latest_eval.week_start.isoformat(),
@@ -556,19 +528,22 @@ class ProgressionService:
 
             rows.append(
                 {
-                    "user_id": user_id,
+                    "user_id": int(user.id),
                     "display_name": cls._display_name_for_user(user),
                     "username": user.username,
                     "current_level": current_level,
                     "suggested_level_by_xp": max(current_level, mapped_level),
                     "range_xp": range_xp,
+                    "current_week_xp": int(status_row.current_week_xp),
                     "cumulative_xp": cumulative_xp,
                     "weekly_target_xp": weekly_target_xp,
                     "range_target_xp": range_target_xp,
-                    "meets_target": meets_target,
-                    "warning_active": warning_active,
-                    "suggested_warning": suggested_warning,
-                    "suggested_reset_to_l1": suggested_reset_to_l1,
+                    "meets_target": meets_target_row,
+                    "warning_active": warning_active_row,
+                    "suggested_warning": (not meets_target_row)
+                    and (not warning_active_row),
+                    "suggested_reset_to_l1": (not meets_target_row)
+                    and warning_active_row,
                     "latest_history_event": latest_history_payload,
                     "latest_weekly_evaluation": latest_eval_payload,
                 }
@@ -581,6 +556,8 @@ class ProgressionService:
             "weekly_target_xp": weekly_target_xp,
             "range_target_xp": range_target_xp,
             "rules_version": int(rules_snapshot["version"]),
+            "ordering": ordering,
+            "next_cursor": next_cursor,
             "rows": rows,
             "summary": summary,
         }
@@ -594,14 +571,18 @@ class ProgressionService:
         date_to: date | None = None,
         limit: int = 500,
     ) -> dict[str, Any]:
-        user = User.objects.filter(pk=user_id).only(
-            "id",
-            "first_name",
-            "last_name",
-            "username",
-            "level",
-            "is_active",
-        ).first()
+        user = (
+            User.objects.filter(pk=user_id)
+            .only(
+                "id",
+                "first_name",
+                "last_name",
+                "username",
+                "level",
+                "is_active",
+            )
+            .first()
+        )
         if not user:
             raise ValueError("User was not found.")
 
@@ -619,7 +600,9 @@ class ProgressionService:
                 _,
             ) = cls._date_range_bounds(date_from=date_from, date_to=date_to)
 
-        xp_qs = XPTransaction.objects.filter(user_id=user.id).order_by("-created_at", "-id")
+        xp_qs = XPTransaction.objects.filter(user_id=user.id).order_by(
+            "-created_at", "-id"
+        )
         if range_start_dt is not None and range_end_exclusive_dt is not None:
             xp_qs = xp_qs.filter(
                 created_at__gte=range_start_dt,
@@ -627,9 +610,11 @@ class ProgressionService:
             )
         xp_entries = list(xp_qs[:normalized_limit])
 
-        eval_qs = WeeklyLevelEvaluation.objects.select_related("evaluated_by").filter(
-            user_id=user.id
-        ).order_by("-week_start", "-id")
+        eval_qs = (
+            WeeklyLevelEvaluation.objects.select_related("evaluated_by")
+            .filter(user_id=user.id)
+            .order_by("-week_start", "-id")
+        )
         if resolved_date_from is not None and resolved_date_to is not None:
             eval_qs = eval_qs.filter(
                 week_end__gte=resolved_date_from,
@@ -637,9 +622,11 @@ class ProgressionService:
             )
         evaluations = list(eval_qs[:normalized_limit])
 
-        history_qs = UserLevelHistoryEvent.objects.select_related("actor").filter(
-            user_id=user.id
-        ).order_by("-created_at", "-id")
+        history_qs = (
+            UserLevelHistoryEvent.objects.select_related("actor")
+            .filter(user_id=user.id)
+            .order_by("-created_at", "-id")
+        )
         if range_start_dt is not None and range_end_exclusive_dt is not None:
             history_qs = history_qs.filter(
                 created_at__gte=range_start_dt,
@@ -648,7 +635,9 @@ class ProgressionService:
         history_entries = list(history_qs[:normalized_limit])
 
         latest_history_event = cls._latest_level_history_for_user(user_id=user.id)
-        warning_active_now = cls._warning_active_from_history_event(latest_history_event)
+        warning_active_now = cls._warning_active_from_history_event(
+            latest_history_event
+        )
         if latest_history_event is None:
             latest_evaluation = (
                 WeeklyLevelEvaluation.objects.filter(user_id=user.id)
@@ -725,12 +714,14 @@ class ProgressionService:
                 "level": cls._normalize_level(user.level),
                 "warning_active_now": warning_active_now,
             },
-            "range": {
-                "date_from": resolved_date_from.isoformat(),
-                "date_to": resolved_date_to.isoformat(),
-            }
-            if resolved_date_from is not None and resolved_date_to is not None
-            else None,
+            "range": (
+                {
+                    "date_from": resolved_date_from.isoformat(),
+                    "date_to": resolved_date_to.isoformat(),
+                }
+                if resolved_date_from is not None and resolved_date_to is not None
+                else None
+            ),
             "xp_history": serialized_xp,
             "weekly_evaluations": serialized_evaluations,
             "level_history": serialized_history,
@@ -810,6 +801,8 @@ class ProgressionService:
             },
         )
 
+        UserLevelStatusService.rebuild(user_ids=[user.id])
+
         UserNotificationService.notify_manual_level_update(
             target_user_id=user.id,
             actor_user_id=actor_user_id,
@@ -834,14 +827,33 @@ class ProgressionService:
             "history_created_at": history_event.created_at.isoformat(),
         }
 
+    @staticmethod
+    def seed_technician_rows(*, user_ids: Sequence[int]) -> None:
+        """
+        Bring leaderboard and level-status rows in line after role changes.
+
+        Missing rows are created and the leaderboard's active-technician flag
+        is refreshed, so deactivated users drop out of ranks immediately.
+        """
+        TechnicianScoreService.sync_active_flags(user_ids=user_ids)
+        TechnicianScoreService.seed_missing_active_technicians(user_ids=user_ids)
+        UserLevelStatusService.seed_missing_active_technicians(user_ids=user_ids)
+
     @classmethod
-    @transaction.atomic
     def run_weekly_level_evaluation(
         cls,
         *,
         week_start: date | None = None,
         actor_user_id: int | None = None,
     ) -> dict[str, int | str]:
+        """
+        Evaluate every candidate user for one week in bounded batches.
+
+        XP totals come from one grouped aggregate; each batch locks only its
+        own users and commits in its own transaction, so a crashed run resumes
+        by skipping users that already have an evaluation for the week. Status
+        rows left on an earlier week are then rolled over to the current one.
+        """
         if (
             actor_user_id is not None
             and not User.objects.filter(id=actor_user_id).exists()
@@ -859,51 +871,101 @@ class ProgressionService:
         candidate_user_ids = cls._candidate_user_ids(
             week_end_exclusive_dt=week_end_exclusive_dt
         )
-        users_by_id = {
-            user.id: user
-            for user in User.objects.select_for_update()
-            .filter(id__in=candidate_user_ids, is_active=True)
-            .only("id", "level")
+        user_ids = list(
+            User.objects.filter(id__in=candidate_user_ids, is_active=True)
             .order_by("id")
-        }
-        user_ids = sorted(users_by_id.keys())
+            .values_list("id", flat=True)
+        )
         cumulative_by_user, weekly_by_user = cls._xp_aggregates(
             user_ids=user_ids,
             period_start_inclusive_dt=week_start_inclusive_dt,
             period_end_exclusive_dt=week_end_exclusive_dt,
         )
-        already_evaluated_user_ids = set(
+
+        counts: Counter[str] = Counter()
+        for batch in batched(user_ids, cls.EVALUATION_BATCH_SIZE, strict=False):
+            with transaction.atomic():
+                counts.update(
+                    cls._evaluate_weekly_batch(
+                        user_ids=list(batch),
+                        week_start=week_start,
+                        week_end=week_end,
+                        week_start_inclusive_dt=week_start_inclusive_dt,
+                        cumulative_by_user=cumulative_by_user,
+                        weekly_by_user=weekly_by_user,
+                        level_thresholds=level_thresholds,
+                        coupon_amount=coupon_amount,
+                        weekly_target_xp=weekly_target_xp,
+                        rules_snapshot=rules_snapshot,
+                        actor_user_id=actor_user_id,
+                    )
+                )
+        # Evaluated rows were rebuilt on the current week; the rest start it
+        # with no XP so the overview does not show last week's totals.
+        UserLevelStatusService.roll_over_week()
+
+        return {
+            "week_start": week_start.isoformat(),
+            "week_end": week_end.isoformat(),
+            "weekly_target_xp": weekly_target_xp,
+            "evaluations_created": counts["evaluations_created"],
+            "evaluations_skipped": counts["evaluations_skipped"],
+            "level_ups": counts["level_ups"],
+            "warnings_created": counts["warnings_created"],
+            "levels_reset_to_l1": counts["levels_reset_to_l1"],
+            "coupon_events_created": counts["coupon_events_created"],
+        }
+
+    @classmethod
+    def _evaluate_weekly_batch(
+        cls,
+        *,
+        user_ids: list[int],
+        week_start: date,
+        week_end: date,
+        week_start_inclusive_dt: datetime,
+        cumulative_by_user: Mapping[int, int],
+        weekly_by_user: Mapping[int, int],
+        level_thresholds: Mapping[int, int],
+        coupon_amount: int,
+        weekly_target_xp: int,
+        rules_snapshot: dict,
+        actor_user_id: int | None,
+    ) -> Counter[str]:
+        counts: Counter[str] = Counter()
+        users = list(
+            User.objects.select_for_update()
+            .filter(id__in=user_ids, is_active=True)
+            .only("id", "level")
+            .order_by("id")
+        )
+        evaluated_user_ids = set(
             WeeklyLevelEvaluation.objects.filter(
                 week_start=week_start, user_id__in=user_ids
             ).values_list("user_id", flat=True)
         )
+        pending_users = [user for user in users if user.id not in evaluated_user_ids]
+        counts["evaluations_skipped"] = len(users) - len(pending_users)
+        if not pending_users:
+            return counts
+
+        pending_user_ids = [user.id for user in pending_users]
         previous_evaluation_by_user = cls._latest_previous_evaluation_by_user(
-            user_ids=user_ids,
+            user_ids=pending_user_ids,
             week_start=week_start,
         )
         previous_history_by_user = cls._latest_level_history_by_user(
-            user_ids=user_ids,
+            user_ids=pending_user_ids,
             created_before=week_start_inclusive_dt,
         )
-
-        created = 0
-        skipped = 0
-        level_ups = 0
-        coupon_events = 0
-        warnings = 0
-        resets_to_l1 = 0
-
-        for user_id in user_ids:
-            if user_id in already_evaluated_user_ids:
-                skipped += 1
-                continue
-
-            user = users_by_id.get(user_id)
-            if not user:
-                continue
-
-            cumulative_xp = int(cumulative_by_user.get(user_id, 0))
-            weekly_xp = int(weekly_by_user.get(user_id, 0))
+        thresholds_payload = {str(k): int(v) for k, v in level_thresholds.items()}
+
+        evaluations: list[WeeklyLevelEvaluation] = []
+        outcomes: dict[int, dict[str, Any]] = {}
+        changed_users: list[User] = []
+        for user in pending_users:
+            cumulative_xp = int(cumulative_by_user.get(user.id, 0))
+            weekly_xp = int(weekly_by_user.get(user.id, 0))
             met_weekly_target = weekly_xp >= weekly_target_xp
             previous_level = cls._normalize_level(user.level)
             mapped_level = cls.map_raw_xp_to_level(
@@ -911,110 +973,141 @@ class ProgressionService:
                 level_thresholds=level_thresholds,
             )
             previous_warning_active = cls._warning_active_from_history_event(
-                previous_history_by_user.get(user_id)
+                previous_history_by_user.get(user.id)
             )
-            if user_id not in previous_history_by_user:
+            if user.id not in previous_history_by_user:
                 previous_warning_active = cls._warning_active_from_evaluation(
-                    previous_evaluation_by_user.get(user_id)
+                    previous_evaluation_by_user.get(user.id)
+                )
+            new_level, target_status, warning_active_after = (
+                cls._resolve_weekly_outcome(
+                    previous_level=previous_level,
+                    mapped_level=mapped_level,
+                    met_weekly_target=met_weekly_target,
+                    previous_warning_active=previous_warning_active,
                 )
-            new_level, target_status, warning_active_after = cls._resolve_weekly_outcome(
-                previous_level=previous_level,
-                mapped_level=mapped_level,
-                met_weekly_target=met_weekly_target,
-                previous_warning_active=previous_warning_active,
             )
             is_level_up = new_level > previous_level
 
-            evaluation = WeeklyLevelEvaluation.objects.create(
-                user_id=user_id,
-                week_start=week_start,
-                week_end=week_end,
-                raw_xp=cumulative_xp,
-                previous_level=previous_level,
-                new_level=new_level,
-                is_level_up=is_level_up,
-                rules_version=int(rules_snapshot["version"]),
-                rules_cache_key=str(rules_snapshot["cache_key"]),
-                evaluated_by_id=actor_user_id,
-                payload={
-                    "thresholds": {str(k): int(v) for k, v in level_thresholds.items()},
-                    "raw_xp": cumulative_xp,
-                    "weekly_xp": weekly_xp,
-                    "weekly_target_xp": weekly_target_xp,
-                    "met_weekly_target": met_weekly_target,
-                    "previous_warning_active": previous_warning_active,
-                    "warning_active_after": warning_active_after,
-                    "target_status": target_status,
-                },
-            )
-
-            UserLevelHistoryEvent.objects.create(
-                user_id=user_id,
-                actor_id=actor_user_id,
-                weekly_evaluation=evaluation,
-                source=UserLevelHistorySource.WEEKLY_EVALUATION,
-                status=target_status,
-                previous_level=previous_level,
-                new_level=new_level,
-                warning_active_before=previous_warning_active,
-                warning_active_after=warning_active_after,
-                week_start=week_start,
-                week_end=week_end,
-                reference=f"weekly_level_history:{week_start.isoformat()}:{user_id}",
-                note="",
-                payload={
-                    "weekly_xp": weekly_xp,
-                    "weekly_target_xp": weekly_target_xp,
-                    "met_weekly_target": met_weekly_target,
-                },
+            evaluations.append(
+                WeeklyLevelEvaluation(
+                    user_id=user.id,
+                    week_start=week_start,
+                    week_end=week_end,
+                    raw_xp=cumulative_xp,
+                    previous_level=previous_level,
+                    new_level=new_level,
+                    is_level_up=is_level_up,
+                    rules_version=int(rules_snapshot["version"]),
+                    rules_cache_key=str(rules_snapshot["cache_key"]),
+                    evaluated_by_id=actor_user_id,
+                    payload={
+                        "thresholds": thresholds_payload,
+                        "raw_xp": cumulative_xp,
+                        "weekly_xp": weekly_xp,
+                        "weekly_target_xp": weekly_target_xp,
+                        "met_weekly_target": met_weekly_target,
+                        "previous_warning_active": previous_warning_active,
+                        "warning_active_after": warning_active_after,
+                        "target_status": target_status,
+                    },
+                )
             )
-
-            created += 1
-
+            outcomes[user.id] = {
+                "previous_level": previous_level,
+                "new_level": new_level,
+                "target_status": target_status,
+                "previous_warning_active": previous_warning_active,
+                "warning_active_after": warning_active_after,
+                "weekly_xp": weekly_xp,
+                "met_weekly_target": met_weekly_target,
+            }
             if new_level != previous_level:
                 user.level = new_level
-                user.save(update_fields=["level", "updated_at"])
+                changed_users.append(user)
 
+            counts["evaluations_created"] += 1
             if target_status == "warning":
-                warnings += 1
+                counts["warnings_created"] += 1
             if target_status == "reset_to_l1":
-                resets_to_l1 += 1
-
+                counts["levels_reset_to_l1"] += 1
             if is_level_up:
-                level_ups += 1
-                if coupon_amount > 0:
-                    coupon_reference = (
-                        f"level_up_coupon:{week_start.isoformat()}:{user_id}"
-                    )
-                    try:
-                        LevelUpCouponEvent.objects.create(
-                            user_id=user_id,
-                            evaluation=evaluation,
-                            week_start=week_start,
-                            amount=coupon_amount,
-                            currency="UZS",
-                            reference=coupon_reference,
-                            description="Weekly level-up coupon",
-                            issued_by_id=actor_user_id,
-                            payload={
-                                "week_start": week_start.isoformat(),
-                                "week_end": week_end.isoformat(),
-                                "previous_level": previous_level,
-                                "new_level": new_level,
-                            },
-                        )
-                        coupon_events += 1
-                    except IntegrityError:
-                        pass
+                counts["level_ups"] += 1
 
-        return {
-            "week_start": week_start.isoformat(),
-            "week_end": week_end.isoformat(),
-            "weekly_target_xp": weekly_target_xp,
-            "evaluations_created": created,
-            "evaluations_skipped": skipped,
-            "level_ups": level_ups,
-            "warnings_created": warnings,
-            "levels_reset_to_l1": resets_to_l1,
-            "coupon_events_created": coupon_events,
-        }
+        WeeklyLevelEvaluation.objects.bulk_create(evaluations, ignore_conflicts=True)
+        # ignore_conflicts leaves primary keys unset, so read them back.
+        evaluation_ids = dict(
+            WeeklyLevelEvaluation.objects.filter(
+                week_start=week_start, user_id__in=pending_user_ids
+            ).values_list("user_id", "id")
+        )
+
+        UserLevelHistoryEvent.objects.bulk_create(
+            [
+                UserLevelHistoryEvent(
+                    user_id=user_id,
+                    actor_id=actor_user_id,
+                    weekly_evaluation_id=evaluation_ids[user_id],
+                    source=UserLevelHistorySource.WEEKLY_EVALUATION,
+                    status=outcome["target_status"],
+                    previous_level=outcome["previous_level"],
+                    new_level=outcome["new_level"],
+                    warning_active_before=outcome["previous_warning_active"],
+                    warning_active_after=outcome["warning_active_after"],
+                    week_start=week_start,
+                    week_end=week_end,
+                    reference=(
+                        f"weekly_level_history:{week_start.isoformat()}:{user_id}"
+                    ),
+                    note="",
+                    payload={
+                        "weekly_xp": outcome["weekly_xp"],
+                        "weekly_target_xp": weekly_target_xp,
+                        "met_weekly_target": outcome["met_weekly_target"],
+                    },
+                )
+                for user_id, outcome in outcomes.items()
+            ],
+            ignore_conflicts=True,
+        )
+
+        level_up_evaluation_ids = [
+            evaluation_ids[user_id]
+            for user_id, outcome in outcomes.items()
+            if outcome["new_level"] > outcome["previous_level"]
+        ]
+        if coupon_amount > 0 and level_up_evaluation_ids:
+            LevelUpCouponEvent.objects.bulk_create(
+                [
+                    LevelUpCouponEvent(
+                        user_id=user_id,
+                        evaluation_id=evaluation_ids[user_id],
+                        week_start=week_start,
+                        amount=coupon_amount,
+                        currency="UZS",
+                        reference=f"level_up_coupon:{week_start.isoformat()}:{user_id}",
+                        description="Weekly level-up coupon",
+                        issued_by_id=actor_user_id,
+                        payload={
+                            "week_start": week_start.isoformat(),
+                            "week_end": week_end.isoformat(),
+                            "previous_level": outcome["previous_level"],
+                            "new_level": outcome["new_level"],
+                        },
+                    )
+                    for user_id, outcome in outcomes.items()
+                    if outcome["new_level"] > outcome["previous_level"]
+                ],
+                ignore_conflicts=True,
+            )
+            counts["coupon_events_created"] = LevelUpCouponEvent.objects.filter(
+                evaluation_id__in=level_up_evaluation_ids
+            ).count()
+
+        if changed_users:
+            updated_at = timezone.now()
+            for user in changed_users:
+                user.updated_at = updated_at
+            User.objects.bulk_update(changed_users, ["level", "updated_at"])
+        UserLevelStatusService.rebuild(user_ids=pending_user_ids)
+        return counts
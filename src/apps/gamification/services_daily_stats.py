@@ -0,0 +1,426 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from django.db import connection, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from attendance.models import AttendanceRecord
+from core.utils.business_dates import (
+    BUSINESS_TIMEZONE,
+    business_date,
+    business_date_range_bounds,
+)
+from core.utils.constants import (
+    AnalyticsGranularity,
+    TicketColor,
+    TicketStatus,
+    TicketTransitionAction,
+)
+from gamification.models import (
+    TechnicianDailyStats,
+    TechnicianDailyStatsDay,
+    XPTransaction,
+)
+from ticket.models import Ticket, TicketTransition
+
+
+class TechnicianDailyStatsService:
+    """
+    Maintains the per-user daily KPI rollup used by team and QC analytics.
+
+    Business dates are built from source tables by the hourly build task (or the
+    nightly rebuild); afterwards scoring events update their rows in place.
+    Reads never build: a date without a marker simply has no rows yet.
+    """
+
+    BUSINESS_TZ = BUSINESS_TIMEZONE
+    FLAG_FIELDS = {
+        TicketColor.GREEN: "tickets_flag_green",
+        TicketColor.YELLOW: "tickets_flag_yellow",
+        TicketColor.RED: "tickets_flag_red",
+    }
+    NIGHTLY_REBUILD_DAYS = 2
+    BUILD_WINDOW_DAYS = 366
+    # First key of the (namespace, date ordinal) advisory lock pair.
+    ADVISORY_LOCK_NAMESPACE = 8008
+    PERIOD_TRUNCATORS = {
+        AnalyticsGranularity.WEEK: TruncWeek,
+        AnalyticsGranularity.MONTH: TruncMonth,
+    }
+
+    @classmethod
+    def business_date(cls, value: datetime | None = None) -> date:
+        return business_date(value)
+
+    @classmethod
+    def record_qc_pass(cls, *, ticket: Ticket, had_rework: bool) -> None:
+        if not ticket.technician_id:
+            return
+        deltas = {
+            "tickets_done": 1,
+            "tickets_rework" if had_rework else "tickets_first_pass": 1,
+            "qc_pass_events": 1,
+        }
+        flag_field = cls.FLAG_FIELDS.get(ticket.flag_color)
+        if flag_field:
+            deltas[flag_field] = 1
+        cls._apply(
+            user_id=ticket.technician_id,
+            business_date=ticket.finished_business_date,
+            deltas=deltas,
+        )
+
+    @classmethod
+    def record_qc_fail(cls, *, ticket: Ticket, transition: TicketTransition) -> None:
+        if not ticket.technician_id:
+            return
+        cls._apply(
+            user_id=ticket.technician_id,
+            business_date=cls.business_date(transition.created_at),
+            deltas={"qc_fail_events": 1},
+        )
+
+    @classmethod
+    def record_xp_entries(cls, entries: Iterable[XPTransaction]) -> None:
+        """Apply new XP entries as one row update per user and business date."""
+        by_row: dict[tuple[int, date], dict[str, int]] = defaultdict(
+            lambda: defaultdict(int)
+        )
+        for entry in entries:
+            by_row[(entry.user_id, entry.business_date)][entry.entry_type] += int(
+                entry.amount
+            )
+        for (user_id, day), by_type in sorted(by_row.items()):
+            cls._apply(
+                user_id=user_id,
+                business_date=day,
+                deltas={"xp_total": sum(by_type.values())},
+                xp_by_entry_type=by_type,
+            )
+
+    @classmethod
+    def record_check_in(cls, *, record: AttendanceRecord) -> None:
+        cls._apply(
+            user_id=record.user_id,
+            business_date=record.work_date,
+            deltas={"attendance_days": 1},
+        )
+
+    @classmethod
+    def record_check_out(cls, *, record: AttendanceRecord) -> None:
+        cls._apply(
+            user_id=record.user_id,
+            business_date=record.work_date,
+            deltas={"attendance_minutes": cls._attendance_minutes(record)},
+        )
+
+    @classmethod
+    def totals_by_user(
+        cls, *, user_ids: Iterable[int], date_from: date, date_to: date
+    ) -> dict[int, dict[str, int]]:
+        rows = (
+            TechnicianDailyStats.objects.filter(
+                user_id__in=list(user_ids),
+                business_date__gte=date_from,
+                business_date__lte=date_to,
+            )
+            .values("user_id")
+            .annotate(**cls._counter_sums())
+            .order_by()
+        )
+        return {int(row["user_id"]): cls._counter_totals(row) for row in rows}
+
+    @classmethod
+    def totals_by_period(
+        cls,
+        *,
+        date_from: date,
+        date_to: date,
+        granularity: str = AnalyticsGranularity.DAY,
+        fields: Iterable[str] | None = None,
+    ) -> dict[date, dict[str, int]]:
+        """
+        Sum rollup counters per day, ISO week or calendar month in the database.
+
+        Keys are period start dates (Mondays or month firsts for coarser
+        granularities), so a year of monthly data comes back as a dozen rows.
+        """
+        counter_fields = tuple(fields or TechnicianDailyStats.COUNTER_FIELDS)
+        queryset = TechnicianDailyStats.objects.filter(
+            business_date__gte=date_from,
+            business_date__lte=date_to,
+        )
+        truncator = cls.PERIOD_TRUNCATORS.get(granularity)
+        if truncator is None:
+            queryset = queryset.annotate(period=F("business_date"))
+        else:
+            queryset = queryset.annotate(period=truncator("business_date"))
+        rows = (
+            queryset.values("period")
+            .annotate(**cls._counter_sums(counter_fields))
+            .order_by()
+        )
+        return {
+            cls._as_date(row["period"]): cls._counter_totals(row, counter_fields)
+            for row in rows
+        }
+
+    @classmethod
+    def build_missing(cls) -> dict[str, Any]:
+        """Build every unbuilt date of the trailing window, today included."""
+        date_to = cls.business_date()
+        date_from = date_to - timedelta(days=cls.BUILD_WINDOW_DAYS - 1)
+        return {
+            "date_from": date_from.isoformat(),
+            "date_to": date_to.isoformat(),
+            "rows": cls.ensure_built(date_from=date_from, date_to=date_to),
+        }
+
+    @classmethod
+    def ensure_built(cls, *, date_from: date, date_to: date) -> int:
+        """Build rollup rows for dates in range that have not been built yet."""
+        last_date = min(date_to, cls.business_date())
+        if date_from > last_date:
+            return 0
+        built_dates = set(
+            TechnicianDailyStatsDay.objects.filter(
+                business_date__gte=date_from,
+                business_date__lte=last_date,
+            ).values_list("business_date", flat=True)
+        )
+        missing_dates = {
+            date_from + timedelta(days=offset)
+            for offset in range((last_date - date_from).days + 1)
+        } - built_dates
+        if not missing_dates:
+            return 0
+        return cls._build(
+            date_from=min(missing_dates),
+            date_to=max(missing_dates),
+            only_dates=missing_dates,
+        )
+
+    @classmethod
+    def rebuild(
+        cls, *, date_from: date | None = None, date_to: date | None = None
+    ) -> dict[str, Any]:
+        """Recompute rollup rows from source tables, replacing built rows."""
+        resolved_date_to = min(date_to or cls.business_date(), cls.business_date())
+        resolved_date_from = date_from or (
+            resolved_date_to - timedelta(days=cls.NIGHTLY_REBUILD_DAYS - 1)
+        )
+        if resolved_date_from > resolved_date_to:
+            raise ValueError("date_from must be less than or equal to date_to.")
+        rows_written = cls._build(
+            date_from=resolved_date_from,
+            date_to=resolved_date_to,
+        )
+        return {
+            "date_from": resolved_date_from.isoformat(),
+            "date_to": resolved_date_to.isoformat(),
+            "rows": rows_written,
+        }
+
+    @classmethod
+    @transaction.atomic(savepoint=False)
+    def _apply(
+        cls,
+        *,
+        user_id: int,
+        business_date: date,
+        deltas: Mapping[str, int],
+        xp_by_entry_type: Mapping[str, int] | None = None,
+    ) -> None:
+        # Dates that were never built pick the event up from source tables
+        # when the build task reaches them.
+        cls._lock_dates([business_date], shared=True)
+        if not TechnicianDailyStatsDay.objects.filter(
+            business_date=business_date
+        ).exists():
+            return
+
+        row, _ = TechnicianDailyStats.objects.select_for_update().get_or_create(
+            user_id=user_id,
+            business_date=business_date,
+        )
+        for field, delta in deltas.items():
+            setattr(row, field, getattr(row, field) + int(delta))
+        if xp_by_entry_type:
+            by_type = dict(row.xp_by_entry_type or {})
+            for entry_type, amount in xp_by_entry_type.items():
+                by_type[entry_type] = int(by_type.get(entry_type, 0)) + int(amount)
+            row.xp_by_entry_type = by_type
+        row.save()
+
+    @classmethod
+    @transaction.atomic
+    def _build(
+        cls,
+        *,
+        date_from: date,
+        date_to: date,
+        only_dates: set[date] | None = None,
+    ) -> int:
+        target_dates = only_dates or {
+            date_from + timedelta(days=offset)
+            for offset in range((date_to - date_from).days + 1)
+        }
+        # Hooks of these dates either committed before the lock (and are in the
+        # source read below) or wait for the build and apply on top of it.
+        cls._lock_dates(target_dates, shared=False)
+        source_rows = cls._source_rows(date_from=date_from, date_to=date_to)
+
+        TechnicianDailyStats.objects.filter(business_date__in=target_dates).delete()
+        TechnicianDailyStats.objects.bulk_create(
+            [
+                TechnicianDailyStats(user_id=user_id, business_date=day, **values)
+                for (user_id, day), values in source_rows.items()
+                if day in target_dates
+            ],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+        TechnicianDailyStatsDay.objects.bulk_create(
+            [TechnicianDailyStatsDay(business_date=day) for day in target_dates],
+            ignore_conflicts=True,
+        )
+        TechnicianDailyStatsDay.objects.filter(business_date__in=target_dates).update(
+            updated_at=timezone.now()
+        )
+        return sum(1 for user_id, day in source_rows if day in target_dates)
+
+    @classmethod
+    def _lock_dates(cls, dates: Iterable[date], *, shared: bool) -> None:
+        # SQLite serialises writers on its own; Postgres needs the advisory lock.
+        if connection.vendor != "postgresql":
+            return
+        function = "pg_advisory_xact_lock_shared" if shared else "pg_advisory_xact_lock"
+        with connection.cursor() as cursor:
+            for day in sorted(dates):
+                cursor.execute(
+                    f"SELECT {function}(%s, %s)",
+                    [cls.ADVISORY_LOCK_NAMESPACE, day.toordinal()],
+                )
+
+    @classmethod
+    def _source_rows(
+        cls, *, date_from: date, date_to: date
+    ) -> dict[tuple[int, date], dict[str, Any]]:
+        start_dt, end_exclusive_dt, _ = business_date_range_bounds(
+            date_from=date_from, date_to=date_to, max_days=None
+        )
+        rows: dict[tuple[int, date], dict[str, Any]] = defaultdict(
+            lambda: {
+                **dict.fromkeys(TechnicianDailyStats.COUNTER_FIELDS, 0),
+                "xp_by_entry_type": {},
+            }
+        )
+
+        done_rows = (
+            Ticket.domain.filter(
+                technician_id__isnull=False,
+                status=TicketStatus.DONE,
+                finished_business_date__gte=date_from,
+                finished_business_date__lte=date_to,
+            )
+            .values("technician_id", "finished_business_date")
+            .annotate(
+                done=Count("id"),
+                rework=Count("id", filter=Q(qc_fail_count__gt=0)),
+                green=Count("id", filter=Q(flag_color=TicketColor.GREEN)),
+                yellow=Count("id", filter=Q(flag_color=TicketColor.YELLOW)),
+                red=Count("id", filter=Q(flag_color=TicketColor.RED)),
+            )
+            .order_by()
+        )
+        for row in done_rows:
+            values = rows[(int(row["technician_id"]), row["finished_business_date"])]
+            values["tickets_done"] = int(row["done"])
+            values["tickets_rework"] = int(row["rework"])
+            values["tickets_first_pass"] = int(row["done"]) - int(row["rework"])
+            values["tickets_flag_green"] = int(row["green"])
+            values["tickets_flag_yellow"] = int(row["yellow"])
+            values["tickets_flag_red"] = int(row["red"])
+
+        qc_event_rows = (
+            TicketTransition.objects.filter(
+                ticket__technician_id__isnull=False,
+                action__in=[
+                    TicketTransitionAction.QC_PASS,
+                    TicketTransitionAction.QC_FAIL,
+                ],
+                created_at__gte=start_dt,
+                created_at__lt=end_exclusive_dt,
+            )
+            .annotate(day=TruncDate("created_at", tzinfo=cls.BUSINESS_TZ))
+            .values("ticket__technician_id", "day", "action")
+            .annotate(total=Count("id"))
+            .order_by()
+        )
+        for row in qc_event_rows:
+            field = (
+                "qc_pass_events"
+                if row["action"] == TicketTransitionAction.QC_PASS
+                else "qc_fail_events"
+            )
+            rows[(int(row["ticket__technician_id"]), row["day"])][field] = int(
+                row["total"]
+            )
+
+        xp_rows = (
+            XPTransaction.objects.filter(
+                business_date__gte=date_from,
+                business_date__lte=date_to,
+            )
+            .values("user_id", "business_date", "entry_type")
+            .annotate(total=Sum("amount"))
+            .order_by()
+        )
+        for row in xp_rows:
+            values = rows[(int(row["user_id"]), row["business_date"])]
+            amount = int(row["total"] or 0)
+            values["xp_total"] += amount
+            values["xp_by_entry_type"][str(row["entry_type"])] = amount
+
+        attendance_records = AttendanceRecord.domain.filter(
+            work_date__gte=date_from,
+            work_date__lte=date_to,
+            check_in_at__isnull=False,
+        ).only("user_id", "work_date", "check_in_at", "check_out_at")
+        for record in attendance_records:
+            values = rows[(int(record.user_id), record.work_date)]
+            values["attendance_days"] += 1
+            values["attendance_minutes"] += cls._attendance_minutes(record)
+
+        return rows
+
+    @staticmethod
+    def _attendance_minutes(record: AttendanceRecord) -> int:
+        if not record.check_in_at or not record.check_out_at:
+            return 0
+        return max(
+            0, int((record.check_out_at - record.check_in_at).total_seconds() // 60)
+        )
+
+    @staticmethod
+    def _counter_sums(
+        fields: Iterable[str] = TechnicianDailyStats.COUNTER_FIELDS,
+    ) -> dict[str, Sum]:
+        return {f"sum_{field}": Sum(field) for field in fields}
+
+    @staticmethod
+    def _counter_totals(
+        row: Mapping[str, Any],
+        fields: Iterable[str] = TechnicianDailyStats.COUNTER_FIELDS,
+    ) -> dict[str, int]:
+        return {field: int(row[f"sum_{field}"] or 0) for field in fields}
+
+    @staticmethod
+    def _as_date(value: date | datetime) -> date:
+        return value.date() if isinstance(value, datetime) else value
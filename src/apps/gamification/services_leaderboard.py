@@ -0,0 +1,348 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from itertools import batched
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Exists, OuterRef, Q, Sum
+from django.db.models.functions import Coalesce
+
+from account.models import User
+from attendance.models import AttendanceRecord
+from core.utils.constants import (
+    RoleSlug,
+    TicketColor,
+    TicketStatus,
+    TicketTransitionAction,
+)
+from core.utils.swr_cache import invalidate_cache_tags
+from gamification.models import TechnicianScore
+from gamification.services_xp_balance import XPBalanceService
+from ticket.models import Ticket, TicketTransition
+
+
+class TechnicianScoreService:
+    """Keeps persisted leaderboard score components in step with scoring events."""
+
+    SCORE_WEIGHTS = {
+        "tickets_done": 120,
+        "xp_total": 1,
+        "first_pass_done": 40,
+        "green_flag_done": 20,
+        "yellow_flag_done": 10,
+        "red_flag_done_penalty": 8,
+        "attendance_day": 6,
+        "rework_done_penalty": 25,
+        "qc_fail_event_penalty": 12,
+    }
+    FLAG_COMPONENT_FIELDS = {
+        TicketColor.GREEN: "tickets_flag_green_total",
+        TicketColor.YELLOW: "tickets_flag_yellow_total",
+        TicketColor.RED: "tickets_flag_red_total",
+    }
+    PUBLIC_LEADERBOARD_CACHE_TAG = "gamification.public_leaderboard"
+    REBUILD_BATCH_SIZE = 500
+
+    @classmethod
+    def record_qc_pass(cls, *, ticket: Ticket, had_rework: bool) -> None:
+        if not ticket.technician_id:
+            return
+        deltas = {
+            "tickets_done_total": 1,
+            "resolution_minutes_total": int(ticket.total_duration or 0),
+            ("tickets_rework_total" if had_rework else "tickets_first_pass_total"): 1,
+        }
+        flag_field = cls.FLAG_COMPONENT_FIELDS.get(ticket.flag_color)
+        if flag_field:
+            deltas[flag_field] = 1
+        cls._apply(user_id=ticket.technician_id, deltas=deltas)
+
+    @classmethod
+    def record_qc_fail(cls, *, ticket: Ticket) -> None:
+        if not ticket.technician_id:
+            return
+        cls._apply(user_id=ticket.technician_id, deltas={"qc_fail_events_total": 1})
+
+    @classmethod
+    def record_xp(cls, *, user_id: int, amount: int) -> None:
+        cls._apply(user_id=user_id, deltas={"xp_total": int(amount)})
+
+    @classmethod
+    def record_check_in(cls, *, user_id: int) -> None:
+        cls._apply(user_id=user_id, deltas={"attendance_days_total": 1})
+
+    @staticmethod
+    def active_technicians():
+        return User.objects.filter(
+            deleted_at__isnull=True,
+            is_active=True,
+            roles__slug=RoleSlug.TECHNICIAN,
+            roles__deleted_at__isnull=True,
+        )
+
+    @classmethod
+    def seed_missing_active_technicians(
+        cls, *, user_ids: Iterable[int] | None = None
+    ) -> None:
+        technicians = cls.active_technicians().filter(technician_score__isnull=True)
+        if user_ids is not None:
+            technicians = technicians.filter(id__in=list(user_ids))
+        missing_ids = list(technicians.values_list("id", flat=True).distinct())
+        if missing_ids:
+            cls.rebuild(user_ids=missing_ids)
+
+    @classmethod
+    def sync_active_flags(cls, *, user_ids: Iterable[int]) -> int:
+        """Refresh ``is_active_technician`` on existing rows after role changes."""
+        updated = TechnicianScore.objects.filter(user_id__in=list(user_ids)).update(
+            is_active_technician=Exists(
+                cls.active_technicians().filter(id=OuterRef("user_id"))
+            )
+        )
+        if updated:
+            cls.invalidate_public_leaderboard()
+        return updated
+
+    @classmethod
+    def active_technician_scores(cls) -> list[TechnicianScore]:
+        """
+        Return score rows of active technicians.
+
+        Rows are seeded on role assignment and by the rebuild task, never here.
+        """
+        return list(cls._active_score_rows().select_related("user").order_by("user_id"))
+
+    @classmethod
+    def rank_position(
+        cls, *, user_id: int
+    ) -> tuple[TechnicianScore, dict[str, int]] | None:
+        """
+        Resolve one technician's leaderboard rank without loading other rows.
+
+        Rank counts active technicians ordered ahead on the leaderboard key, in
+        the same aggregate that returns the population size and score total.
+        The stored ``is_active_technician`` flag keeps that count on the
+        partial rank index, with no join to users or roles. Returns ``None``
+        when the user is not an active technician or has no score row yet.
+        """
+        active_rows = cls._active_score_rows()
+        row = active_rows.select_related("user").filter(user_id=user_id).first()
+        if row is None:
+            return None
+
+        totals = active_rows.aggregate(
+            total=Count("id"),
+            total_score=Coalesce(Sum("score"), 0),
+            ahead=Count("id", filter=cls._ranked_ahead_of(row)),
+        )
+        return row, {
+            "rank": int(totals["ahead"]) + 1,
+            "total": int(totals["total"]),
+            "total_score": int(totals["total_score"]),
+        }
+
+    @classmethod
+    def score_components(cls, row: TechnicianScore) -> dict[str, int]:
+        weights = cls.SCORE_WEIGHTS
+        return {
+            "tickets_done_points": row.tickets_done_total * weights["tickets_done"],
+            "xp_total_points": row.xp_total * weights["xp_total"],
+            "first_pass_points": (
+                row.tickets_first_pass_total * weights["first_pass_done"]
+            ),
+            "quality_points": (
+                row.tickets_flag_green_total * weights["green_flag_done"]
+                + row.tickets_flag_yellow_total * weights["yellow_flag_done"]
+                - row.tickets_flag_red_total * weights["red_flag_done_penalty"]
+            ),
+            "attendance_points": (
+                row.attendance_days_total * weights["attendance_day"]
+            ),
+            "rework_penalty_points": -(
+                row.tickets_rework_total * weights["rework_done_penalty"]
+                + row.qc_fail_events_total * weights["qc_fail_event_penalty"]
+            ),
+        }
+
+    @classmethod
+    def rebuild(cls, *, user_ids: Iterable[int] | None = None) -> dict[str, int]:
+        """
+        Recompute score rows from tickets, QC transitions, XP and attendance.
+
+        Without ``user_ids`` every existing row plus every technician is rebuilt.
+        Returns how many rows were checked and how many had drifted.
+        """
+        if user_ids is None:
+            target_ids = set(
+                TechnicianScore.objects.values_list("user_id", flat=True)
+            ) | set(
+                User.objects.filter(
+                    roles__slug=RoleSlug.TECHNICIAN,
+                    roles__deleted_at__isnull=True,
+                ).values_list("id", flat=True)
+            )
+        else:
+            target_ids = {int(user_id) for user_id in user_ids}
+
+        checked = 0
+        changed = 0
+        for batch in batched(sorted(target_ids), cls.REBUILD_BATCH_SIZE, strict=False):
+            with transaction.atomic():
+                changed += cls._rebuild_batch(user_ids=list(batch))
+            checked += len(batch)
+        if changed:
+            cls.invalidate_public_leaderboard()
+        return {"users": checked, "changed": changed}
+
+    @classmethod
+    def invalidate_public_leaderboard(cls) -> None:
+        transaction.on_commit(
+            lambda: invalidate_cache_tags(cls.PUBLIC_LEADERBOARD_CACHE_TAG)
+        )
+
+    @staticmethod
+    def _active_score_rows():
+        return TechnicianScore.objects.filter(is_active_technician=True)
+
+    @staticmethod
+    def _ranked_ahead_of(row: TechnicianScore) -> Q:
+        # Mirrors the leaderboard sort: higher score, done, first-pass and XP
+        # totals rank first; the lower user id wins a full tie.
+        ahead = Q(user_id__lt=row.user_id)
+        for field in (
+            "xp_total",
+            "tickets_first_pass_total",
+            "tickets_done_total",
+            "score",
+        ):
+            value = getattr(row, field)
+            ahead = Q(**{f"{field}__gt": value}) | (Q(**{field: value}) & ahead)
+        return ahead
+
+    @classmethod
+    def _apply(cls, *, user_id: int, deltas: Mapping[str, int]) -> None:
+        # Score is linear in its components, so it moves by the weighted delta.
+        deltas = {**deltas, "score": cls._score_delta(deltas)}
+        if not TechnicianScore.objects.apply_deltas(user_id=user_id, deltas=deltas):
+            # The first event of a user seeds the row from source data, which
+            # already includes the event being recorded.
+            try:
+                with transaction.atomic():
+                    cls._rebuild_batch(user_ids=[user_id])
+            except IntegrityError:
+                TechnicianScore.objects.apply_deltas(user_id=user_id, deltas=deltas)
+        cls.invalidate_public_leaderboard()
+
+    @classmethod
+    def _score_delta(cls, deltas: Mapping[str, int]) -> int:
+        weights = cls.SCORE_WEIGHTS
+        component_weights = {
+            "tickets_done_total": weights["tickets_done"],
+            "xp_total": weights["xp_total"],
+            "tickets_first_pass_total": weights["first_pass_done"],
+            "tickets_flag_green_total": weights["green_flag_done"],
+            "tickets_flag_yellow_total": weights["yellow_flag_done"],
+            "tickets_flag_red_total": -weights["red_flag_done_penalty"],
+            "attendance_days_total": weights["attendance_day"],
+            "tickets_rework_total": -weights["rework_done_penalty"],
+            "qc_fail_events_total": -weights["qc_fail_event_penalty"],
+        }
+        return sum(
+            int(delta) * component_weights.get(field, 0)
+            for field, delta in deltas.items()
+        )
+
+    @classmethod
+    def _rebuild_batch(cls, *, user_ids: list[int]) -> int:
+        expected = cls._source_components(user_ids=user_ids)
+        active_ids = set(
+            cls.active_technicians()
+            .filter(id__in=user_ids)
+            .values_list("id", flat=True)
+        )
+        existing = {
+            row.user_id: row
+            for row in TechnicianScore.objects.select_for_update().filter(
+                user_id__in=user_ids
+            )
+        }
+
+        changed = 0
+        for user_id in user_ids:
+            values = {
+                **expected[user_id],
+                "is_active_technician": user_id in active_ids,
+            }
+            row = existing.get(user_id) or TechnicianScore(user_id=user_id)
+            if row.pk and all(
+                getattr(row, field) == value for field, value in values.items()
+            ):
+                continue
+            for field, value in values.items():
+                setattr(row, field, value)
+            row.score = sum(cls.score_components(row).values())
+            row.save()
+            changed += 1
+        return changed
+
+    @classmethod
+    def _source_components(cls, *, user_ids: list[int]) -> dict[int, dict[str, int]]:
+        components: dict[int, dict[str, int]] = defaultdict(
+            lambda: dict.fromkeys(TechnicianScore.COMPONENT_FIELDS, 0)
+        )
+
+        done_rows = (
+            Ticket.domain.filter(
+                technician_id__in=user_ids,
+                status=TicketStatus.DONE,
+            )
+            .values("technician_id")
+            .annotate(
+                done=Count("id"),
+                rework=Count("id", filter=Q(qc_fail_count__gt=0)),
+                minutes=Coalesce(Sum("total_duration"), 0),
+                green=Count("id", filter=Q(flag_color=TicketColor.GREEN)),
+                yellow=Count("id", filter=Q(flag_color=TicketColor.YELLOW)),
+                red=Count("id", filter=Q(flag_color=TicketColor.RED)),
+            )
+            .order_by()
+        )
+        for row in done_rows:
+            values = components[int(row["technician_id"])]
+            values["tickets_done_total"] = int(row["done"])
+            values["tickets_rework_total"] = int(row["rework"])
+            values["tickets_first_pass_total"] = int(row["done"]) - int(row["rework"])
+            values["resolution_minutes_total"] = int(row["minutes"])
+            values["tickets_flag_green_total"] = int(row["green"])
+            values["tickets_flag_yellow_total"] = int(row["yellow"])
+            values["tickets_flag_red_total"] = int(row["red"])
+
+        qc_fail_counts = (
+            TicketTransition.objects.filter(
+                ticket__technician_id__in=user_ids,
+                action=TicketTransitionAction.QC_FAIL,
+            )
+            .values_list("ticket__technician_id")
+            .annotate(total=Count("id"))
+            .order_by()
+        )
+        for user_id, total in qc_fail_counts:
+            components[int(user_id)]["qc_fail_events_total"] = int(total)
+
+        for user_id, balance in XPBalanceService.balances(user_ids=user_ids).items():
+            components[user_id]["xp_total"] = balance.total
+
+        attendance_totals = (
+            AttendanceRecord.domain.filter(
+                user_id__in=user_ids,
+                check_in_at__isnull=False,
+            )
+            .values_list("user_id")
+            .annotate(total=Count("id"))
+            .order_by()
+        )
+        for user_id, total in attendance_totals:
+            components[int(user_id)]["attendance_days_total"] = int(total)
+
+        return {user_id: components[user_id] for user_id in user_ids}
@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+import base64
+import json
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import date, timedelta
+from itertools import batched
+from typing import Any
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+from account.models import User
+from core.utils.business_dates import business_date, business_day_start
+from core.utils.constants import RoleSlug
+from gamification.models import (
+    TechnicianDailyStats,
+    UserLevelHistoryEvent,
+    UserLevelStatus,
+    WeeklyLevelEvaluation,
+    XPTransaction,
+)
+from gamification.services_leaderboard import TechnicianScoreService
+from gamification.services_xp_balance import XPBalance, XPBalanceService
+
+
+class UserLevelStatusService:
+    """
+    Keeps the precomputed level-control row of each user in step with events.
+
+    XP appends move this-week and cumulative XP by the entry amount and roll a
+    row forward on the first entry of a new week; the first entry of a user,
+    weekly evaluations and manual level changes rebuild rows from source
+    tables. The overview filters, sorts and pages these rows in SQL instead of
+    recomputing every technician per load.
+    """
+
+    REBUILD_BATCH_SIZE = 500
+    MAX_PAGE_SIZE = 500
+    # Sort keys per ordering as (field, descending); user id breaks ties.
+    ORDERINGS: dict[str, tuple[tuple[str, bool], ...]] = {
+        "name": (
+            ("user__first_name", False),
+            ("last_name_key", False),
+            ("user__username", False),
+        ),
+        "level": (("level", False),),
+        "-level": (("level", True),),
+        "range_xp": (("range_xp", False),),
+        "-range_xp": (("range_xp", True),),
+        "cumulative_xp": (("cumulative_xp", False),),
+        "-cumulative_xp": (("cumulative_xp", True),),
+    }
+    DEFAULT_ORDERING = "name"
+
+    @staticmethod
+    def week_start(value: date | None = None) -> date:
+        day = value or business_date()
+        return day - timedelta(days=day.weekday())
+
+    @classmethod
+    def record_xp_entries(cls, entries: Iterable[XPTransaction]) -> None:
+        """Apply new XP entries as one row update per user and business week."""
+        amounts: dict[tuple[int, date], int] = defaultdict(int)
+        for entry in entries:
+            amounts[(entry.user_id, cls.week_start(entry.business_date))] += int(
+                entry.amount
+            )
+        for (user_id, week_start), amount in sorted(amounts.items()):
+            cls._record_xp(user_id=user_id, amount=amount, week_start=week_start)
+
+    @classmethod
+    def _record_xp(cls, *, user_id: int, amount: int, week_start: date) -> None:
+        if UserLevelStatus.objects.apply_xp(
+            user_id=user_id, amount=amount, week_start=week_start
+        ):
+            return
+        # A missing row is rebuilt from source data, which already includes
+        # the entries being recorded.
+        try:
+            with transaction.atomic():
+                cls._rebuild_batch(user_ids=[user_id])
+        except IntegrityError:
+            UserLevelStatus.objects.apply_xp(
+                user_id=user_id, amount=amount, week_start=week_start
+            )
+
+    @classmethod
+    def roll_over_week(cls) -> int:
+        """Move rows without XP this week to the current week; returns the count."""
+        return UserLevelStatus.objects.roll_over(week_start=cls.week_start())
+
+    @classmethod
+    def seed_missing_active_technicians(
+        cls, *, user_ids: Iterable[int] | None = None
+    ) -> None:
+        technicians = TechnicianScoreService.active_technicians().filter(
+            level_status__isnull=True
+        )
+        if user_ids is not None:
+            technicians = technicians.filter(id__in=list(user_ids))
+        missing_ids = list(technicians.values_list("id", flat=True).distinct())
+        if missing_ids:
+            cls.rebuild(user_ids=missing_ids)
+
+    @classmethod
+    def rebuild(cls, *, user_ids: Iterable[int] | None = None) -> dict[str, int]:
+        """
+        Recompute status rows from users, the XP ledger and level history.
+
+        Without ``user_ids`` every existing row plus every technician is rebuilt.
+        Returns how many rows were checked and how many had drifted.
+        """
+        if user_ids is None:
+            target_ids = set(
+                UserLevelStatus.objects.values_list("user_id", flat=True)
+            ) | set(
+                User.objects.filter(
+                    roles__slug=RoleSlug.TECHNICIAN,
+                    roles__deleted_at__isnull=True,
+                ).values_list("id", flat=True)
+            )
+        else:
+            target_ids = {int(user_id) for user_id in user_ids}
+
+        checked = 0
+        changed = 0
+        for batch in batched(sorted(target_ids), cls.REBUILD_BATCH_SIZE, strict=False):
+            with transaction.atomic():
+                changed += cls._rebuild_batch(user_ids=list(batch))
+            checked += len(batch)
+        return {"users": checked, "changed": changed}
+
+    @classmethod
+    def overview_page(
+        cls,
+        *,
+        date_from: date,
+        date_to: date,
+        range_target_xp: int,
+        level: int | None = None,
+        warning_active: bool | None = None,
+        meets_target: bool | None = None,
+        ordering: str = DEFAULT_ORDERING,
+        cursor: str | None = None,
+        limit: int | None = None,
+    ) -> tuple[list[UserLevelStatus], str | None, dict[str, int]]:
+        """
+        Return one sorted page of active technicians' status rows.
+
+        Range XP is summed from the daily rollup in the same statement, and
+        ``current_week_xp`` is zero for rows not yet rolled over to this week.
+        The summary counts every row matching the filters, not just this page.
+        Without ``limit`` all rows are returned and the next cursor is ``None``.
+        """
+        keys = cls.ORDERINGS.get(ordering)
+        if keys is None:
+            raise ValueError(f"ordering must be one of: {', '.join(cls.ORDERINGS)}.")
+        if limit is not None and not 1 <= limit <= cls.MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {cls.MAX_PAGE_SIZE}.")
+        after = cls._decode_cursor(cursor, ordering=ordering) if cursor else None
+
+        range_xp = (
+            TechnicianDailyStats.objects.filter(
+                user_id=OuterRef("user_id"),
+                business_date__gte=date_from,
+                business_date__lte=date_to,
+            )
+            .values("user_id")
+            .annotate(total=Sum("xp_total"))
+            .values("total")
+        )
+        rows = UserLevelStatus.objects.filter(
+            user_id__in=TechnicianScoreService.active_technicians().values("id")
+        ).annotate(
+            range_xp=Coalesce(Subquery(range_xp), 0),
+            current_week_xp=Case(
+                When(week_start=cls.week_start(), then="week_xp"), default=Value(0)
+            ),
+            last_name_key=Coalesce("user__last_name", Value("")),
+        )
+        met = Q(range_xp__gte=range_target_xp)
+        below = Q(range_xp__lt=range_target_xp)
+        if level is not None:
+            rows = rows.filter(level=level)
+        if warning_active is not None:
+            rows = rows.filter(warning_active=warning_active)
+        if meets_target is not None:
+            rows = rows.filter(met if meets_target else below)
+
+        # Aliases avoid clashing with the model's own warning_active field.
+        totals = rows.aggregate(
+            technicians_total=Count("id"),
+            met_target=Count("id", filter=met),
+            below_target=Count("id", filter=below),
+            warned=Count("id", filter=Q(warning_active=True)),
+            suggested_warning=Count("id", filter=below & Q(warning_active=False)),
+            suggested_reset_to_l1=Count("id", filter=below & Q(warning_active=True)),
+        )
+        summary = {
+            "technicians_total": totals["technicians_total"],
+            "met_target": totals["met_target"],
+            "below_target": totals["below_target"],
+            "warning_active": totals["warned"],
+            "suggested_warning": totals["suggested_warning"],
+            "suggested_reset_to_l1": totals["suggested_reset_to_l1"],
+        }
+
+        if after is not None:
+            rows = rows.filter(cls._after(keys, after))
+        rows = rows.select_related(
+            "user",
+            "latest_history_event__actor",
+            "latest_evaluation__evaluated_by",
+        ).order_by(
+            *(f"-{field}" if descending else field for field, descending in keys),
+            "user_id",
+        )
+        if limit is None:
+            return list(rows), None, summary
+        page = list(rows[: limit + 1])
+        next_cursor = None
+        if len(page) > limit:
+            page = page[:limit]
+            next_cursor = cls._encode_cursor(page[-1], ordering=ordering)
+        return page, next_cursor, summary
+
+    @classmethod
+    def _encode_cursor(cls, row: UserLevelStatus, *, ordering: str) -> str:
+        values = [
+            (
+                getattr(row.user, field.removeprefix("user__"))
+                if field.startswith("user__")
+                else getattr(row, field)
+            )
+            for field, _ in cls.ORDERINGS[ordering]
+        ]
+        raw = json.dumps([ordering, [*values, row.user_id]], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @classmethod
+    def _decode_cursor(cls, cursor: str, *, ordering: str) -> list[Any]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            decoded_ordering, values = json.loads(base64.urlsafe_b64decode(padded))
+        except (TypeError, ValueError):
+            raise ValueError("cursor is invalid.") from None
+        if decoded_ordering != ordering:
+            raise ValueError("cursor does not match ordering.")
+        if (
+            not isinstance(values, list)
+            or len(values) != len(cls.ORDERINGS[ordering]) + 1
+        ):
+            raise ValueError("cursor is invalid.")
+        return values
+
+    @staticmethod
+    def _after(keys: tuple[tuple[str, bool], ...], values: list[Any]) -> Q:
+        # Rows strictly after the cursor in (keys..., user_id) sort order.
+        after = Q(user_id__gt=values[-1])
+        for (field, descending), value in reversed(
+            list(zip(keys, values[:-1], strict=True))
+        ):
+            lookup = "lt" if descending else "gt"
+            after = Q(**{f"{field}__{lookup}": value}) | (Q(**{field: value}) & after)
+        return after
+
+    @classmethod
+    def _rebuild_batch(cls, *, user_ids: list[int]) -> int:
+        expected = cls._source_values(user_ids=user_ids)
+        existing = {
+            row.user_id: row
+            for row in UserLevelStatus.objects.select_for_update().filter(
+                user_id__in=user_ids
+            )
+        }
+
+        changed = 0
+        for user_id, values in expected.items():
+            row = existing.get(user_id) or UserLevelStatus(user_id=user_id)
+            if row.pk and all(
+                getattr(row, field) == value for field, value in values.items()
+            ):
+                continue
+            for field, value in values.items():
+                setattr(row, field, value)
+            row.save()
+            changed += 1
+        return changed
+
+    @classmethod
+    def _source_values(cls, *, user_ids: list[int]) -> dict[int, dict[str, Any]]:
+        week_start = cls.week_start()
+        latest_history = UserLevelHistoryEvent.objects.filter(
+            user_id=OuterRef("pk")
+        ).order_by("-created_at", "-id")
+        latest_evaluation = WeeklyLevelEvaluation.objects.filter(
+            user_id=OuterRef("pk")
+        ).order_by("-week_start", "-id")
+        users = (
+            User.all_objects.filter(id__in=user_ids)
+            .annotate(
+                history_id=Subquery(latest_history.values("id")[:1]),
+                history_warning=Subquery(
+                    latest_history.values("warning_active_after")[:1]
+                ),
+                evaluation_id=Subquery(latest_evaluation.values("id")[:1]),
+            )
+            .values_list(
+                "id", "level", "history_id", "history_warning", "evaluation_id"
+            )
+        )
+        balances = XPBalanceService.balances(user_ids=user_ids)
+        week_xp = dict(
+            XPTransaction.objects.filter(
+                user_id__in=user_ids,
+                created_at__gte=business_day_start(week_start),
+            )
+            .values_list("user_id")
+            .annotate(total=Sum("amount"))
+            .order_by()
+        )
+
+        values: dict[int, dict[str, Any]] = {}
+        fallback_evaluation_ids: dict[int, int] = {}
+        for user_id, level, history_id, history_warning, evaluation_id in users:
+            values[user_id] = {
+                "level": int(level),
+                "week_start": week_start,
+                "week_xp": int(week_xp.get(user_id) or 0),
+                "cumulative_xp": balances.get(user_id, XPBalance()).total,
+                "warning_active": bool(history_warning),
+                "latest_history_event_id": history_id,
+                "latest_evaluation_id": evaluation_id,
+            }
+            if history_id is None and evaluation_id is not None:
+                fallback_evaluation_ids[user_id] = evaluation_id
+        # Users evaluated before level history existed take the warning state
+        # from their latest evaluation instead.
+        evaluations = WeeklyLevelEvaluation.objects.in_bulk(
+            fallback_evaluation_ids.values()
+        )
+        for user_id, evaluation_id in fallback_evaluation_ids.items():
+            values[user_id]["warning_active"] = evaluations[
+                evaluation_id
+            ].warning_active_after
+        return values
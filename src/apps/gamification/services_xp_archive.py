@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from collections import Counter
+from datetime import date
+from typing import Any
+
+from django.db import transaction
+from django.db.models import Count, Max, Min, Sum
+
+from core.utils.business_dates import business_date, business_day_start
+from gamification.models import (
+    XPMonthlySummary,
+    XPMonthlySummaryMonth,
+    XPTransaction,
+)
+
+
+class XPArchiveService:
+    """
+    Monthly summary rows for closed periods of the append-only XP ledger.
+
+    Months are archived in order from the first ledger month, so every month
+    up to ``archived_through()`` is summarized. Full-history reads add the
+    summaries to ledger rows created after that month, which keeps totals
+    exact while the raw scan covers only the open period. Ledger rows are
+    kept as the audit trail.
+    """
+
+    @staticmethod
+    def month_start(value: date) -> date:
+        return value.replace(day=1)
+
+    @staticmethod
+    def next_month(value: date) -> date:
+        if value.month == 12:
+            return date(value.year + 1, 1, 1)
+        return date(value.year, value.month + 1, 1)
+
+    @staticmethod
+    def archived_through() -> date | None:
+        return XPMonthlySummaryMonth.objects.aggregate(month=Max("month"))["month"]
+
+    @classmethod
+    def archive_closed_months(cls) -> dict[str, Any]:
+        """Summarize every closed month after the last archived one."""
+        current_month = cls.month_start(business_date())
+        archived_through = cls.archived_through()
+        if archived_through is not None:
+            month = cls.next_month(archived_through)
+        else:
+            first_created_at = XPTransaction.objects.aggregate(first=Min("created_at"))[
+                "first"
+            ]
+            if first_created_at is None:
+                return {"months": 0, "rows": 0, "archived_through": None}
+            month = cls.month_start(business_date(first_created_at))
+
+        months = 0
+        rows = 0
+        while month < current_month:
+            with transaction.atomic():
+                rows += cls._archive_month(month)
+            months += 1
+            archived_through = month
+            month = cls.next_month(month)
+        return {
+            "months": months,
+            "rows": rows,
+            "archived_through": (
+                archived_through.isoformat() if archived_through else None
+            ),
+        }
+
+    @classmethod
+    def entry_type_totals(cls, *, user_id: int) -> dict[str, tuple[int, int]]:
+        """Return ``{entry_type: (amount_total, entry_count)}`` over all history."""
+        amounts: Counter[str] = Counter()
+        counts: Counter[str] = Counter()
+        tail = XPTransaction.objects.filter(user_id=user_id)
+
+        archived_through = cls.archived_through()
+        if archived_through is not None:
+            summaries = (
+                XPMonthlySummary.objects.filter(
+                    user_id=user_id, month__lte=archived_through
+                )
+                .values_list("entry_type")
+                .annotate(amount=Sum("amount_total"), count=Sum("entry_count"))
+                .order_by()
+            )
+            for entry_type, amount, count in summaries:
+                amounts[entry_type] += int(amount or 0)
+                counts[entry_type] += int(count or 0)
+            tail = tail.filter(
+                created_at__gte=business_day_start(cls.next_month(archived_through))
+            )
+
+        tail_rows = (
+            tail.values_list("entry_type")
+            .annotate(amount=Sum("amount"), count=Count("id"))
+            .order_by()
+        )
+        for entry_type, amount, count in tail_rows:
+            amounts[entry_type] += int(amount or 0)
+            counts[entry_type] += int(count)
+        return {
+            entry_type: (amounts[entry_type], counts[entry_type])
+            for entry_type in counts
+        }
+
+    @classmethod
+    def _archive_month(cls, month: date) -> int:
+        rows = (
+            XPTransaction.objects.filter(
+                created_at__gte=business_day_start(month),
+                created_at__lt=business_day_start(cls.next_month(month)),
+            )
+            .values_list("user_id", "entry_type")
+            .annotate(amount=Sum("amount"), count=Count("id"))
+            .order_by()
+        )
+        summaries = [
+            XPMonthlySummary(
+                month=month,
+                user_id=user_id,
+                entry_type=entry_type,
+                amount_total=int(amount or 0),
+                entry_count=int(count),
+            )
+            for user_id, entry_type, amount, count in rows
+        ]
+        XPMonthlySummary.objects.bulk_create(
+            summaries, batch_size=1000, ignore_conflicts=True
+        )
+        # Empty months get a marker too so coverage stays contiguous.
+        XPMonthlySummaryMonth.objects.bulk_create(
+            [XPMonthlySummaryMonth(month=month)], ignore_conflicts=True
+        )
+        return len(summaries)
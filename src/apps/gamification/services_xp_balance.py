@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from django.db import transaction
+from django.db.models import Count, Max, OuterRef, Subquery, Sum
+
+from account.models import User
+from core.utils.business_dates import business_date, business_day_start
+from gamification.models import XPBalanceSnapshot, XPTransaction
+
+
+@dataclass(frozen=True, slots=True)
+class XPBalance:
+    total: int = 0
+    tx_count: int = 0
+
+
+class XPBalanceService:
+    """
+    Cumulative XP as the latest balance snapshot plus the recent tail.
+
+    Each snapshot run writes rows only for users with transactions since the
+    previous run cutoff, so nobody has XP between their own latest snapshot and
+    that cutoff. Reads therefore add one grouped ``SUM`` over transactions
+    created after the newest cutoff, and cost follows recent activity instead of
+    the full ledger history. Relies on ``created_at`` being the insert time.
+    """
+
+    @classmethod
+    def balances(
+        cls, *, user_ids: Iterable[int], as_of: datetime | None = None
+    ) -> dict[int, XPBalance]:
+        """Return balances of transactions created before ``as_of`` (default: all)."""
+        ids = sorted({int(user_id) for user_id in user_ids})
+        if not ids:
+            return {}
+
+        tail_filters: dict[str, Any] = {}
+        if as_of is not None:
+            tail_filters["created_at__lt"] = as_of
+        balances: dict[int, XPBalance] = {}
+        cutoff = cls.latest_cutoff(as_of=as_of)
+        if cutoff is not None:
+            balances.update(cls._snapshot_balances(user_ids=ids, cutoff=cutoff))
+            tail_filters["created_at__gte"] = cutoff
+
+        tail_rows = (
+            XPTransaction.objects.filter(user_id__in=ids, **tail_filters)
+            .values_list("user_id")
+            .annotate(total=Sum("amount"), tx_count=Count("id"))
+            .order_by()
+        )
+        for user_id, total, tx_count in tail_rows:
+            base = balances.get(user_id, XPBalance())
+            balances[user_id] = XPBalance(
+                total=base.total + int(total or 0),
+                tx_count=base.tx_count + int(tx_count),
+            )
+        return balances
+
+    @classmethod
+    def balance_for_user(
+        cls, *, user_id: int, as_of: datetime | None = None
+    ) -> XPBalance:
+        return cls.balances(user_ids=[user_id], as_of=as_of).get(
+            int(user_id), XPBalance()
+        )
+
+    @staticmethod
+    def latest_cutoff(*, as_of: datetime | None = None) -> datetime | None:
+        snapshots = XPBalanceSnapshot.objects.all()
+        if as_of is not None:
+            snapshots = snapshots.filter(as_of__lte=as_of)
+        return snapshots.aggregate(cutoff=Max("as_of"))["cutoff"]
+
+    @classmethod
+    def capture(cls, *, snapshot_date: date | None = None) -> dict[str, Any]:
+        """
+        Snapshot balances as of the end of a closed business day.
+
+        Defaults to yesterday. Re-running a captured day is a no-op.
+        """
+        today = business_date()
+        target_date = snapshot_date or today - timedelta(days=1)
+        if target_date >= today:
+            raise ValueError("snapshot_date must be before the current business date.")
+        as_of = business_day_start(target_date + timedelta(days=1))
+
+        with transaction.atomic():
+            previous_cutoff = cls.latest_cutoff(as_of=as_of)
+            if previous_cutoff == as_of:
+                return {"business_date": target_date.isoformat(), "users": 0}
+
+            tail_filters: dict[str, Any] = {"created_at__lt": as_of}
+            if previous_cutoff is not None:
+                tail_filters["created_at__gte"] = previous_cutoff
+            active_user_ids = list(
+                XPTransaction.objects.filter(**tail_filters)
+                .values_list("user_id", flat=True)
+                .distinct()
+            )
+            balances = cls.balances(user_ids=active_user_ids, as_of=as_of)
+            XPBalanceSnapshot.objects.bulk_create(
+                [
+                    XPBalanceSnapshot(
+                        user_id=user_id,
+                        business_date=target_date,
+                        as_of=as_of,
+                        balance=balance.total,
+                        tx_count=balance.tx_count,
+                    )
+                    for user_id, balance in sorted(balances.items())
+                ],
+                batch_size=1000,
+                ignore_conflicts=True,
+            )
+        return {"business_date": target_date.isoformat(), "users": len(balances)}
+
+    @staticmethod
+    def _snapshot_balances(
+        *, user_ids: list[int], cutoff: datetime
+    ) -> dict[int, XPBalance]:
+        # One index seek on (user, -as_of) per user instead of scanning history.
+        latest = XPBalanceSnapshot.objects.filter(
+            user_id=OuterRef("pk"), as_of__lte=cutoff
+        ).order_by("-as_of")
+        rows = (
+            User.all_objects.filter(id__in=user_ids)
+            .annotate(
+                snapshot_balance=Subquery(latest.values("balance")[:1]),
+                snapshot_tx_count=Subquery(latest.values("tx_count")[:1]),
+            )
+            .filter(snapshot_balance__isnull=False)
+            .values_list("id", "snapshot_balance", "snapshot_tx_count")
+        )
+        return {
+            int(user_id): XPBalance(total=int(balance), tx_count=int(tx_count))
+            for user_id, balance, tx_count in rows
+        }
@@ -3,8 +3,43 @@ from __future__ import annotations
 from celery import shared_task
 
 from gamification.services import ProgressionService
+from gamification.services_daily_stats import TechnicianDailyStatsService
+from gamification.services_leaderboard import TechnicianScoreService
+from gamification.services_level_status import UserLevelStatusService
+from gamification.services_xp_archive import XPArchiveService
+from gamification.services_xp_balance import XPBalanceService
 
 
 @shared_task(name="gamification.tasks.run_weekly_level_evaluation")
 def run_weekly_level_evaluation() -> dict[str, int | str]:
     return ProgressionService.run_weekly_level_evaluation()
+
+
+@shared_task(name="gamification.tasks.rebuild_technician_scores")
+def rebuild_technician_scores() -> dict[str, int]:
+    return TechnicianScoreService.rebuild()
+
+
+@shared_task(name="gamification.tasks.rebuild_user_level_statuses")
+def rebuild_user_level_statuses() -> dict[str, int]:
+    return UserLevelStatusService.rebuild()
+
+
+@shared_task(name="gamification.tasks.rebuild_technician_daily_stats")
+def rebuild_technician_daily_stats() -> dict[str, int | str]:
+    return TechnicianDailyStatsService.rebuild()
+
+
+@shared_task(name="gamification.tasks.build_technician_daily_stats")
+def build_technician_daily_stats() -> dict[str, int | str]:
+    return TechnicianDailyStatsService.build_missing()
+
+
+@shared_task(name="gamification.tasks.capture_xp_balance_snapshots")
+def capture_xp_balance_snapshots() -> dict[str, int | str]:
+    return XPBalanceService.capture()
+
+
+@shared_task(name="gamification.tasks.archive_xp_ledger_months")
+def archive_xp_ledger_months() -> dict[str, int | str | None]:
+    return XPArchiveService.archive_closed_months()
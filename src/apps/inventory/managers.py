@@ -2,7 +2,8 @@ from __future__ import annotations
 
 import difflib
 
-from django.db import IntegrityError, models, transaction
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models import F
 
 from core.utils.constants import InventoryItemStatus, TicketStatus
 
@@ -190,3 +191,52 @@ class InventoryItemDomainManager(models.Manager.from_queryset(InventoryItemQuery
             if len(suggestions) >= limit:
                 break
         return suggestions
+
+
+class FleetSnapshotCounterDomainManager(models.Manager):
+    ADVISORY_LOCK_KEY = (8005, 0)
+
+    def values_by_key(self) -> dict[str, int]:
+        return {key: int(value) for key, value in self.values_list("key", "value")}
+
+    @transaction.atomic(savepoint=False)
+    def apply_deltas(self, deltas: dict[str, int]) -> None:
+        self._lock_counters(shared=True)
+        # Sorted keys keep row-lock order stable across concurrent writers.
+        for key in sorted(deltas):
+            delta = int(deltas[key])
+            if not delta:
+                continue
+            if self.filter(key=key).update(value=F("value") + delta):
+                continue
+            try:
+                with transaction.atomic():
+                    self.create(key=key, value=delta)
+            except IntegrityError:
+                self.filter(key=key).update(value=F("value") + delta)
+
+    def lock_all(self) -> dict[str, int]:
+        """Wait for in-flight deltas, then lock every counter row for a recount."""
+        self._lock_counters(shared=False)
+        return {
+            key: int(value)
+            for key, value in self.select_for_update()
+            .order_by("key")
+            .values_list("key", "value")
+        }
+
+    def _lock_counters(self, *, shared: bool) -> None:
+        # Writers hold the lock shared from their delta until they commit; the
+        # reconcile takes it exclusively, so its recount and overwrite run
+        # between writers and no counter key is inserted meanwhile.
+        # SQLite serialises writers on its own; Postgres needs the advisory lock.
+        if connection.vendor != "postgresql":
+            return
+        function = "pg_advisory_xact_lock_shared" if shared else "pg_advisory_xact_lock"
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT {function}(%s, %s)", list(self.ADVISORY_LOCK_KEY))
+
+    def replace_values(self, values: dict[str, int]) -> None:
+        self.exclude(key__in=list(values)).update(value=0)
+        for key in sorted(values):
+            self.update_or_create(key=key, defaults={"value": int(values[key])})
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.11 on 2026-10-16 19:37
+
+import django.db.models.manager
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0004_inventoryitempart_category"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FleetSnapshotCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, db_index=True, verbose_name="Created At"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, db_index=True, verbose_name="Updated At"
+                    ),
+                ),
+                ("key", models.CharField(max_length=64, unique=True)),
+                ("value", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "abstract": False,
+            },
+            managers=[
+                ("domain", django.db.models.manager.Manager()),
+            ],
+        ),
+    ]
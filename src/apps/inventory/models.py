@@ -1,7 +1,14 @@
-from django.db import models
+from abc import ABCMeta, abstractmethod
+from collections.abc import Mapping
+from datetime import timedelta
+from typing import Any
+
+from django.db import models, transaction
+from django.db.models.base import ModelBase
 
 from core.models import SoftDeleteModel, TimestampedModel
-from core.utils.constants import InventoryItemStatus
+from core.utils.constants import InventoryItemStatus, LiveEventTopic
+from core.utils.live_events import publish_live_event
 from inventory import managers
 
 
@@ -78,7 +85,129 @@ class InventoryItemPart(TimestampedModel, SoftDeleteModel):
         return self.name
 
 
-class InventoryItem(TimestampedModel, SoftDeleteModel):
+class FleetSnapshotCounter(TimestampedModel):
+    """One named fleet counter, maintained as deltas by tracked model saves."""
+
+    domain = managers.FleetSnapshotCounterDomainManager()
+
+    key = models.CharField(max_length=64, unique=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"{self.key}={self.value}"
+
+
+class FleetCounterTrackedModelBase(ABCMeta, ModelBase):
+    """Model metaclass that also enforces ``abc.abstractmethod``."""
+
+
+class FleetCounterTrackedModel(models.Model, metaclass=FleetCounterTrackedModelBase):
+    """
+    Applies fleet counter deltas in the same transaction as the row write.
+
+    Subclasses list the fields their contribution depends on and map a row's
+    values to counter increments, so counters commit or roll back together
+    with the workflow write. Queryset ``update()``/hard deletes bypass
+    ``save()``; the periodic reconciliation job repairs that drift.
+    """
+
+    FLEET_COUNTER_FIELDS: tuple[str, ...] = ()
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    @abstractmethod
+    def fleet_counter_contribution(cls, values: Mapping[str, Any]) -> dict[str, int]:
+        """Map one row's ``FLEET_COUNTER_FIELDS`` values to counter increments."""
+
+    @classmethod
+    @abstractmethod
+    def fleet_counter_totals(cls, queryset: models.QuerySet) -> dict[str, int]:
+        """Aggregate the same counters over ``queryset`` in a single query."""
+
+    @staticmethod
+    def _aggregate_fleet_counters(
+        queryset: models.QuerySet, aggregates: Mapping[str, models.Aggregate]
+    ) -> dict[str, int]:
+        # Counter keys contain dots, so aggregate under positional aliases.
+        aliases = {f"counter_{index}": key for index, key in enumerate(aggregates)}
+        row = queryset.order_by().aggregate(
+            **{alias: aggregates[key] for alias, key in aliases.items()}
+        )
+        totals: dict[str, int] = {}
+        for alias, key in aliases.items():
+            value = row[alias]
+            if isinstance(value, timedelta):
+                value = int(value.total_seconds())
+            if value:
+                totals[key] = int(value)
+        return totals
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_fleet_counters()
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._remember_fleet_counters()
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and not set(update_fields) & set(
+            self.FLEET_COUNTER_FIELDS
+        ):
+            super().save(*args, **kwargs)
+            return
+
+        with transaction.atomic():
+            before = self._fleet_counters_before_save()
+            super().save(*args, **kwargs)
+            after = self.fleet_counter_contribution(self._fleet_counter_values())
+            changed = {
+                key: after.get(key, 0) - before.get(key, 0)
+                for key in set(before) | set(after)
+                if after.get(key, 0) != before.get(key, 0)
+            }
+            if changed:
+                FleetSnapshotCounter.domain.apply_deltas(changed)
+                publish_live_event(
+                    topic=LiveEventTopic.FLEET,
+                    event_type="fleet.counters",
+                    data={"deltas": changed},
+                )
+        self._fleet_counters = after
+
+    def _fleet_counter_values(self) -> dict[str, Any]:
+        return {field: getattr(self, field) for field in self.FLEET_COUNTER_FIELDS}
+
+    def _remember_fleet_counters(self) -> None:
+        deferred = self.get_deferred_fields()
+        if deferred & set(self.FLEET_COUNTER_FIELDS):
+            self._fleet_counters = None
+            return
+        self._fleet_counters = self.fleet_counter_contribution(
+            self._fleet_counter_values()
+        )
+
+    def _fleet_counters_before_save(self) -> dict[str, int]:
+        if self._state.adding:
+            return {}
+        remembered = getattr(self, "_fleet_counters", None)
+        if remembered is not None:
+            return remembered
+        stored = (
+            type(self)
+            .all_objects.filter(pk=self.pk)
+            .values(*self.FLEET_COUNTER_FIELDS)
+            .first()
+        )
+        return self.fleet_counter_contribution(stored) if stored else {}
+
+
+class InventoryItem(FleetCounterTrackedModel, TimestampedModel, SoftDeleteModel):
     domain = managers.InventoryItemDomainManager()
 
     inventory = models.ForeignKey(
@@ -113,6 +242,42 @@ class InventoryItem(TimestampedModel, SoftDeleteModel):
             ),
         ]
 
+    FLEET_COUNTER_FIELDS = ("status", "is_active", "deleted_at")
+
+    @classmethod
+    def fleet_counter_contribution(cls, values: Mapping[str, Any]) -> dict[str, int]:
+        if values.get("deleted_at") is not None:
+            return {}
+        status = values["status"]
+        counters = {"inventory.total": 1, f"inventory.status.{status}": 1}
+        if values["is_active"] and status != InventoryItemStatus.WRITE_OFF:
+            counters["inventory.active"] = 1
+            if status == InventoryItemStatus.READY:
+                counters["inventory.active_ready"] = 1
+        return counters
+
+    @classmethod
+    def fleet_counter_totals(cls, queryset: models.QuerySet) -> dict[str, int]:
+        active = models.Q(is_active=True) & ~models.Q(
+            status=InventoryItemStatus.WRITE_OFF
+        )
+        return cls._aggregate_fleet_counters(
+            queryset,
+            {
+                "inventory.total": models.Count("id"),
+                **{
+                    f"inventory.status.{status}": models.Count(
+                        "id", filter=models.Q(status=status)
+                    )
+                    for status in InventoryItemStatus.values
+                },
+                "inventory.active": models.Count("id", filter=active),
+                "inventory.active_ready": models.Count(
+                    "id", filter=active & models.Q(status=InventoryItemStatus.READY)
+                ),
+            },
+        )
+
     def mark_in_service(self) -> None:
         if self.status == InventoryItemStatus.IN_SERVICE:
             return
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from core.utils.constants import EmployeeLevel
+
+DEFAULT_RULES_TIMEZONE = "Asia/Tashkent"
+DEFAULT_LEVEL_THRESHOLDS = {
+    int(EmployeeLevel.L1): 0,
+    int(EmployeeLevel.L2): 200,
+    int(EmployeeLevel.L3): 450,
+    int(EmployeeLevel.L4): 750,
+    int(EmployeeLevel.L5): 1100,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class TicketXpRules:
+    base_divisor: int
+    first_pass_bonus: int
+    qc_status_update_xp: int
+    flag_green_max_minutes: int
+    flag_yellow_max_minutes: int
+
+
+@dataclass(frozen=True, slots=True)
+class AttendanceRules:
+    on_time_xp: int
+    grace_xp: int
+    late_xp: int
+    on_time_cutoff_minutes: int
+    grace_cutoff_minutes: int
+    timezone: ZoneInfo
+
+
+@dataclass(frozen=True, slots=True)
+class WorkSessionRules:
+    daily_pause_limit_seconds: int
+    timezone: ZoneInfo
+
+
+@dataclass(frozen=True, slots=True)
+class ProgressionRules:
+    level_thresholds: Mapping[int, int]
+    weekly_coupon_amount: int
+    weekly_target_xp: int
+
+
+def _section(config: Mapping[str, Any], name: str) -> Mapping[str, Any]:
+    value = config.get(name)
+    return value if isinstance(value, Mapping) else {}
+
+
+def _int_or_default(value: Any, default: int) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _resolve_timezone(value: Any) -> ZoneInfo:
+    try:
+        return ZoneInfo(str(value or DEFAULT_RULES_TIMEZONE))
+    except Exception:
+        return ZoneInfo(DEFAULT_RULES_TIMEZONE)
+
+
+def _cutoff_minutes(value: Any) -> int | None:
+    try:
+        hours, minutes = str(value).split(":")
+        return int(hours) * 60 + int(minutes)
+    except (ValueError, TypeError):
+        return None
+
+
+def compile_ticket_xp_rules(config: Mapping[str, Any]) -> TicketXpRules:
+    rules = _section(config, "ticket_xp")
+    base_divisor = int(rules.get("base_divisor", 20) or 20)
+    if base_divisor <= 0:
+        base_divisor = 20
+    first_pass_bonus = max(int(rules.get("first_pass_bonus", 1) or 0), 0)
+    qc_status_update_xp = max(int(rules.get("qc_status_update_xp", 1) or 0), 0)
+    flag_green_max_minutes = int(rules.get("flag_green_max_minutes", 30) or 30)
+    if flag_green_max_minutes < 0:
+        flag_green_max_minutes = 30
+    flag_yellow_max_minutes = int(rules.get("flag_yellow_max_minutes", 60) or 60)
+    if flag_yellow_max_minutes < flag_green_max_minutes:
+        flag_yellow_max_minutes = max(flag_green_max_minutes, 60)
+    return TicketXpRules(
+        base_divisor=base_divisor,
+        first_pass_bonus=first_pass_bonus,
+        qc_status_update_xp=qc_status_update_xp,
+        flag_green_max_minutes=flag_green_max_minutes,
+        flag_yellow_max_minutes=flag_yellow_max_minutes,
+    )
+
+
+def compile_attendance_rules(config: Mapping[str, Any]) -> AttendanceRules:
+    rules = _section(config, "attendance")
+    on_time_minutes = _cutoff_minutes(rules.get("on_time_cutoff", "10:00"))
+    grace_minutes = _cutoff_minutes(rules.get("grace_cutoff", "10:20"))
+    if on_time_minutes is None or grace_minutes is None:
+        on_time_minutes = 10 * 60
+        grace_minutes = 10 * 60 + 20
+    return AttendanceRules(
+        on_time_xp=int(rules.get("on_time_xp", 2) or 0),
+        grace_xp=int(rules.get("grace_xp", 0) or 0),
+        late_xp=int(rules.get("late_xp", -1) or 0),
+        on_time_cutoff_minutes=on_time_minutes,
+        grace_cutoff_minutes=grace_minutes,
+        timezone=_resolve_timezone(rules.get("timezone")),
+    )
+
+
+def compile_work_session_rules(config: Mapping[str, Any]) -> WorkSessionRules:
+    rules = _section(config, "work_session")
+    limit_minutes = max(
+        _int_or_default(rules.get("daily_pause_limit_minutes", 30), 30), 0
+    )
+    return WorkSessionRules(
+        daily_pause_limit_seconds=limit_minutes * 60,
+        timezone=_resolve_timezone(rules.get("timezone")),
+    )
+
+
+def compile_progression_rules(config: Mapping[str, Any]) -> ProgressionRules:
+    rules = _section(config, "progression")
+    thresholds_raw = rules.get("level_thresholds", {})
+    normalized_thresholds: dict[int, int] = {}
+    last_threshold = 0
+    for level in EmployeeLevel.values:
+        level_int = int(level)
+        raw_threshold = None
+        if isinstance(thresholds_raw, Mapping):
+            raw_threshold = thresholds_raw.get(
+                str(level_int), thresholds_raw.get(level_int)
+            )
+        parsed_threshold = max(
+            0, _int_or_default(raw_threshold, DEFAULT_LEVEL_THRESHOLDS[level_int])
+        )
+        if level_int == int(EmployeeLevel.L1):
+            parsed_threshold = 0
+        if parsed_threshold < last_threshold:
+            parsed_threshold = last_threshold
+        normalized_thresholds[level_int] = parsed_threshold
+        last_threshold = parsed_threshold
+
+    return ProgressionRules(
+        level_thresholds=MappingProxyType(normalized_thresholds),
+        weekly_coupon_amount=max(
+            0, _int_or_default(rules.get("weekly_coupon_amount", 100_000), 100_000)
+        ),
+        weekly_target_xp=max(
+            0, _int_or_default(rules.get("weekly_target_xp", 100), 100)
+        ),
+    )
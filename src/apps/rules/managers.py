@@ -60,6 +60,13 @@ class RulesConfigVersionDomainManager(
 
 
 class RulesConfigStateDomainManager(models.Manager):
+    def get_singleton(self):
+        return (
+            self.get_queryset()
+            .select_related("active_version", "active_version__created_by")
+            .first()
+        )
+
     def get_singleton_for_update(self):
         return (
             self.get_queryset()
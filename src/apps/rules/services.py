@@ -3,6 +3,7 @@ from __future__ import annotations
 import copy
 import hashlib
 import json
+import threading
 import uuid
 from collections.abc import Mapping
 from typing import Any
@@ -12,13 +13,21 @@ from django.db import transaction
 
 from core.api.exceptions import DomainValidationError
 from core.utils.constants import EmployeeLevel
+from core.utils.request_scope import RULES_SNAPSHOT, scoped_discard, scoped_memoize
 from rules.models import RulesConfigAction, RulesConfigState, RulesConfigVersion
+from rules.snapshot import RulesSnapshot
 
 
 class RulesService:
     """Central rules registry with validation, versioning, rollback, and caching."""
 
     RULES_CONFIG_CACHE_PREFIX = "rules:active-config:"
+    RULES_ACTIVE_POINTER_CACHE_KEY = "rules:active-pointer"
+
+    # Process-local snapshot of the active version. Workers compare its cache key
+    # against the shared pointer, so rules activations propagate without DB reads.
+    _local_snapshot: RulesSnapshot | None = None
+    _local_snapshot_lock = threading.Lock()
 
     @staticmethod
     def default_rules_config() -> dict[str, Any]:
@@ -91,6 +100,61 @@ class RulesService:
     def _invalidate_cached_active_config(cls, *, state_cache_key: str) -> None:
         cache.delete(cls._cache_storage_key(state_cache_key))
 
+    @classmethod
+    def _read_active_pointer(cls) -> dict[str, Any] | None:
+        pointer = cache.get(cls.RULES_ACTIVE_POINTER_CACHE_KEY)
+        if isinstance(pointer, dict) and pointer.get("cache_key"):
+            return pointer
+        return None
+
+    @classmethod
+    def _publish_active_snapshot(
+        cls,
+        *,
+        state_cache_key: str,
+        version: int,
+        config_payload: dict[str, Any],
+        replace_pointer: bool = True,
+    ) -> RulesSnapshot:
+        """
+        Build the snapshot and publish it to the shared cache once committed.
+
+        Activations replace the pointer. Bootstrap and read paths only add it
+        when it is missing, so a reader holding an older committed state can
+        never move the pointer back over a newer activation.
+        """
+        snapshot = RulesSnapshot.build(
+            version=version,
+            cache_key=state_cache_key,
+            config=config_payload,
+        )
+
+        def _publish() -> None:
+            cls._set_cached_active_config(
+                state_cache_key=state_cache_key,
+                config_payload=config_payload,
+            )
+            pointer = {"cache_key": state_cache_key, "version": int(version)}
+            if replace_pointer:
+                cache.set(cls.RULES_ACTIVE_POINTER_CACHE_KEY, pointer, timeout=None)
+            elif not cache.add(
+                cls.RULES_ACTIVE_POINTER_CACHE_KEY, pointer, timeout=None
+            ):
+                current = cls._read_active_pointer()
+                if current is None or current["cache_key"] != state_cache_key:
+                    return
+            cls._local_snapshot = snapshot
+            scoped_discard(RULES_SNAPSHOT)
+
+        # Rolled-back activations must never reach other workers.
+        transaction.on_commit(_publish)
+        return snapshot
+
+    @classmethod
+    def reset_local_snapshot(cls) -> None:
+        cls._local_snapshot = None
+        scoped_discard(RULES_SNAPSHOT)
+
     @classmethod
     def validate_and_normalize_rules_config(cls, raw_config: Any) -> dict[str, Any]:
         if not isinstance(raw_config, dict):
@@ -203,14 +267,20 @@ class RulesService:
             "level_thresholds", default_progression["level_thresholds"]
         )
         if not isinstance(thresholds_raw, dict):
-            raise DomainValidationError("progression.level_thresholds must be an object.")
+            raise DomainValidationError(
+                "progression.level_thresholds must be an object."
+            )
 
         normalized_thresholds: dict[str, int] = {}
         last_threshold = 0
         for level in EmployeeLevel.values:
             level_int = int(level)
-            default_threshold = int(default_progression["level_thresholds"][str(level_int)])
-            raw_threshold = thresholds_raw.get(str(level_int), thresholds_raw.get(level_int))
+            default_threshold = int(
+                default_progression["level_thresholds"][str(level_int)]
+            )
+            raw_threshold = thresholds_raw.get(
+                str(level_int), thresholds_raw.get(level_int)
+            )
             if raw_threshold is None:
                 parsed_threshold = default_threshold
             else:
@@ -239,7 +309,9 @@ class RulesService:
             field="progression.weekly_coupon_amount",
         )
         weekly_target_xp = cls._require_int(
-            progression.get("weekly_target_xp", default_progression["weekly_target_xp"]),
+            progression.get(
+                "weekly_target_xp", default_progression["weekly_target_xp"]
+            ),
             field="progression.weekly_target_xp",
         )
 
@@ -311,31 +383,80 @@ class RulesService:
             active_version=version,
             cache_key=uuid.uuid4().hex,
         )
-        cls._set_cached_active_config(
+        cls._publish_active_snapshot(
             state_cache_key=state.cache_key,
+            version=version.version,
             config_payload=version.config,
+            replace_pointer=False,
         )
         return state
 
     @classmethod
     def get_active_rules_state(cls) -> RulesConfigState:
+        state = RulesConfigState.domain.get_singleton()
+        if state:
+            return state
         with transaction.atomic():
             state = cls.ensure_rules_state()
         return RulesConfigState.domain.get_with_related(state_id=state.pk)
 
     @classmethod
-    def get_active_rules_config(cls) -> dict[str, Any]:
-        state = cls.get_active_rules_state()
-        cached = cache.get(cls._cache_storage_key(state.cache_key))
-        if isinstance(cached, dict):
-            return copy.deepcopy(cached)
+    def get_active_rules_snapshot(cls) -> RulesSnapshot:
+        """
+        Return the active rules as an immutable snapshot.
 
-        active_config = copy.deepcopy(state.active_version.config)
-        cls._set_cached_active_config(
-            state_cache_key=state.cache_key,
-            config_payload=active_config,
-        )
-        return copy.deepcopy(active_config)
+        The hot path is one cache read of the shared active pointer; the DB is
+        touched only when no worker has published the active version yet.
+        Within a request/update scope the pointer is read once, so every rules
+        consumer of one unit of work sees the same version.
+        """
+        return scoped_memoize(RULES_SNAPSHOT, None, cls._resolve_active_snapshot)
+
+    @classmethod
+    def _resolve_active_snapshot(cls) -> RulesSnapshot:
+        pointer = cls._read_active_pointer()
+        snapshot = cls._local_snapshot
+        if (
+            snapshot is not None
+            and pointer is not None
+            and pointer["cache_key"] == snapshot.cache_key
+        ):
+            return snapshot
+        return cls._reload_local_snapshot(pointer=pointer)
+
+    @classmethod
+    def _reload_local_snapshot(cls, *, pointer: dict[str, Any] | None) -> RulesSnapshot:
+        with cls._local_snapshot_lock:
+            snapshot = cls._local_snapshot
+            if (
+                snapshot is not None
+                and pointer is not None
+                and pointer["cache_key"] == snapshot.cache_key
+            ):
+                return snapshot
+
+            if pointer is not None:
+                cached = cache.get(cls._cache_storage_key(pointer["cache_key"]))
+                if isinstance(cached, dict) and pointer.get("version"):
+                    snapshot = RulesSnapshot.build(
+                        version=pointer["version"],
+                        cache_key=pointer["cache_key"],
+                        config=cached,
+                    )
+                    cls._local_snapshot = snapshot
+                    return snapshot
+
+            state = cls.get_active_rules_state()
+            return cls._publish_active_snapshot(
+                state_cache_key=state.cache_key,
+                version=state.active_version.version,
+                config_payload=state.active_version.config,
+                replace_pointer=False,
+            )
+
+    @classmethod
+    def get_active_rules_config(cls) -> dict[str, Any]:
+        return cls.get_active_rules_snapshot().as_dict()
 
     @classmethod
     @transaction.atomic
@@ -362,9 +483,14 @@ class RulesService:
         )
 
         state.activate_version(active_version=new_version, cache_key=uuid.uuid4().hex)
-        cls._invalidate_cached_active_config(state_cache_key=previous_cache_key)
-        cls._set_cached_active_config(
+        transaction.on_commit(
+            lambda: cls._invalidate_cached_active_config(
+                state_cache_key=previous_cache_key
+            )
+        )
+        cls._publish_active_snapshot(
             state_cache_key=state.cache_key,
+            version=new_version.version,
             config_payload=new_version.config,
         )
         return RulesConfigState.domain.get_with_related(state_id=state.pk)
@@ -402,9 +528,14 @@ class RulesService:
         )
 
         state.activate_version(active_version=new_version, cache_key=uuid.uuid4().hex)
-        cls._invalidate_cached_active_config(state_cache_key=previous_cache_key)
-        cls._set_cached_active_config(
+        transaction.on_commit(
+            lambda: cls._invalidate_cached_active_config(
+                state_cache_key=previous_cache_key
+            )
+        )
+        cls._publish_active_snapshot(
             state_cache_key=state.cache_key,
+            version=new_version.version,
             config_payload=new_version.config,
         )
         return RulesConfigState.domain.get_with_related(state_id=state.pk)
@@ -0,0 +1,457 @@
+from __future__ import annotations
+
+import math
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta
+from itertools import batched
+from typing import Any
+
+from django.db.models import Sum
+from django.db.models.functions import Coalesce
+
+from core.api.exceptions import DomainValidationError
+from core.utils.business_dates import business_date, business_date_range_bounds
+from core.utils.constants import (
+    TicketColor,
+    TicketStatus,
+    TicketTransitionAction,
+    XPTransactionEntryType,
+)
+from gamification.models import LevelUpCouponEvent, WeeklyLevelEvaluation, XPTransaction
+from gamification.services import ProgressionService
+from rules.services import RulesService
+from rules.snapshot import RulesSnapshot
+from ticket.models import Ticket, TicketTransition, WorkSession
+
+
+class _ImpactLedger:
+    """Per-user XP deltas bucketed by business week start."""
+
+    def __init__(self) -> None:
+        self.delta_by_user_week: dict[int, dict[date, int]] = defaultdict(
+            lambda: defaultdict(int)
+        )
+        self.recorded_by_user: Counter[int] = Counter()
+        self.candidate_by_user: Counter[int] = Counter()
+
+    def add(
+        self, *, user_id: int, event_at: datetime, recorded: int, candidate: int
+    ) -> None:
+        self.recorded_by_user[user_id] += recorded
+        self.candidate_by_user[user_id] += candidate
+        delta = candidate - recorded
+        if delta:
+            local_date = business_date(event_at)
+            week_start = local_date - timedelta(days=local_date.weekday())
+            self.delta_by_user_week[user_id][week_start] += delta
+
+    def cumulative_delta(self, *, user_id: int, through_week: date) -> int:
+        return sum(
+            delta
+            for week_start, delta in self.delta_by_user_week.get(user_id, {}).items()
+            if week_start <= through_week
+        )
+
+    def week_delta(self, *, user_id: int, week_start: date) -> int:
+        return self.delta_by_user_week.get(user_id, {}).get(week_start, 0)
+
+
+class RulesImpactSimulationService:
+    """
+    Dry-run replay of a candidate rules config over recorded history.
+
+    Nothing is written: ticket rewards, QC status-update XP and weekly
+    evaluations are recomputed from streamed rows in fixed-size batches, with
+    one lookup query per batch instead of per-ticket workflow calls.
+    """
+
+    BATCH_SIZE = 2000
+    REPORT_ROWS_LIMIT = 200
+
+    @classmethod
+    def simulate(
+        cls,
+        *,
+        candidate_config: Any,
+        date_from: date,
+        date_to: date,
+    ) -> dict[str, Any]:
+        normalized = RulesService.validate_and_normalize_rules_config(candidate_config)
+        try:
+            start_dt, end_exclusive_dt, range_days = business_date_range_bounds(
+                date_from=date_from, date_to=date_to
+            )
+        except ValueError as exc:
+            raise DomainValidationError(str(exc)) from exc
+
+        active = RulesService.get_active_rules_snapshot()
+        candidate = RulesSnapshot.build(
+            version=0, cache_key="dry-run", config=normalized
+        )
+        ledger = _ImpactLedger()
+
+        tickets = cls._replay_tickets(
+            candidate=candidate,
+            ledger=ledger,
+            start_dt=start_dt,
+            end_exclusive_dt=end_exclusive_dt,
+        )
+        qc_status_updates = cls._replay_qc_status_updates(
+            candidate=candidate,
+            ledger=ledger,
+            start_dt=start_dt,
+            end_exclusive_dt=end_exclusive_dt,
+        )
+        weekly = cls._replay_weekly_evaluations(
+            candidate=candidate,
+            ledger=ledger,
+            date_from=date_from,
+            date_to=date_to,
+        )
+
+        users = [
+            {
+                "user_id": user_id,
+                "recorded_xp": int(ledger.recorded_by_user[user_id]),
+                "candidate_xp": int(ledger.candidate_by_user[user_id]),
+                "delta_xp": int(
+                    ledger.candidate_by_user[user_id] - ledger.recorded_by_user[user_id]
+                ),
+            }
+            for user_id in set(ledger.recorded_by_user) | set(ledger.candidate_by_user)
+        ]
+        users = [row for row in users if row["delta_xp"]]
+        users.sort(key=lambda row: (-abs(row["delta_xp"]), row["user_id"]))
+
+        recorded_total = sum(ledger.recorded_by_user.values())
+        candidate_total = sum(ledger.candidate_by_user.values())
+        return {
+            "date_from": date_from.isoformat(),
+            "date_to": date_to.isoformat(),
+            "range_days": range_days,
+            "active_version": active.version,
+            "config_diff": RulesService._diff_rules(active.as_dict(), normalized),
+            "xp": {
+                "recorded_total": int(recorded_total),
+                "candidate_total": int(candidate_total),
+                "delta_total": int(candidate_total - recorded_total),
+                "users_changed": len(users),
+                "users": users[: cls.REPORT_ROWS_LIMIT],
+            },
+            "tickets": tickets,
+            "qc_status_updates": qc_status_updates,
+            "weekly_evaluations": weekly,
+        }
+
+    @staticmethod
+    def _candidate_base_xp(
+        *, total_duration: int, xp_amount: int, is_manual: bool, base_divisor: int
+    ) -> int:
+        # Manual tickets keep their override; auto tickets re-run the create formula.
+        if is_manual and xp_amount > 0:
+            return xp_amount
+        return math.ceil(max(total_duration, 0) / max(base_divisor, 1))
+
+    @classmethod
+    def _replay_tickets(
+        cls,
+        *,
+        candidate: RulesSnapshot,
+        ledger: _ImpactLedger,
+        start_dt: datetime,
+        end_exclusive_dt: datetime,
+    ) -> dict[str, Any]:
+        xp_rules = candidate.ticket_xp
+        rows = (
+            Ticket.objects.filter(
+                status=TicketStatus.DONE,
+                technician_id__isnull=False,
+                finished_at__gte=start_dt,
+                finished_at__lt=end_exclusive_dt,
+            )
+            .order_by("id")
+            .values_list(
+                "id",
+                "technician_id",
+                "total_duration",
+                "flag_minutes",
+                "flag_color",
+                "xp_amount",
+                "is_manual",
+                "finished_at",
+                "qc_fail_count",
+            )
+            .iterator(chunk_size=cls.BATCH_SIZE)
+        )
+
+        replayed = 0
+        first_pass_eligible = 0
+        flag_changes = 0
+        recorded_flags: Counter[str] = Counter()
+        candidate_flags: Counter[str] = Counter()
+        base_totals = {"recorded": 0, "candidate": 0}
+        bonus_totals = {"recorded": 0, "candidate": 0}
+
+        for batch in batched(rows, cls.BATCH_SIZE, strict=False):
+            ticket_ids = [row[0] for row in batch]
+            recorded_amounts = dict(
+                XPTransaction.objects.filter(
+                    reference__in=[
+                        reference
+                        for ticket_id in ticket_ids
+                        for reference in (
+                            f"ticket_base_xp:{ticket_id}",
+                            f"ticket_qc_first_pass_bonus:{ticket_id}",
+                        )
+                    ]
+                ).values_list("reference", "amount")
+            )
+            active_seconds_by_ticket = dict(
+                WorkSession.objects.filter(ticket_id__in=ticket_ids)
+                .values("ticket_id")
+                .annotate(total=Coalesce(Sum("active_seconds"), 0))
+                .values_list("ticket_id", "total")
+            )
+
+            for (
+                ticket_id,
+                technician_id,
+                total_duration,
+                flag_minutes,
+                flag_color,
+                xp_amount,
+                is_manual,
+                finished_at,
+                qc_fail_count,
+            ) in batch:
+                total_duration = int(total_duration or 0)
+                candidate_base = cls._candidate_base_xp(
+                    total_duration=total_duration,
+                    xp_amount=int(xp_amount or 0),
+                    is_manual=bool(is_manual),
+                    base_divisor=xp_rules.base_divisor,
+                )
+                is_first_pass = not qc_fail_count and int(
+                    active_seconds_by_ticket.get(ticket_id, 0) or 0
+                ) <= (total_duration * 60)
+                candidate_bonus = xp_rules.first_pass_bonus if is_first_pass else 0
+                recorded_base = int(
+                    recorded_amounts.get(f"ticket_base_xp:{ticket_id}", 0)
+                )
+                recorded_bonus = int(
+                    recorded_amounts.get(f"ticket_qc_first_pass_bonus:{ticket_id}", 0)
+                )
+
+                candidate_flag = (
+                    flag_color
+                    if is_manual
+                    else Ticket.flag_color_from_minutes(
+                        total_minutes=flag_minutes,
+                        green_max_minutes=xp_rules.flag_green_max_minutes,
+                        yellow_max_minutes=xp_rules.flag_yellow_max_minutes,
+                    )
+                )
+                recorded_flags[flag_color] += 1
+                candidate_flags[candidate_flag] += 1
+                flag_changes += int(candidate_flag != flag_color)
+
+                ledger.add(
+                    user_id=technician_id,
+                    event_at=finished_at,
+                    recorded=recorded_base + recorded_bonus,
+                    candidate=candidate_base + candidate_bonus,
+                )
+                base_totals["recorded"] += recorded_base
+                base_totals["candidate"] += candidate_base
+                bonus_totals["recorded"] += recorded_bonus
+                bonus_totals["candidate"] += candidate_bonus
+                first_pass_eligible += int(is_first_pass)
+                replayed += 1
+
+        return {
+            "replayed": replayed,
+            "base_xp": base_totals,
+            "first_pass_bonus": {
+                **bonus_totals,
+                "eligible_tickets": first_pass_eligible,
+            },
+            "flag_colors": {
+                "recorded": {
+                    color: recorded_flags[color] for color in TicketColor.values
+                },
+                "candidate": {
+                    color: candidate_flags[color] for color in TicketColor.values
+                },
+                "changed": flag_changes,
+            },
+        }
+
+    @classmethod
+    def _replay_qc_status_updates(
+        cls,
+        *,
+        candidate: RulesSnapshot,
+        ledger: _ImpactLedger,
+        start_dt: datetime,
+        end_exclusive_dt: datetime,
+    ) -> dict[str, int]:
+        amount = candidate.ticket_xp.qc_status_update_xp
+        rows = (
+            TicketTransition.objects.filter(
+                action__in=[
+                    TicketTransitionAction.QC_PASS,
+                    TicketTransitionAction.QC_FAIL,
+                ],
+                actor_id__isnull=False,
+                created_at__gte=start_dt,
+                created_at__lt=end_exclusive_dt,
+            )
+            .order_by("id")
+            .values_list("id", "ticket_id", "actor_id", "created_at")
+            .iterator(chunk_size=cls.BATCH_SIZE)
+        )
+
+        replayed = 0
+        totals = {"recorded": 0, "candidate": 0}
+        for batch in batched(rows, cls.BATCH_SIZE, strict=False):
+            recorded_amounts = dict(
+                XPTransaction.objects.filter(
+                    entry_type=XPTransactionEntryType.TICKET_QC_STATUS_UPDATE,
+                    reference__in=[
+                        f"ticket_qc_status_update:{ticket_id}:{transition_id}"
+                        for transition_id, ticket_id, _, _ in batch
+                    ],
+                ).values_list("reference", "amount")
+            )
+            for transition_id, ticket_id, actor_id, created_at in batch:
+                recorded = int(
+                    recorded_amounts.get(
+                        f"ticket_qc_status_update:{ticket_id}:{transition_id}", 0
+                    )
+                )
+                ledger.add(
+                    user_id=actor_id,
+                    event_at=created_at,
+                    recorded=recorded,
+                    candidate=amount,
+                )
+                totals["recorded"] += recorded
+                totals["candidate"] += amount
+                replayed += 1
+
+        return {"replayed": replayed, **totals}
+
+    @classmethod
+    def _replay_weekly_evaluations(
+        cls,
+        *,
+        candidate: RulesSnapshot,
+        ledger: _ImpactLedger,
+        date_from: date,
+        date_to: date,
+    ) -> dict[str, Any]:
+        progression = candidate.progression
+        rows = (
+            WeeklyLevelEvaluation.objects.filter(
+                week_start__gte=date_from, week_start__lte=date_to
+            )
+            .order_by("user_id", "week_start", "id")
+            .values_list(
+                "user_id",
+                "week_start",
+                "raw_xp",
+                "previous_level",
+                "new_level",
+                "payload",
+            )
+            .iterator(chunk_size=cls.BATCH_SIZE)
+        )
+
+        replayed = 0
+        recorded_statuses: Counter[str] = Counter()
+        candidate_statuses: Counter[str] = Counter()
+        changed: list[dict[str, Any]] = []
+        changed_count = 0
+
+        chain_user_id = None
+        chain_recorded_level = None
+        chain_level = 0
+        chain_warning = False
+        for (
+            user_id,
+            week_start,
+            raw_xp,
+            recorded_previous_level,
+            recorded_new_level,
+            payload,
+        ) in rows:
+            payload = payload if isinstance(payload, dict) else {}
+            # Follow the candidate outcome week to week; restart from recorded state
+            # when a manual level change happened between two evaluations.
+            if (
+                user_id != chain_user_id
+                or recorded_previous_level != chain_recorded_level
+            ):
+                chain_level = ProgressionService._normalize_level(
+                    recorded_previous_level
+                )
+                chain_warning = bool(payload.get("previous_warning_active"))
+            chain_user_id = user_id
+            chain_recorded_level = recorded_new_level
+
+            candidate_raw_xp = int(raw_xp or 0) + ledger.cumulative_delta(
+                user_id=user_id, through_week=week_start
+            )
+            candidate_weekly_xp = int(
+                payload.get("weekly_xp", 0) or 0
+            ) + ledger.week_delta(user_id=user_id, week_start=week_start)
+            new_level, status, warning_after = (
+                ProgressionService._resolve_weekly_outcome(
+                    previous_level=chain_level,
+                    mapped_level=ProgressionService.map_raw_xp_to_level(
+                        raw_xp=candidate_raw_xp,
+                        level_thresholds=progression.level_thresholds,
+                    ),
+                    met_weekly_target=candidate_weekly_xp
+                    >= progression.weekly_target_xp,
+                    previous_warning_active=chain_warning,
+                )
+            )
+            recorded_status = str(payload.get("target_status", ""))
+            recorded_statuses[recorded_status] += 1
+            candidate_statuses[status] += 1
+            if status != recorded_status or new_level != recorded_new_level:
+                changed_count += 1
+                if len(changed) < cls.REPORT_ROWS_LIMIT:
+                    changed.append(
+                        {
+                            "user_id": user_id,
+                            "week_start": week_start.isoformat(),
+                            "recorded_status": recorded_status,
+                            "candidate_status": status,
+                            "recorded_new_level": int(recorded_new_level),
+                            "candidate_new_level": new_level,
+                            "candidate_raw_xp": candidate_raw_xp,
+                            "candidate_weekly_xp": candidate_weekly_xp,
+                        }
+                    )
+            chain_level = new_level
+            chain_warning = warning_after
+            replayed += 1
+
+        recorded_coupon_total = LevelUpCouponEvent.objects.filter(
+            week_start__gte=date_from, week_start__lte=date_to
+        ).aggregate(total=Coalesce(Sum("amount"), 0))["total"]
+        return {
+            "replayed": replayed,
+            "recorded_statuses": dict(recorded_statuses),
+            "candidate_statuses": dict(candidate_statuses),
+            "changed": changed_count,
+            "changes": changed,
+            "coupon_amount": {
+                "recorded_total": int(recorded_coupon_total or 0),
+                "candidate_total": int(
+                    candidate_statuses["level_up"] * progression.weekly_coupon_amount
+                ),
+            },
+        }
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any
+
+from rules.compiled import (
+    AttendanceRules,
+    ProgressionRules,
+    TicketXpRules,
+    WorkSessionRules,
+    compile_attendance_rules,
+    compile_progression_rules,
+    compile_ticket_xp_rules,
+    compile_work_session_rules,
+)
+
+
+def freeze_config(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return MappingProxyType(
+            {key: freeze_config(item) for key, item in value.items()}
+        )
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_config(item) for item in value)
+    return value
+
+
+def thaw_config(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {key: thaw_config(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw_config(item) for item in value]
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class RulesSnapshot:
+    """Immutable process-local view of one activated rules version."""
+
+    version: int
+    cache_key: str
+    config: Mapping[str, Any]
+    ticket_xp: TicketXpRules
+    attendance: AttendanceRules
+    work_session: WorkSessionRules
+    progression: ProgressionRules
+
+    @classmethod
+    def build(
+        cls, *, version: int, cache_key: str, config: Mapping[str, Any]
+    ) -> RulesSnapshot:
+        # Sections are compiled once per activated version, not per request.
+        return cls(
+            version=int(version),
+            cache_key=str(cache_key),
+            config=freeze_config(config),
+            ticket_xp=compile_ticket_xp_rules(config),
+            attendance=compile_attendance_rules(config),
+            work_session=compile_work_session_rules(config),
+            progression=compile_progression_rules(config),
+        )
+
+    def section(self, name: str) -> Mapping[str, Any]:
+        value = self.config.get(name)
+        if isinstance(value, Mapping):
+            return value
+        return MappingProxyType({})
+
+    def as_dict(self) -> dict[str, Any]:
+        return thaw_config(self.config)
@@ -0,0 +1,38 @@
+from itertools import batched
+
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from core.utils.constants import TicketStatus
+from ticket.models import Ticket
+
+
+class Command(BaseCommand):
+    help = "Recompute ticket QC wait timestamps and totals from transitions."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Tickets updated per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, int(options["batch_size"]))
+        ticket_ids = (
+            Ticket.all_objects.filter(transitions__to_status=TicketStatus.WAITING_QC)
+            .distinct()
+            .order_by("id")
+            .values_list("id", flat=True)
+            .iterator(chunk_size=batch_size)
+        )
+
+        updated = 0
+        for batch in batched(ticket_ids, batch_size, strict=False):
+            with transaction.atomic():
+                updated += Ticket.domain.refresh_qc_wait_fields(ticket_ids=list(batch))
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Backfilled ticket QC wait fields: tickets={updated}")
+        )
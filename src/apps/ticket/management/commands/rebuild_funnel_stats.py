@@ -0,0 +1,53 @@
+from django.core.management import BaseCommand, CommandError
+
+from gamification.services import ProgressionService
+from ticket.services_funnel_analytics import TicketFunnelAnalyticsService
+
+
+class Command(BaseCommand):
+    help = "Recompute weekly ticket funnel cohorts from transitions."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--week-from",
+            type=str,
+            required=False,
+            help="Business date token in YYYY-MM-DD format; its week is included.",
+        )
+        parser.add_argument(
+            "--week-to",
+            type=str,
+            required=False,
+            help="Business date token in YYYY-MM-DD format. Defaults to today.",
+        )
+
+    def handle(self, *args, **options):
+        week_from_token = options.get("week_from")
+        week_to_token = options.get("week_to")
+
+        try:
+            week_from = None
+            if week_from_token:
+                week_from = ProgressionService.parse_date_token(
+                    week_from_token, field_name="week_from"
+                )
+            week_to = None
+            if week_to_token:
+                week_to = ProgressionService.parse_date_token(
+                    week_to_token, field_name="week_to"
+                )
+
+            summary = TicketFunnelAnalyticsService.rebuild(
+                week_from=week_from,
+                week_to=week_to,
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Rebuilt ticket funnel stats: "
+                f"weeks={summary['week_from']}..{summary['week_to']} "
+                f"rows={summary['rows']}"
+            )
+        )
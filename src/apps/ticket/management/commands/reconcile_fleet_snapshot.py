@@ -0,0 +1,22 @@
+from django.core.management import BaseCommand
+
+from ticket.services_fleet_snapshot import FleetSnapshotService
+
+
+class Command(BaseCommand):
+    help = "Recount fleet snapshot counters and repair any drift."
+
+    def handle(self, *args, **options):
+        summary = FleetSnapshotService.reconcile()
+        drift = summary["drift"]
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Reconciled fleet snapshot: "
+                f"counters={summary['counters']} "
+                f"initialized={summary['initialized']} "
+                f"drifted_keys={len(drift)}"
+            )
+        )
+        for key, delta in drift.items():
+            self.stdout.write(f"  {key}: stored-expected={delta}")
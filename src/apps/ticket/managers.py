@@ -18,6 +18,10 @@ ACTIVE_WORKFLOW_STATUSES = (
     TicketStatus.WAITING_QC,
     TicketStatus.REWORK,
 )
+QC_DECISION_ACTIONS = (
+    TicketTransitionAction.QC_PASS,
+    TicketTransitionAction.QC_FAIL,
+)
 
 
 class TicketQuerySet(models.QuerySet):
@@ -63,6 +67,84 @@ class TicketDomainManager(models.Manager.from_queryset(TicketQuerySet)):
             .count()
         )
 
+    def record_qc_fail(self, *, ticket_id: int) -> None:
+        # Soft-deleted tickets keep their history, so bypass the default filter.
+        super().get_queryset().filter(pk=ticket_id).update(
+            qc_fail_count=models.F("qc_fail_count") + 1,
+            first_passed=models.Case(
+                models.When(first_passed__isnull=True, then=models.Value(None)),
+                default=models.Value(False),
+            ),
+        )
+
+    def refresh_qc_counters(self, *, ticket_ids: list[int]) -> int:
+        """Recompute QC fail counters and first-pass flags from transitions."""
+        transition_model = self.model.transitions.rel.related_model
+        queryset = super().get_queryset().filter(pk__in=ticket_ids)
+        updated = queryset.update(
+            qc_fail_count=Coalesce(
+                models.Subquery(
+                    transition_model.objects.filter(
+                        ticket_id=models.OuterRef("pk"),
+                        action=TicketTransitionAction.QC_FAIL,
+                    )
+                    .order_by()
+                    .values("ticket_id")
+                    .annotate(total=models.Count("id"))
+                    .values("total")
+                ),
+                0,
+            )
+        )
+        queryset.exclude(status=TicketStatus.DONE).update(first_passed=None)
+        queryset.filter(status=TicketStatus.DONE, qc_fail_count=0).update(
+            first_passed=True
+        )
+        queryset.filter(status=TicketStatus.DONE, qc_fail_count__gt=0).update(
+            first_passed=False
+        )
+        return updated
+
+    def refresh_qc_wait_fields(self, *, ticket_ids: list[int]) -> int:
+        """Recompute QC wait timestamps and totals by replaying transitions."""
+        transition_model = self.model.transitions.rel.related_model
+        fields: dict[int, dict[str, object]] = {
+            ticket_id: {
+                "first_waiting_qc_at": None,
+                "last_waiting_qc_at": None,
+                "qc_wait_seconds_total": 0,
+            }
+            for ticket_id in ticket_ids
+        }
+        transitions = (
+            transition_model.objects.filter(ticket_id__in=ticket_ids)
+            .order_by("ticket_id", "created_at", "id")
+            .values_list("ticket_id", "action", "to_status", "created_at")
+        )
+        for ticket_id, action, to_status, created_at in transitions:
+            values = fields[ticket_id]
+            if to_status == TicketStatus.WAITING_QC:
+                values["first_waiting_qc_at"] = (
+                    values["first_waiting_qc_at"] or created_at
+                )
+                values["last_waiting_qc_at"] = created_at
+            elif action in QC_DECISION_ACTIONS and values["last_waiting_qc_at"]:
+                waited = (created_at - values["last_waiting_qc_at"]).total_seconds()
+                values["qc_wait_seconds_total"] += max(int(waited), 0)
+
+        tickets = list(super().get_queryset().filter(pk__in=ticket_ids).only("id"))
+        for ticket in tickets:
+            for field, value in fields[ticket.pk].items():
+                setattr(ticket, field, value)
+        return (
+            super()
+            .get_queryset()
+            .bulk_update(
+                tickets,
+                ["first_waiting_qc_at", "last_waiting_qc_at", "qc_wait_seconds_total"],
+            )
+        )
+
 
 class WorkSessionQuerySet(models.QuerySet):
     def open(self):
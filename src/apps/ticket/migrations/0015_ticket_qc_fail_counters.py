@@ -0,0 +1,23 @@
+# Generated by Django 5.2.11 on 2026-10-16 20:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ticket", "0014_remove_ticket_unique_in_progress_ticket_per_technician"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ticket",
+            name="first_passed",
+            field=models.BooleanField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="ticket",
+            name="qc_fail_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
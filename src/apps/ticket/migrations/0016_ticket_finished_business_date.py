@@ -0,0 +1,43 @@
+# Generated by Django 5.2.11 on 2026-10-16 20:30
+
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+
+
+def backfill_finished_business_date(apps, schema_editor):
+    Ticket = apps.get_model("ticket", "Ticket")
+    Ticket._base_manager.filter(finished_at__isnull=False).update(
+        finished_business_date=TruncDate(
+            "finished_at", tzinfo=ZoneInfo("Asia/Tashkent")
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0005_fleetsnapshotcounter"),
+        ("ticket", "0015_ticket_qc_fail_counters"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ticket",
+            name="finished_business_date",
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="ticket",
+            index=models.Index(
+                fields=["finished_business_date", "technician"],
+                name="ticket_tick_finishe_4515ab_idx",
+            ),
+        ),
+        migrations.RunPython(
+            backfill_finished_business_date, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 5.2.11 on 2026-10-16 21:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ticket", "0016_ticket_finished_business_date"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TicketStageStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, db_index=True, verbose_name="Created At"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, db_index=True, verbose_name="Updated At"
+                    ),
+                ),
+                ("week_start", models.DateField()),
+                (
+                    "stage",
+                    models.CharField(
+                        choices=[
+                            ("time_to_assign", "Time to Assign"),
+                            ("time_in_progress", "Time in Progress"),
+                            ("time_in_qc", "Time in QC"),
+                            ("cycle_time", "Cycle Time"),
+                        ],
+                        max_length=30,
+                    ),
+                ),
+                (
+                    "dimension",
+                    models.CharField(
+                        choices=[
+                            ("all", "All"),
+                            ("technician", "Technician"),
+                            ("category", "Category"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("dimension_id", models.PositiveBigIntegerField(default=0)),
+                ("sample_count", models.PositiveIntegerField(default=0)),
+                ("avg_seconds", models.PositiveIntegerField(blank=True, null=True)),
+                ("p50_seconds", models.PositiveIntegerField(blank=True, null=True)),
+                ("p90_seconds", models.PositiveIntegerField(blank=True, null=True)),
+                ("p99_seconds", models.PositiveIntegerField(blank=True, null=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["dimension", "week_start"],
+                        name="ticket_tick_dimensi_82d6ff_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("week_start", "stage", "dimension", "dimension_id"),
+                        name="unique_ticket_stage_stats_per_week_dimension",
+                    )
+                ],
+            },
+        ),
+    ]
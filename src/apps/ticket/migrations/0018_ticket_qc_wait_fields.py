@@ -0,0 +1,35 @@
+# Generated by Django 5.2.11 on 2026-10-16 21:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ticket", "0017_ticketstagestats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ticket",
+            name="first_waiting_qc_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="ticket",
+            name="last_waiting_qc_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="ticket",
+            name="qc_wait_seconds_total",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="ticket",
+            index=models.Index(
+                fields=["status", "last_waiting_qc_at"],
+                name="ticket_tick_status_8cd33d_idx",
+            ),
+        ),
+    ]
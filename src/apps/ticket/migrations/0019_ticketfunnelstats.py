@@ -0,0 +1,70 @@
+# Generated by Django 6.0.9 on 2026-10-16 22:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ticket", "0018_ticket_qc_wait_fields"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TicketFunnelStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, db_index=True, verbose_name="Created At"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, db_index=True, verbose_name="Updated At"
+                    ),
+                ),
+                ("week_start", models.DateField()),
+                (
+                    "dimension",
+                    models.CharField(
+                        choices=[
+                            ("all", "All"),
+                            ("category", "Category"),
+                            ("master", "Master"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("dimension_id", models.PositiveBigIntegerField(default=0)),
+                ("ticket_count", models.PositiveIntegerField(default=0)),
+                ("rework_ticket_count", models.PositiveIntegerField(default=0)),
+                ("reached", models.JSONField(blank=True, default=dict)),
+                ("transitions", models.JSONField(blank=True, default=dict)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["dimension", "week_start"],
+                        name="ticket_tick_dimensi_eefaad_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("week_start", "dimension", "dimension_id"),
+                        name="unique_ticket_funnel_stats_per_week_dimension",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 6.0.9 on 2026-10-17 09:10
+
+from django.db import migrations
+from django.utils import timezone
+
+
+def seed_fleet_snapshot_counters(apps, schema_editor):
+    # The tracked models' aggregate helpers only reference stored fields, so
+    # they run unchanged over the historical querysets.
+    from inventory.models import InventoryItem as TrackedInventoryItem
+    from ticket.models import Ticket as TrackedTicket
+
+    FleetSnapshotCounter = apps.get_model("inventory", "FleetSnapshotCounter")
+    totals: dict[str, int] = {}
+    for tracked, model in (
+        (TrackedInventoryItem, apps.get_model("inventory", "InventoryItem")),
+        (TrackedTicket, apps.get_model("ticket", "Ticket")),
+    ):
+        totals.update(
+            tracked.fleet_counter_totals(
+                model._base_manager.filter(deleted_at__isnull=True)
+            )
+        )
+    totals["meta.reconciled_at"] = int(timezone.now().timestamp())
+    FleetSnapshotCounter._base_manager.exclude(key__in=list(totals)).update(value=0)
+    for key in sorted(totals):
+        FleetSnapshotCounter._base_manager.update_or_create(
+            key=key, defaults={"value": totals[key]}
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0005_fleetsnapshotcounter"),
+        ("ticket", "0019_ticketfunnelstats"),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_fleet_snapshot_counters, migrations.RunPython.noop),
+    ]
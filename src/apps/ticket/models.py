@@ -1,17 +1,28 @@
 import math
+from collections.abc import Mapping
+from datetime import UTC, datetime
+from typing import Any
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import TruncSecond
 from django.utils import timezone
 
 from core.api.exceptions import DomainValidationError
 from core.models import AppendOnlyModel, SoftDeleteModel, TimestampedModel
+from core.utils.business_dates import business_date
 from core.utils.constants import (
+    LiveEventTopic,
     TicketColor,
+    TicketFunnelDimension,
+    TicketStage,
+    TicketStageDimension,
     TicketStatus,
     TicketTransitionAction,
     WorkSessionStatus,
     WorkSessionTransitionAction,
 )
+from core.utils.live_events import publish_live_event
+from inventory.models import FleetCounterTrackedModel
 from ticket.managers import (
     TicketDomainManager,
     TicketTransitionDomainManager,
@@ -19,6 +30,8 @@ from ticket.managers import (
     WorkSessionTransitionDomainManager,
 )
 
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
 ACTIVE_TICKET_STATUSES = [
     TicketStatus.UNDER_REVIEW,
     TicketStatus.NEW,
@@ -29,7 +42,7 @@ ACTIVE_TICKET_STATUSES = [
 ]
 
 
-class Ticket(TimestampedModel, SoftDeleteModel):
+class Ticket(FleetCounterTrackedModel, TimestampedModel, SoftDeleteModel):
     domain = TicketDomainManager()
 
     inventory_item = models.ForeignKey(
@@ -75,11 +88,19 @@ class Ticket(TimestampedModel, SoftDeleteModel):
     assigned_at = models.DateTimeField(null=True, blank=True)
     started_at = models.DateTimeField(null=True, blank=True)
     finished_at = models.DateTimeField(null=True, blank=True)
+    finished_business_date = models.DateField(null=True, blank=True, editable=False)
+    qc_fail_count = models.PositiveIntegerField(default=0)
+    first_passed = models.BooleanField(null=True, blank=True)
+    first_waiting_qc_at = models.DateTimeField(null=True, blank=True)
+    last_waiting_qc_at = models.DateTimeField(null=True, blank=True)
+    qc_wait_seconds_total = models.PositiveIntegerField(default=0)
 
     class Meta:
         indexes = [
             models.Index(fields=["status", "created_at"]),
             models.Index(fields=["technician", "status"]),
+            models.Index(fields=["finished_business_date", "technician"]),
+            models.Index(fields=["status", "last_waiting_qc_at"]),
         ]
         constraints = [
             models.UniqueConstraint(
@@ -91,6 +112,77 @@ class Ticket(TimestampedModel, SoftDeleteModel):
             ),
         ]
 
+    FLEET_COUNTER_FIELDS = (
+        "status",
+        "flag_color",
+        "flag_minutes",
+        "created_at",
+        "deleted_at",
+    )
+
+    def save(self, *args, **kwargs):
+        self.finished_business_date = (
+            business_date(self.finished_at) if self.finished_at else None
+        )
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "finished_at" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "finished_business_date"}
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def fleet_counter_contribution(cls, values: Mapping[str, Any]) -> dict[str, int]:
+        if values.get("deleted_at") is not None:
+            return {}
+        status = values["status"]
+        counters = {f"tickets.status.{status}": 1}
+        if status in ACTIVE_TICKET_STATUSES:
+            created_at = values.get("created_at")
+            counters.update(
+                {
+                    "tickets.active.total": 1,
+                    f"tickets.active.flag.{values['flag_color']}": 1,
+                    "tickets.active.flag_minutes_sum": int(values["flag_minutes"] or 0),
+                    # Epoch sum lets readers derive average age without a scan.
+                    "tickets.active.created_epoch_sum": (
+                        int(created_at.timestamp()) if created_at else 0
+                    ),
+                }
+            )
+        return counters
+
+    @classmethod
+    def fleet_counter_totals(cls, queryset: models.QuerySet) -> dict[str, int]:
+        active = models.Q(status__in=ACTIVE_TICKET_STATUSES)
+        # Whole seconds since the epoch, matching ``int(created_at.timestamp())``.
+        created_epoch = models.ExpressionWrapper(
+            TruncSecond("created_at") - models.Value(EPOCH),
+            output_field=models.DurationField(),
+        )
+        return cls._aggregate_fleet_counters(
+            queryset,
+            {
+                **{
+                    f"tickets.status.{status}": models.Count(
+                        "id", filter=models.Q(status=status)
+                    )
+                    for status in TicketStatus.values
+                },
+                "tickets.active.total": models.Count("id", filter=active),
+                **{
+                    f"tickets.active.flag.{color}": models.Count(
+                        "id", filter=active & models.Q(flag_color=color)
+                    )
+                    for color in TicketColor.values
+                },
+                "tickets.active.flag_minutes_sum": models.Sum(
+                    "flag_minutes", filter=active
+                ),
+                "tickets.active.created_epoch_sum": models.Sum(
+                    created_epoch, filter=active
+                ),
+            },
+        )
+
     def assign_to_technician(self, *, technician_id: int, assigned_at=None) -> str:
         from_status = self.status
         if self.status not in (
@@ -197,7 +289,7 @@ class Ticket(TimestampedModel, SoftDeleteModel):
         self.save(update_fields=update_fields)
         return from_status
 
-    def move_to_waiting_qc(self, *, actor_user_id: int) -> str:
+    def move_to_waiting_qc(self, *, actor_user_id: int, entered_at=None) -> str:
         from_status = self.status
         if self.status != TicketStatus.IN_PROGRESS:
             raise DomainValidationError(
@@ -209,7 +301,12 @@ class Ticket(TimestampedModel, SoftDeleteModel):
             )
 
         self.status = TicketStatus.WAITING_QC
-        self.save(update_fields=["status"])
+        self.last_waiting_qc_at = entered_at or timezone.now()
+        update_fields = ["status", "last_waiting_qc_at"]
+        if not self.first_waiting_qc_at:
+            self.first_waiting_qc_at = self.last_waiting_qc_at
+            update_fields.append("first_waiting_qc_at")
+        self.save(update_fields=update_fields)
         return from_status
 
     def mark_qc_pass(self, *, finished_at=None) -> str:
@@ -223,19 +320,41 @@ class Ticket(TimestampedModel, SoftDeleteModel):
 
         self.status = TicketStatus.DONE
         self.finished_at = finished_at or timezone.now()
-        self.save(update_fields=["status", "finished_at"])
+        self.first_passed = self.qc_fail_count == 0
+        self._close_qc_wait(ended_at=self.finished_at)
+        self.save(
+            update_fields=[
+                "status",
+                "finished_at",
+                "first_passed",
+                "qc_wait_seconds_total",
+            ]
+        )
         return from_status
 
-    def mark_qc_fail(self) -> str:
+    def mark_qc_fail(self, *, failed_at=None) -> str:
         from_status = self.status
         if self.status != TicketStatus.WAITING_QC:
             raise DomainValidationError("QC FAIL allowed only from WAITING_QC.")
 
         self.status = TicketStatus.REWORK
         self.finished_at = None
-        self.save(update_fields=["status", "finished_at"])
+        self._close_qc_wait(ended_at=failed_at or timezone.now())
+        with transaction.atomic():
+            self.save(update_fields=["status", "finished_at", "qc_wait_seconds_total"])
+            # Counted with F() so concurrent writers never lose a failure.
+            Ticket.domain.record_qc_fail(ticket_id=self.pk)
+        self.qc_fail_count += 1
+        if self.first_passed is not None:
+            self.first_passed = False
         return from_status
 
+    def _close_qc_wait(self, *, ended_at) -> None:
+        # ``last_waiting_qc_at`` stays set so queue aging can still read it.
+        if self.last_waiting_qc_at:
+            waited = (ended_at - self.last_waiting_qc_at).total_seconds()
+            self.qc_wait_seconds_total += max(int(waited), 0)
+
     def add_transition(
         self,
         *,
@@ -378,7 +497,7 @@ class WorkSession(TimestampedModel, SoftDeleteModel):
         event_at,
         metadata: dict | None = None,
     ):
-        return WorkSessionTransition.objects.create(
+        transition = WorkSessionTransition.objects.create(
             work_session=self,
             ticket=self.ticket,
             action=action,
@@ -388,6 +507,20 @@ class WorkSession(TimestampedModel, SoftDeleteModel):
             event_at=event_at,
             metadata=metadata or {},
         )
+        publish_live_event(
+            topic=LiveEventTopic.WORK_SESSIONS,
+            event_type="work_session.transition",
+            technician_id=self.technician_id,
+            data={
+                "work_session_id": self.id,
+                "ticket_id": self.ticket_id,
+                "action": action,
+                "from_status": from_status,
+                "to_status": to_status,
+                "technician_id": self.technician_id,
+            },
+        )
+        return transition
 
     def recalculate_active_seconds(self, *, until_dt) -> int:
         transitions = self.transitions.order_by("event_at", "id").only(
@@ -579,3 +712,76 @@ class TicketTransition(AppendOnlyModel):
 
     def __str__(self) -> str:
         return f"TicketTransition #{self.pk} {self.from_status}>{self.to_status} ({self.action})"
+
+
+class TicketStageStats(TimestampedModel):
+    """
+    Stage-duration percentiles of tickets finished in one business week.
+
+    ``dimension_id`` is the technician or inventory category id, ``0`` for the
+    fleet-wide row. Every built week has fleet-wide rows for all stages, even
+    when no ticket was finished.
+    """
+
+    week_start = models.DateField()
+    stage = models.CharField(max_length=30, choices=TicketStage)
+    dimension = models.CharField(max_length=20, choices=TicketStageDimension)
+    dimension_id = models.PositiveBigIntegerField(default=0)
+    sample_count = models.PositiveIntegerField(default=0)
+    avg_seconds = models.PositiveIntegerField(null=True, blank=True)
+    p50_seconds = models.PositiveIntegerField(null=True, blank=True)
+    p90_seconds = models.PositiveIntegerField(null=True, blank=True)
+    p99_seconds = models.PositiveIntegerField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["dimension", "week_start"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["week_start", "stage", "dimension", "dimension_id"],
+                name="unique_ticket_stage_stats_per_week_dimension",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return (
+            f"TicketStageStats {self.week_start} {self.stage} "
+            f"{self.dimension}={self.dimension_id}"
+        )
+
+
+class TicketFunnelStats(TimestampedModel):
+    """
+    Funnel rollup for the tickets created in one business week.
+
+    ``reached`` maps each funnel status to the number of cohort tickets that got
+    at least that far; ``transitions`` is the ``"from>to"`` edge count matrix
+    from the transition log. ``dimension_id`` is the inventory category or
+    master id, ``0`` for the fleet-wide row that every built week has.
+    """
+
+    week_start = models.DateField()
+    dimension = models.CharField(max_length=20, choices=TicketFunnelDimension)
+    dimension_id = models.PositiveBigIntegerField(default=0)
+    ticket_count = models.PositiveIntegerField(default=0)
+    rework_ticket_count = models.PositiveIntegerField(default=0)
+    reached = models.JSONField(default=dict, blank=True)
+    transitions = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["dimension", "week_start"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["week_start", "dimension", "dimension_id"],
+                name="unique_ticket_funnel_stats_per_week_dimension",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return (
+            f"TicketFunnelStats {self.week_start} "
+            f"{self.dimension}={self.dimension_id}"
+        )
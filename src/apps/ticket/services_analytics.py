@@ -1,87 +1,102 @@
 from __future__ import annotations
 
-from collections import defaultdict
+import hashlib
+import json
 from datetime import timedelta
-from zoneinfo import ZoneInfo
+from operator import itemgetter
 
-from django.db.models import Count, Sum
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Count, F, Q, Value
 from django.utils import timezone
+from django.utils.cache import quote_etag
 
 from account.models import User
 from attendance.models import AttendanceRecord
+from core.utils.business_dates import BUSINESS_TIMEZONE
 from core.utils.constants import (
+    AnalyticsGranularity,
     InventoryItemStatus,
     RoleSlug,
     TicketColor,
     TicketStatus,
     TicketTransitionAction,
 )
-from gamification.models import XPTransaction
-from inventory.models import InventoryItem
-from ticket.models import Ticket, TicketTransition
+from core.utils.swr_cache import invalidate_cache_tags, stale_while_revalidate
+from gamification.models import TechnicianScore, XPTransaction
+from gamification.services_daily_stats import TechnicianDailyStatsService
+from gamification.services_leaderboard import TechnicianScoreService
+from gamification.services_xp_archive import XPArchiveService
+from ticket.managers import ACTIVE_WORKFLOW_STATUSES
+from ticket.models import Ticket
+from ticket.services_fleet_snapshot import FleetSnapshotService
 
 
 class TicketAnalyticsService:
     """Aggregates fleet/team operational KPIs for analytics API payloads."""
 
-    BUSINESS_TIMEZONE = ZoneInfo("Asia/Tashkent")
+    BUSINESS_TIMEZONE = BUSINESS_TIMEZONE
     QC_WINDOW_DAYS = 7
-
-    SCORE_WEIGHTS = {
-        "tickets_done": 120,
-        "xp_total": 1,
-        "first_pass_done": 40,
-        "green_flag_done": 20,
-        "yellow_flag_done": 10,
-        "red_flag_done_penalty": 8,
-        "attendance_day": 6,
-        "rework_done_penalty": 25,
-        "qc_fail_event_penalty": 12,
-    }
+    QC_TREND_MAX_DAYS = 365
+    QC_ROLLUP_FIELDS = (
+        "tickets_done",
+        "tickets_first_pass",
+        "tickets_rework",
+        "qc_pass_events",
+        "qc_fail_events",
+    )
+
+    # Ticket transitions bump this tag; score events bump the leaderboard tag.
+    CACHE_TAG = "ticket.analytics"
+    CACHE_FRESH_SECONDS = settings.ANALYTICS_CACHE_FRESH_SECONDS
+    CACHE_STALE_SECONDS = settings.ANALYTICS_CACHE_STALE_SECONDS
+    PUBLIC_LEADERBOARD_CACHE_TAG = TechnicianScoreService.PUBLIC_LEADERBOARD_CACHE_TAG
+    SCORE_WEIGHTS = TechnicianScoreService.SCORE_WEIGHTS
 
     @classmethod
+    def invalidate_cache(cls) -> None:
+        transaction.on_commit(lambda: invalidate_cache_tags(cls.CACHE_TAG))
+
+    @stale_while_revalidate(
+        namespace="analytics.fleet_summary",
+        fresh_seconds=CACHE_FRESH_SECONDS,
+        stale_seconds=CACHE_STALE_SECONDS,
+        tags=(CACHE_TAG,),
+    )
     def fleet_summary(cls) -> dict[str, object]:
         now_utc = timezone.now()
         now_local = timezone.localtime(now_utc, cls.BUSINESS_TIMEZONE)
 
-        inventory_items_qs = InventoryItem.domain.all()
-        items_by_status = dict(
-            inventory_items_qs.values("status")
-            .annotate(total=Count("id"))
-            .values_list("status", "total")
-        )
-
-        active_fleet_qs = inventory_items_qs.filter(is_active=True).exclude(
-            status=InventoryItemStatus.WRITE_OFF
-        )
-        active_count = active_fleet_qs.count()
-        ready_count = active_fleet_qs.filter(status=InventoryItemStatus.READY).count()
+        # Fleet/backlog counters are maintained incrementally; one row scan here.
+        counters = FleetSnapshotService.counters()
+        items_by_status = {
+            item_status: counters.get(f"inventory.status.{item_status}", 0)
+            for item_status in InventoryItemStatus.values
+        }
+        active_count = counters.get("inventory.active", 0)
+        ready_count = counters.get("inventory.active_ready", 0)
         availability_pct = (
             round((ready_count / active_count) * 100, 2) if active_count else 0.0
         )
 
-        active_tickets_qs = Ticket.domain.active_workflow()
-        ticket_counts = dict(
-            Ticket.domain.all()
-            .values("status")
-            .annotate(total=Count("id"))
-            .values_list("status", "total")
-        )
+        ticket_counts = {
+            ticket_status: counters.get(f"tickets.status.{ticket_status}", 0)
+            for ticket_status in TicketStatus.values
+        }
         backlog_counts = {
-            "green": active_tickets_qs.filter(flag_color=TicketColor.GREEN).count(),
-            "yellow": active_tickets_qs.filter(flag_color=TicketColor.YELLOW).count(),
-            "red": active_tickets_qs.filter(flag_color=TicketColor.RED).count(),
+            "green": counters.get(f"tickets.active.flag.{TicketColor.GREEN}", 0),
+            "yellow": counters.get(f"tickets.active.flag.{TicketColor.YELLOW}", 0),
+            "red": counters.get(f"tickets.active.flag.{TicketColor.RED}", 0),
         }
         backlog_total = sum(backlog_counts.values())
-        active_status_counts = dict(
-            active_tickets_qs.values("status")
-            .annotate(total=Count("id"))
-            .values_list("status", "total")
-        )
+        active_status_counts = {
+            ticket_status: ticket_counts[ticket_status]
+            for ticket_status in ACTIVE_WORKFLOW_STATUSES
+        }
 
         # KPI helpers keep the endpoint payload stable while internals evolve.
         backlog_kpis = cls._backlog_kpis(
-            active_tickets_qs=active_tickets_qs,
+            counters=counters,
             backlog_counts=backlog_counts,
             now_utc=now_utc,
         )
@@ -98,7 +113,7 @@ class TicketAnalyticsService:
             "generated_at": now_utc.isoformat(),
             "local_time": now_local.isoformat(),
             "fleet": {
-                "total": inventory_items_qs.count(),
+                "total": counters.get("inventory.total", 0),
                 "active": active_count,
                 "ready": ready_count,
                 "in_service": items_by_status.get(InventoryItemStatus.IN_SERVICE, 0),
@@ -107,7 +122,7 @@ class TicketAnalyticsService:
                 "write_off": items_by_status.get(InventoryItemStatus.WRITE_OFF, 0),
             },
             "tickets": {
-                "active_total": active_tickets_qs.count(),
+                "active_total": counters.get("tickets.active.total", 0),
                 "under_review": ticket_counts.get(TicketStatus.UNDER_REVIEW, 0),
                 "new": ticket_counts.get(TicketStatus.NEW, 0),
                 "assigned": ticket_counts.get(TicketStatus.ASSIGNED, 0),
@@ -140,10 +155,38 @@ class TicketAnalyticsService:
             "qc": qc_kpis,
         }
 
-    @classmethod
+    @stale_while_revalidate(
+        namespace="analytics.qc_trend",
+        fresh_seconds=CACHE_FRESH_SECONDS,
+        stale_seconds=CACHE_STALE_SECONDS,
+        tags=(CACHE_TAG,),
+    )
+    def qc_trend(
+        cls,
+        *,
+        days: int = 30,
+        granularity: str = AnalyticsGranularity.DAY,
+    ) -> dict[str, object]:
+        now_utc = timezone.now()
+        window_days = min(max(1, int(days)), cls.QC_TREND_MAX_DAYS)
+        return {
+            "generated_at": now_utc.isoformat(),
+            **cls._qc_kpis(
+                now_utc=now_utc,
+                days=window_days,
+                granularity=granularity,
+            ),
+        }
+
+    @stale_while_revalidate(
+        namespace="analytics.team_summary",
+        fresh_seconds=CACHE_FRESH_SECONDS,
+        stale_seconds=CACHE_STALE_SECONDS,
+        tags=(CACHE_TAG, PUBLIC_LEADERBOARD_CACHE_TAG),
+    )
     def team_summary(cls, *, days: int = 7) -> dict[str, object]:
         now = timezone.now()
-        end_date = now.date()
+        end_date = TechnicianDailyStatsService.business_date(now)
         start_date = end_date - timedelta(days=max(1, days) - 1)
 
         technicians = list(
@@ -176,60 +219,10 @@ class TicketAnalyticsService:
                 "members": [],
             }
 
-        tickets_done_qs = Ticket.domain.filter(
-            technician_id__in=technician_ids,
-            status=TicketStatus.DONE,
-            finished_at__date__gte=start_date,
-            finished_at__date__lte=end_date,
-        )
-        done_counts = dict(
-            tickets_done_qs.values("technician_id")
-            .annotate(total=Count("id"))
-            .values_list("technician_id", "total")
-        )
-        done_records = list(tickets_done_qs.values("id", "technician_id"))
-        done_ticket_ids = [row["id"] for row in done_records]
-
-        qc_failed_ticket_ids = set()
-        if done_ticket_ids:
-            qc_failed_ticket_ids = set(
-                TicketTransition.objects.filter(
-                    ticket_id__in=done_ticket_ids,
-                    action=TicketTransitionAction.QC_FAIL,
-                )
-                .values_list("ticket_id", flat=True)
-                .distinct()
-            )
-
-        first_pass_counts: dict[int, int] = {}
-        for row in done_records:
-            technician_id = row["technician_id"]
-            is_first_pass = row["id"] not in qc_failed_ticket_ids
-            if is_first_pass:
-                first_pass_counts[technician_id] = (
-                    first_pass_counts.get(technician_id, 0) + 1
-                )
-
-        raw_xp_sums = dict(
-            XPTransaction.objects.filter(
-                user_id__in=technician_ids,
-                created_at__date__gte=start_date,
-                created_at__date__lte=end_date,
-            )
-            .values("user_id")
-            .annotate(total=Sum("amount"))
-            .values_list("user_id", "total")
-        )
-        attendance_days = dict(
-            AttendanceRecord.domain.filter(
-                user_id__in=technician_ids,
-                work_date__gte=start_date,
-                work_date__lte=end_date,
-                check_in_at__isnull=False,
-            )
-            .values("user_id")
-            .annotate(total=Count("id"))
-            .values_list("user_id", "total")
+        daily_totals = TechnicianDailyStatsService.totals_by_user(
+            user_ids=technician_ids,
+            date_from=start_date,
+            date_to=end_date,
         )
         in_progress_counts = dict(
             Ticket.domain.filter(
@@ -248,10 +241,11 @@ class TicketAnalyticsService:
         total_attendance_days = 0
 
         for technician in technicians:
-            done_total = int(done_counts.get(technician.id, 0) or 0)
-            first_pass_total = int(first_pass_counts.get(technician.id, 0) or 0)
-            raw_xp_total = int(raw_xp_sums.get(technician.id, 0) or 0)
-            attendance_total = int(attendance_days.get(technician.id, 0) or 0)
+            totals = daily_totals.get(technician.id, {})
+            done_total = int(totals.get("tickets_done", 0))
+            first_pass_total = int(totals.get("tickets_first_pass", 0))
+            raw_xp_total = int(totals.get("xp_total", 0))
+            attendance_total = int(totals.get("attendance_days", 0))
             in_progress_total = int(in_progress_counts.get(technician.id, 0) or 0)
             first_pass_rate = (
                 round((first_pass_total / done_total) * 100, 2) if done_total else 0.0
@@ -311,9 +305,24 @@ class TicketAnalyticsService:
 
     @classmethod
     def public_technician_leaderboard(cls) -> dict[str, object]:
+        return cls.public_technician_leaderboard_entry()["payload"]
+
+    @stale_while_revalidate(
+        namespace="analytics.public_leaderboard",
+        fresh_seconds=CACHE_FRESH_SECONDS,
+        stale_seconds=CACHE_STALE_SECONDS,
+        tags=(PUBLIC_LEADERBOARD_CACHE_TAG,),
+    )
+    def public_technician_leaderboard_entry(cls) -> dict[str, object]:
+        """
+        Return the public leaderboard with its validators.
+
+        The entry holds ``payload``, a content ``etag`` and ``last_modified``
+        (epoch seconds). Score updates retire the cached entry on commit; the
+        fresh TTL bounds staleness from level or profile edits.
+        """
         now = timezone.now()
-        technicians = cls._active_technicians()
-        members = cls._public_leaderboard_members(technicians=technicians)
+        members = cls._public_leaderboard_members()
 
         tickets_done_total = sum(int(item["tickets_done_total"]) for item in members)
         first_pass_total = sum(
@@ -322,10 +331,9 @@ class TicketAnalyticsService:
         xp_total = sum(int(item["xp_total"]) for item in members)
         total_score = sum(int(item["score"]) for item in members)
 
-        return {
-            "generated_at": now.isoformat(),
+        content = {
             "summary": {
-                "technicians_total": len(technicians),
+                "technicians_total": len(members),
                 "tickets_done_total": tickets_done_total,
                 "tickets_first_pass_total": first_pass_total,
                 "first_pass_rate_percent": (
@@ -339,23 +347,33 @@ class TicketAnalyticsService:
             "members": members,
             "weights": {key: int(value) for key, value in cls.SCORE_WEIGHTS.items()},
         }
+        content_digest = hashlib.sha256(
+            json.dumps(content, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        ).hexdigest()
+        return {
+            "payload": {"generated_at": now.isoformat(), **content},
+            "etag": quote_etag(content_digest),
+            "last_modified": int(now.timestamp()),
+        }
 
-    @classmethod
+    @stale_while_revalidate(
+        namespace="analytics.public_technician_detail",
+        fresh_seconds=CACHE_FRESH_SECONDS,
+        stale_seconds=CACHE_STALE_SECONDS,
+        tags=(CACHE_TAG, PUBLIC_LEADERBOARD_CACHE_TAG),
+    )
     def public_technician_detail(cls, *, user_id: int) -> dict[str, object]:
-        leaderboard = cls.public_technician_leaderboard()
-        members = list(leaderboard.get("members", []))
-        selected_member = next(
-            (item for item in members if int(item.get("user_id", 0)) == int(user_id)),
-            None,
-        )
-        if selected_member is None:
+        position = TechnicianScoreService.rank_position(user_id=user_id)
+        if position is None:
             raise ValueError("Technician was not found.")
+        score_row, ranking = position
+        selected_member = cls._public_leaderboard_member(score_row)
 
-        total_technicians = max(int(leaderboard["summary"]["technicians_total"]), 1)
-        rank = int(selected_member["rank"])
+        total_technicians = max(int(ranking["total"]), 1)
+        rank = int(ranking["rank"])
         score = int(selected_member["score"])
         average_score = (
-            round(int(leaderboard["summary"]["total_score"]) / total_technicians, 2)
+            round(int(ranking["total_score"]) / total_technicians, 2)
             if total_technicians
             else 0.0
         )
@@ -365,108 +383,75 @@ class TicketAnalyticsService:
             else 100.0
         )
 
-        status_counts_raw = dict(
-            Ticket.domain.filter(technician_id=user_id)
-            .values("status")
-            .annotate(total=Count("id"))
-            .values_list("status", "total")
-        )
-        status_counts = {
-            TicketStatus.UNDER_REVIEW: int(
-                status_counts_raw.get(TicketStatus.UNDER_REVIEW, 0) or 0
-            ),
-            TicketStatus.NEW: int(status_counts_raw.get(TicketStatus.NEW, 0) or 0),
-            TicketStatus.ASSIGNED: int(
-                status_counts_raw.get(TicketStatus.ASSIGNED, 0) or 0
-            ),
-            TicketStatus.IN_PROGRESS: int(
-                status_counts_raw.get(TicketStatus.IN_PROGRESS, 0) or 0
-            ),
-            TicketStatus.WAITING_QC: int(
-                status_counts_raw.get(TicketStatus.WAITING_QC, 0) or 0
+        # Status counts cover alive tickets; QC events keep counting
+        # transitions of soft-deleted tickets, as the score rows do.
+        alive = Q(deleted_at__isnull=True)
+        ticket_counts = Ticket.all_objects.filter(technician_id=user_id).aggregate(
+            **{
+                str(ticket_status): Count(
+                    "id", filter=alive & Q(status=ticket_status), distinct=True
+                )
+                for ticket_status in (
+                    TicketStatus.UNDER_REVIEW,
+                    TicketStatus.NEW,
+                    TicketStatus.ASSIGNED,
+                    TicketStatus.IN_PROGRESS,
+                    TicketStatus.WAITING_QC,
+                    TicketStatus.REWORK,
+                    TicketStatus.DONE,
+                )
+            },
+            qc_pass_events_total=Count(
+                "transitions",
+                filter=Q(transitions__action=TicketTransitionAction.QC_PASS),
             ),
-            TicketStatus.REWORK: int(
-                status_counts_raw.get(TicketStatus.REWORK, 0) or 0
+            qc_fail_events_total=Count(
+                "transitions",
+                filter=Q(transitions__action=TicketTransitionAction.QC_FAIL),
             ),
-            TicketStatus.DONE: int(status_counts_raw.get(TicketStatus.DONE, 0) or 0),
-        }
-
-        qc_event_counts_raw = dict(
-            TicketTransition.objects.filter(
-                ticket__technician_id=user_id,
-                action__in=[
-                    TicketTransitionAction.QC_PASS,
-                    TicketTransitionAction.QC_FAIL,
-                ],
-            )
-            .values("action")
-            .annotate(total=Count("id"))
-            .values_list("action", "total")
-        )
-        qc_pass_events_total = int(
-            qc_event_counts_raw.get(TicketTransitionAction.QC_PASS, 0) or 0
-        )
-        qc_fail_events_total = int(
-            qc_event_counts_raw.get(TicketTransitionAction.QC_FAIL, 0) or 0
         )
+        qc_pass_events_total = int(ticket_counts.pop("qc_pass_events_total") or 0)
+        qc_fail_events_total = int(ticket_counts.pop("qc_fail_events_total") or 0)
+        status_counts = {key: int(value or 0) for key, value in ticket_counts.items()}
 
-        xp_breakdown_rows = list(
-            XPTransaction.objects.filter(user_id=user_id)
-            .values("entry_type")
-            .annotate(
-                total_amount=Sum("amount"),
-                total_count=Count("id"),
-            )
-            .order_by("-total_amount", "-total_count", "entry_type")
-        )
-        xp_by_entry_type = [
-            {
-                "entry_type": str(row["entry_type"]),
-                "total_amount": int(row["total_amount"] or 0),
-                "total_count": int(row["total_count"] or 0),
-            }
-            for row in xp_breakdown_rows
-        ]
-        recent_xp_rows = list(
-            XPTransaction.objects.filter(user_id=user_id)
-            .order_by("-created_at", "-id")
-            .values(
-                "id",
-                "amount",
-                "entry_type",
-                "description",
-                "reference",
-                "payload",
-                "created_at",
-            )[:20]
+        xp_by_entry_type = sorted(
+            (
+                {
+                    "entry_type": str(entry_type),
+                    "total_amount": total_amount,
+                    "total_count": total_count,
+                }
+                for entry_type, (
+                    total_amount,
+                    total_count,
+                ) in XPArchiveService.entry_type_totals(user_id=user_id).items()
+            ),
+            key=lambda row: (
+                -row["total_amount"],
+                -row["total_count"],
+                row["entry_type"],
+            ),
         )
+        recent = cls._public_technician_recent_rows(user_id=user_id)
         recent_xp_transactions = [
             {
-                "id": int(row["id"]),
-                "amount": int(row["amount"] or 0),
-                "entry_type": str(row["entry_type"]),
-                "description": row["description"],
-                "reference": str(row["reference"]),
-                "payload": row["payload"] or {},
-                "created_at": row["created_at"].isoformat(),
+                "id": int(row["row_id"]),
+                "ticket_id": row["row_ticket_id"],
+                "amount": int(row["row_amount"] or 0),
+                "entry_type": str(row["row_kind"]),
+                "description": row["row_text"],
+                "reference": str(row["row_reference"]),
+                "payload": row["row_payload"] or {},
+                "created_at": row["row_at"].isoformat(),
             }
-            for row in recent_xp_rows
+            for row in recent["xp"]
         ]
 
-        attendance_rows = list(
-            AttendanceRecord.domain.filter(
-                user_id=user_id,
-                check_in_at__isnull=False,
-            )
-            .values("work_date", "check_in_at", "check_out_at")
-            .order_by("-work_date")[:366]
-        )
-        attendance_days_total = len(attendance_rows)
         attendance_completed_days = 0
         attendance_minutes_total = 0
-        for row in attendance_rows:
-            check_in_at = row.get("check_in_at")
-            check_out_at = row.get("check_out_at")
+        for row in recent["attendance"]:
+            check_in_at = row["row_at"]
+            check_out_at = row["row_until"]
             if check_in_at is None or check_out_at is None:
                 continue
             attendance_completed_days += 1
@@ -479,32 +464,17 @@ class TicketAnalyticsService:
             else 0.0
         )
 
-        recent_done_ticket_rows = list(
-            Ticket.domain.filter(technician_id=user_id, status=TicketStatus.DONE)
-            .order_by("-finished_at", "-id")
-            .values(
-                "id",
-                "title",
-                "finished_at",
-                "total_duration",
-                "flag_color",
-                "xp_amount",
-                "is_manual",
-            )[:20]
-        )
         recent_done_tickets = [
             {
-                "id": int(row["id"]),
-                "title": row["title"],
-                "finished_at": (
-                    row["finished_at"].isoformat() if row.get("finished_at") else None
-                ),
-                "total_duration": int(row["total_duration"] or 0),
-                "flag_color": str(row["flag_color"]),
-                "xp_amount": int(row["xp_amount"] or 0),
-                "is_manual": bool(row["is_manual"]),
+                "id": int(row["row_id"]),
+                "title": row["row_text"],
+                "finished_at": (row["row_at"].isoformat() if row["row_at"] else None),
+                "total_duration": int(row["row_duration"] or 0),
+                "flag_color": str(row["row_kind"]),
+                "xp_amount": int(row["row_amount"] or 0),
+                "is_manual": bool(row["row_manual"]),
             }
-            for row in recent_done_ticket_rows
+            for row in recent["tickets"]
         ]
 
         components = selected_member["score_components"]
@@ -537,7 +507,7 @@ class TicketAnalyticsService:
         ][:3]
 
         return {
-            "generated_at": leaderboard["generated_at"],
+            "generated_at": timezone.now().isoformat(),
             "leaderboard_position": {
                 "rank": rank,
                 "total_technicians": total_technicians,
@@ -553,8 +523,7 @@ class TicketAnalyticsService:
             },
             "score_breakdown": {
                 "components": {
-                    key: int(value or 0)
-                    for key, value in components.items()
+                    key: int(value or 0) for key, value in components.items()
                 },
                 "contribution_items": contribution_items,
                 "reasoning": {
@@ -608,180 +577,124 @@ class TicketAnalyticsService:
             },
         }
 
-    @classmethod
-    def _active_technicians(cls) -> list[User]:
-        return list(
-            User.objects.filter(
-                deleted_at__isnull=True,
-                is_active=True,
-                roles__slug=RoleSlug.TECHNICIAN,
-                roles__deleted_at__isnull=True,
+    @staticmethod
+    def _public_technician_recent_rows(*, user_id: int) -> dict[str, list[dict]]:
+        """
+        Fetch recent XP entries, done tickets and check-ins in one UNION ALL.
+
+        Each part keeps its own order and limit inside an ``id IN`` subquery,
+        which SQLite also accepts in a compound statement; rows come back
+        unordered and are sorted per section here.
+        """
+        null_int = Value(None, output_field=models.IntegerField())
+        null_text = Value(None, output_field=models.TextField())
+        null_at = Value(None, output_field=models.DateTimeField())
+        columns = (
+            "row_section",
+            "row_id",
+            "row_ticket_id",
+            "row_amount",
+            "row_kind",
+            "row_text",
+            "row_reference",
+            "row_payload",
+            "row_at",
+            "row_until",
+            "row_duration",
+            "row_manual",
+        )
+        xp = (
+            XPTransaction.objects.filter(
+                id__in=XPTransaction.objects.filter(user_id=user_id)
+                .order_by("-created_at", "-id")
+                .values("id")[:20]
             )
-            .distinct()
-            .order_by("id")
-        )
-
-    @classmethod
-    def _public_leaderboard_members(
-        cls,
-        *,
-        technicians: list[User],
-    ) -> list[dict[str, object]]:
-        technician_ids = [int(user.id) for user in technicians]
-        if not technician_ids:
-            return []
-
-        done_ticket_rows = list(
-            Ticket.domain.filter(
-                technician_id__in=technician_ids,
-                status=TicketStatus.DONE,
-            ).values(
-                "id",
-                "technician_id",
-                "flag_color",
-                "total_duration",
+            .annotate(
+                row_section=Value("xp"),
+                row_id=F("id"),
+                row_ticket_id=F("ticket_id"),
+                row_amount=F("amount"),
+                row_kind=F("entry_type"),
+                row_text=F("description"),
+                row_reference=F("reference"),
+                row_payload=F("payload"),
+                row_at=F("created_at"),
+                row_until=null_at,
+                row_duration=null_int,
+                row_manual=Value(False),
             )
+            .order_by()
+            .values(*columns)
         )
-        done_ticket_ids = [int(row["id"]) for row in done_ticket_rows]
-        qc_failed_ticket_ids: set[int] = set()
-        if done_ticket_ids:
-            qc_failed_ticket_ids = set(
-                TicketTransition.objects.filter(
-                    ticket_id__in=done_ticket_ids,
-                    action=TicketTransitionAction.QC_FAIL,
+        tickets = (
+            Ticket.domain.filter(
+                id__in=Ticket.domain.filter(
+                    technician_id=user_id, status=TicketStatus.DONE
                 )
-                .values_list("ticket_id", flat=True)
-                .distinct()
+                .order_by("-finished_at", "-id")
+                .values("id")[:20]
             )
-
-        done_counts: dict[int, int] = defaultdict(int)
-        first_pass_counts: dict[int, int] = defaultdict(int)
-        rework_done_counts: dict[int, int] = defaultdict(int)
-        duration_sums: dict[int, int] = defaultdict(int)
-        flag_counts: dict[int, dict[str, int]] = defaultdict(
-            lambda: {
-                "green": 0,
-                "yellow": 0,
-                "red": 0,
-            }
-        )
-
-        for row in done_ticket_rows:
-            technician_id = int(row["technician_id"])
-            ticket_id = int(row["id"])
-            done_counts[technician_id] += 1
-            duration_sums[technician_id] += int(row["total_duration"] or 0)
-
-            flag_color = str(row.get("flag_color") or TicketColor.GREEN)
-            if flag_color in ("green", "yellow", "red"):
-                flag_counts[technician_id][flag_color] += 1
-
-            if ticket_id in qc_failed_ticket_ids:
-                rework_done_counts[technician_id] += 1
-            else:
-                first_pass_counts[technician_id] += 1
-
-        qc_fail_event_counts = dict(
-            TicketTransition.objects.filter(
-                ticket__technician_id__in=technician_ids,
-                action=TicketTransitionAction.QC_FAIL,
+            .annotate(
+                row_section=Value("tickets"),
+                row_id=F("id"),
+                row_ticket_id=F("id"),
+                row_amount=F("xp_amount"),
+                row_kind=F("flag_color"),
+                row_text=F("title"),
+                row_reference=null_text,
+                row_payload=Value(None, output_field=models.JSONField()),
+                row_at=F("finished_at"),
+                row_until=null_at,
+                row_duration=F("total_duration"),
+                row_manual=F("is_manual"),
             )
-            .values("ticket__technician_id")
-            .annotate(total=Count("id"))
-            .values_list("ticket__technician_id", "total")
+            .order_by()
+            .values(*columns)
         )
-
-        xp_totals = dict(
-            XPTransaction.objects.filter(user_id__in=technician_ids)
-            .values("user_id")
-            .annotate(total=Sum("amount"))
-            .values_list("user_id", "total")
-        )
-        attendance_totals = dict(
+        attendance = (
             AttendanceRecord.domain.filter(
-                user_id__in=technician_ids,
-                check_in_at__isnull=False,
-            )
-            .values("user_id")
-            .annotate(total=Count("id"))
-            .values_list("user_id", "total")
-        )
-
-        members: list[dict[str, object]] = []
-        for user in technicians:
-            user_id = int(user.id)
-            done_total = int(done_counts.get(user_id, 0) or 0)
-            first_pass_total = int(first_pass_counts.get(user_id, 0) or 0)
-            rework_done_total = int(rework_done_counts.get(user_id, 0) or 0)
-            qc_fail_events_total = int(qc_fail_event_counts.get(user_id, 0) or 0)
-            xp_total = int(xp_totals.get(user_id, 0) or 0)
-            attendance_total = int(attendance_totals.get(user_id, 0) or 0)
-            flags = flag_counts[user_id]
-            average_resolution_minutes = (
-                round(duration_sums[user_id] / done_total, 2) if done_total else 0.0
-            )
-            first_pass_rate_percent = (
-                round((first_pass_total / done_total) * 100, 2) if done_total else 0.0
-            )
-
-            tickets_done_points = done_total * cls.SCORE_WEIGHTS["tickets_done"]
-            xp_total_points = xp_total * cls.SCORE_WEIGHTS["xp_total"]
-            first_pass_points = (
-                first_pass_total * cls.SCORE_WEIGHTS["first_pass_done"]
-            )
-            quality_points = (
-                int(flags["green"]) * cls.SCORE_WEIGHTS["green_flag_done"]
-                + int(flags["yellow"]) * cls.SCORE_WEIGHTS["yellow_flag_done"]
-                - int(flags["red"]) * cls.SCORE_WEIGHTS["red_flag_done_penalty"]
-            )
-            attendance_points = (
-                attendance_total * cls.SCORE_WEIGHTS["attendance_day"]
-            )
-            rework_penalty_points = -(
-                rework_done_total * cls.SCORE_WEIGHTS["rework_done_penalty"]
-                + qc_fail_events_total * cls.SCORE_WEIGHTS["qc_fail_event_penalty"]
-            )
-            score = (
-                tickets_done_points
-                + xp_total_points
-                + first_pass_points
-                + quality_points
-                + attendance_points
-                + rework_penalty_points
+                id__in=AttendanceRecord.domain.filter(
+                    user_id=user_id, check_in_at__isnull=False
+                )
+                .order_by("-work_date")
+                .values("id")[:366]
             )
-
-            full_name = f"{user.first_name or ''} {user.last_name or ''}".strip()
-            members.append(
-                {
-                    "user_id": user_id,
-                    "name": full_name or user.username,
-                    "username": user.username,
-                    "level": int(user.level),
-                    "score": int(score),
-                    "score_components": {
-                        "tickets_done_points": int(tickets_done_points),
-                        "xp_total_points": int(xp_total_points),
-                        "first_pass_points": int(first_pass_points),
-                        "quality_points": int(quality_points),
-                        "attendance_points": int(attendance_points),
-                        "rework_penalty_points": int(rework_penalty_points),
-                    },
-                    "tickets_done_total": done_total,
-                    "tickets_first_pass_total": first_pass_total,
-                    "tickets_rework_total": rework_done_total,
-                    "first_pass_rate_percent": first_pass_rate_percent,
-                    "tickets_closed_by_flag": {
-                        "green": int(flags["green"]),
-                        "yellow": int(flags["yellow"]),
-                        "red": int(flags["red"]),
-                    },
-                    "xp_total": xp_total,
-                    "attendance_days_total": attendance_total,
-                    "average_resolution_minutes": average_resolution_minutes,
-                    "qc_fail_events_total": qc_fail_events_total,
-                }
+            .annotate(
+                row_section=Value("attendance"),
+                row_id=F("id"),
+                row_ticket_id=null_int,
+                row_amount=null_int,
+                row_kind=null_text,
+                row_text=null_text,
+                row_reference=null_text,
+                row_payload=Value(None, output_field=models.JSONField()),
+                row_at=F("check_in_at"),
+                row_until=F("check_out_at"),
+                row_duration=null_int,
+                row_manual=Value(False),
             )
+            .order_by()
+            .values(*columns)
+        )
+
+        sections: dict[str, list[dict]] = {"xp": [], "tickets": [], "attendance": []}
+        for row in xp.union(tickets, attendance, all=True):
+            sections[row["row_section"]].append(row)
+        newest_first = itemgetter("row_at", "row_id")
+        sections["xp"].sort(key=newest_first, reverse=True)
+        # Done tickets carry finished_at; a missing one sorts last.
+        sections["tickets"].sort(
+            key=lambda row: (row["row_at"] is not None, row["row_at"], row["row_id"]),
+            reverse=True,
+        )
+        return sections
 
+    @classmethod
+    def _public_leaderboard_members(cls) -> list[dict[str, object]]:
+        members = [
+            cls._public_leaderboard_member(row)
+            for row in TechnicianScoreService.active_technician_scores()
+        ]
         members.sort(
             key=lambda item: (
                 int(item["score"]),
@@ -796,15 +709,53 @@ class TicketAnalyticsService:
             row["rank"] = index
         return members
 
+    @classmethod
+    def _public_leaderboard_member(cls, row: TechnicianScore) -> dict[str, object]:
+        user = row.user
+        done_total = int(row.tickets_done_total)
+        first_pass_total = int(row.tickets_first_pass_total)
+        components = TechnicianScoreService.score_components(row)
+        average_resolution_minutes = (
+            round(int(row.resolution_minutes_total) / done_total, 2)
+            if done_total
+            else 0.0
+        )
+        first_pass_rate_percent = (
+            round((first_pass_total / done_total) * 100, 2) if done_total else 0.0
+        )
+
+        full_name = f"{user.first_name or ''} {user.last_name or ''}".strip()
+        return {
+            "user_id": int(row.user_id),
+            "name": full_name or user.username,
+            "username": user.username,
+            "level": int(user.level),
+            "score": int(row.score),
+            "score_components": {key: int(value) for key, value in components.items()},
+            "tickets_done_total": done_total,
+            "tickets_first_pass_total": first_pass_total,
+            "tickets_rework_total": int(row.tickets_rework_total),
+            "first_pass_rate_percent": first_pass_rate_percent,
+            "tickets_closed_by_flag": {
+                "green": int(row.tickets_flag_green_total),
+                "yellow": int(row.tickets_flag_yellow_total),
+                "red": int(row.tickets_flag_red_total),
+            },
+            "xp_total": int(row.xp_total),
+            "attendance_days_total": int(row.attendance_days_total),
+            "average_resolution_minutes": average_resolution_minutes,
+            "qc_fail_events_total": int(row.qc_fail_events_total),
+        }
+
     @classmethod
     def _backlog_kpis(
         cls,
         *,
-        active_tickets_qs,
+        counters: dict[str, int],
         backlog_counts: dict[str, int],
         now_utc,
     ) -> dict[str, float | int]:
-        total = int(active_tickets_qs.count())
+        total = int(counters.get("tickets.active.total", 0))
         if total <= 0:
             return {
                 "avg_flag_minutes": 0.0,
@@ -813,25 +764,16 @@ class TicketAnalyticsService:
                 "black_or_worse_count": 0,
             }
 
-        total_flag_minutes = 0
-        total_age_minutes = 0
-        for created_at, flag_minutes in active_tickets_qs.values_list(
-            "created_at",
-            "flag_minutes",
-        ):
-            total_flag_minutes += int(flag_minutes or 0)
-            ticket_age_minutes = max(
-                int((now_utc - created_at).total_seconds() // 60),
-                0,
-            )
-            total_age_minutes += ticket_age_minutes
+        total_flag_minutes = int(counters.get("tickets.active.flag_minutes_sum", 0))
+        created_epoch_sum = int(counters.get("tickets.active.created_epoch_sum", 0))
+        total_age_seconds = max(int(now_utc.timestamp()) * total - created_epoch_sum, 0)
 
         red_or_worse = int(backlog_counts.get("red", 0))
         black_or_worse = red_or_worse
 
         return {
             "avg_flag_minutes": round(total_flag_minutes / total, 2),
-            "avg_age_minutes": round(total_age_minutes / total, 2),
+            "avg_age_minutes": round(total_age_seconds / 60 / total, 2),
             "red_or_worse_count": red_or_worse,
             "black_or_worse_count": black_or_worse,
         }
@@ -859,113 +801,86 @@ class TicketAnalyticsService:
         }
 
     @classmethod
-    def _qc_kpis(cls, *, now_utc, days: int) -> dict[str, object]:
+    def _qc_kpis(
+        cls,
+        *,
+        now_utc,
+        days: int,
+        granularity: str = AnalyticsGranularity.DAY,
+    ) -> dict[str, object]:
         window_days = max(1, int(days))
-        end_date = now_utc.date()
+        end_date = TechnicianDailyStatsService.business_date(now_utc)
         start_date = end_date - timedelta(days=window_days - 1)
 
-        done_records = list(
-            Ticket.domain.filter(
-                status=TicketStatus.DONE,
-                finished_at__date__gte=start_date,
-                finished_at__date__lte=end_date,
-            ).values("id", "finished_at__date")
-        )
-        done_ticket_ids = [record["id"] for record in done_records]
-
-        qc_failed_ticket_ids: set[int] = set()
-        if done_ticket_ids:
-            qc_failed_ticket_ids = set(
-                TicketTransition.objects.filter(
-                    ticket_id__in=done_ticket_ids,
-                    action=TicketTransitionAction.QC_FAIL,
-                )
-                .values_list("ticket_id", flat=True)
-                .distinct()
-            )
-
-        qc_event_rows = list(
-            TicketTransition.objects.filter(
-                action__in=[
-                    TicketTransitionAction.QC_PASS,
-                    TicketTransitionAction.QC_FAIL,
-                ],
-                created_at__date__gte=start_date,
-                created_at__date__lte=end_date,
-            )
-            .values("action", "created_at__date")
-            .annotate(total=Count("id"))
-        )
-
-        done_by_date: dict[object, int] = defaultdict(int)
-        first_pass_by_date: dict[object, int] = defaultdict(int)
-        rework_by_date: dict[object, int] = defaultdict(int)
-        first_pass_total = 0
-
-        for record in done_records:
-            ticket_id = int(record["id"])
-            done_date = record["finished_at__date"]
-            done_by_date[done_date] += 1
-            if ticket_id in qc_failed_ticket_ids:
-                rework_by_date[done_date] += 1
-                continue
-            first_pass_total += 1
-            first_pass_by_date[done_date] += 1
-
-        qc_pass_by_date: dict[object, int] = defaultdict(int)
-        qc_fail_by_date: dict[object, int] = defaultdict(int)
-        qc_pass_total = 0
-        qc_fail_total = 0
-        for row in qc_event_rows:
-            action = row["action"]
-            event_date = row["created_at__date"]
-            total = int(row["total"] or 0)
-            if action == TicketTransitionAction.QC_PASS:
-                qc_pass_by_date[event_date] += total
-                qc_pass_total += total
-            elif action == TicketTransitionAction.QC_FAIL:
-                qc_fail_by_date[event_date] += total
-                qc_fail_total += total
-
-        done_total = len(done_records)
-        rework_total = done_total - first_pass_total
-        first_pass_rate_total = (
-            round((first_pass_total / done_total) * 100, 2) if done_total else 0.0
+        totals_by_period = TechnicianDailyStatsService.totals_by_period(
+            date_from=start_date,
+            date_to=end_date,
+            granularity=granularity,
+            fields=cls.QC_ROLLUP_FIELDS,
         )
 
         trend: list[dict[str, object]] = []
-        for idx in range(window_days):
-            day = start_date + timedelta(days=idx)
-            day_done_total = int(done_by_date.get(day, 0))
-            day_first_pass = int(first_pass_by_date.get(day, 0))
-            day_rework = int(rework_by_date.get(day, 0))
+        for period_start, period_end in cls._periods(
+            start_date=start_date, end_date=end_date, granularity=granularity
+        ):
+            totals = totals_by_period.get(period_start, {})
             trend.append(
                 {
-                    "date": day.isoformat(),
-                    "done": day_done_total,
-                    "first_pass_done": day_first_pass,
-                    "rework_done": day_rework,
-                    "first_pass_rate_percent": (
-                        round((day_first_pass / day_done_total) * 100, 2)
-                        if day_done_total
-                        else 0.0
-                    ),
-                    "qc_pass_events": int(qc_pass_by_date.get(day, 0)),
-                    "qc_fail_events": int(qc_fail_by_date.get(day, 0)),
+                    # Edge periods are clipped to the requested window.
+                    "date": max(period_start, start_date).isoformat(),
+                    "end_date": min(period_end, end_date).isoformat(),
+                    **cls._qc_point(totals),
                 }
             )
 
+        period_totals = {
+            field: sum(int(row.get(field, 0)) for row in totals_by_period.values())
+            for field in cls.QC_ROLLUP_FIELDS
+        }
+        totals = cls._qc_point(period_totals)
+        # Rework is derived so totals stay consistent with first-pass counts.
+        totals["rework_done"] = totals["done"] - totals["first_pass_done"]
+
         return {
             "window_days": window_days,
+            "granularity": granularity,
             "start_date": start_date.isoformat(),
             "end_date": end_date.isoformat(),
-            "totals": {
-                "done": done_total,
-                "first_pass_done": first_pass_total,
-                "rework_done": rework_total,
-                "first_pass_rate_percent": first_pass_rate_total,
-                "qc_pass_events": qc_pass_total,
-                "qc_fail_events": qc_fail_total,
-            },
+            "totals": totals,
             "trend": trend,
         }
+
+    @staticmethod
+    def _qc_point(totals: dict[str, int]) -> dict[str, object]:
+        done = int(totals.get("tickets_done", 0))
+        first_pass = int(totals.get("tickets_first_pass", 0))
+        return {
+            "done": done,
+            "first_pass_done": first_pass,
+            "rework_done": int(totals.get("tickets_rework", 0)),
+            "first_pass_rate_percent": (
+                round((first_pass / done) * 100, 2) if done else 0.0
+            ),
+            "qc_pass_events": int(totals.get("qc_pass_events", 0)),
+            "qc_fail_events": int(totals.get("qc_fail_events", 0)),
+        }
+
+    @staticmethod
+    def _periods(*, start_date, end_date, granularity: str):
+        """Yield unclipped ``(start, end)`` periods covering the window."""
+        if granularity == AnalyticsGranularity.WEEK:
+            cursor = start_date - timedelta(days=start_date.weekday())
+        elif granularity == AnalyticsGranularity.MONTH:
+            cursor = start_date.replace(day=1)
+        else:
+            cursor = start_date
+
+        while cursor <= end_date:
+            if granularity == AnalyticsGranularity.WEEK:
+                next_start = cursor + timedelta(days=7)
+            elif granularity == AnalyticsGranularity.MONTH:
+                next_start = (cursor + timedelta(days=32)).replace(day=1)
+            else:
+                next_start = cursor + timedelta(days=1)
+            yield cursor, next_start - timedelta(days=1)
+            cursor = next_start
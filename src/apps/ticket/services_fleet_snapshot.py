@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+
+from inventory.models import FleetSnapshotCounter, InventoryItem
+from ticket.models import Ticket
+
+logger = logging.getLogger(__name__)
+
+
+class FleetSnapshotService:
+    """Reads and reconciles the incrementally maintained fleet counters."""
+
+    RECONCILED_AT_KEY = "meta.reconciled_at"
+    TRACKED_MODELS = (InventoryItem, Ticket)
+
+    @classmethod
+    def counters(cls) -> dict[str, int]:
+        # Seeding belongs to the migration and the reconcile task, never reads.
+        return FleetSnapshotCounter.domain.values_by_key()
+
+    @classmethod
+    def recount(cls) -> dict[str, int]:
+        """Recompute every counter with one conditional aggregate per model."""
+        totals: dict[str, int] = {}
+        for model in cls.TRACKED_MODELS:
+            totals.update(
+                model.fleet_counter_totals(
+                    model.all_objects.filter(deleted_at__isnull=True)
+                )
+            )
+        return totals
+
+    @classmethod
+    @transaction.atomic
+    def reconcile(cls) -> dict[str, object]:
+        """
+        Compare stored counters with a full recount and overwrite them.
+
+        Writers apply deltas inside their own transaction while holding the
+        counter lock shared; the lock is taken here exclusively before the
+        recount, so every write is either fully in the recount or applies its
+        delta on top of the repaired values after this transaction commits.
+        """
+        stored = FleetSnapshotCounter.domain.lock_all()
+        expected = cls.recount()
+        drift = {
+            key: stored.get(key, 0) - expected.get(key, 0)
+            for key in sorted(set(stored) | set(expected))
+            if not key.startswith("meta.")
+            and stored.get(key, 0) != expected.get(key, 0)
+        }
+        was_initialized = cls.RECONCILED_AT_KEY in stored
+        if drift and was_initialized:
+            logger.warning("Fleet snapshot drift repaired: %s", drift)
+
+        expected[cls.RECONCILED_AT_KEY] = int(timezone.now().timestamp())
+        FleetSnapshotCounter.domain.replace_values(expected)
+        return {
+            "initialized": not was_initialized,
+            "drift": drift,
+            "counters": len(expected),
+        }
@@ -0,0 +1,402 @@
+from __future__ import annotations
+
+import itertools
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from operator import itemgetter
+from typing import Any
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from account.models import User
+from core.utils.business_dates import business_date, business_day_start
+from core.utils.constants import TicketFunnelDimension, TicketStatus
+from core.utils.swr_cache import stale_while_revalidate
+from inventory.models import InventoryItemCategory
+from ticket.models import Ticket, TicketFunnelStats, TicketTransition
+from ticket.services_analytics import TicketAnalyticsService
+
+CohortKey = tuple[date, str, int]
+
+
+@dataclass(slots=True)
+class _CohortTally:
+    ticket_count: int = 0
+    rework_ticket_count: int = 0
+    # Deepest funnel stage index -> tickets that stopped there.
+    depth_counts: Counter[int] = field(default_factory=Counter)
+    transitions: Counter[str] = field(default_factory=Counter)
+
+
+class TicketFunnelAnalyticsService:
+    """
+    Stage conversion and drop-off of weekly intake cohorts.
+
+    Tickets are grouped by the business week of ``created_at``. One ordered
+    pass over ``TicketTransition`` yields each ticket's deepest funnel stage
+    and its ``from>to`` edges; the per-cohort tallies are persisted in
+    ``TicketFunnelStats`` by the build task and the rebuild command so reads
+    only touch the rollup.
+    """
+
+    FUNNEL_STAGES = (
+        TicketStatus.UNDER_REVIEW,
+        TicketStatus.NEW,
+        TicketStatus.ASSIGNED,
+        TicketStatus.IN_PROGRESS,
+        TicketStatus.WAITING_QC,
+        TicketStatus.DONE,
+    )
+    # Rework always follows a QC review, so it counts as reaching WAITING_QC.
+    STAGE_DEPTH = {
+        **{stage: depth for depth, stage in enumerate(FUNNEL_STAGES)},
+        TicketStatus.REWORK: FUNNEL_STAGES.index(TicketStatus.WAITING_QC),
+    }
+    MAX_WEEKS = 52
+    # Young cohorts keep moving through the funnel; every build refreshes these.
+    OPEN_COHORT_WEEKS = 2
+    ADVISORY_LOCK_KEY = (8018, 0)
+    NIGHTLY_REBUILD_WEEKS = 8
+
+    @staticmethod
+    def week_start(value: date) -> date:
+        return value - timedelta(days=value.weekday())
+
+    @stale_while_revalidate(
+        namespace="analytics.ticket_funnel",
+        fresh_seconds=TicketAnalyticsService.CACHE_FRESH_SECONDS,
+        stale_seconds=TicketAnalyticsService.CACHE_STALE_SECONDS,
+        tags=(TicketAnalyticsService.CACHE_TAG,),
+    )
+    def summary(
+        cls,
+        *,
+        weeks: int = 12,
+        dimension: str = TicketFunnelDimension.ALL,
+    ) -> dict[str, object]:
+        now = timezone.now()
+        week_count = min(max(1, int(weeks)), cls.MAX_WEEKS)
+        current_week = cls.week_start(business_date(now))
+        week_from = current_week - timedelta(weeks=week_count - 1)
+
+        rows = list(
+            TicketFunnelStats.objects.filter(
+                dimension=dimension,
+                week_start__gte=week_from,
+                week_start__lte=current_week,
+            )
+            .order_by("week_start", "dimension_id")
+            .values(
+                "week_start",
+                "dimension_id",
+                "ticket_count",
+                "rework_ticket_count",
+                "reached",
+                "transitions",
+            )
+        )
+        names = cls._dimension_names(
+            dimension=dimension,
+            ids={row["dimension_id"] for row in rows},
+        )
+
+        totals: dict[int, dict[str, Any]] = {}
+        cohorts = []
+        for row in rows:
+            dimension_id = row["dimension_id"]
+            total = totals.setdefault(
+                dimension_id,
+                {
+                    "ticket_count": 0,
+                    "rework_ticket_count": 0,
+                    "reached": Counter(),
+                    "transitions": Counter(),
+                },
+            )
+            total["ticket_count"] += row["ticket_count"]
+            total["rework_ticket_count"] += row["rework_ticket_count"]
+            total["reached"].update(row["reached"])
+            total["transitions"].update(row["transitions"])
+            cohorts.append(
+                {
+                    "week_start": row["week_start"].isoformat(),
+                    **cls._funnel_payload(
+                        dimension_id=dimension_id,
+                        name=names.get(dimension_id),
+                        **{key: row[key] for key in total},
+                    ),
+                }
+            )
+
+        return {
+            "generated_at": now.isoformat(),
+            "dimension": dimension,
+            "weeks": week_count,
+            "start_date": week_from.isoformat(),
+            "end_date": (current_week + timedelta(days=6)).isoformat(),
+            "stages": list(cls.FUNNEL_STAGES),
+            "totals": [
+                cls._funnel_payload(
+                    dimension_id=dimension_id,
+                    name=names.get(dimension_id),
+                    **total,
+                )
+                for dimension_id, total in sorted(totals.items())
+            ],
+            "cohorts": cohorts,
+        }
+
+    @classmethod
+    def build_missing(cls) -> dict[str, Any]:
+        """Build unbuilt cohort weeks of the window and refresh the open cohorts."""
+        week_to = cls.week_start(business_date())
+        week_from = week_to - timedelta(weeks=cls.MAX_WEEKS - 1)
+        open_weeks = set(
+            cls._week_starts(
+                week_from=week_to - timedelta(weeks=cls.OPEN_COHORT_WEEKS - 1),
+                week_to=week_to,
+            )
+        )
+        missing = cls._missing_weeks(week_from=week_from, week_to=week_to)
+        return {
+            "week_from": week_from.isoformat(),
+            "week_to": week_to.isoformat(),
+            "rows": cls._build(week_starts=missing | open_weeks),
+        }
+
+    @classmethod
+    def ensure_built(cls, *, week_from: date, week_to: date) -> int:
+        """Build cohort weeks in range that have no fleet-wide row yet."""
+        missing = cls._missing_weeks(week_from=week_from, week_to=week_to)
+        return cls._build(week_starts=missing) if missing else 0
+
+    @classmethod
+    def _missing_weeks(cls, *, week_from: date, week_to: date) -> set[date]:
+        built = set(
+            TicketFunnelStats.objects.filter(
+                dimension=TicketFunnelDimension.ALL,
+                week_start__gte=week_from,
+                week_start__lte=week_to,
+            ).values_list("week_start", flat=True)
+        )
+        return set(cls._week_starts(week_from=week_from, week_to=week_to)) - built
+
+    @classmethod
+    def rebuild(
+        cls, *, week_from: date | None = None, week_to: date | None = None
+    ) -> dict[str, Any]:
+        """Recompute stored cohorts, by default for the last eight intake weeks."""
+        resolved_week_to = cls.week_start(week_to or business_date())
+        resolved_week_from = cls.week_start(
+            week_from
+            or resolved_week_to - timedelta(weeks=cls.NIGHTLY_REBUILD_WEEKS - 1)
+        )
+        if resolved_week_from > resolved_week_to:
+            raise ValueError("week_from must be less than or equal to week_to.")
+        rows_written = cls._build(
+            week_starts=set(
+                cls._week_starts(week_from=resolved_week_from, week_to=resolved_week_to)
+            )
+        )
+        return {
+            "week_from": resolved_week_from.isoformat(),
+            "week_to": resolved_week_to.isoformat(),
+            "rows": rows_written,
+        }
+
+    @classmethod
+    @transaction.atomic
+    def _build(cls, *, week_starts: set[date]) -> int:
+        cls._lock_builds()
+        tallies = cls._compute(
+            date_from=min(week_starts), date_to=max(week_starts) + timedelta(days=6)
+        )
+        # Every built week gets a fleet-wide row so empty weeks are not rebuilt.
+        for week in week_starts:
+            tallies.setdefault((week, TicketFunnelDimension.ALL, 0), _CohortTally())
+
+        TicketFunnelStats.objects.filter(week_start__in=week_starts).delete()
+        TicketFunnelStats.objects.bulk_create(
+            [
+                TicketFunnelStats(
+                    week_start=week,
+                    dimension=dimension,
+                    dimension_id=dimension_id,
+                    ticket_count=tally.ticket_count,
+                    rework_ticket_count=tally.rework_ticket_count,
+                    reached=cls._reached(tally.depth_counts),
+                    transitions=dict(tally.transitions),
+                )
+                for (week, dimension, dimension_id), tally in tallies.items()
+                if week in week_starts
+            ],
+            batch_size=1000,
+        )
+        return sum(1 for key in tallies if key[0] in week_starts)
+
+    @classmethod
+    def _lock_builds(cls) -> None:
+        # Concurrent builds of one week would both delete and re-insert its
+        # rows and collide on the unique key; the task and the command queue
+        # here instead. SQLite serialises writers on its own.
+        if connection.vendor != "postgresql":
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_advisory_xact_lock(%s, %s)", list(cls.ADVISORY_LOCK_KEY)
+            )
+
+    @classmethod
+    def _compute(
+        cls, *, date_from: date, date_to: date
+    ) -> dict[CohortKey, _CohortTally]:
+        cohort = Ticket.domain.filter(
+            created_at__gte=business_day_start(date_from),
+            created_at__lt=business_day_start(date_to + timedelta(days=1)),
+        )
+        tickets = {
+            row["id"]: row
+            for row in cohort.values(
+                "id",
+                "created_at",
+                "status",
+                "approved_at",
+                "master_id",
+                "inventory_item__category_id",
+            )
+        }
+        if not tickets:
+            return {}
+
+        transitions = (
+            TicketTransition.objects.filter(ticket__in=cohort)
+            .order_by("ticket_id", "created_at", "id")
+            .values_list("ticket_id", "from_status", "to_status")
+            .iterator(chunk_size=2000)
+        )
+        tallies: dict[CohortKey, _CohortTally] = defaultdict(_CohortTally)
+        seen: set[int] = set()
+        grouped = (
+            (ticket_id, [step[1:] for step in steps])
+            for ticket_id, steps in itertools.groupby(transitions, key=itemgetter(0))
+        )
+        for ticket_id, steps in itertools.chain(
+            grouped, ((ticket_id, []) for ticket_id in tickets if ticket_id not in seen)
+        ):
+            seen.add(ticket_id)
+            ticket = tickets[ticket_id]
+            depth, edges, reworked = cls._ticket_path(ticket, steps)
+            week = cls.week_start(business_date(ticket["created_at"]))
+            for dimension, dimension_id in (
+                (TicketFunnelDimension.ALL, 0),
+                (TicketFunnelDimension.CATEGORY, ticket["inventory_item__category_id"]),
+                (TicketFunnelDimension.MASTER, ticket["master_id"]),
+            ):
+                tally = tallies[(week, dimension, dimension_id)]
+                tally.ticket_count += 1
+                tally.rework_ticket_count += int(reworked)
+                tally.depth_counts[depth] += 1
+                tally.transitions.update(edges)
+        return tallies
+
+    @classmethod
+    def _ticket_path(
+        cls, ticket: dict[str, Any], steps: Iterable[tuple[str | None, str]]
+    ) -> tuple[int, list[str], bool]:
+        """Return a ticket's deepest stage index, its edges and rework flag."""
+        depth = cls.STAGE_DEPTH[ticket["status"]]
+        if ticket["approved_at"] is not None:
+            depth = max(depth, cls.STAGE_DEPTH[TicketStatus.NEW])
+        edges: list[str] = []
+        reworked = False
+        previous_status: str | None = None
+        for from_status, to_status in steps:
+            # An empty origin marks a transition logged without ``from_status``.
+            edges.append(f"{from_status or previous_status or ''}>{to_status}")
+            depth = max(depth, cls.STAGE_DEPTH.get(to_status, 0))
+            reworked = reworked or to_status == TicketStatus.REWORK
+            previous_status = to_status
+        return depth, edges, reworked
+
+    @classmethod
+    def _reached(cls, depth_counts: Counter[int]) -> dict[str, int]:
+        """Turn "stopped at stage" counts into "got at least this far" counts."""
+        reached: dict[str, int] = {}
+        running = 0
+        for depth in range(len(cls.FUNNEL_STAGES) - 1, -1, -1):
+            running += depth_counts.get(depth, 0)
+            reached[cls.FUNNEL_STAGES[depth]] = running
+        return {stage: reached[stage] for stage in cls.FUNNEL_STAGES}
+
+    @classmethod
+    def _funnel_payload(
+        cls,
+        *,
+        dimension_id: int,
+        name: str | None,
+        ticket_count: int,
+        rework_ticket_count: int,
+        reached: dict[str, int],
+        transitions: dict[str, int],
+    ) -> dict[str, Any]:
+        counts = [int(reached.get(stage, 0)) for stage in cls.FUNNEL_STAGES]
+        stages = []
+        for index, stage in enumerate(cls.FUNNEL_STAGES):
+            next_count = counts[index + 1] if index + 1 < len(counts) else None
+            stages.append(
+                {
+                    "stage": stage,
+                    "reached": counts[index],
+                    "reached_percent": cls._percent(counts[index], ticket_count),
+                    "conversion_percent": (
+                        None
+                        if next_count is None
+                        else cls._percent(next_count, counts[index])
+                    ),
+                    "drop_off": (
+                        None if next_count is None else counts[index] - next_count
+                    ),
+                }
+            )
+        return {
+            "dimension_id": dimension_id or None,
+            "name": name,
+            "tickets": ticket_count,
+            "rework_tickets": rework_ticket_count,
+            "stages": stages,
+            "transitions": dict(sorted(transitions.items())),
+        }
+
+    @staticmethod
+    def _percent(part: int, whole: int) -> float:
+        return round(part / whole * 100, 2) if whole else 0.0
+
+    @staticmethod
+    def _dimension_names(*, dimension: str, ids: set[int]) -> dict[int, str]:
+        if dimension == TicketFunnelDimension.MASTER:
+            return {
+                user.id: (
+                    f"{user.first_name or ''} {user.last_name or ''}".strip()
+                    or user.username
+                )
+                for user in User.objects.filter(id__in=ids).only(
+                    "id", "first_name", "last_name", "username"
+                )
+            }
+        if dimension == TicketFunnelDimension.CATEGORY:
+            return dict(
+                InventoryItemCategory.objects.filter(id__in=ids).values_list(
+                    "id", "name"
+                )
+            )
+        return {}
+
+    @staticmethod
+    def _week_starts(*, week_from: date, week_to: date) -> list[date]:
+        return [
+            week_from + timedelta(weeks=offset)
+            for offset in range((week_to - week_from).days // 7 + 1)
+        ]
@@ -0,0 +1,479 @@
+from __future__ import annotations
+
+import itertools
+import math
+from collections import defaultdict
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from account.models import User
+from core.utils.business_dates import business_date
+from core.utils.constants import (
+    TicketStage,
+    TicketStageDimension,
+    TicketStatus,
+    TicketTransitionAction,
+)
+from core.utils.swr_cache import stale_while_revalidate
+from inventory.models import InventoryItem, InventoryItemCategory
+from ticket.models import Ticket, TicketStageStats, TicketTransition
+from ticket.services_analytics import TicketAnalyticsService
+
+StatsKey = tuple[date, str, str, int]
+
+
+class TicketStageAnalyticsService:
+    """
+    Weekly stage-duration percentiles for done tickets.
+
+    Durations come from the ticket transition log and are grouped by the
+    business week of ``finished_at``. PostgreSQL computes them in one query with
+    ``LEAD`` and ``percentile_cont``; other databases stream transitions through
+    Python. Results are persisted in ``TicketStageStats`` by the build task and
+    the rebuild command; reads only select stored rows.
+    """
+
+    PERCENTILES = (0.5, 0.9, 0.99)
+    MAX_WEEKS = 52
+    ADVISORY_LOCK_KEY = (8015, 0)
+    NIGHTLY_REBUILD_WEEKS = 2
+    # Stage -> transition target status whose dwell time it sums.
+    DWELL_STAGES = {
+        TicketStage.TIME_IN_PROGRESS: TicketStatus.IN_PROGRESS,
+        TicketStage.TIME_IN_QC: TicketStatus.WAITING_QC,
+    }
+
+    @staticmethod
+    def week_start(value: date) -> date:
+        return value - timedelta(days=value.weekday())
+
+    @stale_while_revalidate(
+        namespace="analytics.stage_durations",
+        fresh_seconds=TicketAnalyticsService.CACHE_FRESH_SECONDS,
+        stale_seconds=TicketAnalyticsService.CACHE_STALE_SECONDS,
+        tags=(TicketAnalyticsService.CACHE_TAG,),
+    )
+    def summary(
+        cls,
+        *,
+        weeks: int = 8,
+        dimension: str = TicketStageDimension.ALL,
+    ) -> dict[str, object]:
+        now = timezone.now()
+        week_count = min(max(1, int(weeks)), cls.MAX_WEEKS)
+        current_week = cls.week_start(business_date(now))
+        week_from = current_week - timedelta(weeks=week_count - 1)
+
+        rows = list(
+            TicketStageStats.objects.filter(
+                dimension=dimension,
+                week_start__gte=week_from,
+                week_start__lte=current_week,
+            ).order_by("week_start", "dimension_id", "stage")
+        )
+        names = cls._dimension_names(
+            dimension=dimension,
+            ids={row.dimension_id for row in rows},
+        )
+
+        series: dict[tuple[date, int], dict[str, Any]] = {}
+        for row in rows:
+            point = series.setdefault(
+                (row.week_start, row.dimension_id),
+                {
+                    "week_start": row.week_start.isoformat(),
+                    "dimension_id": row.dimension_id or None,
+                    "name": names.get(row.dimension_id),
+                    "stages": {},
+                },
+            )
+            point["stages"][row.stage] = {
+                "count": row.sample_count,
+                "avg_minutes": cls._minutes(row.avg_seconds),
+                "p50_minutes": cls._minutes(row.p50_seconds),
+                "p90_minutes": cls._minutes(row.p90_seconds),
+                "p99_minutes": cls._minutes(row.p99_seconds),
+            }
+
+        return {
+            "generated_at": now.isoformat(),
+            "dimension": dimension,
+            "weeks": week_count,
+            "start_date": week_from.isoformat(),
+            "end_date": (current_week + timedelta(days=6)).isoformat(),
+            "stages": list(TicketStage.values),
+            "series": list(series.values()),
+        }
+
+    @classmethod
+    def build_missing(cls) -> dict[str, Any]:
+        """Build unbuilt weeks of the trailing window and refresh the open week."""
+        week_to = cls.week_start(business_date())
+        week_from = week_to - timedelta(weeks=cls.MAX_WEEKS - 1)
+        missing = cls._missing_weeks(week_from=week_from, week_to=week_to)
+        return {
+            "week_from": week_from.isoformat(),
+            "week_to": week_to.isoformat(),
+            "rows": cls._build(week_starts=missing | {week_to}),
+        }
+
+    @classmethod
+    def ensure_built(cls, *, week_from: date, week_to: date) -> int:
+        """Build weeks in range that have no fleet-wide rows yet."""
+        missing = cls._missing_weeks(week_from=week_from, week_to=week_to)
+        return cls._build(week_starts=missing) if missing else 0
+
+    @classmethod
+    def _missing_weeks(cls, *, week_from: date, week_to: date) -> set[date]:
+        built = set(
+            TicketStageStats.objects.filter(
+                dimension=TicketStageDimension.ALL,
+                week_start__gte=week_from,
+                week_start__lte=week_to,
+            ).values_list("week_start", flat=True)
+        )
+        return set(cls._week_starts(week_from=week_from, week_to=week_to)) - built
+
+    @classmethod
+    def rebuild(
+        cls, *, week_from: date | None = None, week_to: date | None = None
+    ) -> dict[str, Any]:
+        """Recompute stored percentiles, by default for the last two weeks."""
+        resolved_week_to = cls.week_start(week_to or business_date())
+        resolved_week_from = cls.week_start(
+            week_from
+            or resolved_week_to - timedelta(weeks=cls.NIGHTLY_REBUILD_WEEKS - 1)
+        )
+        if resolved_week_from > resolved_week_to:
+            raise ValueError("week_from must be less than or equal to week_to.")
+        rows_written = cls._build(
+            week_starts=set(
+                cls._week_starts(week_from=resolved_week_from, week_to=resolved_week_to)
+            )
+        )
+        return {
+            "week_from": resolved_week_from.isoformat(),
+            "week_to": resolved_week_to.isoformat(),
+            "rows": rows_written,
+        }
+
+    @classmethod
+    @transaction.atomic
+    def _build(cls, *, week_starts: set[date]) -> int:
+        cls._lock_builds()
+        date_from = min(week_starts)
+        date_to = max(week_starts) + timedelta(days=6)
+        if connection.vendor == "postgresql":
+            stats = cls._compute_postgres(date_from=date_from, date_to=date_to)
+        else:
+            stats = cls._compute_streaming(date_from=date_from, date_to=date_to)
+
+        # Every built week gets fleet-wide rows so empty weeks are not rebuilt.
+        for week in week_starts:
+            for stage in TicketStage.values:
+                stats.setdefault((week, stage, TicketStageDimension.ALL, 0), {})
+
+        TicketStageStats.objects.filter(week_start__in=week_starts).delete()
+        TicketStageStats.objects.bulk_create(
+            [
+                TicketStageStats(
+                    week_start=week,
+                    stage=stage,
+                    dimension=dimension,
+                    dimension_id=dimension_id,
+                    **values,
+                )
+                for (week, stage, dimension, dimension_id), values in stats.items()
+                if week in week_starts
+            ],
+            batch_size=1000,
+        )
+        return sum(1 for key in stats if key[0] in week_starts)
+
+    @classmethod
+    def _lock_builds(cls) -> None:
+        # Concurrent builds of one week would both delete and re-insert its
+        # rows and collide on the unique key; the task and the command queue
+        # here instead. SQLite serialises writers on its own.
+        if connection.vendor != "postgresql":
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_advisory_xact_lock(%s, %s)", list(cls.ADVISORY_LOCK_KEY)
+            )
+
+    @classmethod
+    def _compute_streaming(
+        cls, *, date_from: date, date_to: date
+    ) -> dict[StatsKey, dict[str, int]]:
+        tickets = {
+            row["id"]: row
+            for row in cls._done_tickets(date_from=date_from, date_to=date_to).values(
+                "id",
+                "created_at",
+                "finished_at",
+                "finished_business_date",
+                "technician_id",
+                "inventory_item__category_id",
+            )
+        }
+        if not tickets:
+            return {}
+
+        transitions = (
+            TicketTransition.objects.filter(ticket_id__in=list(tickets))
+            .order_by("ticket_id", "created_at", "id")
+            .values_list("ticket_id", "action", "to_status", "created_at")
+            .iterator(chunk_size=2000)
+        )
+        samples: dict[StatsKey, list[float]] = defaultdict(list)
+        grouped = cls._group_by_ticket(transitions)
+        seen: set[int] = set()
+        # Tickets without transitions still contribute their cycle time.
+        for ticket_id, steps in itertools.chain(
+            grouped, ((ticket_id, []) for ticket_id in tickets if ticket_id not in seen)
+        ):
+            seen.add(ticket_id)
+            ticket = tickets[ticket_id]
+            week = cls.week_start(ticket["finished_business_date"])
+            for stage, seconds in cls._stage_seconds(ticket, steps).items():
+                for dimension, dimension_id in cls._dimension_keys(
+                    technician_id=ticket["technician_id"],
+                    category_id=ticket["inventory_item__category_id"],
+                ):
+                    samples[(week, stage, dimension, dimension_id)].append(seconds)
+
+        return {key: cls._summarize(values) for key, values in samples.items()}
+
+    @classmethod
+    def _compute_postgres(
+        cls, *, date_from: date, date_to: date
+    ) -> dict[StatsKey, dict[str, int]]:
+        quote = connection.ops.quote_name
+        sql = f"""
+            WITH done AS (
+                SELECT t.id, t.created_at, t.finished_at, t.technician_id,
+                       i.category_id,
+                       date_trunc('week', t.finished_business_date)::date AS week
+                FROM {quote(Ticket._meta.db_table)} t
+                JOIN {quote(InventoryItem._meta.db_table)} i
+                  ON i.id = t.inventory_item_id
+                WHERE t.status = %(done)s
+                  AND t.deleted_at IS NULL
+                  AND t.finished_at IS NOT NULL
+                  AND t.finished_business_date BETWEEN %(date_from)s AND %(date_to)s
+            ),
+            steps AS (
+                SELECT tr.ticket_id, tr.action, tr.to_status, tr.created_at,
+                       LEAD(tr.created_at) OVER (
+                           PARTITION BY tr.ticket_id ORDER BY tr.created_at, tr.id
+                       ) AS next_at
+                FROM {quote(TicketTransition._meta.db_table)} tr
+                JOIN done ON done.id = tr.ticket_id
+            ),
+            per_ticket AS (
+                SELECT done.week, done.technician_id, done.category_id,
+                    EXTRACT(EPOCH FROM MIN(steps.created_at) FILTER (
+                        WHERE steps.action = %(assigned)s
+                    ) - done.created_at) AS time_to_assign,
+                    EXTRACT(EPOCH FROM SUM(steps.next_at - steps.created_at) FILTER (
+                        WHERE steps.to_status = %(in_progress)s
+                    )) AS time_in_progress,
+                    EXTRACT(EPOCH FROM SUM(steps.next_at - steps.created_at) FILTER (
+                        WHERE steps.to_status = %(waiting_qc)s
+                    )) AS time_in_qc,
+                    EXTRACT(EPOCH FROM done.finished_at - done.created_at)
+                        AS cycle_time
+                FROM done
+                LEFT JOIN steps ON steps.ticket_id = done.id
+                GROUP BY done.id, done.week, done.technician_id, done.category_id,
+                         done.created_at, done.finished_at
+            ),
+            samples AS (
+                SELECT per_ticket.week, per_ticket.technician_id,
+                       per_ticket.category_id, s.stage,
+                       GREATEST(s.seconds, 0) AS seconds
+                FROM per_ticket
+                CROSS JOIN LATERAL (
+                    VALUES
+                        (%(time_to_assign)s, per_ticket.time_to_assign),
+                        (%(time_in_progress)s, per_ticket.time_in_progress),
+                        (%(time_in_qc)s, per_ticket.time_in_qc),
+                        (%(cycle_time)s, per_ticket.cycle_time)
+                ) AS s(stage, seconds)
+                WHERE s.seconds IS NOT NULL
+            )
+            SELECT week, stage,
+                   GROUPING(technician_id), technician_id,
+                   GROUPING(category_id), category_id,
+                   COUNT(*), AVG(seconds),
+                   percentile_cont(%(percentiles)s::float8[])
+                       WITHIN GROUP (ORDER BY seconds)
+            FROM samples
+            GROUP BY GROUPING SETS (
+                (week, stage),
+                (week, stage, technician_id),
+                (week, stage, category_id)
+            )
+        """
+        params = {
+            "done": TicketStatus.DONE,
+            "date_from": date_from,
+            "date_to": date_to,
+            "assigned": TicketTransitionAction.ASSIGNED,
+            "in_progress": TicketStatus.IN_PROGRESS,
+            "waiting_qc": TicketStatus.WAITING_QC,
+            "percentiles": list(cls.PERCENTILES),
+            **{stage: stage for stage in TicketStage.values},
+        }
+        stats: dict[StatsKey, dict[str, int]] = {}
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            for (
+                week,
+                stage,
+                technician_grouped_out,
+                technician_id,
+                category_grouped_out,
+                category_id,
+                count,
+                avg,
+                percentiles,
+            ) in cursor.fetchall():
+                if not technician_grouped_out:
+                    if technician_id is None:
+                        continue
+                    key = (week, stage, TicketStageDimension.TECHNICIAN, technician_id)
+                elif not category_grouped_out:
+                    key = (week, stage, TicketStageDimension.CATEGORY, category_id)
+                else:
+                    key = (week, stage, TicketStageDimension.ALL, 0)
+                p50, p90, p99 = percentiles
+                stats[key] = {
+                    "sample_count": int(count),
+                    "avg_seconds": round(float(avg)),
+                    "p50_seconds": round(p50),
+                    "p90_seconds": round(p90),
+                    "p99_seconds": round(p99),
+                }
+        return stats
+
+    @classmethod
+    def _stage_seconds(
+        cls, ticket: dict[str, Any], steps: Sequence[tuple[str, str, datetime]]
+    ) -> dict[str, float]:
+        durations: dict[str, float] = {
+            TicketStage.CYCLE_TIME: (
+                ticket["finished_at"] - ticket["created_at"]
+            ).total_seconds()
+        }
+        for (action, to_status, created_at), next_step in zip(
+            steps, [*steps[1:], None], strict=True
+        ):
+            if (
+                action == TicketTransitionAction.ASSIGNED
+                and TicketStage.TIME_TO_ASSIGN not in durations
+            ):
+                durations[TicketStage.TIME_TO_ASSIGN] = (
+                    created_at - ticket["created_at"]
+                ).total_seconds()
+            if next_step is None:
+                continue
+            for stage, dwell_status in cls.DWELL_STAGES.items():
+                if to_status == dwell_status:
+                    durations[stage] = (
+                        durations.get(stage, 0.0)
+                        + (next_step[2] - created_at).total_seconds()
+                    )
+        return {stage: max(seconds, 0.0) for stage, seconds in durations.items()}
+
+    @classmethod
+    def _summarize(cls, values: list[float]) -> dict[str, int]:
+        ordered = sorted(values)
+        p50, p90, p99 = (cls.percentile(ordered, p) for p in cls.PERCENTILES)
+        return {
+            "sample_count": len(ordered),
+            "avg_seconds": round(sum(ordered) / len(ordered)),
+            "p50_seconds": round(p50),
+            "p90_seconds": round(p90),
+            "p99_seconds": round(p99),
+        }
+
+    @staticmethod
+    def percentile(ordered: Sequence[float], fraction: float) -> float:
+        """Linear interpolation between ranks, matching ``percentile_cont``."""
+        position = (len(ordered) - 1) * fraction
+        lower = math.floor(position)
+        upper = min(lower + 1, len(ordered) - 1)
+        return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+    @staticmethod
+    def _group_by_ticket(
+        transitions: Iterable[tuple[int, str, str, datetime]],
+    ) -> Iterator[tuple[int, list[tuple[str, str, datetime]]]]:
+        current_id: int | None = None
+        steps: list[tuple[str, str, datetime]] = []
+        for ticket_id, action, to_status, created_at in transitions:
+            if ticket_id != current_id:
+                if current_id is not None:
+                    yield current_id, steps
+                current_id, steps = ticket_id, []
+            steps.append((action, to_status, created_at))
+        if current_id is not None:
+            yield current_id, steps
+
+    @staticmethod
+    def _dimension_keys(
+        *, technician_id: int | None, category_id: int
+    ) -> list[tuple[str, int]]:
+        keys = [
+            (TicketStageDimension.ALL, 0),
+            (TicketStageDimension.CATEGORY, category_id),
+        ]
+        if technician_id is not None:
+            keys.append((TicketStageDimension.TECHNICIAN, technician_id))
+        return keys
+
+    @staticmethod
+    def _done_tickets(*, date_from: date, date_to: date):
+        return Ticket.domain.filter(
+            status=TicketStatus.DONE,
+            finished_at__isnull=False,
+            finished_business_date__gte=date_from,
+            finished_business_date__lte=date_to,
+        )
+
+    @staticmethod
+    def _dimension_names(*, dimension: str, ids: set[int]) -> dict[int, str]:
+        if dimension == TicketStageDimension.TECHNICIAN:
+            return {
+                user.id: (
+                    f"{user.first_name or ''} {user.last_name or ''}".strip()
+                    or user.username
+                )
+                for user in User.objects.filter(id__in=ids).only(
+                    "id", "first_name", "last_name", "username"
+                )
+            }
+        if dimension == TicketStageDimension.CATEGORY:
+            return dict(
+                InventoryItemCategory.objects.filter(id__in=ids).values_list(
+                    "id", "name"
+                )
+            )
+        return {}
+
+    @staticmethod
+    def _week_starts(*, week_from: date, week_to: date) -> list[date]:
+        return [
+            week_from + timedelta(weeks=offset)
+            for offset in range((week_to - week_from).days // 7 + 1)
+        ]
+
+    @staticmethod
+    def _minutes(seconds: int | None) -> float | None:
+        return None if seconds is None else round(seconds / 60, 2)
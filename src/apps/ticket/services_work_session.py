@@ -14,9 +14,6 @@ from ticket.models import Ticket, WorkSession, WorkSessionTransition
 class TicketWorkSessionService:
     """Session lifecycle manager for technician work time accounting."""
 
-    DEFAULT_DAILY_PAUSE_LIMIT_MINUTES = 30
-    DEFAULT_TIMEZONE = "Asia/Tashkent"
-
     @classmethod
     @transaction.atomic
     def pause_work_session(cls, ticket: Ticket, actor_user_id: int) -> WorkSession:
@@ -124,29 +121,10 @@ class TicketWorkSessionService:
         )
         return max(daily_limit_seconds - used_seconds, 0)
 
-    @classmethod
-    def _pause_rules(cls) -> tuple[int, ZoneInfo]:
-        rules = RulesService.get_active_rules_config()
-        work_session_rules = rules.get("work_session", {})
-
-        raw_limit_minutes = work_session_rules.get(
-            "daily_pause_limit_minutes", cls.DEFAULT_DAILY_PAUSE_LIMIT_MINUTES
-        )
-        try:
-            limit_minutes = int(raw_limit_minutes)
-        except (TypeError, ValueError):
-            limit_minutes = cls.DEFAULT_DAILY_PAUSE_LIMIT_MINUTES
-        limit_minutes = max(limit_minutes, 0)
-
-        timezone_name = str(
-            work_session_rules.get("timezone", cls.DEFAULT_TIMEZONE)
-            or cls.DEFAULT_TIMEZONE
-        )
-        try:
-            local_tz = ZoneInfo(timezone_name)
-        except Exception:
-            local_tz = ZoneInfo(cls.DEFAULT_TIMEZONE)
-        return limit_minutes * 60, local_tz
+    @staticmethod
+    def _pause_rules() -> tuple[int, ZoneInfo]:
+        rules = RulesService.get_active_rules_snapshot().work_session
+        return rules.daily_pause_limit_seconds, rules.timezone
 
     @classmethod
     def _day_bounds(cls, *, now_dt, local_tz: ZoneInfo):
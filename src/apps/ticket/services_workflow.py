@@ -1,5 +1,6 @@
 import logging
 import math
+from typing import Any
 
 from django.db import transaction
 from django.utils import timezone
@@ -7,14 +8,20 @@ from django.utils import timezone
 from core.api.exceptions import DomainValidationError
 from core.services.notifications import UserNotificationService
 from core.utils.constants import (
+    LiveEventTopic,
     TicketStatus,
     TicketTransitionAction,
     WorkSessionStatus,
     XPTransactionEntryType,
 )
+from core.utils.live_events import publish_live_event
 from gamification.services import GamificationService
+from gamification.services_daily_stats import TechnicianDailyStatsService
+from gamification.services_leaderboard import TechnicianScoreService
+from rules.compiled import TicketXpRules
 from rules.services import RulesService
 from ticket.models import Ticket, TicketTransition, WorkSession
+from ticket.services_analytics import TicketAnalyticsService
 
 logger = logging.getLogger(__name__)
 
@@ -125,8 +132,8 @@ class TicketWorkflowService:
         actor_user_id: int | None = None,
         transition_metadata: dict | None = None,
     ) -> Ticket:
-        had_rework = TicketTransition.domain.has_qc_fail_for_ticket(ticket=ticket)
         from_status = ticket.mark_qc_pass(finished_at=timezone.now())
+        had_rework = not ticket.first_passed
         ticket.inventory_item.mark_ready()
 
         transition = cls.log_ticket_transition(
@@ -137,37 +144,40 @@ class TicketWorkflowService:
             actor_user_id=actor_user_id,
             metadata=transition_metadata,
         )
+        TechnicianScoreService.record_qc_pass(ticket=ticket, had_rework=had_rework)
+        TechnicianDailyStatsService.record_qc_pass(ticket=ticket, had_rework=had_rework)
 
-        (
-            base_divisor,
-            first_pass_bonus,
-            qc_status_update_xp,
-            _,
-            _,
-        ) = cls._ticket_xp_rules()
+        xp_rules = cls._ticket_xp_rules()
+        base_divisor = xp_rules.base_divisor
+        first_pass_bonus = xp_rules.first_pass_bonus
         # Base XP comes from resolved ticket metrics (auto/manual), with formula fallback.
         base_xp = cls._base_ticket_xp(ticket=ticket, base_divisor=base_divisor)
-        GamificationService.append_xp_entry(
-            user_id=ticket.technician_id,
-            amount=base_xp,
-            entry_type=XPTransactionEntryType.TICKET_BASE_XP,
-            reference=f"ticket_base_xp:{ticket.id}",
-            description="Ticket completion base XP",
-            payload={
+        xp_entries: list[dict[str, Any]] = [
+            {
+                "user_id": ticket.technician_id,
+                "amount": base_xp,
+                "entry_type": XPTransactionEntryType.TICKET_BASE_XP,
+                "reference": f"ticket_base_xp:{ticket.id}",
+                "description": "Ticket completion base XP",
                 "ticket_id": ticket.id,
-                "total_duration": ticket.total_duration,
-                "formula_divisor": base_divisor,
-                "is_manual": bool(ticket.is_manual),
-                "resolved_ticket_xp": int(ticket.xp_amount or 0),
-                "qc_pass": True,
-            },
-        )
-        cls._award_qc_status_update_xp(
+                "payload": {
+                    "ticket_id": ticket.id,
+                    "total_duration": ticket.total_duration,
+                    "formula_divisor": base_divisor,
+                    "is_manual": bool(ticket.is_manual),
+                    "resolved_ticket_xp": int(ticket.xp_amount or 0),
+                    "qc_pass": True,
+                },
+            }
+        ]
+        qc_status_update_entry = cls._qc_status_update_xp_entry(
             ticket=ticket,
             transition=transition,
             actor_user_id=actor_user_id,
-            amount=qc_status_update_xp,
+            amount=xp_rules.qc_status_update_xp,
         )
+        if qc_status_update_entry:
+            xp_entries.append(qc_status_update_entry)
 
         awarded_first_pass_bonus = 0
         if cls._is_first_pass_bonus_eligible(
@@ -176,19 +186,24 @@ class TicketWorkflowService:
             first_pass_bonus=first_pass_bonus,
         ):
             awarded_first_pass_bonus = first_pass_bonus
-            GamificationService.append_xp_entry(
-                user_id=ticket.technician_id,
-                amount=first_pass_bonus,
-                entry_type=XPTransactionEntryType.TICKET_QC_FIRST_PASS_BONUS,
-                reference=f"ticket_qc_first_pass_bonus:{ticket.id}",
-                description="Ticket QC first-pass bonus XP",
-                payload={
+            xp_entries.append(
+                {
+                    "user_id": ticket.technician_id,
+                    "amount": first_pass_bonus,
+                    "entry_type": XPTransactionEntryType.TICKET_QC_FIRST_PASS_BONUS,
+                    "reference": f"ticket_qc_first_pass_bonus:{ticket.id}",
+                    "description": "Ticket QC first-pass bonus XP",
                     "ticket_id": ticket.id,
-                    "first_pass": True,
-                    "first_pass_bonus": first_pass_bonus,
-                    "within_total_duration": True,
-                },
+                    "payload": {
+                        "ticket_id": ticket.id,
+                        "first_pass": True,
+                        "first_pass_bonus": first_pass_bonus,
+                        "within_total_duration": True,
+                    },
+                }
             )
+        # One insert and one read-back instead of a savepoint per entry.
+        GamificationService.append_xp_entries(xp_entries)
         UserNotificationService.notify_ticket_qc_pass(
             ticket=ticket,
             actor_user_id=actor_user_id,
@@ -214,13 +229,16 @@ class TicketWorkflowService:
             actor_user_id=actor_user_id,
             metadata=transition_metadata,
         )
-        _, _, qc_status_update_xp, _, _ = cls._ticket_xp_rules()
-        cls._award_qc_status_update_xp(
+        TechnicianScoreService.record_qc_fail(ticket=ticket)
+        TechnicianDailyStatsService.record_qc_fail(ticket=ticket, transition=transition)
+        qc_status_update_entry = cls._qc_status_update_xp_entry(
             ticket=ticket,
             transition=transition,
             actor_user_id=actor_user_id,
-            amount=qc_status_update_xp,
+            amount=cls._ticket_xp_rules().qc_status_update_xp,
         )
+        if qc_status_update_entry:
+            GamificationService.append_xp_entry(**qc_status_update_entry)
         UserNotificationService.notify_ticket_qc_fail(
             ticket=ticket,
             actor_user_id=actor_user_id,
@@ -290,6 +308,20 @@ class TicketWorkflowService:
             note=note,
             metadata=metadata,
         )
+        TicketAnalyticsService.invalidate_cache()
+        publish_live_event(
+            topic=LiveEventTopic.TICKETS,
+            event_type="ticket.transition",
+            technician_id=ticket.technician_id,
+            data={
+                "ticket_id": ticket.id,
+                "transition_id": transition.id,
+                "action": action,
+                "from_status": from_status,
+                "to_status": to_status,
+                "technician_id": ticket.technician_id,
+            },
+        )
         logger.info(
             (
                 "Ticket transition logged: ticket_id=%s transition_id=%s action=%s "
@@ -306,37 +338,8 @@ class TicketWorkflowService:
         return transition
 
     @staticmethod
-    def _ticket_xp_rules() -> tuple[int, int, int, int, int]:
-        rules = RulesService.get_active_rules_config()
-        ticket_rules = rules.get("ticket_xp", {})
-        base_divisor = int(ticket_rules.get("base_divisor", 20) or 20)
-        if base_divisor <= 0:
-            base_divisor = 20
-        first_pass_bonus = int(ticket_rules.get("first_pass_bonus", 1) or 0)
-        if first_pass_bonus < 0:
-            first_pass_bonus = 0
-        qc_status_update_xp = int(ticket_rules.get("qc_status_update_xp", 1) or 0)
-        if qc_status_update_xp < 0:
-            qc_status_update_xp = 0
-        flag_green_max_minutes = int(
-            ticket_rules.get("flag_green_max_minutes", 30) or 30
-        )
-        if flag_green_max_minutes < 0:
-            flag_green_max_minutes = 30
-
-        flag_yellow_max_minutes = int(
-            ticket_rules.get("flag_yellow_max_minutes", 60) or 60
-        )
-        if flag_yellow_max_minutes < flag_green_max_minutes:
-            flag_yellow_max_minutes = max(flag_green_max_minutes, 60)
-
-        return (
-            base_divisor,
-            first_pass_bonus,
-            qc_status_update_xp,
-            flag_green_max_minutes,
-            flag_yellow_max_minutes,
-        )
+    def _ticket_xp_rules() -> TicketXpRules:
+        return RulesService.get_active_rules_snapshot().ticket_xp
 
     @staticmethod
     def _base_ticket_xp(*, ticket: Ticket, base_divisor: int) -> int:
@@ -365,26 +368,27 @@ class TicketWorkflowService:
         return actual_work_seconds <= (total_duration_minutes * 60)
 
     @staticmethod
-    def _award_qc_status_update_xp(
+    def _qc_status_update_xp_entry(
         *,
         ticket: Ticket,
         transition: TicketTransition,
         actor_user_id: int | None,
         amount: int,
-    ) -> None:
+    ) -> dict[str, Any] | None:
         if not actor_user_id or amount <= 0:
-            return
-
-        GamificationService.append_xp_entry(
-            user_id=actor_user_id,
-            amount=amount,
-            entry_type=XPTransactionEntryType.TICKET_QC_STATUS_UPDATE,
-            reference=f"ticket_qc_status_update:{ticket.id}:{transition.id}",
-            description="QC status update XP",
-            payload={
+            return None
+
+        return {
+            "user_id": actor_user_id,
+            "amount": amount,
+            "entry_type": XPTransactionEntryType.TICKET_QC_STATUS_UPDATE,
+            "reference": f"ticket_qc_status_update:{ticket.id}:{transition.id}",
+            "description": "QC status update XP",
+            "ticket_id": ticket.id,
+            "payload": {
                 "ticket_id": ticket.id,
                 "ticket_transition_id": transition.id,
                 "qc_action": transition.action,
                 "qc_status_update_xp": amount,
             },
-        )
+        }
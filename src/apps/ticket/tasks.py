@@ -2,6 +2,9 @@
 
 from celery import shared_task
 
+from ticket.services_fleet_snapshot import FleetSnapshotService
+from ticket.services_funnel_analytics import TicketFunnelAnalyticsService
+from ticket.services_stage_analytics import TicketStageAnalyticsService
 from ticket.services_work_session import TicketWorkSessionService
 
 
@@ -9,3 +12,33 @@ from ticket.services_work_session import TicketWorkSessionService
 def enforce_daily_pause_limits() -> int:
     """Auto-resume paused work sessions that exhausted today's pause budget."""
     return TicketWorkSessionService.auto_resume_paused_sessions_if_limit_reached()
+
+
+@shared_task(name="ticket.tasks.reconcile_fleet_snapshot")
+def reconcile_fleet_snapshot() -> dict[str, object]:
+    """Verify fleet counters against a full recount and repair drift."""
+    return FleetSnapshotService.reconcile()
+
+
+@shared_task(name="ticket.tasks.rebuild_ticket_stage_stats")
+def rebuild_ticket_stage_stats() -> dict[str, int | str]:
+    """Recompute stage-duration percentiles for the current and previous week."""
+    return TicketStageAnalyticsService.rebuild()
+
+
+@shared_task(name="ticket.tasks.build_ticket_stage_stats")
+def build_ticket_stage_stats() -> dict[str, int | str]:
+    """Build missing stage-duration weeks and refresh the open week."""
+    return TicketStageAnalyticsService.build_missing()
+
+
+@shared_task(name="ticket.tasks.rebuild_ticket_funnel_stats")
+def rebuild_ticket_funnel_stats() -> dict[str, int | str]:
+    """Recompute funnel cohorts for the last eight intake weeks."""
+    return TicketFunnelAnalyticsService.rebuild()
+
+
+@shared_task(name="ticket.tasks.build_ticket_funnel_stats")
+def build_ticket_funnel_stats() -> dict[str, int | str]:
+    """Build missing funnel cohorts and refresh the open intake weeks."""
+    return TicketFunnelAnalyticsService.build_missing()
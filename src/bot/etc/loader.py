@@ -16,6 +16,7 @@ from bot.middlewares import (
     DIMiddleware,
     ErrorMiddleware,
     I18nMiddleware,
+    RequestScopeMiddleware,
 )
 from bot.url_router import get_root_router
 
@@ -60,6 +61,7 @@ def create_bot_bundle() -> BotBundle:
 
     dispatcher = Dispatcher(storage=storage)
     dispatcher.update.outer_middleware(ErrorMiddleware())
+    dispatcher.update.outer_middleware(RequestScopeMiddleware())
     dispatcher.update.middleware(I18nMiddleware(container=container))
     dispatcher.update.middleware(DIMiddleware(container=container))
     dispatcher.update.middleware(AuthMiddleware())
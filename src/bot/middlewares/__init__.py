@@ -2,10 +2,12 @@ from .auth import AuthMiddleware
 from .di import DIMiddleware
 from .error import ErrorMiddleware
 from .i18n import I18nMiddleware
+from .request_scope import RequestScopeMiddleware
 
 __all__ = [
     "DIMiddleware",
     "ErrorMiddleware",
     "I18nMiddleware",
     "AuthMiddleware",
+    "RequestScopeMiddleware",
 ]
@@ -0,0 +1,20 @@
+from logging import getLogger
+
+from aiogram import BaseMiddleware
+
+from core.utils.request_scope import request_scope
+
+logger = getLogger(__name__)
+
+
+class RequestScopeMiddleware(BaseMiddleware):
+    async def __call__(self, handler, event, data):
+        # Sync services run via run_sync inherit this context, so the whole
+        # update shares one memo scope.
+        with request_scope() as scope:
+            try:
+                return await handler(event, data)
+            finally:
+                stats = scope.stats()
+                if stats:
+                    logger.debug("Bot update scope cache stats: %s", stats)
@@ -9,7 +9,7 @@ from aiogram.types import (
     InlineKeyboardMarkup,
     Message,
 )
-from django.db.models import Count, Sum
+from django.db.models import Count
 from django.utils import timezone
 
 from account.models import TelegramProfile, User
@@ -17,6 +17,7 @@ from bot.services.menu import BotMenuService
 from core.utils.asyncio import run_sync
 from core.utils.constants import RoleSlug, TicketStatus
 from gamification.models import XPTransaction
+from gamification.services_xp_balance import XPBalanceService
 from ticket.models import Ticket
 
 
@@ -94,12 +95,8 @@ class StartProfileService:
 
     @staticmethod
     async def xp_totals_for_user(*, user_id: int) -> tuple[int, int]:
-        aggregate = await run_sync(
-            XPTransaction.objects.filter(user_id=user_id).aggregate,
-            total_xp=Sum("amount"),
-            tx_count=Count("id"),
-        )
-        return int(aggregate.get("total_xp") or 0), int(aggregate.get("tx_count") or 0)
+        balance = await run_sync(XPBalanceService.balance_for_user, user_id=user_id)
+        return balance.total, balance.tx_count
 
     @staticmethod
     def role_label(*, role_slug: str, _) -> str:
@@ -759,7 +759,7 @@ class TechnicianTicketActionService:
     ) -> int:
         aggregate = XPTransaction.objects.filter(
             user_id=technician_id,
-            payload__ticket_id=ticket.id,
+            ticket_id=ticket.id,
         ).aggregate(total_amount=Coalesce(Sum("amount"), 0))
         return int(aggregate.get("total_amount") or 0)
 
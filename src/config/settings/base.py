@@ -123,6 +123,7 @@ MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "core.middlewares.request_id.RequestIDMiddleware",
+    "core.middlewares.request_scope.RequestScopeMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -183,6 +184,10 @@ CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = "Asia/Tashkent"
 CELERY_ENABLE_UTC = True
 CELERY_TASK_IGNORE_RESULT = True
+# Tests have no broker; queued work runs inline instead.
+CELERY_TASK_ALWAYS_EAGER = config(
+    "CELERY_TASK_ALWAYS_EAGER", default=IS_TEST_RUN, cast=bool
+)
 if HAS_DJANGO_CELERY_BEAT:
     CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
 
@@ -193,6 +198,50 @@ if HAS_CELERY:
             "task": "ticket.tasks.enforce_daily_pause_limits",
             "schedule": 60.0,
         },
+        "reconcile-fleet-snapshot-counters": {
+            "task": "ticket.tasks.reconcile_fleet_snapshot",
+            "schedule": 900.0,
+        },
+        "rebuild-technician-leaderboard-scores": {
+            "task": "gamification.tasks.rebuild_technician_scores",
+            "schedule": 3600.0,
+        },
+        "rebuild-user-level-statuses": {
+            "task": "gamification.tasks.rebuild_user_level_statuses",
+            "schedule": 3600.0,
+        },
+        "rebuild-technician-daily-stats": {
+            "task": "gamification.tasks.rebuild_technician_daily_stats",
+            "schedule": 86400.0,
+        },
+        "build-technician-daily-stats": {
+            "task": "gamification.tasks.build_technician_daily_stats",
+            "schedule": 3600.0,
+        },
+        "capture-xp-balance-snapshots": {
+            "task": "gamification.tasks.capture_xp_balance_snapshots",
+            "schedule": 86400.0,
+        },
+        "archive-xp-ledger-months": {
+            "task": "gamification.tasks.archive_xp_ledger_months",
+            "schedule": 86400.0,
+        },
+        "rebuild-ticket-stage-stats": {
+            "task": "ticket.tasks.rebuild_ticket_stage_stats",
+            "schedule": 86400.0,
+        },
+        "build-ticket-stage-stats": {
+            "task": "ticket.tasks.build_ticket_stage_stats",
+            "schedule": 900.0,
+        },
+        "rebuild-ticket-funnel-stats": {
+            "task": "ticket.tasks.rebuild_ticket_funnel_stats",
+            "schedule": 86400.0,
+        },
+        "build-ticket-funnel-stats": {
+            "task": "ticket.tasks.build_ticket_funnel_stats",
+            "schedule": 900.0,
+        },
     }
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -250,6 +299,25 @@ TMA_INIT_DATA_MAX_FUTURE_SKEW_SECONDS = config(
 TMA_INIT_DATA_REPLAY_TTL_SECONDS = config(
     "TMA_INIT_DATA_REPLAY_TTL_SECONDS", default=300, cast=int
 )
+ANALYTICS_CACHE_FRESH_SECONDS = config(
+    "ANALYTICS_CACHE_FRESH_SECONDS", default=60, cast=int
+)
+ANALYTICS_CACHE_STALE_SECONDS = config(
+    "ANALYTICS_CACHE_STALE_SECONDS", default=600, cast=int
+)
+LIVE_EVENTS_BACKEND = config(
+    "LIVE_EVENTS_BACKEND",
+    default="memory" if IS_TEST_RUN else "redis",
+)
+LIVE_EVENTS_REDIS_URL = config("LIVE_EVENTS_REDIS_URL", default=REDIS_URL)
+LIVE_EVENTS_CHANNEL = config("LIVE_EVENTS_CHANNEL", default="rmbot:live-events")
+LIVE_EVENTS_HEARTBEAT_SECONDS = config(
+    "LIVE_EVENTS_HEARTBEAT_SECONDS", default=15, cast=int
+)
+LIVE_EVENTS_MAX_PENDING = config("LIVE_EVENTS_MAX_PENDING", default=100, cast=int)
+LIVE_EVENTS_MAX_CONNECTIONS = config(
+    "LIVE_EVENTS_MAX_CONNECTIONS", default=5000, cast=int
+)
 SENTRY_DSN = config("SENTRY_DSN", default="")
 SENTRY_ENVIRONMENT = config(
     "SENTRY_ENVIRONMENT",
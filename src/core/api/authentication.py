@@ -0,0 +1,23 @@
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+class QueryParamJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that also accepts ``?access_token=<jwt>``.
+
+    Only for endpoints consumed by clients that cannot set headers, such as
+    the browser ``EventSource`` used for live event streams.
+    """
+
+    QUERY_PARAM = "access_token"
+
+    def authenticate(self, request):
+        authenticated = super().authenticate(request)
+        if authenticated is not None:
+            return authenticated
+
+        raw_token = request.query_params.get(self.QUERY_PARAM)
+        if not raw_token:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return self.get_user(validated_token), validated_token
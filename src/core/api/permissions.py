@@ -1,6 +1,24 @@
 from rest_framework.permissions import BasePermission
 
 from core.utils.constants import RoleSlug
+from core.utils.request_scope import ROLE_SLUGS, scoped_memoize
+
+
+def request_role_slugs(request) -> frozenset[str]:
+    """Role slugs of the authenticated request user."""
+    # Try to get roles from JWT token first (set by attach_user_role_claims)
+    if hasattr(request, "auth") and request.auth:
+        role_slugs_from_token = request.auth.get("role_slugs", [])
+        if role_slugs_from_token:
+            return frozenset(role_slugs_from_token)
+
+    # Fall back to database relationship, memoized for the request/update
+    user = request.user
+    return scoped_memoize(
+        ROLE_SLUGS,
+        user.pk,
+        lambda: frozenset(user.roles.values_list("slug", flat=True)),
+    )
 
 
 class HasRole(BasePermission):
@@ -9,7 +27,7 @@ class HasRole(BasePermission):
 
     Checks roles from:
     1. JWT token claim 'role_slugs' (set by attach_user_role_claims during auth)
-    2. Database user.roles relationship (loaded by select_related/prefetch_related)
+    2. Database user.roles relationship (memoized per request/update scope)
     3. User is_superuser flag
 
     Usage:
@@ -25,17 +43,7 @@ class HasRole(BasePermission):
         if user.is_superuser:
             return True
 
-        # Try to get roles from JWT token first (set by attach_user_role_claims)
-        role_slugs = set()
-        if hasattr(request, "auth") and request.auth:
-            role_slugs_from_token = request.auth.get("role_slugs", [])
-            if role_slugs_from_token:
-                role_slugs = set(role_slugs_from_token)
-
-        # Fall back to database relationship (requires select_related/prefetch_related)
-        if not role_slugs:
-            role_slugs = set(user.roles.values_list("slug", flat=True))
-
+        role_slugs = request_role_slugs(request)
         return any(slug in role_slugs for slug in self.required_roles)
 
     @classmethod
@@ -59,6 +59,10 @@ class CustomResponseMixin:
     def finalize_response(self, request, response, *args, **kwargs):
         response = super().finalize_response(request, response, *args, **kwargs)  # noqa
 
+        # Streaming and other plain Django responses have no ``data`` to wrap.
+        if not isinstance(response, Response):
+            return response
+
         if response.status_code in self.NO_BODY_STATUS_CODES:
             return response
 
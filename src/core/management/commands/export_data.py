@@ -0,0 +1,95 @@
+from pathlib import Path
+
+from django.core.management import BaseCommand, CommandError
+
+from core.services.exports import DataExportService
+from core.utils.constants import ExportDataset, ExportFormat
+from gamification.services import ProgressionService
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream tickets, ticket transitions, XP transactions or attendance "
+        "to CSV/NDJSON with constant memory."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", choices=ExportDataset.values)
+        parser.add_argument(
+            "--format",
+            dest="file_format",
+            choices=ExportFormat.values,
+            default=ExportFormat.CSV,
+        )
+        parser.add_argument(
+            "--date-from",
+            type=str,
+            required=False,
+            help="Inclusive business date in YYYY-MM-DD format.",
+        )
+        parser.add_argument(
+            "--date-to",
+            type=str,
+            required=False,
+            help="Inclusive business date in YYYY-MM-DD format.",
+        )
+        parser.add_argument(
+            "--gzip",
+            action="store_true",
+            help="Gzip-compress the output; requires --output.",
+        )
+        parser.add_argument(
+            "--output",
+            type=str,
+            required=False,
+            help="Destination file path. Defaults to stdout.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DataExportService.CHUNK_SIZE,
+            help="Rows fetched per database round trip.",
+        )
+
+    def handle(self, *args, **options):
+        output = options.get("output")
+        if options["gzip"] and not output:
+            raise CommandError("--gzip requires --output.")
+
+        try:
+            date_from = None
+            if options.get("date_from"):
+                date_from = ProgressionService.parse_date_token(
+                    options["date_from"], field_name="date_from"
+                )
+            date_to = None
+            if options.get("date_to"):
+                date_to = ProgressionService.parse_date_token(
+                    options["date_to"], field_name="date_to"
+                )
+            chunks = DataExportService.stream(
+                dataset=options["dataset"],
+                file_format=options["file_format"],
+                date_from=date_from,
+                date_to=date_to,
+                compress=options["gzip"],
+                chunk_size=max(1, int(options["chunk_size"])),
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+
+        if not output:
+            for chunk in chunks:
+                self.stdout.write(chunk.decode(), ending="")
+            return
+
+        written = 0
+        with Path(output).open("wb") as handle:
+            for chunk in chunks:
+                handle.write(chunk)
+                written += len(chunk)
+        self.stderr.write(
+            self.style.SUCCESS(
+                f"Exported {options['dataset']}: path={output} bytes={written}"
+            )
+        )
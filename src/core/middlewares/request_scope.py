@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import logging
+
+from django.conf import settings
+
+from core.utils.request_scope import request_scope
+
+logger = logging.getLogger(__name__)
+
+
+class RequestScopeMiddleware:
+    """
+    Memoizes rules, role and display-name lookups for the life of one request.
+
+    Hit/miss counters are logged at debug level and, with ``DEBUG`` enabled,
+    echoed in a response header for profiling.
+    """
+
+    RESPONSE_HEADER = "X-Request-Scope-Cache"
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with request_scope() as scope:
+            response = self.get_response(request)
+            stats = scope.stats()
+
+        if stats:
+            logger.debug("Request scope cache stats for %s: %s", request.path, stats)
+            if settings.DEBUG:
+                response[self.RESPONSE_HEADER] = self._format_header(stats)
+        return response
+
+    @staticmethod
+    def _format_header(stats: dict[str, dict[str, int]]) -> str:
+        return ";".join(
+            f"{namespace}={counts['hits']}/{counts['misses']}"
+            for namespace, counts in stats.items()
+        )
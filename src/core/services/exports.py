@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zlib
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet
+
+from attendance.models import AttendanceRecord
+from core.utils.business_dates import business_day_start
+from core.utils.constants import ExportDataset, ExportFormat
+from gamification.models import XPTransaction
+from ticket.models import Ticket, TicketTransition
+
+# gzip container (header + trailer) instead of a raw zlib stream.
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+@dataclass(frozen=True, slots=True)
+class ExportSpec:
+    queryset: Callable[[], QuerySet]
+    columns: tuple[str, ...]
+    # Column the ``date_from``/``date_to`` business-date filter applies to.
+    date_column: str
+    date_column_is_datetime: bool
+
+
+EXPORT_SPECS: dict[str, ExportSpec] = {
+    ExportDataset.TICKETS: ExportSpec(
+        # Soft-deleted tickets stay in the dump; ``deleted_at`` marks them.
+        queryset=lambda: Ticket.all_objects.all(),
+        columns=(
+            "id",
+            "inventory_item_id",
+            "inventory_item__serial_number",
+            "master_id",
+            "technician_id",
+            "status",
+            "title",
+            "total_duration",
+            "flag_color",
+            "flag_minutes",
+            "xp_amount",
+            "is_manual",
+            "qc_fail_count",
+            "first_passed",
+            "approved_by_id",
+            "approved_at",
+            "assigned_at",
+            "started_at",
+            "first_waiting_qc_at",
+            "last_waiting_qc_at",
+            "qc_wait_seconds_total",
+            "finished_at",
+            "finished_business_date",
+            "created_at",
+            "updated_at",
+            "deleted_at",
+        ),
+        date_column="created_at",
+        date_column_is_datetime=True,
+    ),
+    ExportDataset.TICKET_TRANSITIONS: ExportSpec(
+        queryset=lambda: TicketTransition.all_objects.all(),
+        columns=(
+            "id",
+            "ticket_id",
+            "from_status",
+            "to_status",
+            "action",
+            "actor_id",
+            "note",
+            "metadata",
+            "created_at",
+        ),
+        date_column="created_at",
+        date_column_is_datetime=True,
+    ),
+    ExportDataset.XP_TRANSACTIONS: ExportSpec(
+        queryset=lambda: XPTransaction.all_objects.all(),
+        columns=(
+            "id",
+            "user_id",
+            "ticket_id",
+            "amount",
+            "entry_type",
+            "reference",
+            "description",
+            "payload",
+            "business_date",
+            "created_at",
+        ),
+        date_column="business_date",
+        date_column_is_datetime=False,
+    ),
+    ExportDataset.ATTENDANCE: ExportSpec(
+        queryset=lambda: AttendanceRecord.all_objects.all(),
+        columns=(
+            "id",
+            "user_id",
+            "work_date",
+            "check_in_at",
+            "check_out_at",
+            "created_at",
+            "updated_at",
+            "deleted_at",
+        ),
+        date_column="work_date",
+        date_column_is_datetime=False,
+    ),
+}
+
+
+class DataExportService:
+    """
+    Constant-memory CSV/NDJSON dumps of ledger-style tables for accounting.
+
+    Rows are read with ``QuerySet.iterator(chunk_size=...)`` (server-side
+    cursors on PostgreSQL) in primary-key order and encoded into bounded
+    byte chunks, optionally gzip-compressed on the fly.
+    """
+
+    CHUNK_SIZE = 2000
+    FLUSH_BYTES = 64 * 1024
+    CONTENT_TYPES = {
+        ExportFormat.CSV: "text/csv; charset=utf-8",
+        ExportFormat.NDJSON: "application/x-ndjson",
+    }
+
+    @classmethod
+    def filename(
+        cls,
+        *,
+        dataset: str,
+        file_format: str,
+        compress: bool = False,
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> str:
+        parts = [dataset]
+        if date_from or date_to:
+            parts.append(
+                f"{date_from.isoformat() if date_from else 'start'}"
+                f"_{date_to.isoformat() if date_to else 'now'}"
+            )
+        name = f"{'_'.join(parts)}.{file_format}"
+        return f"{name}.gz" if compress else name
+
+    @classmethod
+    def content_type(cls, *, file_format: str, compress: bool = False) -> str:
+        return "application/gzip" if compress else cls.CONTENT_TYPES[file_format]
+
+    @classmethod
+    def queryset(
+        cls,
+        *,
+        dataset: str,
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> QuerySet:
+        spec = cls._spec(dataset)
+        if date_from and date_to and date_from > date_to:
+            raise ValueError("date_from must be less than or equal to date_to.")
+
+        queryset = spec.queryset()
+        column = spec.date_column
+        if spec.date_column_is_datetime:
+            # Half-open UTC bounds keep the timestamp index usable.
+            if date_from:
+                queryset = queryset.filter(
+                    **{f"{column}__gte": business_day_start(date_from)}
+                )
+            if date_to:
+                queryset = queryset.filter(
+                    **{f"{column}__lt": business_day_start(date_to + timedelta(days=1))}
+                )
+        else:
+            if date_from:
+                queryset = queryset.filter(**{f"{column}__gte": date_from})
+            if date_to:
+                queryset = queryset.filter(**{f"{column}__lte": date_to})
+        return queryset.order_by("pk").values_list(*spec.columns)
+
+    @classmethod
+    def stream(
+        cls,
+        *,
+        dataset: str,
+        file_format: str = ExportFormat.CSV,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        compress: bool = False,
+        chunk_size: int | None = None,
+    ) -> Iterator[bytes]:
+        """
+        Yield the encoded export in chunks of roughly ``FLUSH_BYTES``.
+
+        Validation happens eagerly so callers can surface ``ValueError``
+        before the first byte is sent.
+        """
+        if file_format not in cls.CONTENT_TYPES:
+            raise ValueError(f"Unsupported export format: {file_format}.")
+        spec = cls._spec(dataset)
+        rows = cls.queryset(
+            dataset=dataset, date_from=date_from, date_to=date_to
+        ).iterator(chunk_size=chunk_size or cls.CHUNK_SIZE)
+
+        if file_format == ExportFormat.CSV:
+            chunks = cls._csv_chunks(columns=spec.columns, rows=rows)
+        else:
+            chunks = cls._ndjson_chunks(columns=spec.columns, rows=rows)
+        return cls._gzip_chunks(chunks) if compress else chunks
+
+    @staticmethod
+    def _spec(dataset: str) -> ExportSpec:
+        try:
+            return EXPORT_SPECS[dataset]
+        except KeyError as exc:
+            raise ValueError(f"Unknown export dataset: {dataset}.") from exc
+
+    @classmethod
+    def _csv_chunks(
+        cls, *, columns: tuple[str, ...], rows: Iterable[tuple]
+    ) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow([cls._csv_value(value) for value in row])
+            if buffer.tell() >= cls.FLUSH_BYTES:
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+
+    @classmethod
+    def _ndjson_chunks(
+        cls, *, columns: tuple[str, ...], rows: Iterable[tuple]
+    ) -> Iterator[bytes]:
+        encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(",", ":"))
+        lines: list[str] = []
+        size = 0
+        for row in rows:
+            line = encoder.encode(dict(zip(columns, row, strict=True)))
+            lines.append(line)
+            size += len(line) + 1
+            if size >= cls.FLUSH_BYTES:
+                yield ("\n".join(lines) + "\n").encode()
+                lines.clear()
+                size = 0
+        if lines:
+            yield ("\n".join(lines) + "\n").encode()
+
+    @staticmethod
+    def _gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+        compressor = zlib.compressobj(wbits=GZIP_WBITS)
+        for chunk in chunks:
+            if compressed := compressor.compress(chunk):
+                yield compressed
+        yield compressor.flush()
+
+    @staticmethod
+    def _csv_value(value):
+        if value is None:
+            return ""
+        if isinstance(value, datetime | date):
+            return value.isoformat()
+        if isinstance(value, dict | list):
+            return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        return value
@@ -18,6 +18,7 @@ from bot.etc.i18n import normalize_bot_locale
 from bot.services.technician_ticket_actions import TechnicianTicketActionService
 from bot.services.ticket_qc_actions import TicketQCActionService
 from core.utils.constants import RoleSlug, TicketStatus
+from core.utils.request_scope import DISPLAY_NAME, scoped_memoize
 
 if TYPE_CHECKING:
     from ticket.models import Ticket
@@ -675,20 +676,22 @@ class UserNotificationService:
         translator = _ or translation.gettext
         if not user_id:
             return translator(gettext_noop("Unknown user"))
-        user = (
-            User.objects.filter(pk=user_id)
-            .only("id", "first_name", "last_name", "username")
-            .first()
+        # Name parts are memoized, not the rendered text, since builders run per locale.
+        name_parts = scoped_memoize(
+            DISPLAY_NAME,
+            user_id,
+            lambda: User.objects.filter(pk=user_id)
+            .values_list("first_name", "last_name", "username")
+            .first(),
         )
-        if not user:
+        if not name_parts:
             return translator(gettext_noop("user#%(user_id)s")) % {"user_id": user_id}
-        full_name = " ".join(
-            part for part in [user.first_name, user.last_name] if part
-        ).strip()
+        first_name, last_name, username = name_parts
+        full_name = " ".join(part for part in [first_name, last_name] if part).strip()
         if full_name:
             return full_name
-        return user.username or translator(gettext_noop("user#%(user_id)s")) % {
-            "user_id": user.id
+        return username or translator(gettext_noop("user#%(user_id)s")) % {
+            "user_id": user_id
         }
 
     @classmethod
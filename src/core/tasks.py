@@ -0,0 +1,16 @@
+"""Core Celery task module."""
+
+from celery import shared_task
+from django.utils.module_loading import import_string
+
+
+@shared_task(name="core.tasks.refresh_cached_method")
+def refresh_cached_method(
+    target: str, params: dict, lock_token: str | None = None
+) -> float:
+    """Recompute one stale-while-revalidate entry; returns its generation time."""
+    owner_path, method_name = target.rsplit(".", 1)
+    method = getattr(import_string(owner_path), method_name)
+    if lock_token is None:
+        return method.refresh(**params).generated_at
+    return method.refresh_locked(lock_token, params).generated_at
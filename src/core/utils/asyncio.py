@@ -1,4 +1,4 @@
-from collections.abc import Callable
+from collections.abc import AsyncIterator, Callable, Iterator
 
 from asgiref.sync import sync_to_async
 
@@ -24,3 +24,31 @@ async def run_sync[**P, T](
 
     """
     return await sync_to_async(func, thread_sensitive=thread_sensitive)(*args, **kwargs)
+
+
+async def iterate_sync[T](
+    iterator: Iterator[T], /, *, thread_sensitive: bool = True
+) -> AsyncIterator[T]:
+    """
+    Drive a synchronous iterator from async code one item at a time.
+
+    Each ``next()`` runs through ``run_sync`` so ORM-backed generators (e.g.
+    ``QuerySet.iterator()`` server-side cursors) keep using the same thread
+    and connection. The iterator is closed if the consumer stops early.
+
+    @param iterator: The synchronous iterator to consume.
+    @param thread_sensitive: Whether to keep calls on the same thread.
+    @return: An async iterator yielding the same items.
+
+    """
+    sentinel = object()
+    try:
+        while (
+            item := await run_sync(
+                next, iterator, sentinel, thread_sensitive=thread_sensitive
+            )
+        ) is not sentinel:
+            yield item
+    finally:
+        if close := getattr(iterator, "close", None):
+            await run_sync(close, thread_sensitive=thread_sensitive)
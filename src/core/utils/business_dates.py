@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from datetime import UTC, date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from django.utils import timezone
+
+BUSINESS_TIMEZONE = ZoneInfo("Asia/Tashkent")
+MAX_RANGE_DAYS = 366
+
+
+def business_date(value: datetime | None = None) -> date:
+    """Return the business (Asia/Tashkent) calendar date of an aware instant."""
+    return (value or timezone.now()).astimezone(BUSINESS_TIMEZONE).date()
+
+
+def business_day_start(value: date) -> datetime:
+    """Return the UTC instant at which a business date starts."""
+    return timezone.make_aware(
+        datetime.combine(value, time.min), BUSINESS_TIMEZONE
+    ).astimezone(UTC)
+
+
+def business_date_range_bounds(
+    *, date_from: date, date_to: date, max_days: int | None = MAX_RANGE_DAYS
+) -> tuple[datetime, datetime, int]:
+    """
+    Convert an inclusive business-date range into a half-open UTC range.
+
+    Filtering ``start <= column < end_exclusive`` on the returned instants is
+    served by plain timestamp indexes, unlike ``__date`` lookups which cast
+    every row in the database session timezone.
+    Returns ``(start, end_exclusive, range_days)``.
+    """
+    if date_from > date_to:
+        raise ValueError("date_from must be less than or equal to date_to.")
+
+    range_days = (date_to - date_from).days + 1
+    if max_days is not None and range_days > max_days:
+        raise ValueError(f"Date range cannot exceed {max_days} days.")
+
+    return (
+        business_day_start(date_from),
+        business_day_start(date_to + timedelta(days=1)),
+        range_days,
+    )
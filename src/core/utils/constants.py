@@ -70,6 +70,49 @@ class TicketTransitionAction(models.TextChoices):
     QC_FAIL = "qc_fail", _("QC Fail")
 
 
+class TicketStage(models.TextChoices):
+    TIME_TO_ASSIGN = "time_to_assign", _("Time to Assign")
+    TIME_IN_PROGRESS = "time_in_progress", _("Time in Progress")
+    TIME_IN_QC = "time_in_qc", _("Time in QC")
+    CYCLE_TIME = "cycle_time", _("Cycle Time")
+
+
+class TicketStageDimension(models.TextChoices):
+    ALL = "all", _("All")
+    TECHNICIAN = "technician", _("Technician")
+    CATEGORY = "category", _("Category")
+
+
+class TicketFunnelDimension(models.TextChoices):
+    ALL = "all", _("All")
+    CATEGORY = "category", _("Category")
+    MASTER = "master", _("Master")
+
+
+class AnalyticsGranularity(models.TextChoices):
+    DAY = "day", _("Day")
+    WEEK = "week", _("Week")
+    MONTH = "month", _("Month")
+
+
+class LiveEventTopic(models.TextChoices):
+    TICKETS = "tickets", _("Tickets")
+    WORK_SESSIONS = "work_sessions", _("Work Sessions")
+    FLEET = "fleet", _("Fleet")
+
+
+class ExportDataset(models.TextChoices):
+    TICKETS = "tickets", _("Tickets")
+    TICKET_TRANSITIONS = "ticket_transitions", _("Ticket Transitions")
+    XP_TRANSACTIONS = "xp_transactions", _("XP Transactions")
+    ATTENDANCE = "attendance", _("Attendance")
+
+
+class ExportFormat(models.TextChoices):
+    CSV = "csv", _("CSV")
+    NDJSON = "ndjson", _("NDJSON")
+
+
 class XPTransactionEntryType(models.TextChoices):
     ATTENDANCE_PUNCTUALITY = "attendance_punctuality", _("Attendance Punctuality")
     TICKET_BASE_XP = "ticket_base_xp", _("Ticket Base XP")
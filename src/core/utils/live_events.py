@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+import weakref
+from collections.abc import AsyncIterator, Callable, Iterable, Mapping
+from contextlib import asynccontextmanager
+from typing import Any
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+Listener = Callable[[str], None]
+
+RETRY_MILLISECONDS = 5000
+HEARTBEAT_FRAME = b": ping\n\n"
+RESYNC_FRAME = b"event: resync\ndata: {}\n\n"
+
+
+def publish_live_event(
+    *,
+    topic: str,
+    event_type: str,
+    data: Mapping[str, Any],
+    technician_id: int | None = None,
+) -> None:
+    """Publish a compact dashboard delta once the current transaction commits."""
+    message = json.dumps(
+        {
+            "topic": topic,
+            "type": event_type,
+            "technician_id": technician_id,
+            "data": {**data, "at": timezone.now().isoformat()},
+        },
+        separators=(",", ":"),
+        default=str,
+    )
+    transaction.on_commit(lambda: _publish_now(message))
+
+
+def _publish_now(message: str) -> None:
+    try:
+        get_live_event_backend().publish(message)
+    except Exception:
+        # Live dashboards are best-effort; the domain write already committed.
+        logger.warning("Live event publish failed.", exc_info=True)
+
+
+class MemoryLiveEventBackend:
+    """In-process fan-out used by tests and single-process development."""
+
+    def __init__(self) -> None:
+        self._listeners: list[Listener] = []
+        self._lock = threading.Lock()
+
+    def publish(self, message: str) -> None:
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(message)
+
+    def add_listener(self, listener: Listener) -> None:
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Listener) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    async def listen(self, dispatch: Listener, on_gap: Callable[[], None]) -> None:
+        loop = asyncio.get_running_loop()
+
+        def listener(message: str) -> None:
+            # Publishers run in ORM threads; hand the message to the hub's loop.
+            loop.call_soon_threadsafe(dispatch, message)
+
+        self.add_listener(listener)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            self.remove_listener(listener)
+
+
+class RedisLiveEventBackend:
+    """Redis pub/sub channel shared by every API worker."""
+
+    RECONNECT_MAX_SECONDS = 30
+
+    def __init__(self, *, url: str, channel: str) -> None:
+        self.url = url
+        self.channel = channel
+        self._client = None
+
+    def publish(self, message: str) -> None:
+        if self._client is None:
+            import redis
+
+            self._client = redis.Redis.from_url(self.url)
+        self._client.publish(self.channel, message)
+
+    async def listen(self, dispatch: Listener, on_gap: Callable[[], None]) -> None:
+        from redis import asyncio as redis_asyncio
+        from redis.exceptions import RedisError
+
+        delay = 1
+        while True:
+            client = redis_asyncio.Redis.from_url(self.url)
+            try:
+                async with client.pubsub(ignore_subscribe_messages=True) as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    delay = 1
+                    async for message in pubsub.listen():
+                        data = message["data"]
+                        dispatch(data.decode() if isinstance(data, bytes) else data)
+            except (RedisError, OSError):
+                logger.warning(
+                    "Live event subscription lost; reconnecting in %ss.",
+                    delay,
+                    exc_info=True,
+                )
+            finally:
+                await client.aclose()
+            # Messages published while disconnected are gone.
+            on_gap()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.RECONNECT_MAX_SECONDS)
+
+
+class LiveEventSubscription:
+    """
+    Bounded per-connection queue of pre-encoded SSE frames.
+
+    A connection that falls ``max_pending`` frames behind stops receiving
+    events; once it has drained what it holds it gets a ``resync`` event and
+    the stream ends, so the client reloads a snapshot and reconnects.
+    """
+
+    __slots__ = ("topics", "technician_id", "_queue", "_lagged")
+
+    def __init__(
+        self,
+        *,
+        topics: Iterable[str],
+        technician_id: int | None = None,
+        max_pending: int,
+    ) -> None:
+        self.topics = frozenset(topics)
+        self.technician_id = technician_id
+        self._queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=max_pending)
+        self._lagged = False
+
+    @property
+    def lagged(self) -> bool:
+        return self._lagged
+
+    def accepts(self, *, topic: str, technician_id: int | None) -> bool:
+        if topic not in self.topics:
+            return False
+        return self.technician_id is None or self.technician_id == technician_id
+
+    def offer(self, frame: bytes) -> None:
+        if self._lagged:
+            return
+        try:
+            self._queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            self._lagged = True
+
+    def mark_lagged(self) -> None:
+        self._lagged = True
+
+    async def frames(self, *, heartbeat_seconds: float) -> AsyncIterator[bytes]:
+        yield f"retry: {RETRY_MILLISECONDS}\n\n".encode()
+        while not (self._lagged and self._queue.empty()):
+            try:
+                frame = await asyncio.wait_for(
+                    self._queue.get(), timeout=heartbeat_seconds
+                )
+            except TimeoutError:
+                yield HEARTBEAT_FRAME
+                continue
+            yield frame
+        yield RESYNC_FRAME
+
+
+class LiveEventHub:
+    """
+    Fans one backend subscription out to every stream served by an event loop.
+
+    The backend listener starts with the first subscription and stops with the
+    last. Frames are encoded once per event and shared by all matching queues.
+    """
+
+    def __init__(self, backend) -> None:
+        self._backend = backend
+        self._subscriptions: set[LiveEventSubscription] = set()
+        self._reader: asyncio.Task | None = None
+
+    @asynccontextmanager
+    async def subscribe(
+        self,
+        *,
+        topics: Iterable[str],
+        technician_id: int | None = None,
+        max_pending: int | None = None,
+    ) -> AsyncIterator[LiveEventSubscription]:
+        subscription = LiveEventSubscription(
+            topics=topics,
+            technician_id=technician_id,
+            max_pending=max_pending or settings.LIVE_EVENTS_MAX_PENDING,
+        )
+        self._subscriptions.add(subscription)
+        _connection_counter.change(1)
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.create_task(
+                self._backend.listen(self.dispatch, self.mark_gap)
+            )
+        try:
+            yield subscription
+        finally:
+            self._subscriptions.discard(subscription)
+            _connection_counter.change(-1)
+            if not self._subscriptions and self._reader is not None:
+                self._reader.cancel()
+                self._reader = None
+
+    def dispatch(self, message: str) -> None:
+        try:
+            event = json.loads(message)
+        except ValueError:
+            logger.warning("Dropping malformed live event: %r", message[:200])
+            return
+
+        topic = event.get("topic")
+        technician_id = event.get("technician_id")
+        frame: bytes | None = None
+        for subscription in self._subscriptions:
+            if not subscription.accepts(topic=topic, technician_id=technician_id):
+                continue
+            if frame is None:
+                frame = encode_frame(event)
+            subscription.offer(frame)
+
+    def mark_gap(self) -> None:
+        for subscription in self._subscriptions:
+            subscription.mark_lagged()
+
+
+def encode_frame(event: Mapping[str, Any]) -> bytes:
+    data = json.dumps(event.get("data") or {}, separators=(",", ":"))
+    return f"event: {event.get('type') or 'message'}\ndata: {data}\n\n".encode()
+
+
+class _ConnectionCounter:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.value = 0
+
+    def change(self, delta: int) -> None:
+        with self._lock:
+            self.value += delta
+
+
+_connection_counter = _ConnectionCounter()
+_hubs: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, LiveEventHub] = (
+    weakref.WeakKeyDictionary()
+)
+_backend = None
+
+
+def live_event_connection_count() -> int:
+    """Open streams in this process, across event loops."""
+    return _connection_counter.value
+
+
+def get_live_event_backend():
+    global _backend
+    if _backend is None:
+        backend_name = str(settings.LIVE_EVENTS_BACKEND).strip().lower()
+        if backend_name == "memory":
+            _backend = MemoryLiveEventBackend()
+        elif backend_name == "redis":
+            _backend = RedisLiveEventBackend(
+                url=settings.LIVE_EVENTS_REDIS_URL,
+                channel=settings.LIVE_EVENTS_CHANNEL,
+            )
+        else:
+            raise RuntimeError(
+                f"Unsupported LIVE_EVENTS_BACKEND='{settings.LIVE_EVENTS_BACKEND}'. "
+                "Use 'memory' or 'redis'."
+            )
+    return _backend
+
+
+def get_live_event_hub() -> LiveEventHub:
+    """Return the hub of the running event loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    hub = _hubs.get(loop)
+    if hub is None:
+        hub = _hubs[loop] = LiveEventHub(get_live_event_backend())
+    return hub
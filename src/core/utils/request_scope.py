@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from collections.abc import Callable, Hashable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+RULES_SNAPSHOT = "rules_snapshot"
+ROLE_SLUGS = "role_slugs"
+DISPLAY_NAME = "display_name"
+
+_MISSING = object()
+
+
+class RequestScope:
+    """
+    Memo store for one unit of work (HTTP request or bot update).
+
+    Values are keyed by ``(namespace, key)`` and counted per namespace so
+    profiling can tell which lookups are actually being deduplicated.
+    """
+
+    __slots__ = ("_values", "hits", "misses")
+
+    def __init__(self) -> None:
+        self._values: dict[tuple[str, Hashable], Any] = {}
+        self.hits: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+
+    def get_or_set[T](
+        self, namespace: str, key: Hashable, factory: Callable[[], T]
+    ) -> T:
+        value = self._values.get((namespace, key), _MISSING)
+        if value is not _MISSING:
+            self.hits[namespace] += 1
+            return value
+        self.misses[namespace] += 1
+        value = factory()
+        self._values[(namespace, key)] = value
+        return value
+
+    def discard(self, namespace: str, key: Hashable = _MISSING) -> None:
+        if key is not _MISSING:
+            self._values.pop((namespace, key), None)
+            return
+        for stored_key in [item for item in self._values if item[0] == namespace]:
+            del self._values[stored_key]
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        return _format_stats(self.hits, self.misses)
+
+
+_current_scope: ContextVar[RequestScope | None] = ContextVar(
+    "request_scope", default=None
+)
+_totals_lock = threading.Lock()
+_total_hits: Counter[str] = Counter()
+_total_misses: Counter[str] = Counter()
+
+
+def _format_stats(
+    hits: Counter[str], misses: Counter[str]
+) -> dict[str, dict[str, int]]:
+    return {
+        namespace: {"hits": hits[namespace], "misses": misses[namespace]}
+        for namespace in sorted(set(hits) | set(misses))
+    }
+
+
+def current_request_scope() -> RequestScope | None:
+    return _current_scope.get()
+
+
+@contextmanager
+def request_scope() -> Iterator[RequestScope]:
+    """
+    Open a memo scope for the current context; nested calls reuse the outer one.
+
+    Sync code launched through ``sync_to_async``/``async_to_sync`` inherits the
+    context, so one bot update shares a single scope across its ORM threads.
+    """
+    existing = _current_scope.get()
+    if existing is not None:
+        yield existing
+        return
+
+    scope = RequestScope()
+    token = _current_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_scope.reset(token)
+        with _totals_lock:
+            _total_hits.update(scope.hits)
+            _total_misses.update(scope.misses)
+
+
+def scoped_memoize[T](namespace: str, key: Hashable, factory: Callable[[], T]) -> T:
+    """Return the memoized value for the active scope, or call factory directly."""
+    scope = _current_scope.get()
+    if scope is None:
+        return factory()
+    return scope.get_or_set(namespace, key, factory)
+
+
+def scoped_discard(namespace: str, key: Hashable = _MISSING) -> None:
+    scope = _current_scope.get()
+    if scope is not None:
+        scope.discard(namespace, key)
+
+
+def request_scope_stats() -> dict[str, dict[str, int]]:
+    """Process-wide hit/miss totals of all closed scopes, per namespace."""
+    with _totals_lock:
+        return _format_stats(_total_hits, _total_misses)
+
+
+def reset_request_scope_stats() -> None:
+    with _totals_lock:
+        _total_hits.clear()
+        _total_misses.clear()
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+from uuid import uuid4
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "swr"
+TAG_VERSION_KEY_PREFIX = f"{KEY_PREFIX}:tag:"
+# How long a cold-miss reader waits for the lock holder before computing alone.
+COLD_MISS_WAIT_SECONDS = 5.0
+COLD_MISS_POLL_SECONDS = 0.05
+
+
+@dataclass(frozen=True, slots=True)
+class CachedPayload:
+    """A cached return value together with when it was computed."""
+
+    payload: Any
+    generated_at: float
+    stale: bool = False
+
+    @property
+    def age_seconds(self) -> int:
+        return max(0, int(time.time() - self.generated_at))
+
+
+class StaleWhileRevalidate:
+    """
+    Descriptor caching a service classmethod's result in the shared cache.
+
+    Entries younger than ``fresh_seconds`` are served as is. Older entries are
+    still served for another ``stale_seconds`` while a single background task,
+    guarded by a ``cache.add`` lock, recomputes them. Entries remember the tag
+    versions they were computed under; ``invalidate_cache_tags`` bumps those
+    versions, which marks entries stale without dropping their payload. A
+    cold miss is computed by the lock holder only. Parameters must be
+    keyword-only and JSON-serializable.
+    """
+
+    def __init__(
+        self,
+        func: Callable[..., Any],
+        *,
+        namespace: str,
+        fresh_seconds: int,
+        stale_seconds: int,
+        tags: Iterable[str] = (),
+        lock_seconds: int | None = None,
+    ) -> None:
+        self.func = func
+        self.namespace = namespace
+        self.fresh_seconds = int(fresh_seconds)
+        self.stale_seconds = int(stale_seconds)
+        self.tags = tuple(tags)
+        self.lock_seconds = int(lock_seconds or max(self.fresh_seconds, 30))
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: Any, owner: type | None = None) -> BoundCachedMethod:
+        return BoundCachedMethod(self, owner or type(instance))
+
+    def task_target(self, owner: type) -> str:
+        return f"{owner.__module__}.{owner.__qualname__}.{self.name}"
+
+    def cache_key(self, params: dict[str, Any]) -> str:
+        return self._base_key(params)
+
+    def lock_key(self, params: dict[str, Any]) -> str:
+        return f"{self._base_key(params)}:lock"
+
+    def read(self, params: dict[str, Any]) -> tuple[Any, tuple[int, ...]]:
+        """Return the stored entry (or ``None``) and current tag versions."""
+        key = self.cache_key(params)
+        tag_keys = self._tag_keys()
+        values = cache.get_many([key, *tag_keys])
+        versions = tuple(int(values.get(tag_key, 0)) for tag_key in tag_keys)
+        return values.get(key), versions
+
+    def tag_versions(self) -> tuple[int, ...]:
+        tag_keys = self._tag_keys()
+        values = cache.get_many(tag_keys) if tag_keys else {}
+        return tuple(int(values.get(tag_key, 0)) for tag_key in tag_keys)
+
+    def _tag_keys(self) -> list[str]:
+        return [f"{TAG_VERSION_KEY_PREFIX}{tag}" for tag in self.tags]
+
+    def _base_key(self, params: dict[str, Any]) -> str:
+        digest = hashlib.sha256(
+            json.dumps(params, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()[:16]
+        return f"{KEY_PREFIX}:{self.namespace}:{digest}"
+
+
+class BoundCachedMethod:
+    """Callable view of a ``StaleWhileRevalidate`` method bound to its class."""
+
+    __slots__ = ("_method", "_owner")
+
+    def __init__(self, method: StaleWhileRevalidate, owner: type) -> None:
+        self._method = method
+        self._owner = owner
+
+    def __call__(self, **params: Any) -> Any:
+        return self.cached(**params).payload
+
+    def cached(self, **params: Any) -> CachedPayload:
+        method = self._method
+        entry, versions = method.read(params)
+        if entry is None:
+            return self._cold_miss(params)
+
+        payload, generated_at, entry_versions = entry
+        if (
+            entry_versions == versions
+            and time.time() - generated_at < method.fresh_seconds
+        ):
+            return CachedPayload(payload=payload, generated_at=generated_at)
+
+        lock_token = self._acquire_lock(params)
+        if lock_token is not None:
+            self._schedule_refresh(params, lock_token)
+        return CachedPayload(payload=payload, generated_at=generated_at, stale=True)
+
+    def refresh(self, **params: Any) -> CachedPayload:
+        """Recompute and store the entry; refresh locks are left alone."""
+        method = self._method
+        # Versions are read first, so an invalidation during the recompute
+        # leaves the stored entry stale instead of hiding it.
+        versions = method.tag_versions()
+        payload = self.uncached(**params)
+        generated_at = time.time()
+        cache.set(
+            method.cache_key(params),
+            (payload, generated_at, versions),
+            timeout=method.fresh_seconds + method.stale_seconds,
+        )
+        return CachedPayload(payload=payload, generated_at=generated_at)
+
+    def refresh_locked(self, lock_token: str, params: dict[str, Any]) -> CachedPayload:
+        """Recompute the entry for the refresh lock holder, then release the lock."""
+        try:
+            return self.refresh(**params)
+        finally:
+            self._release_lock(params, lock_token)
+
+    def uncached(self, **params: Any) -> Any:
+        return self._method.func(self._owner, **params)
+
+    def _cold_miss(self, params: dict[str, Any]) -> CachedPayload:
+        lock_token = self._acquire_lock(params)
+        if lock_token is not None:
+            return self.refresh_locked(lock_token, params)
+
+        # Another reader is computing this entry; wait for it instead of
+        # stampeding the source, and only compute alone if it never lands.
+        deadline = time.monotonic() + COLD_MISS_WAIT_SECONDS
+        while time.monotonic() < deadline:
+            time.sleep(COLD_MISS_POLL_SECONDS)
+            entry, versions = self._method.read(params)
+            if entry is not None:
+                payload, generated_at, entry_versions = entry
+                return CachedPayload(
+                    payload=payload,
+                    generated_at=generated_at,
+                    stale=entry_versions != versions,
+                )
+        return CachedPayload(payload=self.uncached(**params), generated_at=time.time())
+
+    def _acquire_lock(self, params: dict[str, Any]) -> str | None:
+        lock_token = uuid4().hex
+        if cache.add(
+            self._method.lock_key(params),
+            lock_token,
+            timeout=self._method.lock_seconds,
+        ):
+            return lock_token
+        return None
+
+    def _release_lock(self, params: dict[str, Any], lock_token: str) -> None:
+        # A lock that expired and was re-acquired belongs to someone else.
+        lock_key = self._method.lock_key(params)
+        if cache.get(lock_key) == lock_token:
+            cache.delete(lock_key)
+
+    def _schedule_refresh(self, params: dict[str, Any], lock_token: str) -> None:
+        from core.tasks import refresh_cached_method
+
+        try:
+            refresh_cached_method.delay(
+                self._method.task_target(self._owner), params, lock_token
+            )
+        except Exception:
+            # The stale entry keeps being served; the next reader retries.
+            logger.warning(
+                "Could not schedule cache refresh: namespace=%s",
+                self._method.namespace,
+                exc_info=True,
+            )
+            self._release_lock(params, lock_token)
+
+
+def stale_while_revalidate(
+    *,
+    namespace: str,
+    fresh_seconds: int,
+    stale_seconds: int,
+    tags: Iterable[str] = (),
+    lock_seconds: int | None = None,
+) -> Callable[[Callable[..., Any]], StaleWhileRevalidate]:
+    """Decorate a ``cls``-taking service method with stale-while-revalidate caching."""
+
+    def decorator(func: Callable[..., Any]) -> StaleWhileRevalidate:
+        return StaleWhileRevalidate(
+            func,
+            namespace=namespace,
+            fresh_seconds=fresh_seconds,
+            stale_seconds=stale_seconds,
+            tags=tags,
+            lock_seconds=lock_seconds,
+        )
+
+    return decorator
+
+
+def invalidate_cache_tags(*tags: str) -> None:
+    """Bump tag versions; entries cached under them go stale and get refreshed."""
+    for tag in tags:
+        key = f"{TAG_VERSION_KEY_PREFIX}{tag}"
+        if cache.add(key, 1, timeout=None):
+            continue
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
@@ -2,12 +2,14 @@ import itertools
 from collections.abc import Callable
 
 import pytest
+from django.core.cache import cache
 from rest_framework.test import APIClient
 
 from account.models import Role, User
 from core.utils.constants import RoleSlug, TicketStatus
 from inventory.models import InventoryItem, InventoryItemCategory
 from inventory.services import InventoryItemService
+from rules.services import RulesService
 from ticket.models import Ticket
 
 ROLE_NAMES = {
@@ -19,6 +21,16 @@ ROLE_NAMES = {
 }
 
 
+@pytest.fixture(autouse=True)
+def reset_shared_caches():
+    # Test DB state is rolled back per test, so cached rules pointers must be too.
+    cache.clear()
+    RulesService.reset_local_snapshot()
+    yield
+    cache.clear()
+    RulesService.reset_local_snapshot()
+
+
 @pytest.fixture
 def api_client() -> APIClient:
     return APIClient()
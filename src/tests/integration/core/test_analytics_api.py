@@ -12,12 +12,16 @@ from core.utils.constants import (
     XPTransactionEntryType,
 )
 from gamification.models import XPTransaction
+from gamification.services_daily_stats import TechnicianDailyStatsService
 from ticket.models import Ticket, TicketTransition
+from ticket.services_fleet_snapshot import FleetSnapshotService
+from ticket.services_workflow import TicketWorkflowService
 
 pytestmark = pytest.mark.django_db
 
 FLEET_URL = "/api/v1/analytics/fleet/"
 TEAM_URL = "/api/v1/analytics/team/"
+QC_TREND_URL = "/api/v1/analytics/qc/"
 
 
 @pytest.fixture
@@ -129,6 +133,8 @@ def test_fleet_analytics_returns_operational_counters(
         title="Done ticket",
         flag_minutes=5,
     )
+    # Counter deltas apply after commit; seed the store as the reconcile task does.
+    FleetSnapshotService.reconcile()
 
     client = authed_client_factory(analytics_users["ops"])
     resp = client.get(FLEET_URL)
@@ -181,6 +187,7 @@ def test_fleet_analytics_returns_qc_trend_and_totals(
         finished_at=now,
         title="QC with rework",
         flag_minutes=95,
+        qc_fail_count=1,
     )
 
     TicketTransition.objects.create(
@@ -205,6 +212,7 @@ def test_fleet_analytics_returns_qc_trend_and_totals(
         actor=master,
     )
 
+    TechnicianDailyStatsService.build_missing()
     client = authed_client_factory(analytics_users["ops"])
     resp = client.get(FLEET_URL)
 
@@ -220,6 +228,107 @@ def test_fleet_analytics_returns_qc_trend_and_totals(
     assert any(day["rework_done"] == 1 for day in qc["trend"])
 
 
+def test_qc_trend_downsamples_long_windows(
+    authed_client_factory, analytics_users, inventory_item_factory
+):
+    now = timezone.now()
+    for idx, days_ago in enumerate((0, 40, 200)):
+        Ticket.objects.create(
+            inventory_item=inventory_item_factory(serial_number=f"RM-QCT-{idx}"),
+            master=analytics_users["master"],
+            technician=analytics_users["technician"],
+            status=TicketStatus.DONE,
+            finished_at=now - timedelta(days=days_ago),
+            title="QC trend",
+            qc_fail_count=1 if days_ago == 40 else 0,
+        )
+
+    TechnicianDailyStatsService.build_missing()
+    client = authed_client_factory(analytics_users["ops"])
+    resp = client.get(QC_TREND_URL, {"days": 365, "granularity": "month"})
+
+    assert resp.status_code == 200
+    qc = resp.data["data"]
+    assert qc["window_days"] == 365
+    assert qc["granularity"] == "month"
+    assert len(qc["trend"]) in (12, 13)
+    assert qc["trend"][0]["date"] == qc["start_date"]
+    assert qc["trend"][-1]["end_date"] == qc["end_date"]
+    assert qc["totals"]["done"] == 3
+    assert qc["totals"]["rework_done"] == 1
+    assert sum(point["done"] for point in qc["trend"]) == 3
+
+    weekly = client.get(QC_TREND_URL, {"days": 30, "granularity": "week"})
+    assert weekly.status_code == 200
+    assert 5 <= len(weekly.data["data"]["trend"]) <= 6
+    assert weekly.data["data"]["totals"]["done"] == 1
+
+
+def test_qc_trend_validates_query_and_role(authed_client_factory, analytics_users):
+    ops_client = authed_client_factory(analytics_users["ops"])
+
+    assert ops_client.get(QC_TREND_URL, {"days": 366}).status_code == 400
+    assert ops_client.get(QC_TREND_URL, {"granularity": "year"}).status_code == 400
+    default = ops_client.get(QC_TREND_URL)
+    assert default.status_code == 200
+    assert default.data["data"]["window_days"] == 30
+    assert len(default.data["data"]["trend"]) == 30
+    assert (
+        authed_client_factory(analytics_users["technician"])
+        .get(QC_TREND_URL)
+        .status_code
+        == 403
+    )
+
+
+def test_fleet_analytics_is_refreshed_after_a_ticket_transition(
+    authed_client_factory,
+    analytics_users,
+    inventory_item_factory,
+    django_capture_on_commit_callbacks,
+):
+    ticket = Ticket.objects.create(
+        inventory_item=inventory_item_factory(serial_number="RM-FA-CACHE"),
+        master=analytics_users["master"],
+        technician=analytics_users["technician"],
+        status=TicketStatus.UNDER_REVIEW,
+        title="Cached ticket",
+    )
+    FleetSnapshotService.reconcile()
+    client = authed_client_factory(analytics_users["ops"])
+
+    first = client.get(FLEET_URL)
+    assert first.headers["Age"] == "0"
+    assert first.data["data"]["cache"] == {"age_seconds": 0, "stale": False}
+    assert first.data["data"]["tickets"]["under_review"] == 1
+
+    ticket.status = TicketStatus.IN_PROGRESS
+    with django_capture_on_commit_callbacks(execute=True):
+        ticket.save(update_fields=["status"])
+    cached = client.get(FLEET_URL)
+    assert cached.data["data"]["generated_at"] == first.data["data"]["generated_at"]
+    assert cached.data["data"]["tickets"]["under_review"] == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        TicketWorkflowService.log_ticket_transition(
+            ticket=ticket,
+            action=TicketTransitionAction.STARTED,
+            from_status=TicketStatus.UNDER_REVIEW,
+            to_status=TicketStatus.IN_PROGRESS,
+        )
+
+    # Invalidation keeps serving the old payload, marked stale, while one
+    # refresh runs (eagerly under tests); the next read sees the new counters.
+    stale = client.get(FLEET_URL)
+    assert stale.data["data"]["cache"]["stale"] is True
+    assert stale.data["data"]["tickets"]["under_review"] == 1
+
+    refreshed = client.get(FLEET_URL)
+    assert refreshed.data["data"]["cache"]["stale"] is False
+    assert refreshed.data["data"]["tickets"]["under_review"] == 0
+    assert refreshed.data["data"]["tickets"]["in_progress"] == 1
+
+
 def test_team_analytics_returns_member_metrics(
     authed_client_factory, analytics_users, inventory_item_factory
 ):
@@ -244,6 +353,7 @@ def test_team_analytics_returns_member_metrics(
         finished_at=now,
         title="Had rework",
         flag_minutes=80,
+        qc_fail_count=1,
     )
     TicketTransition.objects.create(
         ticket=ticket_rework,
@@ -272,6 +382,7 @@ def test_team_analytics_returns_member_metrics(
         check_out_at=now + timedelta(hours=8),
     )
 
+    TechnicianDailyStatsService.build_missing()
     client = authed_client_factory(analytics_users["ops"])
     resp = client.get(TEAM_URL, {"days": 7})
 
@@ -0,0 +1,170 @@
+import asyncio
+import csv
+import gzip
+import io
+import json
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from attendance.models import AttendanceRecord
+from core.services.exports import DataExportService
+from core.utils.asyncio import iterate_sync
+from core.utils.business_dates import business_date
+from core.utils.constants import RoleSlug, XPTransactionEntryType
+from gamification.models import XPTransaction
+
+pytestmark = pytest.mark.django_db
+
+EXPORT_URL = "/api/v1/misc/exports/{dataset}/"
+
+
+@pytest.fixture
+def export_context(user_factory, assign_roles, ticket_factory):
+    ops = assign_roles(user_factory(username="export_ops"), RoleSlug.OPS_MANAGER)
+    today = business_date()
+    for offset, amount in ((0, 5), (3, 7)):
+        XPTransaction.objects.create(
+            user=ops,
+            amount=amount,
+            entry_type=XPTransactionEntryType.MANUAL_ADJUSTMENT,
+            reference=f"export_xp_{offset}",
+            payload={"note": "ledger, quoted"},
+        )
+        XPTransaction.all_objects.filter(reference=f"export_xp_{offset}").update(
+            business_date=today - timedelta(days=offset)
+        )
+    AttendanceRecord.objects.create(
+        user=ops, work_date=today, check_in_at=timezone.now()
+    )
+    return {
+        "ops": ops,
+        "ticket": ticket_factory(technician=ops, title="Export, with comma"),
+        "today": today,
+    }
+
+
+def _content(response) -> bytes:
+    return b"".join(response.streaming_content)
+
+
+def test_csv_export_streams_header_and_rows(authed_client_factory, export_context):
+    client = authed_client_factory(export_context["ops"])
+
+    resp = client.get(EXPORT_URL.format(dataset="tickets"))
+
+    assert resp.status_code == 200
+    assert resp["Content-Type"] == "text/csv; charset=utf-8"
+    assert resp["Content-Disposition"] == 'attachment; filename="tickets.csv"'
+    header, row = list(csv.reader(io.StringIO(_content(resp).decode())))
+    record = dict(zip(header, row, strict=True))
+    assert record["id"] == str(export_context["ticket"].id)
+    assert record["title"] == "Export, with comma"
+    assert record["deleted_at"] == ""
+
+
+def test_ndjson_export_applies_business_date_filter(
+    authed_client_factory, export_context
+):
+    client = authed_client_factory(export_context["ops"])
+    today = export_context["today"]
+
+    resp = client.get(
+        EXPORT_URL.format(dataset="xp_transactions"),
+        {"file_format": "ndjson", "date_from": today.isoformat()},
+    )
+
+    assert resp.status_code == 200
+    assert resp["Content-Type"] == "application/x-ndjson"
+    (line,) = _content(resp).decode().splitlines()
+    row = json.loads(line)
+    assert row["reference"] == "export_xp_0"
+    assert row["payload"] == {"note": "ledger, quoted"}
+    assert row["business_date"] == today.isoformat()
+
+
+def test_gzip_export_round_trips(authed_client_factory, export_context):
+    client = authed_client_factory(export_context["ops"])
+
+    resp = client.get(
+        EXPORT_URL.format(dataset="attendance"),
+        {"gzip": "true", "file_format": "ndjson"},
+    )
+
+    assert resp.status_code == 200
+    assert resp["Content-Type"] == "application/gzip"
+    assert resp["Content-Disposition"].endswith('attendance.ndjson.gz"')
+    (line,) = gzip.decompress(_content(resp)).decode().splitlines()
+    assert json.loads(line)["user_id"] == export_context["ops"].id
+
+
+def test_export_validates_query_and_role(
+    authed_client_factory, user_factory, export_context
+):
+    client = authed_client_factory(export_context["ops"])
+
+    assert client.get(EXPORT_URL.format(dataset="payroll")).status_code == 400
+    assert (
+        client.get(
+            EXPORT_URL.format(dataset="tickets"),
+            {"date_from": "2026-02-02", "date_to": "2026-02-01"},
+        ).status_code
+        == 400
+    )
+    regular = user_factory(username="export_regular")
+    assert (
+        authed_client_factory(regular)
+        .get(EXPORT_URL.format(dataset="tickets"))
+        .status_code
+        == 403
+    )
+
+
+def test_csv_chunks_flush_at_threshold(monkeypatch, export_context):
+    monkeypatch.setattr(DataExportService, "FLUSH_BYTES", 1)
+
+    chunks = list(DataExportService.stream(dataset="xp_transactions", chunk_size=1))
+
+    # The header rides with the first row; no empty trailing chunk.
+    assert len(chunks) == 2
+    assert chunks[0].startswith(b"id,user_id,ticket_id,amount")
+
+
+def test_iterate_sync_drives_generator_and_closes_it():
+    closed = []
+
+    def numbers():
+        try:
+            yield from range(5)
+        finally:
+            closed.append(True)
+
+    async def take_two():
+        iterator = iterate_sync(numbers())
+        items = [await anext(iterator), await anext(iterator)]
+        await iterator.aclose()
+        return items
+
+    assert asyncio.run(take_two()) == [0, 1]
+    assert closed == [True]
+
+
+def test_export_data_command_writes_gzip_file(tmp_path, export_context):
+    output = tmp_path / "xp.csv.gz"
+
+    call_command(
+        "export_data",
+        "xp_transactions",
+        "--gzip",
+        "--output",
+        str(output),
+        "--date-to",
+        (export_context["today"] - timedelta(days=1)).isoformat(),
+    )
+
+    header, row = list(
+        csv.reader(io.StringIO(gzip.decompress(output.read_bytes()).decode()))
+    )
+    assert dict(zip(header, row, strict=True))["reference"] == "export_xp_3"
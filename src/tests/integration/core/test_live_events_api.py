@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from api.v1.core.views.live import LiveEventStreamAPIView
+from core.utils import live_events
+from core.utils.constants import RoleSlug, TicketStatus, TicketTransitionAction
+from ticket.services_workflow import TicketWorkflowService
+
+pytestmark = pytest.mark.django_db
+
+LIVE_URL = "/api/v1/live/events/"
+
+
+@pytest.fixture
+def published_events():
+    backend = live_events.get_live_event_backend()
+    messages: list[dict] = []
+
+    def listener(message: str) -> None:
+        messages.append(json.loads(message))
+
+    backend.add_listener(listener)
+    yield messages
+    backend.remove_listener(listener)
+
+
+def test_live_events_require_auth(api_client):
+    assert api_client.get(LIVE_URL).status_code == 401
+
+
+def test_live_events_reject_unknown_topics(
+    authed_client_factory, user_factory, assign_roles
+):
+    ops = assign_roles(user_factory(username="ops_live"), RoleSlug.OPS_MANAGER)
+
+    resp = authed_client_factory(ops).get(LIVE_URL, {"topics": "tickets,payroll"})
+
+    assert resp.status_code == 400
+
+
+def test_live_events_reject_topics_outside_role(
+    authed_client_factory, user_factory, assign_roles
+):
+    qc = assign_roles(user_factory(username="qc_live"), RoleSlug.QC_INSPECTOR)
+    regular = user_factory(username="regular_live")
+
+    assert (
+        authed_client_factory(qc).get(LIVE_URL, {"topics": "fleet"}).status_code == 403
+    )
+    assert authed_client_factory(regular).get(LIVE_URL).status_code == 403
+
+
+def test_live_events_refuse_connections_at_capacity(
+    authed_client_factory, user_factory, assign_roles, settings
+):
+    settings.LIVE_EVENTS_MAX_CONNECTIONS = 0
+    ops = assign_roles(user_factory(username="ops_live_cap"), RoleSlug.OPS_MANAGER)
+
+    resp = authed_client_factory(ops).get(LIVE_URL)
+
+    assert resp.status_code == 503
+    assert resp["Retry-After"] == "5"
+
+
+def test_allowed_topics_follow_roles():
+    assert LiveEventStreamAPIView.allowed_topics(
+        role_slugs=frozenset({RoleSlug.TECHNICIAN}), is_superuser=False
+    ) == {"tickets", "work_sessions"}
+    assert LiveEventStreamAPIView.allowed_topics(
+        role_slugs=frozenset(), is_superuser=True
+    ) == {"tickets", "work_sessions", "fleet"}
+
+
+def test_ticket_transition_publishes_after_commit(
+    ticket_factory, user_factory, published_events, django_capture_on_commit_callbacks
+):
+    technician = user_factory(username="tech_live")
+    ticket = ticket_factory(status=TicketStatus.ASSIGNED, technician=technician)
+
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        TicketWorkflowService.log_ticket_transition(
+            ticket=ticket,
+            from_status=TicketStatus.ASSIGNED,
+            to_status=TicketStatus.IN_PROGRESS,
+            action=TicketTransitionAction.STARTED,
+            actor_user_id=technician.id,
+        )
+    assert not [event for event in published_events if event["topic"] == "tickets"]
+
+    for callback in callbacks:
+        callback()
+
+    (event,) = [event for event in published_events if event["topic"] == "tickets"]
+    assert event["type"] == "ticket.transition"
+    assert event["technician_id"] == technician.id
+    assert event["data"]["ticket_id"] == ticket.id
+    assert event["data"]["to_status"] == TicketStatus.IN_PROGRESS
@@ -6,6 +6,7 @@ from django.utils import timezone
 from attendance.models import AttendanceRecord
 from core.utils.constants import RoleSlug, TicketStatus, TicketTransitionAction
 from gamification.models import XPTransaction
+from gamification.services import ProgressionService
 from inventory.models import InventoryItemStatus
 from ticket.models import Ticket, TicketTransition
 
@@ -64,6 +65,7 @@ def public_stats_context(user_factory, assign_roles, inventory_item_factory):
         flag_color="red",
         total_duration=90,
         finished_at=now,
+        qc_fail_count=1,
     )
 
     second_ticket_1 = Ticket.objects.create(
@@ -137,6 +139,8 @@ def public_stats_context(user_factory, assign_roles, inventory_item_factory):
         check_in_at=now - timedelta(hours=9),
         check_out_at=now - timedelta(hours=1),
     )
+    # Roles and sources were written directly; seed rows as role updates do.
+    ProgressionService.seed_technician_rows(user_ids=[tech_top.id, tech_second.id])
 
     return {
         "top": tech_top,
@@ -0,0 +1,115 @@
+import pytest
+from django.utils import timezone
+
+from core.utils.constants import RoleSlug, TicketColor, TicketStatus
+from gamification.models import TechnicianDailyStats, TechnicianDailyStatsDay
+from gamification.services import GamificationService
+from gamification.services_daily_stats import TechnicianDailyStatsService
+from ticket.services_analytics import TicketAnalyticsService
+from ticket.services_workflow import TicketWorkflowService
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def daily_context(user_factory, assign_roles, inventory_item_factory, ticket_factory):
+    master = assign_roles(
+        user_factory(username="daily_master", first_name="Master"), RoleSlug.MASTER
+    )
+    technician = assign_roles(
+        user_factory(username="daily_technician", first_name="Tech"),
+        RoleSlug.TECHNICIAN,
+    )
+    qc_user = assign_roles(
+        user_factory(username="daily_qc", first_name="QC"), RoleSlug.QC_INSPECTOR
+    )
+    done_ticket = ticket_factory(
+        inventory_item=inventory_item_factory(serial_number="RM-DAILY-0001"),
+        master=master,
+        technician=technician,
+        status=TicketStatus.DONE,
+        finished_at=timezone.now(),
+        flag_color=TicketColor.GREEN,
+    )
+    waiting_ticket = ticket_factory(
+        inventory_item=inventory_item_factory(serial_number="RM-DAILY-0002"),
+        master=master,
+        technician=technician,
+        status=TicketStatus.WAITING_QC,
+        flag_color=TicketColor.RED,
+    )
+    return {
+        "technician": technician,
+        "qc_user": qc_user,
+        "done_ticket": done_ticket,
+        "waiting_ticket": waiting_ticket,
+    }
+
+
+def _today_totals(user_id: int) -> dict[str, int]:
+    today = TechnicianDailyStatsService.business_date()
+    return TechnicianDailyStatsService.totals_by_user(
+        user_ids=[user_id], date_from=today, date_to=today
+    ).get(user_id, {})
+
+
+def test_reads_never_build_the_build_task_does(daily_context):
+    today = TechnicianDailyStatsService.business_date()
+
+    assert _today_totals(daily_context["technician"].id) == {}
+    assert not TechnicianDailyStatsDay.objects.filter(business_date=today).exists()
+
+    summary = TechnicianDailyStatsService.build_missing()
+    totals = _today_totals(daily_context["technician"].id)
+
+    assert summary["date_to"] == today.isoformat()
+    assert TechnicianDailyStatsDay.objects.filter(business_date=today).exists()
+    assert totals["tickets_done"] == 1
+    assert totals["tickets_first_pass"] == 1
+    assert totals["tickets_flag_green"] == 1
+    assert TechnicianDailyStatsService.build_missing()["rows"] == 0
+
+
+def test_scoring_events_update_built_day_in_place(daily_context):
+    technician = daily_context["technician"]
+    ticket = daily_context["waiting_ticket"]
+    TechnicianDailyStatsService.build_missing()
+
+    TicketWorkflowService.qc_fail_ticket(
+        ticket=ticket, actor_user_id=daily_context["qc_user"].id
+    )
+    ticket.status = TicketStatus.WAITING_QC
+    ticket.save(update_fields=["status"])
+    TicketWorkflowService.qc_pass_ticket(
+        ticket=ticket, actor_user_id=daily_context["qc_user"].id
+    )
+    GamificationService.adjust_user_xp(
+        actor_user_id=daily_context["qc_user"].id,
+        target_user_id=technician.id,
+        amount=7,
+        comment="Bonus",
+    )
+
+    incremental = _today_totals(technician.id)
+    assert incremental["tickets_done"] == 2
+    assert incremental["tickets_rework"] == 1
+    assert incremental["tickets_flag_red"] == 1
+    assert incremental["qc_pass_events"] == 1
+    assert incremental["qc_fail_events"] == 1
+    assert incremental["xp_total"] == 7
+
+    TechnicianDailyStatsService.rebuild()
+    assert _today_totals(technician.id) == incremental
+
+
+def test_team_summary_reads_rollup_rows(daily_context):
+    technician = daily_context["technician"]
+    TechnicianDailyStatsService.build_missing()
+    TechnicianDailyStats.objects.filter(user_id=technician.id).update(
+        tickets_done=5, tickets_first_pass=4
+    )
+
+    member = TicketAnalyticsService.team_summary(days=1)["members"][0]
+
+    assert member["tickets_done"] == 5
+    assert member["tickets_first_pass"] == 4
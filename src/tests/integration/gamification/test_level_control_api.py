@@ -4,8 +4,11 @@ from zoneinfo import ZoneInfo
 import pytest
 
 from core.services.notifications import UserNotificationService
+from core.utils.business_dates import business_date
 from core.utils.constants import EmployeeLevel, RoleSlug, XPTransactionEntryType
 from gamification.models import UserLevelHistoryEvent, XPTransaction
+from gamification.services import ProgressionService
+from gamification.services_daily_stats import TechnicianDailyStatsService
 
 pytestmark = pytest.mark.django_db
 
@@ -32,6 +35,7 @@ def _create_xp_entry(
     XPTransaction.all_objects.filter(pk=entry.pk).update(
         created_at=created_at,
         updated_at=created_at,
+        business_date=business_date(created_at),
     )
     return entry
 
@@ -70,6 +74,9 @@ def level_control_context(user_factory, assign_roles):
         reference="level_control_low_xp",
         created_at=now - timedelta(days=1),
     )
+    # Roles and XP were written directly; seed rows as the services and tasks do.
+    ProgressionService.seed_technician_rows(user_ids=[tech_high.id, tech_low.id])
+    TechnicianDailyStatsService.build_missing()
 
     return {
         "ops": ops,
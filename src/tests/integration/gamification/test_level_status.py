@@ -0,0 +1,202 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+
+from core.utils.constants import EmployeeLevel, RoleSlug, XPTransactionEntryType
+from gamification.models import UserLevelStatus, XPTransaction
+from gamification.services import GamificationService, ProgressionService
+from gamification.services_daily_stats import TechnicianDailyStatsService
+from gamification.services_level_status import UserLevelStatusService
+
+pytestmark = pytest.mark.django_db
+
+LEVEL_OVERVIEW_URL = "/api/v1/xp/levels/overview/"
+
+
+def _append(user, amount: int, reference: str) -> None:
+    GamificationService.append_xp_entry(
+        user_id=user.id,
+        amount=amount,
+        entry_type=XPTransactionEntryType.MANUAL_ADJUSTMENT,
+        reference=reference,
+    )
+
+
+@pytest.fixture
+def technicians(user_factory, assign_roles):
+    def _make(*names: str):
+        return [
+            assign_roles(
+                user_factory(username=f"status_{name}", first_name=name.title()),
+                RoleSlug.TECHNICIAN,
+            )
+            for name in names
+        ]
+
+    return _make
+
+
+def test_xp_append_seeds_then_increments_status(technicians):
+    (tech,) = technicians("alpha")
+
+    _append(tech, 10, "status:alpha:1")
+    _append(tech, 5, "status:alpha:2")
+
+    row = UserLevelStatus.objects.get(user=tech)
+    assert (row.week_start, row.week_xp, row.cumulative_xp) == (
+        UserLevelStatusService.week_start(),
+        15,
+        15,
+    )
+
+    # A row left on last week rolls forward on the first entry of this week.
+    UserLevelStatus.objects.filter(pk=row.pk).update(
+        week_start=row.week_start - timedelta(days=7), week_xp=99
+    )
+    _append(tech, 1, "status:alpha:3")
+
+    row.refresh_from_db()
+    assert (row.week_start, row.week_xp, row.cumulative_xp) == (
+        UserLevelStatusService.week_start(),
+        1,
+        16,
+    )
+
+
+def test_late_entry_of_last_week_moves_only_cumulative_xp(
+    technicians, django_assert_num_queries
+):
+    (tech,) = technicians("golf")
+    _append(tech, 10, "status:golf:1")
+    last_week = UserLevelStatusService.week_start() - timedelta(days=7)
+
+    with django_assert_num_queries(1):
+        UserLevelStatusService.record_xp_entries(
+            [XPTransaction(user_id=tech.id, amount=4, business_date=last_week)]
+        )
+
+    row = UserLevelStatus.objects.get(user=tech)
+    assert (row.week_start, row.week_xp, row.cumulative_xp) == (
+        UserLevelStatusService.week_start(),
+        10,
+        14,
+    )
+
+
+def test_weekly_evaluation_and_manual_level_refresh_status(technicians, user_factory):
+    (tech,) = technicians("bravo")
+    actor = user_factory(username="status_actor")
+    week_start = ProgressionService.default_previous_week_start()
+
+    ProgressionService.run_weekly_level_evaluation(week_start=week_start)
+
+    row = UserLevelStatus.objects.get(user=tech)
+    assert row.warning_active is True
+    assert row.latest_evaluation.week_start == week_start
+    assert row.latest_history_event.status == "warning"
+
+    ProgressionService.set_user_level_manually(
+        actor_user_id=actor.id,
+        user_id=tech.id,
+        new_level=EmployeeLevel.L3,
+        clear_warning=True,
+    )
+
+    row.refresh_from_db()
+    assert (row.level, row.warning_active) == (EmployeeLevel.L3, False)
+    assert row.latest_history_event.source == "manual_override"
+
+
+def test_weekly_evaluation_rolls_idle_rows_over(technicians, user_factory):
+    (tech,) = technicians("hotel")
+    _append(tech, 30, "status:hotel")
+    week_start = ProgressionService.default_previous_week_start()
+    UserLevelStatus.objects.filter(user=tech).update(week_start=week_start)
+    # Already evaluated for the week, so the run skips and does not rebuild it.
+    ProgressionService.run_weekly_level_evaluation(week_start=week_start)
+    UserLevelStatus.objects.filter(user=tech).update(week_start=week_start)
+    (overview_row,) = ProgressionService.get_level_control_overview()["rows"]
+    assert overview_row["current_week_xp"] == 0
+
+    ProgressionService.run_weekly_level_evaluation(week_start=week_start)
+
+    row = UserLevelStatus.objects.get(user=tech)
+    assert (row.week_start, row.week_xp, row.cumulative_xp) == (
+        UserLevelStatusService.week_start(),
+        0,
+        30,
+    )
+
+
+def test_overview_filters_sorts_and_pages_in_sql(
+    authed_client_factory,
+    assign_roles,
+    user_factory,
+    technicians,
+    django_assert_max_num_queries,
+):
+    ops = assign_roles(user_factory(username="status_ops"), RoleSlug.OPS_MANAGER)
+    low, high, mid = technicians("charlie", "delta", "echo")
+    TechnicianDailyStatsService.build_missing()
+    _append(low, 20, "status:low")
+    _append(high, 300, "status:high")
+    _append(mid, 120, "status:mid")
+    client = authed_client_factory(ops)
+    params = {"ordering": "-cumulative_xp", "limit": 2}
+
+    first = client.get(LEVEL_OVERVIEW_URL, params).data["data"]
+    assert [row["username"] for row in first["rows"]] == [
+        "status_delta",
+        "status_echo",
+    ]
+    assert first["rows"][0]["current_week_xp"] == 300
+    assert first["summary"]["technicians_total"] == 3
+    assert first["next_cursor"]
+
+    second = client.get(
+        LEVEL_OVERVIEW_URL, {**params, "cursor": first["next_cursor"]}
+    ).data["data"]
+    assert [row["username"] for row in second["rows"]] == ["status_charlie"]
+    assert second["next_cursor"] is None
+    assert second["summary"] == first["summary"]
+
+    names, cursor = [], None
+    while True:
+        page = ProgressionService.get_level_control_overview(limit=1, cursor=cursor)
+        names += [row["username"] for row in page["rows"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert names == ["status_charlie", "status_delta", "status_echo"]
+
+    below = client.get(LEVEL_OVERVIEW_URL, {"meets_target": "false"}).data["data"]
+    assert [row["username"] for row in below["rows"]] == ["status_charlie"]
+    assert below["summary"]["suggested_warning"] == 1
+
+    # Summary, one page and no per-technician lookups.
+    with django_assert_max_num_queries(7):
+        ProgressionService.get_level_control_overview(limit=2)
+
+
+def test_overview_rejects_bad_paging_params(
+    authed_client_factory, assign_roles, user_factory
+):
+    ops = assign_roles(user_factory(username="status_ops_bad"), RoleSlug.OPS_MANAGER)
+    client = authed_client_factory(ops)
+
+    assert client.get(LEVEL_OVERVIEW_URL, {"ordering": "email"}).status_code == 400
+    assert client.get(LEVEL_OVERVIEW_URL, {"limit": 0}).status_code == 400
+    assert client.get(LEVEL_OVERVIEW_URL, {"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_rebuild_command_repairs_drifted_rows(technicians, capsys):
+    (tech,) = technicians("foxtrot")
+    _append(tech, 40, "status:foxtrot")
+    UserLevelStatus.objects.filter(user=tech).update(cumulative_xp=0, week_xp=0)
+
+    call_command("rebuild_level_status", "--user-id", str(tech.id))
+
+    row = UserLevelStatus.objects.get(user=tech)
+    assert (row.week_xp, row.cumulative_xp) == (40, 40)
+    assert "users=1 changed=1" in capsys.readouterr().out
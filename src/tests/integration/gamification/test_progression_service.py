@@ -3,8 +3,14 @@ from zoneinfo import ZoneInfo
 
 import pytest
 
+from core.utils.business_dates import business_date
 from core.utils.constants import EmployeeLevel, XPTransactionEntryType
-from gamification.models import LevelUpCouponEvent, WeeklyLevelEvaluation, XPTransaction
+from gamification.models import (
+    LevelUpCouponEvent,
+    UserLevelHistoryEvent,
+    WeeklyLevelEvaluation,
+    XPTransaction,
+)
 from gamification.services import ProgressionService
 
 pytestmark = pytest.mark.django_db
@@ -23,6 +29,7 @@ def _create_xp_entry(
     XPTransaction.all_objects.filter(pk=entry.pk).update(
         created_at=created_at,
         updated_at=created_at,
+        business_date=business_date(created_at),
     )
 
 
@@ -147,3 +154,98 @@ def test_weekly_level_evaluation_does_not_downgrade_existing_user_level(user_fac
     assert evaluation.new_level == EmployeeLevel.L3
     assert evaluation.is_level_up is False
     assert LevelUpCouponEvent.objects.count() == 0
+
+
+def test_weekly_level_evaluation_resumes_after_failed_batch(user_factory, monkeypatch):
+    first = user_factory(username="progression_batch_one", level=EmployeeLevel.L1)
+    second = user_factory(username="progression_batch_two", level=EmployeeLevel.L1)
+    week_start = date(2026, 1, 19)
+    for index, user in enumerate((first, second)):
+        _create_xp_entry(
+            user_id=user.id,
+            amount=220,
+            reference=f"progression_batch_xp_{index}",
+            created_at=datetime(2026, 1, 20, 10, 0, tzinfo=ZoneInfo("Asia/Tashkent")),
+        )
+
+    monkeypatch.setattr(ProgressionService, "EVALUATION_BATCH_SIZE", 1)
+    original_batch = ProgressionService._evaluate_weekly_batch.__func__
+    calls = []
+
+    def _crash_on_second_batch(cls, **kwargs):
+        calls.append(kwargs["user_ids"])
+        if len(calls) == 2:
+            raise RuntimeError("worker lost")
+        return original_batch(cls, **kwargs)
+
+    monkeypatch.setattr(
+        ProgressionService,
+        "_evaluate_weekly_batch",
+        classmethod(_crash_on_second_batch),
+    )
+    with pytest.raises(RuntimeError):
+        ProgressionService.run_weekly_level_evaluation(week_start=week_start)
+
+    # The first batch is committed; the failed one left nothing behind.
+    assert list(
+        WeeklyLevelEvaluation.objects.filter(week_start=week_start).values_list(
+            "user_id", flat=True
+        )
+    ) == [first.id]
+    first.refresh_from_db()
+    second.refresh_from_db()
+    assert (first.level, second.level) == (EmployeeLevel.L2, EmployeeLevel.L1)
+
+    summary = ProgressionService.run_weekly_level_evaluation(week_start=week_start)
+
+    second.refresh_from_db()
+    assert summary["evaluations_skipped"] == 1
+    assert summary["evaluations_created"] == 1
+    assert summary["level_ups"] == 1
+    assert summary["coupon_events_created"] == 1
+    assert second.level == EmployeeLevel.L2
+    assert UserLevelHistoryEvent.objects.filter(week_start=week_start).count() == 2
+    assert LevelUpCouponEvent.objects.filter(week_start=week_start).count() == 2
+
+
+def test_latest_level_history_reads_one_row_per_user(
+    user_factory, django_assert_num_queries
+):
+    actor = user_factory(username="history_actor")
+    first = user_factory(username="history_first")
+    second = user_factory(username="history_second")
+    silent = user_factory(username="history_silent")
+
+    def _events(user, count: int) -> UserLevelHistoryEvent:
+        for index in range(count):
+            event = UserLevelHistoryEvent.objects.create(
+                user=user,
+                actor=actor,
+                source="manual_override",
+                status="manual_set",
+                previous_level=EmployeeLevel.L1,
+                new_level=EmployeeLevel.L2,
+                reference=f"history:{user.id}:{UserLevelHistoryEvent.objects.count()}",
+                note=str(index),
+            )
+        return event
+
+    user_ids = [first.id, second.id, silent.id]
+    for history_size in (1, 40):
+        newest_first = _events(first, history_size)
+        newest_second = _events(second, 2)
+
+        # Query shape does not depend on how much history each user has.
+        with django_assert_num_queries(1):
+            latest = ProgressionService._latest_level_history_by_user(user_ids=user_ids)
+            actor_ids = {event.actor.id for event in latest.values()}
+
+        assert latest == {first.id: newest_first, second.id: newest_second}
+        assert actor_ids == {actor.id}
+
+    cutoff = UserLevelHistoryEvent.objects.get(pk=newest_second.pk).created_at
+    earlier = ProgressionService._latest_level_history_by_user(
+        user_ids=user_ids, created_before=cutoff
+    )
+    assert set(earlier) <= {first.id, second.id}
+    assert all(event.created_at < cutoff for event in earlier.values())
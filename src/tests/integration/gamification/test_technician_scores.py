@@ -0,0 +1,206 @@
+import pytest
+
+from attendance.services import AttendanceService
+from core.utils.constants import RoleSlug, TicketColor, TicketStatus
+from gamification.models import TechnicianScore, UserLevelStatus
+from gamification.services import GamificationService
+from gamification.services_leaderboard import TechnicianScoreService
+from ticket.services_analytics import TicketAnalyticsService
+from ticket.services_workflow import TicketWorkflowService
+
+pytestmark = pytest.mark.django_db
+
+LEADERBOARD_URL = "/api/v1/analytics/public/leaderboard/"
+
+
+@pytest.fixture
+def score_context(user_factory, assign_roles, inventory_item_factory, ticket_factory):
+    master = assign_roles(
+        user_factory(username="score_master", first_name="Master"), RoleSlug.MASTER
+    )
+    technician = assign_roles(
+        user_factory(username="score_technician", first_name="Tech"),
+        RoleSlug.TECHNICIAN,
+    )
+    qc_user = assign_roles(
+        user_factory(username="score_qc", first_name="QC"), RoleSlug.QC_INSPECTOR
+    )
+    ticket = ticket_factory(
+        inventory_item=inventory_item_factory(serial_number="RM-SCORE-0001"),
+        master=master,
+        technician=technician,
+        status=TicketStatus.WAITING_QC,
+        total_duration=30,
+        flag_color=TicketColor.YELLOW,
+    )
+    return {"technician": technician, "qc_user": qc_user, "ticket": ticket}
+
+
+def _components(user_id: int) -> dict[str, int]:
+    row = TechnicianScore.objects.get(user_id=user_id)
+    return {
+        field: getattr(row, field)
+        for field in (*TechnicianScore.COMPONENT_FIELDS, "score")
+    }
+
+
+def test_scoring_events_update_row_incrementally(score_context):
+    technician = score_context["technician"]
+    ticket = score_context["ticket"]
+
+    TicketWorkflowService.qc_fail_ticket(
+        ticket=ticket, actor_user_id=score_context["qc_user"].id
+    )
+    assert _components(technician.id)["qc_fail_events_total"] == 1
+
+    ticket.status = TicketStatus.WAITING_QC
+    ticket.save(update_fields=["status"])
+    TicketWorkflowService.qc_pass_ticket(
+        ticket=ticket, actor_user_id=score_context["qc_user"].id
+    )
+    AttendanceService.check_in(user_id=technician.id)
+    GamificationService.adjust_user_xp(
+        actor_user_id=score_context["qc_user"].id,
+        target_user_id=technician.id,
+        amount=-2,
+        comment="Correction",
+    )
+
+    incremental = _components(technician.id)
+    assert incremental["tickets_done_total"] == 1
+    assert incremental["tickets_rework_total"] == 1
+    assert incremental["tickets_flag_yellow_total"] == 1
+    assert incremental["attendance_days_total"] == 1
+
+    assert TechnicianScoreService.rebuild(user_ids=[technician.id])["changed"] == 0
+    assert _components(technician.id) == incremental
+    row = TechnicianScore.objects.get(user_id=technician.id)
+    assert row.score == sum(TechnicianScoreService.score_components(row).values())
+
+
+def test_leaderboard_supports_conditional_requests_and_invalidation(
+    api_client, score_context, django_capture_on_commit_callbacks
+):
+    TechnicianScoreService.seed_missing_active_technicians()
+    first = api_client.get(LEADERBOARD_URL)
+    etag = first.headers["ETag"]
+
+    assert first.status_code == 200
+    assert first.headers["Last-Modified"]
+    assert first.data["data"]["members"][0]["tickets_done_total"] == 0
+
+    not_modified = api_client.get(LEADERBOARD_URL, HTTP_IF_NONE_MATCH=etag)
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == etag
+
+    with django_capture_on_commit_callbacks(execute=True):
+        TicketWorkflowService.qc_pass_ticket(
+            ticket=score_context["ticket"],
+            actor_user_id=score_context["qc_user"].id,
+        )
+
+    # The invalidated entry is served stale once while it is refreshed.
+    assert api_client.get(LEADERBOARD_URL, HTTP_IF_NONE_MATCH=etag).status_code == 304
+    refreshed = api_client.get(LEADERBOARD_URL, HTTP_IF_NONE_MATCH=etag)
+    assert refreshed.status_code == 200
+    assert refreshed.headers["ETag"] != etag
+    assert refreshed.data["data"]["members"][0]["tickets_done_total"] == 1
+
+
+def test_rank_position_matches_full_leaderboard_order(
+    user_factory, assign_roles, score_context
+):
+    TechnicianScoreService.record_xp(user_id=score_context["technician"].id, amount=5)
+    tied_ids = []
+    for index in range(2):
+        tied = assign_roles(
+            user_factory(username=f"score_tied_{index}", first_name="Tied"),
+            RoleSlug.TECHNICIAN,
+        )
+        TechnicianScoreService.record_xp(user_id=tied.id, amount=3)
+        tied_ids.append(tied.id)
+
+    leaderboard = TicketAnalyticsService.public_technician_leaderboard()
+    expected_ranks = {item["user_id"]: item["rank"] for item in leaderboard["members"]}
+
+    for user_id, expected_rank in expected_ranks.items():
+        _, ranking = TechnicianScoreService.rank_position(user_id=user_id)
+        assert ranking["rank"] == expected_rank
+        assert ranking["total"] == 3
+    assert expected_ranks[tied_ids[0]] < expected_ranks[tied_ids[1]]
+    assert (
+        TechnicianScoreService.rank_position(user_id=score_context["qc_user"].id)
+        is None
+    )
+
+
+def test_public_detail_does_not_load_other_technicians(
+    api_client, user_factory, assign_roles, score_context, django_assert_num_queries
+):
+    for index in range(3):
+        assign_roles(
+            user_factory(username=f"score_peer_{index}", first_name="Peer"),
+            RoleSlug.TECHNICIAN,
+        )
+    TechnicianScoreService.seed_missing_active_technicians()
+    user_id = score_context["technician"].id
+
+    # Rank row and count, ticket counts, XP totals and one UNION ALL for the
+    # recent XP, done-ticket and attendance sections.
+    with django_assert_num_queries(6):
+        response = api_client.get(f"/api/v1/analytics/public/technicians/{user_id}/")
+
+    assert response.status_code == 200
+    position = response.data["data"]["leaderboard_position"]
+    assert position["total_technicians"] == 4
+    assert (
+        response.data["data"]["metrics"]["tickets"]["status_counts"][
+            TicketStatus.WAITING_QC
+        ]
+        == 1
+    )
+
+
+def test_public_reads_never_seed_rows_role_updates_do(
+    api_client, authed_client_factory, user_factory, assign_roles, role_factory
+):
+    manager = assign_roles(user_factory(username="score_manager"), RoleSlug.OPS_MANAGER)
+    newcomer = user_factory(username="score_newcomer", first_name="New")
+    role_factory(RoleSlug.TECHNICIAN, name="Technician")
+
+    api_client.get(LEADERBOARD_URL)
+    assert not TechnicianScore.objects.filter(user=newcomer).exists()
+
+    response = authed_client_factory(manager).patch(
+        f"/api/v1/users/management/{newcomer.id}/",
+        {"role_slugs": [RoleSlug.TECHNICIAN]},
+        format="json",
+    )
+
+    assert response.status_code == 200
+    assert TechnicianScore.objects.filter(user=newcomer).exists()
+    assert UserLevelStatus.objects.filter(user=newcomer).exists()
+
+
+def test_deactivation_drops_technician_from_rank_counts(
+    authed_client_factory, user_factory, assign_roles, score_context
+):
+    manager = assign_roles(
+        user_factory(username="score_deactivator"), RoleSlug.OPS_MANAGER
+    )
+    peer = assign_roles(
+        user_factory(username="score_peer_inactive", first_name="Peer"),
+        RoleSlug.TECHNICIAN,
+    )
+    TechnicianScoreService.seed_missing_active_technicians()
+    technician_id = score_context["technician"].id
+    assert TechnicianScoreService.rank_position(user_id=technician_id)[1]["total"] == 2
+
+    response = authed_client_factory(manager).patch(
+        f"/api/v1/users/management/{peer.id}/", {"is_active": False}, format="json"
+    )
+
+    assert response.status_code == 200
+    assert TechnicianScore.objects.get(user=peer).is_active_technician is False
+    assert TechnicianScoreService.rank_position(user_id=peer.id) is None
+    assert TechnicianScoreService.rank_position(user_id=technician_id)[1]["total"] == 1
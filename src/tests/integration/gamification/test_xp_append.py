@@ -0,0 +1,125 @@
+import pytest
+from django.utils import timezone
+
+from core.utils.business_dates import business_date
+from core.utils.constants import XPTransactionEntryType
+from gamification.models import (
+    TechnicianDailyStats,
+    TechnicianDailyStatsDay,
+    TechnicianScore,
+    UserLevelStatus,
+    XPTransaction,
+)
+from gamification.services import GamificationService
+from gamification.services_level_status import UserLevelStatusService
+
+pytestmark = pytest.mark.django_db
+
+
+def _entry(user_id: int, reference: str, amount: int = 2) -> dict:
+    return {
+        "user_id": user_id,
+        "amount": amount,
+        "entry_type": XPTransactionEntryType.MANUAL_ADJUSTMENT,
+        "reference": reference,
+        "payload": {"source": "test"},
+    }
+
+
+def test_append_xp_entries_reports_created_and_existing(user_factory):
+    user = user_factory(username="xp_append_user")
+    TechnicianDailyStatsDay.objects.create(business_date=business_date())
+    existing, _ = GamificationService.append_xp_entry(
+        **_entry(user.id, "xp_append:existing", amount=5)
+    )
+
+    results = GamificationService.append_xp_entries(
+        [
+            _entry(user.id, "xp_append:new"),
+            _entry(user.id, "xp_append:existing", amount=50),
+            _entry(user.id, "xp_append:new"),
+        ]
+    )
+
+    assert [created for _, created in results] == [True, False, False]
+    assert results[0][0].pk == results[2][0].pk
+    assert results[1][0].pk == existing.pk
+    assert results[1][0].amount == 5
+    assert results[0][0].business_date == business_date()
+    # Caller payloads are stored as given.
+    assert XPTransaction.objects.get(reference="xp_append:new").payload == {
+        "source": "test"
+    }
+    assert XPTransaction.objects.filter(user=user).count() == 2
+    # Only created entries reach the rollups.
+    stats = TechnicianDailyStats.objects.get(user=user, business_date=business_date())
+    assert stats.xp_total == 7
+
+
+def test_append_xp_entries_retry_is_one_insert_and_two_selects(
+    user_factory, django_assert_num_queries
+):
+    user = user_factory(username="xp_append_retry")
+    entries = [_entry(user.id, f"xp_append_retry:{index}") for index in range(3)]
+    GamificationService.append_xp_entries(entries)
+
+    # Savepoint and release of the batch transaction around the statements.
+    with django_assert_num_queries(5):
+        results = GamificationService.append_xp_entries(entries)
+
+    assert [created for _, created in results] == [False, False, False]
+    assert GamificationService.append_xp_entries([]) == []
+
+
+def test_existing_row_with_same_timestamp_is_not_reported_created(
+    user_factory, monkeypatch
+):
+    user = user_factory(username="xp_append_same_clock")
+    frozen = timezone.now()
+    monkeypatch.setattr(timezone, "now", lambda: frozen)
+    GamificationService.append_xp_entry(**_entry(user.id, "xp_append:clock"))
+
+    results = GamificationService.append_xp_entries(
+        [_entry(user.id, "xp_append:clock")]
+    )
+
+    assert [created for _, created in results] == [False]
+
+
+def test_batch_applies_one_read_model_delta_per_user(
+    user_factory, django_assert_num_queries
+):
+    user = user_factory(username="xp_append_grouped")
+    TechnicianDailyStatsDay.objects.create(business_date=business_date())
+    GamificationService.append_xp_entry(**_entry(user.id, "xp_append_grouped:seed"))
+    entries = [
+        _entry(user.id, f"xp_append_grouped:{index}", amount=index)
+        for index in range(1, 5)
+    ]
+
+    # Savepoint pair, reads and insert, then one update per read model
+    # regardless of size.
+    with django_assert_num_queries(10):
+        GamificationService.append_xp_entries(entries)
+
+    stats = TechnicianDailyStats.objects.get(user=user, business_date=business_date())
+    assert stats.xp_total == 12
+    assert stats.xp_by_entry_type == {XPTransactionEntryType.MANUAL_ADJUSTMENT: 12}
+    assert TechnicianScore.objects.get(user=user).xp_total == 12
+    assert UserLevelStatus.objects.get(user=user).week_xp == 12
+
+
+def test_failed_read_model_update_rolls_back_the_ledger_insert(
+    user_factory, monkeypatch
+):
+    user = user_factory(username="xp_append_atomic")
+
+    def fail(entries):
+        raise RuntimeError("level status unavailable")
+
+    monkeypatch.setattr(UserLevelStatusService, "record_xp_entries", fail)
+    with pytest.raises(RuntimeError):
+        GamificationService.append_xp_entries([_entry(user.id, "xp_append:atomic")])
+
+    assert not XPTransaction.objects.filter(user=user).exists()
+    assert not TechnicianScore.objects.filter(user=user).exists()
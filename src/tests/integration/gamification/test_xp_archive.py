@@ -0,0 +1,85 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+
+from core.utils.business_dates import business_date, business_day_start
+from core.utils.constants import XPTransactionEntryType
+from gamification.models import XPMonthlySummary, XPMonthlySummaryMonth, XPTransaction
+from gamification.services_xp_archive import XPArchiveService
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def ledger(user_factory):
+    current = XPArchiveService.month_start(business_date())
+    previous = XPArchiveService.month_start(current - timedelta(days=1))
+    oldest = XPArchiveService.month_start(previous - timedelta(days=1))
+    user = user_factory(username="archive_user")
+
+    def _entry(amount: int, entry_type: str, day) -> None:
+        entry = XPTransaction.objects.create(
+            user=user,
+            amount=amount,
+            entry_type=entry_type,
+            reference=f"archive:{XPTransaction.all_objects.count()}",
+        )
+        XPTransaction.all_objects.filter(pk=entry.pk).update(
+            created_at=business_day_start(day) + timedelta(hours=10),
+            business_date=day,
+        )
+
+    _entry(10, XPTransactionEntryType.TICKET_BASE_XP, oldest)
+    _entry(3, XPTransactionEntryType.TICKET_QC_FIRST_PASS_BONUS, oldest)
+    _entry(7, XPTransactionEntryType.TICKET_BASE_XP, previous + timedelta(days=5))
+    _entry(2, XPTransactionEntryType.ATTENDANCE_PUNCTUALITY, current)
+    return {"user": user, "oldest": oldest, "previous": previous}
+
+
+def test_archive_summarizes_closed_months_once(ledger):
+    summary = XPArchiveService.archive_closed_months()
+
+    assert summary == {
+        "months": 2,
+        "rows": 3,
+        "archived_through": ledger["previous"].isoformat(),
+    }
+    assert set(
+        XPMonthlySummary.objects.values_list(
+            "month", "entry_type", "amount_total", "entry_count"
+        )
+    ) == {
+        (ledger["oldest"], XPTransactionEntryType.TICKET_BASE_XP, 10, 1),
+        (ledger["oldest"], XPTransactionEntryType.TICKET_QC_FIRST_PASS_BONUS, 3, 1),
+        (ledger["previous"], XPTransactionEntryType.TICKET_BASE_XP, 7, 1),
+    }
+    assert XPArchiveService.archive_closed_months()["months"] == 0
+    assert XPMonthlySummaryMonth.objects.count() == 2
+
+
+def test_entry_type_totals_match_ledger_before_and_after_archive(
+    ledger, django_assert_num_queries
+):
+    user_id = ledger["user"].id
+    expected = {
+        XPTransactionEntryType.TICKET_BASE_XP: (17, 2),
+        XPTransactionEntryType.TICKET_QC_FIRST_PASS_BONUS: (3, 1),
+        XPTransactionEntryType.ATTENDANCE_PUNCTUALITY: (2, 1),
+    }
+    assert XPArchiveService.entry_type_totals(user_id=user_id) == expected
+
+    call_command("archive_xp_ledger")
+
+    # Cutoff, summaries and the open-month tail.
+    with django_assert_num_queries(3):
+        totals = XPArchiveService.entry_type_totals(user_id=user_id)
+    assert totals == expected
+
+
+def test_archive_without_ledger_is_noop():
+    assert XPArchiveService.archive_closed_months() == {
+        "months": 0,
+        "rows": 0,
+        "archived_through": None,
+    }
@@ -0,0 +1,106 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+
+from core.utils.business_dates import business_date, business_day_start
+from core.utils.constants import XPTransactionEntryType
+from gamification.models import XPBalanceSnapshot, XPTransaction
+from gamification.services_xp_balance import XPBalance, XPBalanceService
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def ledger(user_factory):
+    today = business_date()
+    first = user_factory(username="balance_first")
+    second = user_factory(username="balance_second")
+
+    def _entry(user, amount: int, days_ago: int) -> None:
+        entry = XPTransaction.objects.create(
+            user=user,
+            amount=amount,
+            entry_type=XPTransactionEntryType.MANUAL_ADJUSTMENT,
+            reference=f"balance:{user.id}:{amount}:{days_ago}",
+        )
+        day = today - timedelta(days=days_ago)
+        XPTransaction.all_objects.filter(pk=entry.pk).update(
+            created_at=business_day_start(day) + timedelta(hours=12),
+            business_date=day,
+        )
+
+    _entry(first, 10, days_ago=3)
+    _entry(second, 4, days_ago=3)
+    _entry(first, 5, days_ago=2)
+    _entry(first, -2, days_ago=0)
+    return {"first": first, "second": second, "today": today, "entry": _entry}
+
+
+def test_balances_without_snapshots_sum_the_ledger(ledger):
+    balances = XPBalanceService.balances(
+        user_ids=[ledger["first"].id, ledger["second"].id]
+    )
+
+    assert balances == {
+        ledger["first"].id: XPBalance(total=13, tx_count=3),
+        ledger["second"].id: XPBalance(total=4, tx_count=1),
+    }
+
+
+def test_capture_writes_snapshots_for_active_users_only(ledger):
+    today = ledger["today"]
+
+    XPBalanceService.capture(snapshot_date=today - timedelta(days=3))
+    summary = XPBalanceService.capture(snapshot_date=today - timedelta(days=2))
+
+    assert summary["users"] == 1
+    latest = XPBalanceSnapshot.objects.get(
+        user=ledger["first"], business_date=today - timedelta(days=2)
+    )
+    assert (latest.balance, latest.tx_count) == (15, 2)
+    assert not XPBalanceSnapshot.objects.filter(
+        user=ledger["second"], business_date=today - timedelta(days=2)
+    ).exists()
+    # Re-running a captured day is a no-op.
+    assert XPBalanceService.capture(snapshot_date=today - timedelta(days=2)) == {
+        "business_date": (today - timedelta(days=2)).isoformat(),
+        "users": 0,
+    }
+
+
+def test_balances_add_recent_tail_to_latest_snapshot(ledger, django_assert_num_queries):
+    today = ledger["today"]
+    XPBalanceService.capture(snapshot_date=today - timedelta(days=3))
+    XPBalanceService.capture(snapshot_date=today - timedelta(days=2))
+    ledger["entry"](ledger["second"], 6, days_ago=1)
+    user_ids = [ledger["first"].id, ledger["second"].id]
+
+    with django_assert_num_queries(3):
+        balances = XPBalanceService.balances(user_ids=user_ids)
+
+    assert balances[ledger["first"].id] == XPBalance(total=13, tx_count=3)
+    assert balances[ledger["second"].id] == XPBalance(total=10, tx_count=2)
+    # Historic instants use the snapshot in force at that time.
+    as_of = business_day_start(today - timedelta(days=2))
+    assert XPBalanceService.balances(user_ids=user_ids, as_of=as_of) == {
+        ledger["first"].id: XPBalance(total=10, tx_count=1),
+        ledger["second"].id: XPBalance(total=4, tx_count=1),
+    }
+
+
+def test_capture_rejects_open_business_day(ledger):
+    with pytest.raises(ValueError):
+        XPBalanceService.capture(snapshot_date=ledger["today"])
+
+
+def test_capture_command_defaults_to_yesterday(ledger, capsys):
+    call_command("capture_xp_balances")
+
+    yesterday = ledger["today"] - timedelta(days=1)
+    assert set(
+        XPBalanceSnapshot.objects.filter(business_date=yesterday).values_list(
+            "user_id", "balance"
+        )
+    ) == {(ledger["first"].id, 15), (ledger["second"].id, 4)}
+    assert "users=2" in capsys.readouterr().out
@@ -0,0 +1,65 @@
+from importlib import import_module
+
+import pytest
+from django.apps import apps
+
+from core.utils.constants import XPTransactionEntryType
+from gamification.models import XPTransaction
+
+pytestmark = pytest.mark.django_db
+
+backfill_migration = import_module("gamification.migrations.0012_xptransaction_ticket")
+
+
+def test_backfill_links_ticket_from_payload_or_reference(user_factory, ticket_factory):
+    technician = user_factory(username="backfill_tech")
+    ticket = ticket_factory(technician=technician)
+
+    def _entry(reference: str, payload: dict, entry_type: str) -> XPTransaction:
+        return XPTransaction.objects.create(
+            user=technician,
+            amount=1,
+            entry_type=entry_type,
+            reference=reference,
+            payload=payload,
+        )
+
+    from_payload = _entry(
+        f"ticket_base_xp:{ticket.id}",
+        {"ticket_id": ticket.id},
+        XPTransactionEntryType.TICKET_BASE_XP,
+    )
+    from_reference = _entry(
+        f"ticket_qc_status_update:{ticket.id}:7",
+        {},
+        XPTransactionEntryType.TICKET_QC_STATUS_UPDATE,
+    )
+    missing_ticket = _entry(
+        "ticket_base_xp:999999",
+        {"ticket_id": 999999},
+        XPTransactionEntryType.TICKET_BASE_XP,
+    )
+    unrelated = _entry(
+        "attendance_checkin:backfill",
+        {},
+        XPTransactionEntryType.ATTENDANCE_PUNCTUALITY,
+    )
+
+    backfill_migration.backfill_xp_transaction_ticket(apps, None)
+
+    linked = dict(
+        XPTransaction.objects.filter(
+            pk__in=[
+                from_payload.pk,
+                from_reference.pk,
+                missing_ticket.pk,
+                unrelated.pk,
+            ]
+        ).values_list("pk", "ticket_id")
+    )
+    assert linked == {
+        from_payload.pk: ticket.id,
+        from_reference.pk: ticket.id,
+        missing_ticket.pk: None,
+        unrelated.pk: None,
+    }
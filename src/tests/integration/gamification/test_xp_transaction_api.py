@@ -13,7 +13,7 @@ TRANSACTIONS_URL = "/api/v1/xp/transactions/"
 
 
 @pytest.fixture
-def transactions_context(user_factory, assign_roles):
+def transactions_context(user_factory, assign_roles, ticket_factory):
     tech_one = user_factory(
         username="xp_api_tech_one",
         first_name="Tech One",
@@ -27,26 +27,31 @@ def transactions_context(user_factory, assign_roles):
         first_name="Ops",
     )
     assign_roles(ops, RoleSlug.OPS_MANAGER)
+    ticket_one = ticket_factory(technician=tech_one)
+    ticket_two = ticket_factory(technician=tech_two)
 
     XPTransaction.objects.create(
         user=tech_one,
         amount=3,
         entry_type=XPTransactionEntryType.TICKET_BASE_XP,
-        reference="ticket_base_xp:101",
-        payload={"ticket_id": 101},
+        reference=f"ticket_base_xp:{ticket_one.id}",
+        ticket=ticket_one,
+        payload={"ticket_id": ticket_one.id},
     )
     XPTransaction.objects.create(
         user=tech_one,
         amount=1,
         entry_type=XPTransactionEntryType.TICKET_QC_FIRST_PASS_BONUS,
-        reference="ticket_qc_first_pass_bonus:101",
-        payload={"ticket_id": 101},
+        reference=f"ticket_qc_first_pass_bonus:{ticket_one.id}",
+        ticket=ticket_one,
+        payload={"ticket_id": ticket_one.id},
     )
     XPTransaction.objects.create(
         user=tech_one,
         amount=1,
         entry_type=XPTransactionEntryType.TICKET_QC_STATUS_UPDATE,
-        reference="ticket_qc_status_update:101:501",
+        reference=f"ticket_qc_status_update:{ticket_one.id}:501",
+        ticket=ticket_one,
         payload={},
     )
     XPTransaction.objects.create(
@@ -60,14 +65,16 @@ def transactions_context(user_factory, assign_roles):
         user=tech_two,
         amount=4,
         entry_type=XPTransactionEntryType.TICKET_BASE_XP,
-        reference="ticket_base_xp:202",
-        payload={"ticket_id": 202},
+        reference=f"ticket_base_xp:{ticket_two.id}",
+        ticket=ticket_two,
+        payload={"ticket_id": ticket_two.id},
     )
 
     return {
         "tech_one": tech_one,
         "tech_two": tech_two,
         "ops": ops,
+        "ticket_one": ticket_one,
     }
 
 
@@ -108,15 +115,18 @@ def test_ops_can_filter_by_user_and_ticket(authed_client_factory, transactions_c
     assert len(by_user.data["results"]) == 1
     assert by_user.data["results"][0]["user"] == transactions_context["tech_two"].id
 
+    ticket_id = transactions_context["ticket_one"].id
     by_ticket = client.get(
-        f"{TRANSACTIONS_URL}?user_id={transactions_context['tech_one'].id}&ticket_id=101"
+        f"{TRANSACTIONS_URL}?user_id={transactions_context['tech_one'].id}"
+        f"&ticket_id={ticket_id}"
     )
     assert by_ticket.status_code == 200
     assert len(by_ticket.data["results"]) == 3
     refs = {item["reference"] for item in by_ticket.data["results"]}
-    assert "ticket_base_xp:101" in refs
-    assert "ticket_qc_first_pass_bonus:101" in refs
-    assert "ticket_qc_status_update:101:501" in refs
+    assert f"ticket_base_xp:{ticket_id}" in refs
+    assert f"ticket_qc_first_pass_bonus:{ticket_id}" in refs
+    assert f"ticket_qc_status_update:{ticket_id}:501" in refs
+    assert {item["ticket"] for item in by_ticket.data["results"]} == {ticket_id}
 
 
 def test_ops_can_filter_by_reference_date_range_and_amount(
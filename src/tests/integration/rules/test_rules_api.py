@@ -1,7 +1,10 @@
+from zoneinfo import ZoneInfo
+
 import pytest
 from django.core.cache import cache
 
 from core.utils.constants import RoleSlug, TicketStatus
+from core.utils.request_scope import RULES_SNAPSHOT, request_scope
 from gamification.models import XPTransaction
 from rules.models import RulesConfigVersion
 from rules.services import RulesService
@@ -130,9 +133,12 @@ def test_update_changes_cache_key_and_history(authed_client_factory, rules_conte
     assert "ticket_xp.base_divisor" in items[0]["diff"]["changes"]
 
 
-def test_update_rotates_cached_rules_config(rules_context):
+def test_update_rotates_cached_rules_config(
+    rules_context, django_capture_on_commit_callbacks
+):
     actor = rules_context["super_admin"]
-    state_before = RulesService.get_active_rules_state()
+    with django_capture_on_commit_callbacks(execute=True):
+        state_before = RulesService.get_active_rules_state()
     config_before = RulesService.get_active_rules_config()
     old_cache_key = RulesService._cache_storage_key(state_before.cache_key)
     assert (
@@ -142,11 +148,12 @@ def test_update_rotates_cached_rules_config(rules_context):
 
     updated = RulesService.get_active_rules_config()
     updated["ticket_xp"]["base_divisor"] = 13
-    RulesService.update_rules_config(
-        config=updated,
-        actor_user_id=actor.id,
-        reason="Cache rotation check",
-    )
+    with django_capture_on_commit_callbacks(execute=True):
+        RulesService.update_rules_config(
+            config=updated,
+            actor_user_id=actor.id,
+            reason="Cache rotation check",
+        )
     state_after = RulesService.get_active_rules_state()
     new_cache_key = RulesService._cache_storage_key(state_after.cache_key)
 
@@ -259,3 +266,146 @@ def test_ticket_xp_formula_uses_active_rules(
     )
     assert base_entry.amount == 5  # ceil(45/10)
     assert bonus_entry.amount == 2
+
+
+def test_active_rules_snapshot_is_served_without_db_queries(
+    rules_context, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        snapshot = RulesService.get_active_rules_snapshot()
+
+    with django_assert_num_queries(0):
+        again = RulesService.get_active_rules_snapshot()
+        config = RulesService.get_active_rules_config()
+
+    assert again is snapshot
+    assert config["ticket_xp"]["base_divisor"] == 20
+    with pytest.raises(TypeError):
+        snapshot.config["ticket_xp"]["base_divisor"] = 1
+
+
+def test_rules_snapshot_follows_activation_from_other_worker(
+    rules_context, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    actor = rules_context["super_admin"]
+    with django_capture_on_commit_callbacks(execute=True):
+        stale_snapshot = RulesService.get_active_rules_snapshot()
+
+    updated = RulesService.get_active_rules_config()
+    updated["ticket_xp"]["base_divisor"] = 11
+    with django_capture_on_commit_callbacks(execute=True):
+        RulesService.update_rules_config(
+            config=updated,
+            actor_user_id=actor.id,
+            reason="Cross-worker invalidation check",
+        )
+    # Simulate a worker process that still holds the previous snapshot.
+    RulesService._local_snapshot = stale_snapshot
+
+    with django_assert_num_queries(0):
+        fresh_snapshot = RulesService.get_active_rules_snapshot()
+
+    assert fresh_snapshot.version == stale_snapshot.version + 1
+    assert fresh_snapshot.cache_key != stale_snapshot.cache_key
+    assert fresh_snapshot.section("ticket_xp")["base_divisor"] == 11
+
+
+def test_rules_snapshot_is_pinned_per_request_scope(
+    rules_context, django_capture_on_commit_callbacks
+):
+    actor = rules_context["super_admin"]
+
+    with request_scope() as scope:
+        first = RulesService.get_active_rules_snapshot()
+        assert RulesService.get_active_rules_snapshot() is first
+
+        updated = RulesService.get_active_rules_config()
+        updated["ticket_xp"]["base_divisor"] = 13
+        with django_capture_on_commit_callbacks(execute=True):
+            RulesService.update_rules_config(
+                config=updated,
+                actor_user_id=actor.id,
+                reason="Request scope invalidation check",
+            )
+        refreshed = RulesService.get_active_rules_snapshot()
+
+    assert refreshed.version == first.version + 1
+    assert refreshed.ticket_xp.base_divisor == 13
+    assert scope.stats()[RULES_SNAPSHOT]["misses"] == 2
+
+
+def test_rules_snapshot_exposes_compiled_sections(
+    rules_context, django_capture_on_commit_callbacks
+):
+    actor = rules_context["super_admin"]
+    config = RulesService.get_active_rules_config()
+    config["attendance"]["on_time_cutoff"] = "09:30"
+    config["attendance"]["grace_cutoff"] = "09:45"
+    config["work_session"]["daily_pause_limit_minutes"] = 40
+    config["progression"]["level_thresholds"]["3"] = 100
+    with django_capture_on_commit_callbacks(execute=True):
+        RulesService.update_rules_config(
+            config=config,
+            actor_user_id=actor.id,
+            reason="Compiled sections check",
+        )
+
+    snapshot = RulesService.get_active_rules_snapshot()
+
+    assert snapshot.attendance.on_time_cutoff_minutes == 9 * 60 + 30
+    assert snapshot.attendance.grace_cutoff_minutes == 9 * 60 + 45
+    assert snapshot.attendance.timezone == ZoneInfo("Asia/Tashkent")
+    assert snapshot.work_session.daily_pause_limit_seconds == 40 * 60
+    assert snapshot.ticket_xp.base_divisor == 20
+    # L3 below L2 threshold is lifted to keep thresholds monotonic.
+    assert dict(snapshot.progression.level_thresholds) == {
+        1: 0,
+        2: 200,
+        3: 200,
+        4: 750,
+        5: 1100,
+    }
+    assert RulesService.get_active_rules_snapshot().attendance is snapshot.attendance
+
+
+def test_rolled_back_activation_is_never_published(
+    rules_context, django_capture_on_commit_callbacks
+):
+    actor = rules_context["super_admin"]
+    with django_capture_on_commit_callbacks(execute=True):
+        published = RulesService.get_active_rules_snapshot()
+
+    updated = RulesService.get_active_rules_config()
+    updated["ticket_xp"]["base_divisor"] = 17
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        RulesService.update_rules_config(
+            config=updated,
+            actor_user_id=actor.id,
+            reason="Uncommitted activation",
+        )
+
+    # Nothing reaches the shared pointer until the transaction commits.
+    assert callbacks
+    pointer = cache.get(RulesService.RULES_ACTIVE_POINTER_CACHE_KEY)
+    assert pointer["cache_key"] == published.cache_key
+    assert RulesService._local_snapshot is published
+
+
+def test_read_path_never_moves_pointer_backwards(
+    rules_context, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        stale = RulesService.get_active_rules_snapshot()
+    newer = {"cache_key": "newer-activation", "version": stale.version + 1}
+    cache.set(RulesService.RULES_ACTIVE_POINTER_CACHE_KEY, newer, timeout=None)
+
+    # A reader that loaded the older committed state republishes it.
+    with django_capture_on_commit_callbacks(execute=True):
+        RulesService._publish_active_snapshot(
+            state_cache_key=stale.cache_key,
+            version=stale.version,
+            config_payload=dict(stale.as_dict()),
+            replace_pointer=False,
+        )
+
+    assert cache.get(RulesService.RULES_ACTIVE_POINTER_CACHE_KEY) == newer
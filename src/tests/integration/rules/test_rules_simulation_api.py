@@ -0,0 +1,167 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from core.utils.constants import RoleSlug, TicketColor, TicketStatus
+from gamification.models import XPTransaction
+from gamification.services import ProgressionService
+from rules.models import RulesConfigVersion
+from rules.services import RulesService
+from ticket.services_workflow import TicketWorkflowService
+
+pytestmark = pytest.mark.django_db
+
+
+RULES_SIMULATE_URL = "/api/v1/rules/config/simulate/"
+
+
+@pytest.fixture
+def simulation_context(
+    user_factory, assign_roles, inventory_item_factory, ticket_factory
+):
+    super_admin = assign_roles(
+        user_factory(username="sim_super_admin", first_name="Sim"),
+        RoleSlug.SUPER_ADMIN,
+    )
+    ops = assign_roles(
+        user_factory(username="sim_ops", first_name="Ops"), RoleSlug.OPS_MANAGER
+    )
+    regular = user_factory(username="sim_regular", first_name="Regular")
+    technician = assign_roles(
+        user_factory(username="sim_technician", first_name="Tech"),
+        RoleSlug.TECHNICIAN,
+    )
+    ticket = ticket_factory(
+        inventory_item=inventory_item_factory(serial_number="RM-SIM-0001"),
+        master=super_admin,
+        technician=technician,
+        status=TicketStatus.WAITING_QC,
+        total_duration=45,
+        flag_minutes=45,
+        flag_color=TicketColor.YELLOW,
+        title="Simulation ticket",
+    )
+    TicketWorkflowService.qc_pass_ticket(ticket=ticket, actor_user_id=super_admin.id)
+
+    local_today = timezone.now().astimezone(ProgressionService.BUSINESS_TZ).date()
+    week_start = local_today - timedelta(days=local_today.weekday())
+    ProgressionService.run_weekly_level_evaluation(week_start=week_start)
+    return {
+        "super_admin": super_admin,
+        "ops": ops,
+        "regular": regular,
+        "technician": technician,
+        "date_from": week_start,
+        "date_to": week_start + timedelta(days=6),
+    }
+
+
+def _candidate_config():
+    config = RulesService.get_active_rules_config()
+    config["ticket_xp"]["base_divisor"] = 5
+    config["ticket_xp"]["first_pass_bonus"] = 0
+    config["ticket_xp"]["flag_yellow_max_minutes"] = 40
+    config["progression"]["weekly_target_xp"] = 5
+    return config
+
+
+def test_simulation_reports_xp_flag_and_weekly_diff(
+    authed_client_factory, simulation_context
+):
+    client = authed_client_factory(simulation_context["ops"])
+    xp_rows_before = XPTransaction.objects.count()
+    versions_before = RulesConfigVersion.objects.count()
+
+    resp = client.post(
+        RULES_SIMULATE_URL,
+        {
+            "config": _candidate_config(),
+            "date_from": simulation_context["date_from"].isoformat(),
+            "date_to": simulation_context["date_to"].isoformat(),
+        },
+        format="json",
+    )
+
+    assert resp.status_code == 200
+    report = resp.data["data"]
+    assert report["tickets"]["replayed"] == 1
+    assert report["tickets"]["base_xp"] == {"recorded": 3, "candidate": 9}
+    assert report["tickets"]["first_pass_bonus"]["recorded"] == 1
+    assert report["tickets"]["first_pass_bonus"]["candidate"] == 0
+    assert report["tickets"]["flag_colors"]["changed"] == 1
+    assert report["tickets"]["flag_colors"]["candidate"][TicketColor.RED] == 1
+    assert report["qc_status_updates"] == {
+        "replayed": 1,
+        "recorded": 1,
+        "candidate": 1,
+    }
+    assert report["xp"]["delta_total"] == 5
+    assert report["xp"]["users"] == [
+        {
+            "user_id": simulation_context["technician"].id,
+            "recorded_xp": 4,
+            "candidate_xp": 9,
+            "delta_xp": 5,
+        }
+    ]
+    assert "ticket_xp.base_divisor" in report["config_diff"]["changes"]
+
+    weekly = report["weekly_evaluations"]
+    technician_change = next(
+        row
+        for row in weekly["changes"]
+        if row["user_id"] == simulation_context["technician"].id
+    )
+    assert technician_change["recorded_status"] == "warning"
+    assert technician_change["candidate_status"] == "maintained"
+    assert technician_change["candidate_weekly_xp"] == 9
+
+    assert XPTransaction.objects.count() == xp_rows_before
+    assert RulesConfigVersion.objects.count() == versions_before
+
+
+def test_simulation_requires_rules_read_role(authed_client_factory, simulation_context):
+    client = authed_client_factory(simulation_context["regular"])
+
+    resp = client.post(
+        RULES_SIMULATE_URL,
+        {
+            "config": _candidate_config(),
+            "date_from": simulation_context["date_from"].isoformat(),
+            "date_to": simulation_context["date_to"].isoformat(),
+        },
+        format="json",
+    )
+
+    assert resp.status_code == 403
+
+
+def test_simulation_rejects_invalid_range_and_config(
+    authed_client_factory, simulation_context
+):
+    client = authed_client_factory(simulation_context["ops"])
+
+    inverted = client.post(
+        RULES_SIMULATE_URL,
+        {
+            "config": _candidate_config(),
+            "date_from": simulation_context["date_to"].isoformat(),
+            "date_to": simulation_context["date_from"].isoformat(),
+        },
+        format="json",
+    )
+    bad_config = _candidate_config()
+    bad_config["ticket_xp"]["base_divisor"] = 0
+    invalid = client.post(
+        RULES_SIMULATE_URL,
+        {
+            "config": bad_config,
+            "date_from": simulation_context["date_from"].isoformat(),
+            "date_to": simulation_context["date_to"].isoformat(),
+        },
+        format="json",
+    )
+
+    assert inverted.status_code == 400
+    assert invalid.status_code == 400
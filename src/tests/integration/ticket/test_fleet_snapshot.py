@@ -0,0 +1,213 @@
+from collections import Counter
+
+import pytest
+from django.db import transaction
+
+from core.utils.constants import (
+    InventoryItemStatus,
+    RoleSlug,
+    TicketColor,
+    TicketStatus,
+)
+from inventory.models import FleetSnapshotCounter
+from ticket.models import Ticket
+from ticket.services_analytics import TicketAnalyticsService
+from ticket.services_fleet_snapshot import FleetSnapshotService
+from ticket.services_work_session import TicketWorkSessionService
+from ticket.services_workflow import TicketWorkflowService
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def fleet_context(user_factory, assign_roles, inventory_item_factory):
+    master = assign_roles(
+        user_factory(username="fleet_master", first_name="Master"), RoleSlug.MASTER
+    )
+    technician = assign_roles(
+        user_factory(username="fleet_technician", first_name="Tech"),
+        RoleSlug.TECHNICIAN,
+    )
+    qc_user = assign_roles(
+        user_factory(username="fleet_qc", first_name="QC"), RoleSlug.QC_INSPECTOR
+    )
+    return {
+        "master": master,
+        "technician": technician,
+        "qc_user": qc_user,
+        "item": inventory_item_factory(serial_number="RM-FLEET-0001"),
+    }
+
+
+def _stored_counters() -> dict[str, int]:
+    return {
+        key: value
+        for key, value in FleetSnapshotCounter.domain.values_by_key().items()
+        if value and not key.startswith("meta.")
+    }
+
+
+def test_counters_follow_workflow_without_recount(
+    fleet_context, django_capture_on_commit_callbacks
+):
+    FleetSnapshotService.reconcile()
+    technician_id = fleet_context["technician"].id
+    with django_capture_on_commit_callbacks(execute=True):
+        ticket = Ticket.objects.create(
+            inventory_item=fleet_context["item"],
+            master=fleet_context["master"],
+            status=TicketStatus.NEW,
+            approved_by=fleet_context["master"],
+            approved_at=fleet_context["item"].created_at,
+            flag_minutes=45,
+            flag_color=TicketColor.YELLOW,
+            title="Fleet counters",
+        )
+        TicketWorkflowService.assign_ticket(
+            ticket=ticket,
+            technician_id=technician_id,
+            actor_user_id=fleet_context["master"].id,
+        )
+        TicketWorkflowService.start_ticket(ticket=ticket, actor_user_id=technician_id)
+
+    counters = FleetSnapshotService.counters()
+    assert counters["tickets.status.in_progress"] == 1
+    assert counters["tickets.active.flag.yellow"] == 1
+    assert counters["tickets.active.flag_minutes_sum"] == 45
+    assert counters[f"inventory.status.{InventoryItemStatus.IN_SERVICE}"] == 1
+    assert counters["inventory.active_ready"] == 0
+
+    with django_capture_on_commit_callbacks(execute=True):
+        TicketWorkSessionService.stop_work_session(
+            ticket=ticket, actor_user_id=technician_id
+        )
+        TicketWorkflowService.move_ticket_to_waiting_qc(
+            ticket=ticket, actor_user_id=technician_id
+        )
+        TicketWorkflowService.qc_pass_ticket(
+            ticket=ticket, actor_user_id=fleet_context["qc_user"].id
+        )
+
+    assert _stored_counters() == {
+        key: value for key, value in FleetSnapshotService.recount().items() if value
+    }
+    assert FleetSnapshotService.reconcile()["drift"] == {}
+    counters = FleetSnapshotService.counters()
+    assert counters["tickets.status.done"] == 1
+    assert counters.get("tickets.active.total", 0) == 0
+    assert counters["inventory.active_ready"] == 1
+
+
+def test_counter_deltas_commit_and_roll_back_with_the_write(
+    fleet_context, ticket_factory
+):
+    FleetSnapshotService.reconcile()
+
+    with pytest.raises(RuntimeError), transaction.atomic():
+        ticket_factory(
+            inventory_item=fleet_context["item"],
+            master=fleet_context["master"],
+            status=TicketStatus.UNDER_REVIEW,
+        )
+        # The delta is applied inside the workflow transaction.
+        assert _stored_counters()["tickets.status.under_review"] == 1
+        raise RuntimeError("workflow failed")
+
+    assert "tickets.status.under_review" not in _stored_counters()
+
+
+def test_soft_delete_removes_ticket_from_counters(
+    fleet_context, ticket_factory, django_capture_on_commit_callbacks
+):
+    ticket = ticket_factory(
+        inventory_item=fleet_context["item"],
+        master=fleet_context["master"],
+        status=TicketStatus.UNDER_REVIEW,
+        flag_color=TicketColor.RED,
+    )
+    FleetSnapshotService.reconcile()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        ticket.delete()
+
+    counters = FleetSnapshotService.counters()
+    assert counters["tickets.status.under_review"] == 0
+    assert counters["tickets.active.flag.red"] == 0
+    assert FleetSnapshotService.reconcile()["drift"] == {}
+
+
+def test_reconcile_repairs_drift_from_bulk_updates(fleet_context, ticket_factory):
+    ticket = ticket_factory(
+        inventory_item=fleet_context["item"],
+        master=fleet_context["master"],
+        status=TicketStatus.UNDER_REVIEW,
+    )
+    FleetSnapshotService.reconcile()
+
+    # Queryset updates bypass save(), so counters drift until reconciled.
+    Ticket.objects.filter(pk=ticket.pk).update(status=TicketStatus.DONE)
+    summary = FleetSnapshotService.reconcile()
+
+    assert summary["drift"]["tickets.status.under_review"] == 1
+    assert summary["drift"]["tickets.status.done"] == -1
+    counters = FleetSnapshotService.counters()
+    assert counters["tickets.status.done"] == 1
+    assert counters["tickets.status.under_review"] == 0
+
+
+def test_counters_read_is_single_query_and_never_seeds(
+    fleet_context, django_assert_num_queries
+):
+    FleetSnapshotCounter.domain.all().delete()
+
+    with django_assert_num_queries(1):
+        assert FleetSnapshotService.counters() == {}
+
+    FleetSnapshotService.reconcile()
+    with django_assert_num_queries(1):
+        counters = FleetSnapshotService.counters()
+
+    assert counters["inventory.total"] == 1
+    assert FleetSnapshotService.RECONCILED_AT_KEY in counters
+
+
+def test_recount_aggregates_each_model_in_one_query(
+    fleet_context, ticket_factory, django_assert_num_queries
+):
+    ticket_factory(
+        inventory_item=fleet_context["item"],
+        master=fleet_context["master"],
+        status=TicketStatus.UNDER_REVIEW,
+        flag_minutes=75,
+        flag_color=TicketColor.RED,
+    )
+    expected: Counter[str] = Counter()
+    for model in FleetSnapshotService.TRACKED_MODELS:
+        for row in model.all_objects.filter(deleted_at__isnull=True).values(
+            *model.FLEET_COUNTER_FIELDS
+        ):
+            expected.update(model.fleet_counter_contribution(row))
+
+    with django_assert_num_queries(len(FleetSnapshotService.TRACKED_MODELS)):
+        recounted = FleetSnapshotService.recount()
+
+    assert recounted == {key: value for key, value in expected.items() if value}
+
+
+def test_fleet_summary_query_count_is_pinned(
+    fleet_context, ticket_factory, django_assert_num_queries
+):
+    ticket_factory(
+        inventory_item=fleet_context["item"],
+        master=fleet_context["master"],
+        status=TicketStatus.UNDER_REVIEW,
+    )
+    FleetSnapshotService.reconcile()
+    TicketAnalyticsService.fleet_summary()
+
+    # Counter rows and the QC rollup sum; reads never build rollup days.
+    with django_assert_num_queries(2):
+        summary = TicketAnalyticsService.fleet_summary.uncached()
+
+    assert summary["tickets"]["under_review"] == 1
+    assert summary["backlog"]["kpis"]["avg_age_minutes"] >= 0
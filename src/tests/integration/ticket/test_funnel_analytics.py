@@ -0,0 +1,193 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from core.utils.business_dates import business_date
+from core.utils.constants import (
+    RoleSlug,
+    TicketFunnelDimension,
+    TicketStatus,
+    TicketTransitionAction,
+)
+from ticket.models import Ticket, TicketFunnelStats, TicketTransition
+from ticket.services_funnel_analytics import TicketFunnelAnalyticsService
+
+pytestmark = pytest.mark.django_db
+
+FUNNEL_URL = "/api/v1/analytics/funnel/"
+
+ASSIGN = [
+    (TicketTransitionAction.ASSIGNED, TicketStatus.NEW, TicketStatus.ASSIGNED),
+]
+FIRST_PASS = [
+    *ASSIGN,
+    (TicketTransitionAction.STARTED, TicketStatus.ASSIGNED, TicketStatus.IN_PROGRESS),
+    (
+        TicketTransitionAction.TO_WAITING_QC,
+        TicketStatus.IN_PROGRESS,
+        TicketStatus.WAITING_QC,
+    ),
+    (TicketTransitionAction.QC_PASS, TicketStatus.WAITING_QC, TicketStatus.DONE),
+]
+REWORK = [
+    *FIRST_PASS[:3],
+    (TicketTransitionAction.QC_FAIL, TicketStatus.WAITING_QC, TicketStatus.REWORK),
+    (TicketTransitionAction.STARTED, TicketStatus.REWORK, TicketStatus.IN_PROGRESS),
+    *FIRST_PASS[2:],
+]
+
+
+@pytest.fixture
+def funnel_context(user_factory, assign_roles, ticket_factory):
+    master = user_factory(username="funnel_master", first_name="Funnel")
+    other_master = user_factory(username="funnel_other")
+    ops = assign_roles(user_factory(username="funnel_ops"), RoleSlug.OPS_MANAGER)
+    created_at = timezone.now() - timedelta(hours=1)
+
+    def _ticket(steps, *, status, master=master, approved=True) -> Ticket:
+        ticket = ticket_factory(
+            master=master,
+            status=status,
+            approved_at=created_at if approved else None,
+        )
+        Ticket.objects.filter(pk=ticket.pk).update(created_at=created_at)
+        for action, from_status, to_status in steps:
+            TicketTransition.objects.create(
+                ticket=ticket,
+                from_status=from_status,
+                to_status=to_status,
+                action=action,
+            )
+        ticket.refresh_from_db()
+        return ticket
+
+    tickets = [
+        _ticket(FIRST_PASS, status=TicketStatus.DONE),
+        _ticket(REWORK, status=TicketStatus.DONE),
+        _ticket(ASSIGN, status=TicketStatus.ASSIGNED),
+        _ticket(
+            [], status=TicketStatus.UNDER_REVIEW, master=other_master, approved=False
+        ),
+    ]
+    return {
+        "master": master,
+        "ops": ops,
+        "week": TicketFunnelAnalyticsService.week_start(business_date(created_at)),
+        "tickets": tickets,
+    }
+
+
+def test_rebuild_persists_reached_counts_and_transition_matrix(funnel_context):
+    week = funnel_context["week"]
+
+    TicketFunnelAnalyticsService.rebuild(week_from=week, week_to=week)
+
+    fleet = TicketFunnelStats.objects.get(
+        week_start=week, dimension=TicketFunnelDimension.ALL
+    )
+    assert fleet.ticket_count == 4
+    assert fleet.rework_ticket_count == 1
+    assert fleet.reached == {
+        "under_review": 4,
+        "new": 3,
+        "assigned": 3,
+        "in_progress": 2,
+        "waiting_qc": 2,
+        "done": 2,
+    }
+    assert fleet.transitions["new>assigned"] == 3
+    assert fleet.transitions["waiting_qc>rework"] == 1
+    assert fleet.transitions["in_progress>waiting_qc"] == 3
+
+    by_master = TicketFunnelStats.objects.get(
+        week_start=week,
+        dimension=TicketFunnelDimension.MASTER,
+        dimension_id=funnel_context["master"].id,
+    )
+    assert by_master.ticket_count == 3
+    assert by_master.reached["under_review"] == 3
+    assert (
+        TicketFunnelStats.objects.filter(
+            week_start=week, dimension=TicketFunnelDimension.CATEGORY
+        ).count()
+        == 4
+    )
+
+
+def test_empty_weeks_are_built_once(funnel_context, django_assert_num_queries):
+    week = funnel_context["week"] - timedelta(weeks=10)
+
+    TicketFunnelAnalyticsService.ensure_built(week_from=week, week_to=week)
+
+    row = TicketFunnelStats.objects.get(week_start=week)
+    assert (row.dimension, row.ticket_count) == (TicketFunnelDimension.ALL, 0)
+    with django_assert_num_queries(1):
+        TicketFunnelAnalyticsService.ensure_built(week_from=week, week_to=week)
+
+
+def test_reads_never_build_the_build_task_does(funnel_context):
+    assert TicketFunnelAnalyticsService.summary.uncached(weeks=4)["cohorts"] == []
+    assert not TicketFunnelStats.objects.exists()
+
+    summary = TicketFunnelAnalyticsService.build_missing()
+
+    assert summary["rows"] > 0
+    assert TicketFunnelStats.objects.filter(week_start=funnel_context["week"]).exists()
+    assert TicketFunnelAnalyticsService.summary.uncached(weeks=4)["cohorts"]
+
+
+def test_year_summary_reads_rollup_with_bounded_queries(
+    funnel_context, django_assert_max_num_queries
+):
+    TicketFunnelAnalyticsService.build_missing()
+
+    # Reads only touch the rollup and dimension names.
+    with django_assert_max_num_queries(2):
+        payload = TicketFunnelAnalyticsService.summary.uncached(weeks=52)
+
+    (total,) = payload["totals"]
+    assert total["tickets"] == 4
+    assert len(payload["cohorts"]) == 52
+
+
+def test_funnel_api_returns_conversion_and_drop_off(
+    authed_client_factory, funnel_context
+):
+    TicketFunnelAnalyticsService.build_missing()
+    client = authed_client_factory(funnel_context["ops"])
+
+    resp = client.get(FUNNEL_URL, {"weeks": 4, "dimension": "master"})
+
+    assert resp.status_code == 200
+    data = resp.data["data"]
+    assert data["stages"] == list(TicketFunnelAnalyticsService.FUNNEL_STAGES)
+    totals = {item["dimension_id"]: item for item in data["totals"]}
+    master_funnel = totals[funnel_context["master"].id]
+    assert master_funnel["name"] == "Funnel"
+    assert master_funnel["rework_tickets"] == 1
+    stages = {item["stage"]: item for item in master_funnel["stages"]}
+    assert stages["assigned"] == {
+        "stage": "assigned",
+        "reached": 3,
+        "reached_percent": 100.0,
+        "conversion_percent": 66.67,
+        "drop_off": 1,
+    }
+    assert stages["done"]["conversion_percent"] is None
+    assert totals[funnel_context["tickets"][3].master_id]["stages"][0]["drop_off"] == 1
+
+
+def test_funnel_api_validates_query_and_role(
+    authed_client_factory, user_factory, funnel_context
+):
+    client = authed_client_factory(funnel_context["ops"])
+
+    assert client.get(FUNNEL_URL, {"weeks": 53}).status_code == 400
+    assert client.get(FUNNEL_URL, {"dimension": "technician"}).status_code == 400
+    assert (
+        authed_client_factory(user_factory(username="funnel_regular"))
+        .get(FUNNEL_URL)
+        .status_code
+        == 403
+    )
@@ -0,0 +1,179 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from core.utils.constants import (
+    RoleSlug,
+    TicketStage,
+    TicketStageDimension,
+    TicketStatus,
+    TicketTransitionAction,
+)
+from ticket.models import Ticket, TicketStageStats, TicketTransition
+from ticket.services_stage_analytics import TicketStageAnalyticsService
+
+pytestmark = pytest.mark.django_db
+
+STAGES_URL = "/api/v1/analytics/stages/"
+
+# (action, to_status, minutes after creation)
+FIRST_PASS_STEPS = [
+    (TicketTransitionAction.ASSIGNED, TicketStatus.ASSIGNED, 10),
+    (TicketTransitionAction.STARTED, TicketStatus.IN_PROGRESS, 20),
+    (TicketTransitionAction.TO_WAITING_QC, TicketStatus.WAITING_QC, 80),
+    (TicketTransitionAction.QC_PASS, TicketStatus.DONE, 90),
+]
+REWORK_STEPS = [
+    (TicketTransitionAction.ASSIGNED, TicketStatus.ASSIGNED, 30),
+    (TicketTransitionAction.STARTED, TicketStatus.IN_PROGRESS, 40),
+    (TicketTransitionAction.TO_WAITING_QC, TicketStatus.WAITING_QC, 100),
+    (TicketTransitionAction.QC_FAIL, TicketStatus.REWORK, 110),
+    (TicketTransitionAction.STARTED, TicketStatus.IN_PROGRESS, 120),
+    (TicketTransitionAction.TO_WAITING_QC, TicketStatus.WAITING_QC, 150),
+    (TicketTransitionAction.QC_PASS, TicketStatus.DONE, 160),
+]
+
+
+@pytest.fixture
+def stage_context(user_factory, assign_roles, ticket_factory):
+    technician = assign_roles(
+        user_factory(username="stage_tech", first_name="Stage", last_name="Tech"),
+        RoleSlug.TECHNICIAN,
+    )
+    ops = assign_roles(user_factory(username="stage_ops"), RoleSlug.OPS_MANAGER)
+    created_at = timezone.now() - timedelta(hours=3)
+
+    def _done_ticket(steps) -> Ticket:
+        ticket = ticket_factory(
+            technician=technician,
+            status=TicketStatus.DONE,
+            finished_at=created_at + timedelta(minutes=steps[-1][2]),
+        )
+        Ticket.objects.filter(pk=ticket.pk).update(created_at=created_at)
+        for action, to_status, minutes in steps:
+            transition = TicketTransition.objects.create(
+                ticket=ticket,
+                to_status=to_status,
+                action=action,
+            )
+            TicketTransition.all_objects.filter(pk=transition.pk).update(
+                created_at=created_at + timedelta(minutes=minutes)
+            )
+        ticket.refresh_from_db()
+        return ticket
+
+    first_pass = _done_ticket(FIRST_PASS_STEPS)
+    rework = _done_ticket(REWORK_STEPS)
+    return {
+        "technician": technician,
+        "ops": ops,
+        "week": TicketStageAnalyticsService.week_start(
+            first_pass.finished_business_date
+        ),
+        "category_id": first_pass.inventory_item.category_id,
+        "tickets": (first_pass, rework),
+    }
+
+
+def test_percentile_matches_linear_interpolation():
+    ordered = [10.0, 20.0, 30.0, 40.0]
+
+    assert TicketStageAnalyticsService.percentile(ordered, 0.5) == 25.0
+    assert TicketStageAnalyticsService.percentile(ordered, 0.9) == pytest.approx(37.0)
+    assert TicketStageAnalyticsService.percentile([5.0], 0.99) == 5.0
+
+
+def test_rebuild_persists_stage_percentiles_per_dimension(stage_context):
+    week = stage_context["week"]
+
+    TicketStageAnalyticsService.rebuild(week_from=week, week_to=week)
+
+    rows = {
+        (row.stage, row.dimension, row.dimension_id): row
+        for row in TicketStageStats.objects.filter(week_start=week)
+    }
+    assign = rows[(TicketStage.TIME_TO_ASSIGN, TicketStageDimension.ALL, 0)]
+    assert assign.sample_count == 2
+    assert assign.p50_seconds == 20 * 60
+    assert assign.p90_seconds == 28 * 60
+    assert assign.avg_seconds == 20 * 60
+
+    progress = rows[(TicketStage.TIME_IN_PROGRESS, TicketStageDimension.ALL, 0)]
+    assert (progress.p50_seconds, progress.sample_count) == (75 * 60, 2)
+    qc = rows[(TicketStage.TIME_IN_QC, TicketStageDimension.ALL, 0)]
+    assert qc.p50_seconds == 15 * 60
+    cycle = rows[(TicketStage.CYCLE_TIME, TicketStageDimension.ALL, 0)]
+    assert cycle.p99_seconds == round((90 + 0.99 * 70) * 60)
+
+    technician_id = stage_context["technician"].id
+    assert (
+        rows[
+            (TicketStage.CYCLE_TIME, TicketStageDimension.TECHNICIAN, technician_id)
+        ].sample_count
+        == 2
+    )
+    category_id = stage_context["category_id"]
+    assert (
+        rows[
+            (TicketStage.CYCLE_TIME, TicketStageDimension.CATEGORY, category_id)
+        ].sample_count
+        == 1
+    )
+
+
+def test_empty_weeks_are_built_once(stage_context, django_assert_num_queries):
+    week = stage_context["week"] - timedelta(weeks=5)
+
+    TicketStageAnalyticsService.ensure_built(week_from=week, week_to=week)
+
+    assert TicketStageStats.objects.filter(week_start=week).count() == len(
+        TicketStage.values
+    )
+    with django_assert_num_queries(1):
+        TicketStageAnalyticsService.ensure_built(week_from=week, week_to=week)
+
+
+def test_reads_never_build_the_build_task_does(stage_context):
+    assert TicketStageAnalyticsService.summary.uncached(weeks=4)["series"] == []
+    assert not TicketStageStats.objects.exists()
+
+    summary = TicketStageAnalyticsService.build_missing()
+
+    assert summary["rows"] > 0
+    assert TicketStageStats.objects.filter(week_start=stage_context["week"]).exists()
+    assert TicketStageAnalyticsService.summary.uncached(weeks=4)["series"]
+
+
+def test_stage_duration_api_returns_weekly_series(authed_client_factory, stage_context):
+    TicketStageAnalyticsService.build_missing()
+    client = authed_client_factory(stage_context["ops"])
+
+    resp = client.get(STAGES_URL, {"weeks": 4, "dimension": "technician"})
+
+    assert resp.status_code == 200
+    data = resp.data["data"]
+    assert data["weeks"] == 4
+    assert data["stages"] == list(TicketStage.values)
+    (point,) = [
+        item
+        for item in data["series"]
+        if item["week_start"] == stage_context["week"].isoformat()
+    ]
+    assert point["dimension_id"] == stage_context["technician"].id
+    assert point["name"] == "Stage Tech"
+    assert point["stages"][TicketStage.CYCLE_TIME]["count"] == 2
+    assert point["stages"][TicketStage.TIME_TO_ASSIGN]["p50_minutes"] == 20.0
+
+
+def test_stage_duration_api_validates_query_and_role(
+    authed_client_factory, stage_context
+):
+    ops_client = authed_client_factory(stage_context["ops"])
+
+    assert ops_client.get(STAGES_URL, {"weeks": 53}).status_code == 400
+    assert ops_client.get(STAGES_URL, {"dimension": "master"}).status_code == 400
+    assert (
+        authed_client_factory(stage_context["technician"]).get(STAGES_URL).status_code
+        == 403
+    )
@@ -410,6 +410,7 @@ def test_state_includes_acquired_xp_for_ticket(technician_ticket_context):
         amount=3,
         entry_type=XPTransactionEntryType.TICKET_BASE_XP,
         reference=f"test_ticket_base:{ticket.id}",
+        ticket=ticket,
         payload={"ticket_id": ticket.id},
     )
 
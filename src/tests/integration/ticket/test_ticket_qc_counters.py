@@ -0,0 +1,116 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from core.utils.constants import RoleSlug, TicketStatus, TicketTransitionAction
+from ticket.models import Ticket, TicketTransition
+from ticket.services_workflow import TicketWorkflowService
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def qc_counter_context(user_factory, assign_roles, inventory_item_factory):
+    master = assign_roles(
+        user_factory(username="qc_counter_master", first_name="Master"),
+        RoleSlug.MASTER,
+    )
+    technician = assign_roles(
+        user_factory(username="qc_counter_technician", first_name="Tech"),
+        RoleSlug.TECHNICIAN,
+    )
+    qc_user = assign_roles(
+        user_factory(username="qc_counter_qc", first_name="QC"),
+        RoleSlug.QC_INSPECTOR,
+    )
+
+    def _waiting_ticket(serial_number: str) -> Ticket:
+        return Ticket.objects.create(
+            inventory_item=inventory_item_factory(serial_number=serial_number),
+            master=master,
+            technician=technician,
+            status=TicketStatus.WAITING_QC,
+            title="QC counters",
+        )
+
+    return {"qc_user": qc_user, "waiting_ticket": _waiting_ticket}
+
+
+def test_qc_actions_maintain_ticket_counters(qc_counter_context):
+    qc_user_id = qc_counter_context["qc_user"].id
+    first_pass = qc_counter_context["waiting_ticket"]("RM-QCC-0001")
+    reworked = qc_counter_context["waiting_ticket"]("RM-QCC-0002")
+
+    TicketWorkflowService.qc_pass_ticket(ticket=first_pass, actor_user_id=qc_user_id)
+    TicketWorkflowService.qc_fail_ticket(ticket=reworked, actor_user_id=qc_user_id)
+    reworked.status = TicketStatus.WAITING_QC
+    reworked.save(update_fields=["status"])
+    TicketWorkflowService.qc_pass_ticket(ticket=reworked, actor_user_id=qc_user_id)
+
+    first_pass.refresh_from_db()
+    reworked.refresh_from_db()
+    assert (first_pass.qc_fail_count, first_pass.first_passed) == (0, True)
+    assert (reworked.qc_fail_count, reworked.first_passed) == (1, False)
+
+
+def test_backfill_command_recomputes_counters_from_transitions(qc_counter_context):
+    qc_user_id = qc_counter_context["qc_user"].id
+    ticket = qc_counter_context["waiting_ticket"]("RM-QCC-0003")
+    TicketWorkflowService.qc_fail_ticket(ticket=ticket, actor_user_id=qc_user_id)
+    ticket.status = TicketStatus.WAITING_QC
+    ticket.save(update_fields=["status"])
+    TicketWorkflowService.qc_pass_ticket(ticket=ticket, actor_user_id=qc_user_id)
+
+    Ticket.objects.filter(pk=ticket.pk).update(qc_fail_count=0, first_passed=None)
+    call_command("backfill_ticket_qc_counters", batch_size=1)
+
+    ticket.refresh_from_db()
+    assert (ticket.qc_fail_count, ticket.first_passed) == (1, False)
+
+
+def test_qc_wait_fields_track_each_qc_round(qc_counter_context):
+    ticket = qc_counter_context["waiting_ticket"]("RM-QCC-0004")
+    technician_id = ticket.technician_id
+    ticket.status = TicketStatus.IN_PROGRESS
+    ticket.save(update_fields=["status"])
+    entered_at = timezone.now() - timedelta(hours=1)
+
+    ticket.move_to_waiting_qc(actor_user_id=technician_id, entered_at=entered_at)
+    ticket.mark_qc_fail(failed_at=entered_at + timedelta(minutes=10))
+    ticket.start_progress(actor_user_id=technician_id)
+    ticket.move_to_waiting_qc(
+        actor_user_id=technician_id, entered_at=entered_at + timedelta(minutes=30)
+    )
+    ticket.mark_qc_pass(finished_at=entered_at + timedelta(minutes=35))
+
+    ticket.refresh_from_db()
+    assert ticket.first_waiting_qc_at == entered_at
+    assert ticket.last_waiting_qc_at == entered_at + timedelta(minutes=30)
+    assert ticket.qc_wait_seconds_total == 15 * 60
+
+
+def test_backfill_command_recomputes_qc_wait_fields(qc_counter_context):
+    ticket = qc_counter_context["waiting_ticket"]("RM-QCC-0005")
+    entered_at = timezone.now() - timedelta(hours=2)
+    steps = [
+        (TicketTransitionAction.TO_WAITING_QC, TicketStatus.WAITING_QC, 0),
+        (TicketTransitionAction.QC_FAIL, TicketStatus.REWORK, 20),
+        (TicketTransitionAction.TO_WAITING_QC, TicketStatus.WAITING_QC, 50),
+        (TicketTransitionAction.QC_PASS, TicketStatus.DONE, 55),
+    ]
+    for action, to_status, minutes in steps:
+        transition = TicketTransition.objects.create(
+            ticket=ticket, to_status=to_status, action=action
+        )
+        TicketTransition.all_objects.filter(pk=transition.pk).update(
+            created_at=entered_at + timedelta(minutes=minutes)
+        )
+
+    call_command("backfill_ticket_qc_wait", batch_size=1)
+
+    ticket.refresh_from_db()
+    assert ticket.first_waiting_qc_at == entered_at
+    assert ticket.last_waiting_qc_at == entered_at + timedelta(minutes=50)
+    assert ticket.qc_wait_seconds_total == 25 * 60
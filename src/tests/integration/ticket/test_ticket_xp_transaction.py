@@ -164,6 +164,11 @@ def test_qc_pass_logs_transition_and_creates_base_reference(xp_ticket_context):
         XPTransaction.objects.filter(reference=f"ticket_base_xp:{ticket.id}").count()
         == 1
     )
+    assert set(
+        XPTransaction.objects.filter(payload__ticket_id=ticket.id).values_list(
+            "ticket_id", flat=True
+        )
+    ) == {ticket.id}
 
 
 def test_qc_decisions_from_telegram_store_transition_metadata_and_logs(
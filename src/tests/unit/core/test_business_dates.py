@@ -0,0 +1,28 @@
+from datetime import UTC, date, datetime
+
+import pytest
+
+from core.utils.business_dates import business_date, business_date_range_bounds
+
+
+def test_business_date_uses_tashkent_calendar():
+    # 20:30 UTC is already the next day in Asia/Tashkent (UTC+5).
+    assert business_date(datetime(2026, 3, 1, 20, 30, tzinfo=UTC)) == date(2026, 3, 2)
+    assert business_date(datetime(2026, 3, 1, 18, 59, tzinfo=UTC)) == date(2026, 3, 1)
+
+
+def test_range_bounds_are_half_open_utc_instants():
+    start, end_exclusive, range_days = business_date_range_bounds(
+        date_from=date(2026, 3, 1), date_to=date(2026, 3, 7)
+    )
+
+    assert start == datetime(2026, 2, 28, 19, 0, tzinfo=UTC)
+    assert end_exclusive == datetime(2026, 3, 7, 19, 0, tzinfo=UTC)
+    assert range_days == 7
+
+
+def test_range_bounds_reject_inverted_and_oversized_ranges():
+    with pytest.raises(ValueError):
+        business_date_range_bounds(date_from=date(2026, 3, 2), date_to=date(2026, 3, 1))
+    with pytest.raises(ValueError):
+        business_date_range_bounds(date_from=date(2025, 1, 1), date_to=date(2026, 3, 1))
@@ -0,0 +1,92 @@
+import asyncio
+import json
+
+from core.utils.live_events import (
+    HEARTBEAT_FRAME,
+    RESYNC_FRAME,
+    LiveEventHub,
+    MemoryLiveEventBackend,
+    encode_frame,
+)
+
+
+def _message(topic: str, *, technician_id: int | None = None, **data) -> str:
+    return json.dumps(
+        {
+            "topic": topic,
+            "type": f"{topic}.changed",
+            "technician_id": technician_id,
+            "data": data,
+        }
+    )
+
+
+async def _collect(iterator, count: int) -> list[bytes]:
+    return [await anext(iterator) for _ in range(count)]
+
+
+def test_encode_frame_emits_named_sse_event():
+    frame = encode_frame({"type": "ticket.transition", "data": {"ticket_id": 7}})
+
+    assert frame == b'event: ticket.transition\ndata: {"ticket_id":7}\n\n'
+
+
+def test_hub_filters_by_topic_and_technician():
+    async def scenario():
+        hub = LiveEventHub(MemoryLiveEventBackend())
+        async with (
+            hub.subscribe(topics=["tickets"], technician_id=5) as own,
+            hub.subscribe(topics=["tickets", "fleet"]) as everything,
+        ):
+            hub.dispatch(_message("tickets", technician_id=5, ticket_id=1))
+            hub.dispatch(_message("tickets", technician_id=6, ticket_id=2))
+            hub.dispatch(_message("fleet", ready=1))
+
+            own_frames = own.frames(heartbeat_seconds=60)
+            all_frames = everything.frames(heartbeat_seconds=60)
+            return await _collect(own_frames, 2), await _collect(all_frames, 4)
+
+    own, everything = asyncio.run(scenario())
+
+    assert own[1] == b'event: tickets.changed\ndata: {"ticket_id":1}\n\n'
+    assert [frame.split(b"\n")[1] for frame in everything[1:]] == [
+        b'data: {"ticket_id":1}',
+        b'data: {"ticket_id":2}',
+        b'data: {"ready":1}',
+    ]
+
+
+def test_idle_stream_gets_heartbeats():
+    async def scenario():
+        hub = LiveEventHub(MemoryLiveEventBackend())
+        async with hub.subscribe(topics=["fleet"]) as subscription:
+            return await _collect(subscription.frames(heartbeat_seconds=0.01), 2)
+
+    assert asyncio.run(scenario())[1] == HEARTBEAT_FRAME
+
+
+def test_lagging_stream_drains_then_resyncs():
+    async def scenario():
+        hub = LiveEventHub(MemoryLiveEventBackend())
+        async with hub.subscribe(topics=["fleet"], max_pending=2) as subscription:
+            for ready in range(3):
+                hub.dispatch(_message("fleet", ready=ready))
+            return [frame async for frame in subscription.frames(heartbeat_seconds=60)]
+
+    frames = asyncio.run(scenario())
+
+    assert len(frames) == 4
+    assert frames[-1] == RESYNC_FRAME
+
+
+def test_memory_backend_delivers_published_messages_to_subscribers():
+    async def scenario():
+        backend = MemoryLiveEventBackend()
+        hub = LiveEventHub(backend)
+        async with hub.subscribe(topics=["tickets"]) as subscription:
+            # Let the backend listener task register before publishing.
+            await asyncio.sleep(0)
+            await asyncio.to_thread(backend.publish, _message("tickets", ticket_id=3))
+            return await _collect(subscription.frames(heartbeat_seconds=1), 2)
+
+    assert asyncio.run(scenario())[1].endswith(b'data: {"ticket_id":3}\n\n')
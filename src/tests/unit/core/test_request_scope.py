@@ -0,0 +1,111 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from bot.middlewares.request_scope import RequestScopeMiddleware
+from core.api.permissions import HasRole
+from core.utils.asyncio import run_sync
+from core.utils.constants import RoleSlug
+from core.utils.request_scope import (
+    ROLE_SLUGS,
+    current_request_scope,
+    request_scope,
+    request_scope_stats,
+    reset_request_scope_stats,
+    scoped_discard,
+    scoped_memoize,
+)
+
+
+def test_scoped_memoize_calls_factory_every_time_without_scope():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return len(calls)
+
+    assert scoped_memoize("demo", 1, factory) == 1
+    assert scoped_memoize("demo", 1, factory) == 2
+    assert current_request_scope() is None
+
+
+def test_request_scope_memoizes_and_counts_hits_and_misses():
+    reset_request_scope_stats()
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return "value"
+
+    with request_scope() as scope:
+        assert scoped_memoize("demo", 1, factory) == "value"
+        assert scoped_memoize("demo", 1, factory) == "value"
+        assert scoped_memoize("demo", 2, factory) == "value"
+        with request_scope() as nested:
+            assert nested is scope
+            scoped_memoize("demo", 1, factory)
+
+        assert scope.stats() == {"demo": {"hits": 2, "misses": 2}}
+
+    assert len(calls) == 2
+    assert current_request_scope() is None
+    assert request_scope_stats() == {"demo": {"hits": 2, "misses": 2}}
+
+
+def test_scoped_discard_drops_single_key_or_whole_namespace():
+    with request_scope() as scope:
+        scoped_memoize("demo", 1, lambda: "a")
+        scoped_memoize("demo", 2, lambda: "b")
+        scoped_memoize("other", 1, lambda: "c")
+
+        scoped_discard("demo", 1)
+        assert scoped_memoize("demo", 1, lambda: "a2") == "a2"
+        assert scoped_memoize("demo", 2, lambda: "b2") == "b"
+
+        scoped_discard("demo")
+        assert scoped_memoize("demo", 2, lambda: "b3") == "b3"
+        assert scoped_memoize("other", 1, lambda: "c2") == "c"
+        assert scope.stats()["demo"] == {"hits": 1, "misses": 4}
+
+
+def test_bot_request_scope_middleware_shares_scope_with_sync_services():
+    def sync_lookup():
+        return scoped_memoize("demo", "key", object)
+
+    async def handler(_event, data):
+        first = await run_sync(sync_lookup)
+        second = await run_sync(sync_lookup)
+        return first is second, current_request_scope().stats()
+
+    same_value, stats = asyncio.run(
+        RequestScopeMiddleware().__call__(handler, object(), {})
+    )
+
+    assert same_value is True
+    assert stats == {"demo": {"hits": 1, "misses": 1}}
+
+
+@pytest.mark.django_db
+def test_has_role_reads_role_slugs_once_per_scope(
+    user_factory, assign_roles, role_factory, django_assert_num_queries
+):
+    user = assign_roles(
+        user_factory(username="scope_roles_user", first_name="Scope"),
+        RoleSlug.OPS_MANAGER,
+    )
+    role_factory(RoleSlug.QC_INSPECTOR)
+    request = SimpleNamespace(user=user, auth=None)
+    ops_permission = HasRole.as_any(RoleSlug.OPS_MANAGER)()
+    qc_permission = HasRole.as_any(RoleSlug.QC_INSPECTOR)()
+
+    with request_scope() as scope:
+        with django_assert_num_queries(1):
+            assert ops_permission.has_permission(request, view=None) is True
+            assert qc_permission.has_permission(request, view=None) is False
+            assert ops_permission.has_permission(request, view=None) is True
+
+        # Role changes inside the same unit of work drop the memoized slugs.
+        user.assign_roles_by_slugs(role_slugs=[RoleSlug.QC_INSPECTOR])
+        assert qc_permission.has_permission(request, view=None) is True
+        assert scope.stats()[ROLE_SLUGS] == {"hits": 2, "misses": 2}
@@ -0,0 +1,123 @@
+import pytest
+from django.core.cache import cache
+
+from core.utils import swr_cache
+from core.utils.swr_cache import invalidate_cache_tags, stale_while_revalidate
+
+
+class ReportService:
+    calls: list[int] = []
+
+    @stale_while_revalidate(
+        namespace="tests.report",
+        fresh_seconds=10,
+        stale_seconds=100,
+        tags=("tests.report",),
+    )
+    def summary(cls, *, days: int) -> dict[str, int]:
+        cls.calls.append(days)
+        return {"days": days, "build": len(cls.calls)}
+
+
+@pytest.fixture(autouse=True)
+def clock(monkeypatch):
+    ReportService.calls.clear()
+    now = [1_000_000.0]
+    monkeypatch.setattr(swr_cache.time, "time", lambda: now[0])
+    return now
+
+
+def test_fresh_entry_is_served_without_recompute(clock):
+    assert ReportService.summary(days=7) == {"days": 7, "build": 1}
+    clock[0] += 5
+
+    entry = ReportService.summary.cached(days=7)
+
+    assert entry.payload == {"days": 7, "build": 1}
+    assert entry.age_seconds == 5
+    assert not entry.stale
+    assert ReportService.calls == [7]
+
+
+def test_stale_entry_is_served_while_one_refresh_runs(clock):
+    ReportService.summary(days=7)
+    clock[0] += 30
+
+    stale = ReportService.summary.cached(days=7)
+
+    # Refresh tasks run eagerly under tests, so the next read is fresh again.
+    assert stale.stale
+    assert stale.payload["build"] == 1
+    assert ReportService.summary.cached(days=7).payload["build"] == 2
+    assert ReportService.calls == [7, 7]
+
+
+def test_held_refresh_lock_does_not_trigger_another_recompute(clock):
+    ReportService.summary(days=7)
+    clock[0] += 30
+    cache.add(ReportService.summary._method.lock_key({"days": 7}), 1)
+
+    assert ReportService.summary.cached(days=7).stale
+    assert ReportService.calls == [7]
+
+
+def test_tag_invalidation_serves_stale_while_one_refresh_runs(clock):
+    ReportService.summary(days=7)
+    ReportService.summary(days=30)
+
+    invalidate_cache_tags("tests.report")
+    stale = ReportService.summary.cached(days=7)
+
+    # The payload survives invalidation; the eager refresh replaces it.
+    assert stale.stale
+    assert stale.payload["build"] == 1
+    assert ReportService.summary.cached(days=7).payload["build"] == 3
+    assert ReportService.calls == [7, 30, 7]
+
+
+def test_invalidation_during_refresh_leaves_entry_stale(clock):
+    original = ReportService.summary._method.func
+
+    def invalidating(cls, *, days):
+        invalidate_cache_tags("tests.report")
+        return original(cls, days=days)
+
+    ReportService.summary._method.func = invalidating
+    try:
+        ReportService.summary(days=7)
+    finally:
+        ReportService.summary._method.func = original
+
+    assert ReportService.summary.cached(days=7).stale
+
+
+def test_cold_miss_waits_for_the_lock_holder(clock, monkeypatch):
+    lock_key = ReportService.summary._method.lock_key({"days": 7})
+    cache.add(lock_key, "other-reader")
+
+    def other_reader_finishes(_seconds):
+        ReportService.summary.refresh_locked("other-reader", {"days": 7})
+
+    monkeypatch.setattr(swr_cache.time, "sleep", other_reader_finishes)
+
+    assert ReportService.summary(days=7) == {"days": 7, "build": 1}
+    assert ReportService.calls == [7]
+    assert cache.get(lock_key) is None
+
+
+def test_cold_miss_computes_alone_when_the_holder_never_stores(clock, monkeypatch):
+    cache.add(ReportService.summary._method.lock_key({"days": 7}), "other-reader")
+    monkeypatch.setattr(swr_cache, "COLD_MISS_WAIT_SECONDS", 0)
+
+    assert ReportService.summary(days=7)["build"] == 1
+    assert cache.get(ReportService.summary._method.cache_key({"days": 7})) is None
+
+
+def test_refresh_releases_only_its_own_lock(clock):
+    lock_key = ReportService.summary._method.lock_key({"days": 7})
+    cache.add(lock_key, "current-holder")
+
+    ReportService.summary.refresh(days=7)
+    ReportService.summary.refresh_locked("expired-holder", {"days": 7})
+
+    assert cache.get(lock_key) == "current-holder"